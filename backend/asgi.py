@@ -3,6 +3,17 @@ ASGI config for backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Gantt canlı değişiklik akışı (/api/planlama/degisiklikler/akis/) uzun süreli SSE bağlantısı
+tuttuğu için ASGI altında çalıştırılmalıdır:
+
+    uvicorn backend.asgi:application
+    gunicorn backend.asgi:application -k uvicorn.workers.UvicornWorker
+
+Harici kaynağa bağlı uç noktalar (/api/exchange-rates/, /api/mikro-fly/durum/) async view'dir;
+ASGI altında yavaş bir upstream worker'ı bloklamaz. ORM ağırlıklı view'ler senkron kalır ve
+Django tarafından thread havuzunda çalıştırılır. Middleware'ler hem sync hem async çalışabildiği
+için WSGI (gunicorn backend.wsgi) kurulumu da değişmeden çalışmaya devam eder.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
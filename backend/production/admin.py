@@ -5,7 +5,7 @@ from django.utils.html import format_html
 from django.urls import path, reverse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.http import HttpResponseRedirect, JsonResponse
+from django.http import HttpResponse, HttpResponseRedirect, JsonResponse
 from django.utils import timezone
 from django.db import transaction
 from django.db.models import Sum, F
@@ -18,7 +18,9 @@ from .models import (
     SiparisKalem, SiparisDosya, MalzemeIhtiyac,
     Tedarikci, SatinAlmaSiparisi, SatinAlmaKalemi,
     SatinAlmaTeslimGuncelleme, MalzemeGelis, StandardIsAdimi,
-    IsIstasyonu, IsAkisi, IsAkisiOperasyon, IsEmri, BOMTemplate
+    IsIstasyonu, IsAkisi, IsAkisiOperasyon, IsAkisiSurumu, IsEmri, BOMTemplate, DocumentSequence,
+    TatilGunu, IstasyonGunlukYuk, VardiyaDeseni, TakvimIstisnasi, PlanlamaDegisiklik,
+    GunlukMetrik, TedarikciPerformans, TedarikSuresi, OperasyonSinifPolitikasi, DosyaIcerigi, ParcaliYukleme
 )
     
 @admin.register(Musteri)
@@ -208,18 +210,43 @@ class SiparisAdmin(admin.ModelAdmin):
         return f"{obj.toplam_tutar():,.2f} $"
     toplam_tutar_goster.short_description = 'Toplam Tutar'
     
+    actions = ['is_emirleri_olustur']
+    
+    def is_emirleri_olustur(self, request, queryset):
+        """Seçilen siparişlerin kalemlerini aktif iş akışlarına göre iş emirlerine aç"""
+        from .is_emri_service import IsEmriService
+        sonuc = IsEmriService.is_emirleri_olustur(queryset, olusturan=request.user)
+        self.message_user(
+            request,
+            f"{sonuc['kalem_sayisi']} kalem için {sonuc['is_emri_sayisi']} iş emri oluşturuldu."
+        )
+        if sonuc['atlanan_kalemler']:
+            self.message_user(
+                request,
+                f"{len(sonuc['atlanan_kalemler'])} kalemin ürününde aktif iş akışı olmadığı için atlandı.",
+                level=messages.WARNING
+            )
+    is_emirleri_olustur.short_description = "İş emirlerini oluştur"
+    
     def dosya_var_mi(self, obj):
         if obj.dosya or obj.dosyalar.exists():
             return "✓"
         return "-"
     dosya_var_mi.short_description = 'Dosya'
     
-    # Otomatik sipariş numarası üretimi için
-    def get_changeform_initial_data(self, request):
-        from datetime import datetime
-        return {
-            'siparis_no': f"SIP-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
-        }    
+    # Sipariş numarası boş bırakılırsa kayıtta üretilir; form her açıldığında numara harcanmaz
+    def get_form(self, request, obj=None, **kwargs):
+        form = super().get_form(request, obj, **kwargs)
+        if obj is None and 'siparis_no' in form.base_fields:
+            form.base_fields['siparis_no'].required = False
+            form.base_fields['siparis_no'].help_text = 'Boş bırakılırsa kaydederken otomatik atanır'
+        return form
+
+    def save_model(self, request, obj, form, change):
+        if not change and not obj.siparis_no:
+            from .sequence_service import SequenceService
+            obj.siparis_no = SequenceService.sonraki('SIP')
+        super().save_model(request, obj, form, change)
     
 # Proxy Model for Planlama
 class MalzemePlanlama(Siparis):
@@ -303,6 +330,8 @@ class MalzemePlanlamaAdmin(admin.ModelAdmin):
                     # Siparişlerin durumunu güncelle
                     if siparis_ids:
                         Siparis.objects.filter(id__in=siparis_ids).update(durum='malzeme_planlandi')
+                        from .istatistik_service import IstatistikService
+                        transaction.on_commit(IstatistikService.onbellegi_temizle)
                         
             messages.success(request, f"{created_count} adet malzeme ihtiyacı kaydedildi.")
             return redirect('admin:production_malzemeplanlama_changelist')
@@ -396,13 +425,13 @@ class MalzemeIhtiyacAdmin(admin.ModelAdmin):
     def changelist_view(self, request, extra_context=None):
         if request.method == 'POST' and request.POST.get('action') == 'satin_alma_olustur':
             import json
-            from datetime import datetime
+            from .sequence_service import SequenceService
             
             try:
                 siparis_data = json.loads(request.POST.get('siparis_data'))
                 
                 # Sipariş no oluştur
-                siparis_no = f"SA-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+                siparis_no = SequenceService.sonraki('SA')
                 
                 # Satın alma siparişi oluştur
                 siparis = SatinAlmaSiparisi.objects.create(
@@ -513,27 +542,52 @@ class SatinAlmaSiparisiAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+    actions = ['pdf_indir', 'pdf_zip_indir']
+
     def get_urls(self):
         urls = super().get_urls()
         custom_urls = [
             path('<path:object_id>/export/', self.admin_site.admin_view(self.export_pdf_view), name='production_satinalmasiparisi_export'),
+            path('<path:object_id>/pdf/', self.admin_site.admin_view(self.pdf_view), name='production_satinalmasiparisi_pdf'),
         ]
         return custom_urls + urls
 
     def export_pdf_view(self, request, object_id):
-        siparis = get_object_or_404(SatinAlmaSiparisi, pk=object_id)
+        siparis = get_object_or_404(SatinAlmaSiparisi.objects.select_related('tedarikci', 'olusturan'), pk=object_id)
         
         context = {
             'siparis': siparis,
-            'kalemler': siparis.kalemler.all(),
+            'kalemler': siparis.kalemler.select_related('malzeme_ihtiyaci'),
             'today': timezone.now().date(),
         }
     
         return render(request, 'admin/satinalma_siparisi_print.html', context)
 
+    def _pdf_yaniti(self, siparis_idleri, bicim, ek=True):
+        from .satinalma_pdf_service import SatinAlmaPdfService
+        icerik, content_type, dosya_adi = SatinAlmaPdfService.olustur(siparis_idleri, bicim=bicim)
+        response = HttpResponse(icerik, content_type=content_type)
+        response['Content-Disposition'] = f'{"attachment" if ek else "inline"}; filename="{dosya_adi}"'
+        return response
+
+    def pdf_view(self, request, object_id):
+        siparis = get_object_or_404(SatinAlmaSiparisi, pk=object_id)
+        return self._pdf_yaniti([siparis.pk], 'pdf', ek=False)
+
+    def pdf_indir(self, request, queryset):
+        """Seçilen siparişleri tek PDF dosyasında indir"""
+        return self._pdf_yaniti(queryset.values_list('pk', flat=True), 'pdf')
+    pdf_indir.short_description = "Seçilen siparişleri PDF olarak indir"
+
+    def pdf_zip_indir(self, request, queryset):
+        """Seçilen siparişleri sipariş başına ayrı PDF'lerle zip olarak indir"""
+        return self._pdf_yaniti(queryset.values_list('pk', flat=True), 'zip')
+    pdf_zip_indir.short_description = "Seçilen siparişleri PDF'ler halinde zip olarak indir"
+
     def change_view(self, request, object_id, form_url='', extra_context=None):
         extra_context = extra_context or {}
         extra_context['export_url'] = reverse('admin:production_satinalmasiparisi_export', args=[object_id])
+        extra_context['pdf_url'] = reverse('admin:production_satinalmasiparisi_pdf', args=[object_id])
         return super().change_view(request, object_id, form_url, extra_context=extra_context)
     
     def guncel_teslim_goster(self, obj):
@@ -671,6 +725,36 @@ class MalzemeGelisAdmin(admin.ModelAdmin):
         """Malzeme adını göster"""
         return obj.satinalma_kalemi.malzeme_ihtiyaci.malzeme_adi
     malzeme_adi.short_description = 'Malzeme Adı'
+
+    def get_urls(self):
+        urls = super().get_urls()
+        custom_urls = [
+            path('tedarikci-performans/', self.admin_site.admin_view(self.tedarikci_performans_view), name='malzeme_gelis_tedarikci_performans'),
+        ]
+        return custom_urls + urls
+
+    def tedarikci_performans_view(self, request):
+        """Tedarikçi karnesi: seçilen tarih aralığındaki aylar için sıralı performans tablosu"""
+        from datetime import date, timedelta
+        from .tedarikci_performans_service import TedarikciPerformansService
+        bugun = timezone.localdate()
+        try:
+            bitis = date.fromisoformat(request.GET['bitis']) if request.GET.get('bitis') else bugun
+            baslangic = (date.fromisoformat(request.GET['baslangic']) if request.GET.get('baslangic')
+                         else (bitis - timedelta(days=180)).replace(day=1))
+        except ValueError:
+            messages.error(request, "Geçersiz tarih aralığı.")
+            bitis, baslangic = bugun, (bugun - timedelta(days=180)).replace(day=1)
+
+        context = {
+            **self.admin_site.each_context(request),
+            'title': 'Tedarikçi Performans Raporu',
+            'tedarikci_performans': TedarikciPerformansService.siralama(baslangic, bitis),
+            'baslangic_tarihi': baslangic.isoformat(),
+            'bitis_tarihi': bitis.isoformat(),
+            'opts': self.model._meta,
+        }
+        return render(request, 'admin/tedarikci_performans.html', context)
     
     def save_model(self, request, obj, form, change):
         """Kaydetme sırasında kullanıcıyı otomatik ata"""
@@ -707,10 +791,153 @@ class StandardIsAdimiAdmin(admin.ModelAdmin):
 
 @admin.register(IsIstasyonu) 
 class IsIstasyonuAdmin(admin.ModelAdmin):
-    list_display = ['ad', 'tip', 'lokasyon', 'aktif']
-    list_filter = ['aktif', 'tip']
+    list_display = ['ad', 'tip', 'sinif', 'lokasyon', 'vardiya_deseni', 'aktif']
+    list_filter = ['aktif', 'tip', 'sinif']
     search_fields = ['ad', 'aciklama']
 
+@admin.register(OperasyonSinifPolitikasi)
+class OperasyonSinifPolitikasiAdmin(admin.ModelAdmin):
+    list_display = ['sinif', 'malzeme_kontrolu', 'kalemsiz_tedarik_bekle', 'aciklama']
+    list_editable = ['malzeme_kontrolu', 'kalemsiz_tedarik_bekle']
+
+@admin.register(TatilGunu)
+class TatilGunuAdmin(admin.ModelAdmin):
+    list_display = ['tarih', 'ad', 'calisma_orani']
+    list_filter = ['tarih']
+    search_fields = ['ad']
+    date_hierarchy = 'tarih'
+    
+    def delete_queryset(self, request, queryset):
+        # Toplu silme delete() çağırmaz; takvim ve kapasite burada tazelenir
+        from .kapasite_service import KapasiteService
+        tarihler = list(queryset.values_list('tarih', flat=True))
+        super().delete_queryset(request, queryset)
+        KapasiteService.takvim_degisti(tarihler=tarihler)
+
+@admin.register(VardiyaDeseni)
+class VardiyaDeseniAdmin(admin.ModelAdmin):
+    list_display = ['kod', 'ad', 'aktif']
+    list_filter = ['aktif']
+    search_fields = ['kod', 'ad']
+
+@admin.register(TakvimIstisnasi)
+class TakvimIstisnasiAdmin(admin.ModelAdmin):
+    list_display = ['tarih', 'istasyon', 'vardiyalar', 'aciklama']
+    list_filter = ['istasyon']
+    date_hierarchy = 'tarih'
+    list_select_related = ['istasyon']
+    
+    def delete_queryset(self, request, queryset):
+        from .kapasite_service import KapasiteService
+        tarihler = list(queryset.values_list('tarih', flat=True))
+        super().delete_queryset(request, queryset)
+        KapasiteService.takvim_degisti(tarihler=tarihler)
+
+@admin.register(IstasyonGunlukYuk)
+class IstasyonGunlukYukAdmin(admin.ModelAdmin):
+    list_display = ['istasyon', 'tarih', 'kullanilabilir_dakika', 'planlanan_dakika', 'is_emri_sayisi', 'doluluk_goster']
+    list_filter = ['istasyon', 'tarih']
+    date_hierarchy = 'tarih'
+    list_select_related = ['istasyon']
+    # Tablo iş emirlerinden türetilir; elle düzenlenmez
+    readonly_fields = ['istasyon', 'tarih', 'kullanilabilir_dakika', 'planlanan_dakika', 'is_emri_sayisi']
+
+    def doluluk_goster(self, obj):
+        return f"%{obj.doluluk_orani}"
+    doluluk_goster.short_description = 'Doluluk'
+
+    def has_add_permission(self, request):
+        return False
+
+@admin.register(PlanlamaDegisiklik)
+class PlanlamaDegisiklikAdmin(admin.ModelAdmin):
+    list_display = ['id', 'zaman', 'is_emri_id', 'islem', 'veri']
+    list_filter = ['islem']
+    search_fields = ['=is_emri_id']
+    date_hierarchy = 'zaman'
+    # Yalnızca eklenen akış; planlama_degisiklik_temizle komutuyla budanır
+    readonly_fields = ['is_emri_id', 'islem', 'veri', 'zaman']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+@admin.register(TedarikciPerformans)
+class TedarikciPerformansAdmin(admin.ModelAdmin):
+    list_display = ['tedarikci', 'ay', 'siparis_sayisi', 'zamaninda_orani', 'ortalama_kayma_gun',
+                    'revizyon_sayisi', 'doluluk_orani', 'hesaplama_zamani']
+    list_filter = ['ay']
+    search_fields = ['tedarikci__ad', 'tedarikci__kod']
+    list_select_related = ['tedarikci']
+    # Satın alma ve geliş kayıtlarından türetilen önbellek; elle düzenlenmez
+    readonly_fields = [f.name for f in TedarikciPerformans._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+@admin.register(TedarikSuresi)
+class TedarikSuresiAdmin(admin.ModelAdmin):
+    list_display = ['malzeme_adi', 'tedarikci', 'gozlem_sayisi', 'medyan_gun', 'p90_gun', 'son_gelis_tarihi']
+    list_filter = ['tedarikci']
+    search_fields = ['malzeme_adi', 'tedarikci__ad']
+    list_select_related = ['tedarikci']
+    # Malzeme gelişlerinden öğrenilir (tedarik_sureleri_hesapla komutu ile baştan kurulur); elle düzenlenmez
+    readonly_fields = [f.name for f in TedarikSuresi._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+@admin.register(DosyaIcerigi)
+class DosyaIcerigiAdmin(admin.ModelAdmin):
+    list_display = ['sha256', 'dosya', 'boyut', 'olusturulma_tarihi']
+    search_fields = ['sha256', 'dosya']
+    # Yüklemeler sırasında tekilleştirilerek yazılır; elle düzenlenmez
+    readonly_fields = [f.name for f in DosyaIcerigi._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+@admin.register(ParcaliYukleme)
+class ParcaliYuklemeAdmin(admin.ModelAdmin):
+    list_display = ['dosya_adi', 'hedef', 'hedef_id', 'toplam_boyut', 'durum', 'olusturan', 'guncellenme_tarihi']
+    list_filter = ['durum', 'hedef']
+    search_fields = ['dosya_adi']
+    list_select_related = ['olusturan']
+    # yarim_yuklemeleri_temizle komutuyla temizlenir
+    readonly_fields = [f.name for f in ParcaliYukleme._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+@admin.register(GunlukMetrik)
+class GunlukMetrikAdmin(admin.ModelAdmin):
+    list_display = ['tarih', 'metrik', 'anahtar', 'etiket', 'deger']
+    list_filter = ['metrik']
+    search_fields = ['anahtar', 'etiket']
+    date_hierarchy = 'tarih'
+    # metrik_ozet_al komutuyla hesaplanır
+    readonly_fields = ['tarih', 'metrik', 'anahtar', 'etiket', 'deger']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
 @admin.register(IsAkisi)
 class IsAkisiAdmin(admin.ModelAdmin):
     list_display = ['ad', 'urun', 'versiyon', 'operasyon_sayisi']
@@ -721,6 +948,21 @@ class IsAkisiAdmin(admin.ModelAdmin):
         return obj.operasyonlar.count()
     operasyon_sayisi.short_description = 'Operasyon Sayısı'
     
+    actions = ['yayinla']
+    
+    def yayinla(self, request, queryset):
+        """Seçilen iş akışlarının güncel halini yeni rota sürümü olarak yayınla"""
+        from .is_akisi_service import IsAkisiService, IsAkisiTasarimHatasi
+        yayinlanan = 0
+        for is_akisi in queryset:
+            try:
+                IsAkisiService.yayinla(is_akisi, yayinlayan=request.user)
+                yayinlanan += 1
+            except IsAkisiTasarimHatasi as e:
+                self.message_user(request, str(e), level=messages.WARNING)
+        self.message_user(request, f"{yayinlanan} iş akışı yayınlandı.")
+    yayinla.short_description = "Rota sürümü yayınla"
+    
     def get_urls(self):
         urls = super().get_urls()
         custom_urls = [
@@ -730,39 +972,65 @@ class IsAkisiAdmin(admin.ModelAdmin):
 
     def gorsel_tasarim_view(self, request, object_id):
         """Görsel iş akışı tasarım sayfası"""
+        from .is_akisi_service import IsAkisiService, IsAkisiTasarimHatasi
         is_akisi = get_object_or_404(IsAkisi, pk=object_id)
         
         if request.method == 'POST':
             try:
-                workflow_data = request.POST.get('workflow_data')
-                if workflow_data:
-                    workflow = json.loads(workflow_data)
-                    
-                    # Mevcut operasyonları temizle
-                    is_akisi.operasyonlar.all().delete()
-                    
-                    # Yeni operasyonları kaydet
-                    for op_data in workflow['operations']:
-                        IsAkisiOperasyon.objects.create(
-                            is_akisi=is_akisi,
-                            operasyon_id=op_data['operasyon_id'],
-                            sira_no=op_data['sira_no'],
-                            konum_x=op_data['x'],
-                            konum_y=op_data['y'],
-                            malzeme_atamalari=json.dumps(op_data.get('malzemeler', []))
-                        )
-                    
-                    return JsonResponse({'success': True})
-                    
+                if request.content_type == 'application/json':
+                    workflow = json.loads(request.body)
+                else:
+                    workflow = json.loads(request.POST.get('workflow_data') or '{}')
+                
+                # Sadece değişen operasyon ve bağlantılar yazılır
+                sonuc = IsAkisiService.tasarimi_kaydet(
+                    is_akisi, workflow.get('steps', []), workflow.get('connections', [])
+                )
+                return JsonResponse({
+                    'success': True,
+                    'message': f"İş akışı kaydedildi: {sonuc['olusturulan']} yeni, "
+                               f"{sonuc['guncellenen']} güncellenen, {sonuc['silinen']} silinen operasyon",
+                    'workflow_id': is_akisi.pk,
+                    'workflow_code': is_akisi.kod,
+                    **sonuc,
+                })
+            except IsAkisiTasarimHatasi as e:
+                return JsonResponse({'success': False, 'error': str(e)}, status=400)
             except Exception as e:
                 return JsonResponse({'success': False, 'error': str(e)})
         
+        operasyonlar = list(is_akisi.operasyonlar.select_related('standart_adim', 'istasyon'))
+        Through = IsAkisiOperasyon.onceki_operasyonlar.through
+        baglantilar = Through.objects.filter(
+            from_isakisioperasyon__is_akisi=is_akisi
+        ).values_list('from_isakisioperasyon_id', 'to_isakisioperasyon_id')
+        mevcut_akis = {
+            'urun_id': is_akisi.urun_id,
+            'steps': [{
+                'op_id': op.pk,
+                'standard_id': op.standart_adim_id,
+                'name': op.operasyon_adi,
+                'code': op.standart_adim.kod if op.standart_adim else '',
+                'time': str(op.standart_sure),
+                'color': op.standart_adim.renk if op.standart_adim else '',
+                'istasyon_id': op.istasyon_id,
+                'materials': op.operasyon_malzemeleri,
+                'subproducts': op.operasyon_ara_urunleri,
+            } for op in operasyonlar],
+            # Tasarımcıda bağlantı öncülden ardıla çizilir
+            'connections': [{'from': onceki_id, 'to': op_id} for op_id, onceki_id in baglantilar],
+        }
+        
+        standard_adimlar = StandardIsAdimi.objects.all()
         context = {
             'title': f'{is_akisi.urun.ad} - Görsel İş Akışı Tasarımı',
             'is_akisi': is_akisi,
-            'standard_adimlar': StandardIsAdimi.objects.all(),
+            'standard_adimlar': standard_adimlar,
+            'standard_is_adimlari': standard_adimlar,
+            'urunler': Urun.objects.filter(pk=is_akisi.urun_id),
             'bom_malzemeleri': [],
-            'mevcut_operasyonlar': is_akisi.operasyonlar.all(),
+            'mevcut_operasyonlar': operasyonlar,
+            'mevcut_akis': mevcut_akis,
             'opts': self.model._meta,
         }
         
@@ -779,8 +1047,8 @@ class IsAkisiAdmin(admin.ModelAdmin):
 
 @admin.register(IsAkisiOperasyon)
 class IsAkisiOperasyonAdmin(admin.ModelAdmin):
-    list_display = ['is_akisi', 'istasyon', 'operasyon_adi', 'sira_no']
-    list_filter = ['is_akisi__urun__kategori']
+    list_display = ['is_akisi', 'istasyon', 'operasyon_adi', 'sinif', 'sira_no']
+    list_filter = ['is_akisi__urun__kategori', 'sinif']
     search_fields = ['is_akisi__urun__ad', 'istasyon__ad']
     
 
@@ -902,17 +1170,33 @@ class IsEmriAdmin(admin.ModelAdmin):
     
     def reset_durum_malzeme_bekliyor(self, request, queryset):
         """Seçilen iş emirlerinin durumunu 'malzeme_bekliyor' olarak değiştir"""
-        updated = queryset.update(durum='malzeme_bekliyor')
+        from .kapasite_service import KapasiteService
+        from .degisiklik_akisi_service import DegisiklikAkisiService
+        with transaction.atomic():
+            # Tamamlanmış/iptal emirler tekrar kapasite tüketmeye başlayabilir
+            emir_idleri = list(queryset.values_list('pk', flat=True))
+            KapasiteService.emirleri_yukten_cikar(queryset)
+            # queryset.update auto_now uygulamaz; terminallerin delta sorgusu için elle yazılır
+            updated = queryset.update(durum='malzeme_bekliyor', guncellenme_tarihi=timezone.now())
+            KapasiteService.emirleri_yuke_ekle(queryset)
+            DegisiklikAkisiService.kaydet_idler(emir_idleri)
         self.message_user(request, f'{updated} iş emrinin durumu malzeme_bekliyor olarak güncellendi.')
     reset_durum_malzeme_bekliyor.short_description = "Durumu 'Malzeme Bekliyor' yap"
     
     def reset_planlanan_istasyon(self, request, queryset):
         """Seçilen iş emirlerinin planlanan istasyonunu temizle"""
         from datetime import date
-        updated = queryset.update(
-            planlanan_istasyon=None, 
-            planlanan_baslangic_tarihi=date.today()
-        )
+        from .kapasite_service import KapasiteService
+        from .degisiklik_akisi_service import DegisiklikAkisiService
+        with transaction.atomic():
+            emir_idleri = list(queryset.values_list('pk', flat=True))
+            KapasiteService.emirleri_yukten_cikar(queryset)
+            updated = queryset.update(
+                planlanan_istasyon=None, 
+                planlanan_baslangic_tarihi=date.today(),
+                guncellenme_tarihi=timezone.now(),
+            )
+            DegisiklikAkisiService.kaydet_idler(emir_idleri)
         self.message_user(request, f'{updated} iş emrinin planlanan istasyonu temizlendi.')
     reset_planlanan_istasyon.short_description = "Planlanan istasyonu temizle"
 
@@ -932,43 +1216,25 @@ class UretimPlanlamaAdmin(admin.ModelAdmin):
         """Ana üretim planlama ekranı - Gantt görünümü"""
         from datetime import datetime, timedelta
         import calendar
+        from django.db.models.functions import Lower
+        from .degisiklik_akisi_service import DegisiklikAkisiService
         
-        # İş istasyonlarını özel sıralama ile getir
-        def istasyon_sirala_key(istasyon):
-            """İstasyon adına göre sıralama anahtarı"""
-            ad = istasyon.ad.lower()
-            
-            # AG Sargı'lar en önce (1xx)
-            if 'ag' in ad and 'sargı' in ad:
-                return (100, ad)
-            # YG Sargı'lar ikinci sırada (2xx)  
-            elif 'yg' in ad and 'sargı' in ad:
-                return (200, ad)
-            # Montaj üçüncü sırada (3xx)
-            elif 'montaj' in ad:
-                return (300, ad)
-            # Kurutma dördüncü sırada (4xx)
-            elif 'kurutma' in ad:
-                return (400, ad)
-            # Test beşinci sırada (5xx)
-            elif 'test' in ad:
-                return (500, ad)
-            # Diğerleri en sonda (9xx)
-            else:
-                return (900, ad)
+        # Ekran bu sıradan sonraki değişiklikleri canlı akıştan alır (veriler okunmadan önce alınmalı)
+        degisiklik_sirasi = DegisiklikAkisiService.son_sira()
         
-        # Tüm aktif istasyonları al ve sırala
-        istasyonlar = list(IsIstasyonu.objects.filter(aktif=True))
-        istasyonlar.sort(key=istasyon_sirala_key)
+        # Tüm aktif istasyonlar sınıf sırasıyla: AG sargı, YG sargı, sargı, montaj, kurutma, test, diğer
+        istasyonlar = list(IsIstasyonu.objects.filter(aktif=True).order_by('sinif', Lower('ad')))
         
         # Günleri hazırla (bugünden itibaren 30 gün)
+        from .takvim_service import TakvimService
         bugun = datetime.now().date()
+        # Çalışma saati: varsayılan vardiya takvimi (hafta sonu ve resmi tatiller dahil)
+        takvim = TakvimService.takvim(None, bugun)
         gunler = []
         for i in range(30):
             gun = bugun + timedelta(days=i)
             gun_adi = ['Pzt', 'Sal', 'Çar', 'Per', 'Cum', 'Cmt', 'Paz'][gun.weekday()]
-            # Çalışma saati: Pazartesi-Cuma 9 saat, Cumartesi-Pazar 0 saat
-            default_calisma_saati = 9 if gun.weekday() < 5 else 0
+            default_calisma_saati = round(takvim.gunluk_dakika(gun) / 60)
             gunler.append({
                 'tarih': gun,
                 'gun_adi': gun_adi,
@@ -1063,6 +1329,7 @@ class UretimPlanlamaAdmin(admin.ModelAdmin):
             'planlanmamis_emirler': planlanmamis_emirler,
             'planli_emirler': planlanmis_emirler,
             'siparis_emirleri': dict(siparis_emirleri),
+            'degisiklik_sirasi': degisiklik_sirasi,
             'opts': UretimPlanlama._meta,
             'app_label': UretimPlanlama._meta.app_label,
         }
@@ -1076,6 +1343,7 @@ class UretimPlanlamaAdmin(admin.ModelAdmin):
             path('emir-guncelle/', self.admin_site.admin_view(self.emir_guncelle_view), name='production_uretimplanlama_emir_guncelle'),
             path('update-planning/', self.admin_site.admin_view(self.update_planning_view), name='production_uretimplanlama_update_planning'),
             path('unplan-order/', self.admin_site.admin_view(self.unplan_order_view), name='production_uretimplanlama_unplan_order'),
+            path('toplu-planlama/', self.admin_site.admin_view(self.toplu_planlama_view), name='production_uretimplanlama_toplu_planlama'),
         ]
         return custom_urls + urls
     
@@ -1123,6 +1391,7 @@ class UretimPlanlamaAdmin(admin.ModelAdmin):
         if request.method == 'POST':
             import json
             from datetime import datetime
+            from .planlama_service import PlanlamaService
             
             try:
                 data = json.loads(request.body)
@@ -1139,15 +1408,18 @@ class UretimPlanlamaAdmin(admin.ModelAdmin):
                 # Tarihi parse et
                 planlanan_tarih = datetime.strptime(date_str, '%Y-%m-%d').date()
                 
-                # İş emrini güncelle
-                emir.planlanan_istasyon = istasyon
-                emir.planlanan_baslangic_tarihi = planlanan_tarih
-                # emir.durum = 'planlandi'  # Durum değiştirme şimdilik yapılmasın
-                emir.save()
+                # İş emrini istasyon takvimine göre yerleştir (çalışılmayan gün ise sonraki iş günü);
+                # çakışan istasyon kuyruğu ve geç kalan ardıllar ileri kaydırılır
+                degisenler = PlanlamaService.tasi_ve_yay(emir, istasyon, planlanan_tarih)
+                tasinan = degisenler[0]
                 
                 return JsonResponse({
                     'success': True,
-                    'message': f'İş emri {istasyon.ad} istasyonuna {planlanan_tarih.strftime("%d.%m.%Y")} tarihinde planlandı.'
+                    'message': f'İş emri {istasyon.ad} istasyonuna {datetime.fromisoformat(tasinan["planlanan_baslangic"]).strftime("%d.%m.%Y")} tarihinde planlandı.'
+                               + (f' {len(degisenler) - 1} bağlı emir kaydırıldı.' if len(degisenler) > 1 else ''),
+                    'planlanan_baslangic': tasinan['planlanan_baslangic'],
+                    'planlanan_bitis': tasinan['planlanan_bitis'],
+                    'degisen_emirler': degisenler,
                 })
                 
             except Exception as e:
@@ -1158,6 +1430,31 @@ class UretimPlanlamaAdmin(admin.ModelAdmin):
         
         return JsonResponse({'success': False, 'error': 'Invalid request method'})
     
+    def toplu_planlama_view(self, request):
+        """
+        Gantt çoklu seçim için toplu planlama: {"moves": [{"order_id", "station_id", "date"}, ...]}
+        Hareketler birlikte doğrulanır ve tek işlemde uygulanır; station_id boşsa plan kaldırılır.
+        """
+        if request.method != 'POST':
+            return JsonResponse({'success': False, 'error': 'Sadece POST istekleri kabul edilir'})
+        from .planlama_service import PlanlamaService
+        
+        try:
+            hareketler = json.loads(request.body).get('moves')
+        except (ValueError, AttributeError):
+            hareketler = None
+        if not isinstance(hareketler, list) or not hareketler:
+            return JsonResponse({'success': False, 'error': 'moves listesi gerekli'})
+        
+        uygulandi, sonuclar = PlanlamaService.toplu_planla(hareketler)
+        hatali = sum(1 for sonuc in sonuclar if not sonuc['success'])
+        return JsonResponse({
+            'success': uygulandi,
+            'message': f'{len(sonuclar)} iş emri planlandı.' if uygulandi
+                       else f'{hatali} hareket geçersiz, hiçbir değişiklik kaydedilmedi.',
+            'results': sonuclar,
+        })
+    
     def emir_guncelle_view(self, request):
         if request.method == 'POST':
             try:
@@ -1173,8 +1470,10 @@ class UretimPlanlamaAdmin(admin.ModelAdmin):
                 
                 if planlanan_tarih:
                     from datetime import datetime
-                    emir.planlanan_baslangic_tarihi = datetime.fromisoformat(planlanan_tarih)
+                    emir.planlanan_baslangic_tarihi = datetime.fromisoformat(planlanan_tarih).date()
                 
+                if emir.planlanan_istasyon_id:
+                    emir.takvime_gore_zamanla(emir.planlanan_istasyon, emir.planlanan_baslangic_tarihi)
                 emir.save()
                 
                 return JsonResponse({'success': True, 'message': 'İş emri güncellendi'})
@@ -1228,4 +1527,30 @@ class BOMTemplateAdmin(admin.ModelAdmin):
 
 # Admin kayıtları
 admin.site.register(IsEmri, IsEmriAdmin)
+
+
+@admin.register(DocumentSequence)
+class DocumentSequenceAdmin(admin.ModelAdmin):
+    list_display = ['onek', 'son_deger', 'sablon', 'blok_boyutu', 'guncellenme_tarihi']
+    search_fields = ['onek']
+    # Sayaç geriye alınırsa çakışan numara üretilir
+    readonly_fields = ['son_deger', 'guncellenme_tarihi']
+
+
+@admin.register(IsAkisiSurumu)
+class IsAkisiSurumuAdmin(admin.ModelAdmin):
+    list_display = ['is_akisi', 'yayin_no', 'versiyon', 'operasyon_sayisi', 'yayinlayan', 'yayin_tarihi']
+    list_filter = ['yayin_tarihi']
+    search_fields = ['is_akisi__kod', 'is_akisi__ad']
+    list_select_related = ['is_akisi', 'yayinlayan']
+    # Sürümler değişmez; sadece IsAkisiService.yayinla ile oluşturulur
+    exclude = ['veri']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 admin.site.register(UretimPlanlama, UretimPlanlamaAdmin)
\ No newline at end of file
@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class ProductionConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'backend.production'
-    verbose_name = 'Üretim Yönetimi'
\ No newline at end of file
+    verbose_name = 'Üretim Yönetimi'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -7,10 +7,18 @@ import requests
 import logging
 from decimal import Decimal
 from datetime import datetime, timedelta
+from asgiref.sync import sync_to_async
 from django.core.cache import cache
 from django.conf import settings
 import json
 
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    httpx = None
+    HTTPX_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 class CurrencyService:
@@ -21,6 +29,9 @@ class CurrencyService:
     
     # Cache süresi (1 saat)
     CACHE_TIMEOUT = 3600
+
+    # Harici API zaman aşımı (saniye)
+    API_TIMEOUT = 10
     
     # Desteklenen para birimleri
     SUPPORTED_CURRENCIES = [
@@ -58,33 +69,43 @@ class CurrencyService:
             logger.error(f"Error fetching exchange rates: {str(e)}")
             return cls._get_fallback_rates(base_currency)
     
+    @classmethod
+    async def aget_exchange_rates(cls, base_currency='USD'):
+        """
+        get_exchange_rates'in async karşılığı. Harici istek beklenirken worker başka istekleri
+        işleyebilir; httpx yoksa istek ayrı bir thread'de yapılır.
+        """
+        cache_key = f"exchange_rates_{base_currency}"
+
+        rates = await cache.aget(cache_key)
+        if rates:
+            logger.info(f"Exchange rates loaded from cache for {base_currency}")
+            return rates
+
+        try:
+            rates = await cls._afetch_from_api(base_currency)
+
+            if rates:
+                await cache.aset(cache_key, rates, cls.CACHE_TIMEOUT)
+                logger.info(f"Exchange rates fetched and cached for {base_currency}")
+                return rates
+            else:
+                logger.warning(f"Could not fetch rates from API, using fallback for {base_currency}")
+                return cls._get_fallback_rates(base_currency)
+
+        except Exception as e:
+            logger.error(f"Error fetching exchange rates: {str(e)}")
+            return cls._get_fallback_rates(base_currency)
+
     @classmethod
     def _fetch_from_api(cls, base_currency):
         """API'den kur bilgilerini çek"""
         try:
             url = f"{cls.OANDA_BASE_URL}/{base_currency}"
-            response = requests.get(url, timeout=10)
+            response = requests.get(url, timeout=cls.API_TIMEOUT)
             
             if response.status_code == 200:
-                data = response.json()
-                rates = data.get('rates', {})
-                
-                # Sadece desteklenen para birimlerini al
-                filtered_rates = {
-                    currency: float(rate) 
-                    for currency, rate in rates.items() 
-                    if currency in cls.SUPPORTED_CURRENCIES
-                }
-                
-                # Temel para birimini ekle
-                filtered_rates[base_currency] = 1.0
-                
-                return {
-                    'rates': filtered_rates,
-                    'timestamp': datetime.now().isoformat(),
-                    'base': base_currency,
-                    'source': 'API'
-                }
+                return cls._parse_rates(response.json(), base_currency)
             else:
                 logger.error(f"API request failed: {response.status_code}")
                 return None
@@ -95,6 +116,52 @@ class CurrencyService:
         except json.JSONDecodeError as e:
             logger.error(f"JSON decode error: {str(e)}")
             return None
+
+    @classmethod
+    async def _afetch_from_api(cls, base_currency):
+        """API'den kur bilgilerini async HTTP istemcisiyle çek"""
+        if not HTTPX_AVAILABLE:
+            return await sync_to_async(cls._fetch_from_api, thread_sensitive=False)(base_currency)
+
+        try:
+            url = f"{cls.OANDA_BASE_URL}/{base_currency}"
+            async with httpx.AsyncClient(timeout=cls.API_TIMEOUT) as client:
+                response = await client.get(url)
+
+            if response.status_code == 200:
+                return cls._parse_rates(response.json(), base_currency)
+            else:
+                logger.error(f"API request failed: {response.status_code}")
+                return None
+
+        except httpx.HTTPError as e:
+            logger.error(f"API request error: {str(e)}")
+            return None
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON decode error: {str(e)}")
+            return None
+
+    @classmethod
+    def _parse_rates(cls, data, base_currency):
+        """API yanıtından desteklenen para birimlerinin kurlarını ayıkla"""
+        rates = data.get('rates', {})
+
+        # Sadece desteklenen para birimlerini al
+        filtered_rates = {
+            currency: float(rate) 
+            for currency, rate in rates.items() 
+            if currency in cls.SUPPORTED_CURRENCIES
+        }
+
+        # Temel para birimini ekle
+        filtered_rates[base_currency] = 1.0
+
+        return {
+            'rates': filtered_rates,
+            'timestamp': datetime.now().isoformat(),
+            'base': base_currency,
+            'source': 'API'
+        }
     
     @classmethod
     def _get_fallback_rates(cls, base_currency='USD'):
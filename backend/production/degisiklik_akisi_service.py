@@ -0,0 +1,186 @@
+"""
+Planlama değişiklik akışı - iş emri plan değişikliklerini sıra numaralı olarak kaydeder ve
+Gantt ekranlarına son görülen numaradan sonraki farkları (SSE / uzun yoklama) sunar
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time as zaman
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from .models import IsEmri, PlanlamaDegisiklik
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+class DegisiklikAkisiService:
+    """
+    PlanlamaDegisiklik akışı. Kayıtlar plan değişikliğiyle aynı işlemde yazılır; okuma tarafı
+    son sıra numarasını süreç içinde kısa süre önbellekler, böylece bağlı ekran sayısından bağımsız
+    olarak yeni kayıt yoksa veritabanına gidilmez.
+    """
+
+    _kilit = threading.Lock()
+    _son_sira = None  # (okunma zamanı, sıra)
+
+    # ------------------------------------------------------------------
+    # Kayıt
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def kaydet_emir(cls, emir, islem, plan=None):
+        """Tek iş emrinin güncel planını akışa ekler (IsEmri.save)"""
+        kayit = PlanlamaDegisiklik.objects.create(is_emri_id=emir.pk, islem=islem, veri=plan or emir.plan_ozeti())
+        cls._sira_ilerledi(kayit.pk)
+
+    @classmethod
+    def kaydet(cls, emirler, islem='guncelle'):
+        """Plan alanları yüklü iş emirleri için toplu kayıt (bulk_create/bulk_update sonrası)"""
+        kayitlar = PlanlamaDegisiklik.objects.bulk_create([
+            PlanlamaDegisiklik(is_emri_id=emir.pk, islem=islem, veri=emir.plan_ozeti()) for emir in emirler
+        ], batch_size=BATCH_SIZE)
+        if kayitlar and kayitlar[-1].pk:
+            cls._sira_ilerledi(kayitlar[-1].pk)
+        return len(kayitlar)
+
+    @classmethod
+    def kaydet_idler(cls, emir_idleri, islem='guncelle'):
+        """queryset.update sonrası: emirlerin güncel planını tek sorguda okuyup kaydeder"""
+        emirler = IsEmri.objects.filter(pk__in=list(emir_idleri)).only(*IsEmri.PLAN_ALANLARI).order_by('pk')
+        return cls.kaydet(emirler, islem)
+
+    @classmethod
+    def kaydet_silinen(cls, emir_idleri):
+        kayitlar = PlanlamaDegisiklik.objects.bulk_create([
+            PlanlamaDegisiklik(is_emri_id=emir_id, islem='sil') for emir_id in emir_idleri
+        ], batch_size=BATCH_SIZE)
+        if kayitlar and kayitlar[-1].pk:
+            cls._sira_ilerledi(kayitlar[-1].pk)
+        return len(kayitlar)
+
+    @classmethod
+    def onbellegi_temizle(cls):
+        with cls._kilit:
+            cls._son_sira = None
+
+    @classmethod
+    def _sira_ilerledi(cls, sira):
+        with cls._kilit:
+            if cls._son_sira and cls._son_sira[1] >= sira:
+                return
+            cls._son_sira = (zaman.monotonic(), sira)
+
+    # ------------------------------------------------------------------
+    # Okuma
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def son_sira(cls):
+        """Akıştaki en büyük sıra numarası (PLANLAMA_AKIS_YOKLAMA_ARALIGI kadar önbellekli)"""
+        aralik = getattr(settings, 'PLANLAMA_AKIS_YOKLAMA_ARALIGI', 1.0)
+        with cls._kilit:
+            if cls._son_sira and zaman.monotonic() - cls._son_sira[0] < aralik:
+                return cls._son_sira[1]
+        sira = PlanlamaDegisiklik.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        with cls._kilit:
+            cls._son_sira = (zaman.monotonic(), sira)
+        return sira
+
+    @classmethod
+    def degisiklikler(cls, son_sira, limit=None):
+        """
+        son_sira'dan sonraki değişiklikler: {'son': sıra, 'degisiklikler': [...], 'yenile': bool, 'devam': bool}.
+        Bir emir için yalnızca en son hali döner. Eşzamanlı işlemler sıra numarasını commit sırasından farklı
+        alabileceğinden PLANLAMA_AKIS_GECIKME saniyeden yeni kayıtlar bir sonraki okumaya bırakılır.
+        İstenen numara temizlenmiş aralıktaysa 'yenile' döner; istemci ekranı baştan yüklemelidir.
+        """
+        limit = limit or getattr(settings, 'PLANLAMA_AKIS_LIMIT', 1000)
+        if son_sira >= cls.son_sira():
+            return {'son': son_sira, 'degisiklikler': [], 'yenile': False, 'devam': False}
+
+        ilk = PlanlamaDegisiklik.objects.order_by('id').values_list('id', flat=True).first()
+        if ilk is None or son_sira < ilk - 1:
+            return {'son': cls.son_sira(), 'degisiklikler': [], 'yenile': son_sira > 0, 'devam': False}
+
+        sinir = timezone.now() - timedelta(seconds=getattr(settings, 'PLANLAMA_AKIS_GECIKME', 1.0))
+        satirlar = list(PlanlamaDegisiklik.objects.filter(id__gt=son_sira).order_by('id').values_list(
+            'id', 'is_emri_id', 'islem', 'veri', 'zaman'
+        )[:limit])
+        son_emirler = {}
+        for sira, emir_id, islem, veri, kayit_zamani in satirlar:
+            if kayit_zamani > sinir:
+                break
+            son_emirler.pop(emir_id, None)
+            son_emirler[emir_id] = {'sira': sira, 'id': emir_id, 'islem': islem, **veri}
+            son_sira = sira
+        return {
+            'son': son_sira,
+            'degisiklikler': list(son_emirler.values()),
+            'yenile': False,
+            'devam': len(satirlar) == limit and bool(son_emirler),
+        }
+
+    @classmethod
+    async def bekle(cls, son_sira, sure):
+        """
+        Uzun yoklama: son_sira'dan sonraki değişiklikler; yoksa en çok `sure` saniye yeni kayıt beklenir.
+        Bekleme event loop'ta yapılır, bağlı istemciler işçi thread'i tutmaz.
+        """
+        aralik = getattr(settings, 'PLANLAMA_AKIS_YOKLAMA_ARALIGI', 1.0)
+        bitis = zaman.monotonic() + sure
+        oku = sync_to_async(cls.degisiklikler)
+        sonuc = await oku(son_sira)
+        while not (sonuc['degisiklikler'] or sonuc['yenile']) and zaman.monotonic() < bitis:
+            await asyncio.sleep(aralik)
+            sonuc = await oku(son_sira)
+        return sonuc
+
+    @classmethod
+    async def olay_akisi(cls, son_sira):
+        """
+        Server-sent events üreteci. PLANLAMA_AKIS_SURESI saniye sonra kapanır; tarayıcı EventSource
+        Last-Event-ID ile kaldığı yerden yeniden bağlanır.
+        """
+        aralik = getattr(settings, 'PLANLAMA_AKIS_YOKLAMA_ARALIGI', 1.0)
+        bitis = zaman.monotonic() + getattr(settings, 'PLANLAMA_AKIS_SURESI', 300)
+        nabiz = zaman.monotonic()
+        oku = sync_to_async(cls.degisiklikler)
+        yield 'retry: 2000\n\n'
+        while zaman.monotonic() < bitis:
+            sonuc = await oku(son_sira)
+            if sonuc['yenile']:
+                yield f"id: {sonuc['son']}\nevent: yenile\ndata: {{}}\n\n"
+                return
+            if sonuc['degisiklikler']:
+                son_sira = sonuc['son']
+                veri = json.dumps(sonuc['degisiklikler'], cls=DjangoJSONEncoder, ensure_ascii=False)
+                yield f"id: {son_sira}\nevent: plan\ndata: {veri}\n\n"
+                nabiz = zaman.monotonic()
+                if sonuc['devam']:
+                    continue
+            elif zaman.monotonic() - nabiz >= 15:
+                # Proxy'lerin boşta bağlantıyı kapatmaması için yorum satırı
+                yield ': nabiz\n\n'
+                nabiz = zaman.monotonic()
+            await asyncio.sleep(aralik)
+
+    # ------------------------------------------------------------------
+    # Temizlik
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def temizle(gun=None):
+        """Saklama süresinden eski kayıtları siler, silinen sayısını döndürür"""
+        gun = gun if gun is not None else getattr(settings, 'PLANLAMA_DEGISIKLIK_SAKLAMA_GUN', 7)
+        silinen, _ = PlanlamaDegisiklik.objects.filter(zaman__lt=timezone.now() - timedelta(days=gun)).delete()
+        logger.info(f"{silinen} planlama değişiklik kaydı temizlendi ({gun} günden eski)")
+        return silinen
@@ -0,0 +1,347 @@
+"""
+Dışa aktarım servisi - iş emri, malzeme ihtiyacı ve sipariş kalemi dökümlerini CSV / XLSX olarak
+akış halinde üretir. Satırlar values_list().iterator(chunk_size) ile parça parça okunur ve yazılır;
+bellek kullanımı satır sayısından bağımsızdır.
+"""
+
+import csv
+import logging
+import re
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import IsEmri, MalzemeIhtiyac, SiparisKalem
+
+logger = logging.getLogger(__name__)
+
+
+def _secenek(choices):
+    etiketler = dict(choices)
+    return lambda deger: etiketler.get(deger, deger)
+
+
+def _liste(deger):
+    return ', '.join(str(x) for x in deger) if isinstance(deger, (list, tuple)) else deger
+
+
+class DisaAktarimService:
+    """
+    Dışa aktarılabilir kaynaklar ve biçim yazıcıları. Her kaynak (başlık, alan, dönüşüm) sütunlarından
+    oluşur; alanlar values_list'e verilir, dönüşüm (seçenek etiketi vb.) satır yazılırken uygulanır.
+    """
+
+    BICIMLER = ('csv', 'xlsx')
+
+    KAYNAKLAR = {
+        'is-emirleri': {
+            'sayfa': 'İş Emirleri',
+            'sorgu': lambda: IsEmri.objects.order_by('id'),
+            'durum_alani': 'durum',
+            'sutunlar': [
+                ('İş Emri No', 'emirNo', None),
+                ('Ana İş Emri No', 'ana_emirNo', None),
+                ('Sipariş No', 'siparis__siparis_no', None),
+                ('Müşteri', 'siparis__musteri__ad', None),
+                ('Ürün Kodu', 'urun__kod', None),
+                ('Ürün', 'urun__ad', None),
+                ('Operasyon', 'operasyon__operasyon_adi', None),
+                ('İstasyon', 'planlanan_istasyon__ad', None),
+                ('Durum', 'durum', _secenek(IsEmri.DURUM_CHOICES)),
+                ('Öncelik', 'oncelik', _secenek(IsEmri.ONCELIK_CHOICES)),
+                ('Planlanan Miktar', 'planlanan_miktar', None),
+                ('Üretilen Miktar', 'uretilen_miktar', None),
+                ('Planlanan Başlangıç', 'planlanan_baslangic_tarihi', None),
+                ('Planlanan Bitiş', 'planlanan_bitis_tarihi', None),
+                ('Planlanan Süre (dk)', 'planlanan_sure', None),
+                ('Gerçek Başlangıç', 'gercek_baslangic_tarihi', None),
+                ('Gerçek Bitiş', 'gercek_bitis_tarihi', None),
+                ('Gerçek Süre (dk)', 'gercek_sure', None),
+                ('Oluşturulma', 'olusturulma_tarihi', None),
+            ],
+        },
+        'malzeme-ihtiyaclari': {
+            'sayfa': 'Malzeme İhtiyaçları',
+            'sorgu': lambda: MalzemeIhtiyac.objects.order_by('id'),
+            'durum_alani': 'durum',
+            'sutunlar': [
+                ('ID', 'id', None),
+                ('Malzeme', 'malzeme_adi', None),
+                ('Miktar', 'miktar', None),
+                ('Birim', 'birim', None),
+                ('İşlem Tipi', 'islem_tipi', _secenek(MalzemeIhtiyac.ISLEM_CHOICES)),
+                ('Durum', 'durum', _secenek(MalzemeIhtiyac.DURUM_CHOICES)),
+                ('İlgili Siparişler', 'ilgili_siparisler', _liste),
+                ('Oluşturan', 'olusturan__username', None),
+                ('Oluşturulma', 'olusturulma_tarihi', None),
+                ('Notlar', 'notlar', None),
+            ],
+        },
+        'siparis-kalemleri': {
+            'sayfa': 'Sipariş Kalemleri',
+            'sorgu': lambda: SiparisKalem.objects.order_by('id'),
+            'durum_alani': 'siparis__durum',
+            'sutunlar': [
+                ('Sipariş No', 'siparis__siparis_no', None),
+                ('Sipariş Tarihi', 'siparis__tarih', None),
+                ('Sipariş Durumu', 'siparis__durum', None),
+                ('Müşteri Kodu', 'siparis__musteri__kod', None),
+                ('Müşteri', 'siparis__musteri__ad', None),
+                ('Ürün Kodu', 'urun__kod', None),
+                ('Ürün', 'urun__ad', None),
+                ('Miktar', 'miktar', None),
+                ('Para Birimi', 'doviz', None),
+                ('Birim Fiyat', 'birim_fiyat', None),
+                ('Kur', 'kur', None),
+                ('Birim Fiyat (USD)', 'birim_fiyat_usd', None),
+                ('Teslim Tarihi', 'teslim_tarihi', None),
+                ('Son Kullanıcı Ülke', 'son_kullanici_ulke', None),
+            ],
+        },
+    }
+
+    @classmethod
+    def kaynak(cls, ad):
+        if ad not in cls.KAYNAKLAR:
+            raise ValueError(f"Bilinmeyen dışa aktarım kaynağı: {ad}")
+        return cls.KAYNAKLAR[ad]
+
+    @classmethod
+    def satirlar(cls, ad, durum=None):
+        """(başlıklar, satır üreteci); satırlar veritabanından DISA_AKTARIM_PARCA_BOYUTU'luk parçalarla okunur"""
+        tanim = cls.kaynak(ad)
+        sorgu = tanim['sorgu']()
+        if durum:
+            sorgu = sorgu.filter(**{tanim['durum_alani']: durum})
+        sutunlar = tanim['sutunlar']
+        donusumler = [(i, donusum) for i, (_, _, donusum) in enumerate(sutunlar) if donusum]
+        parca = getattr(settings, 'DISA_AKTARIM_PARCA_BOYUTU', 2000)
+
+        def uret():
+            for satir in sorgu.values_list(*(alan for _, alan, _ in sutunlar)).iterator(chunk_size=parca):
+                if donusumler:
+                    satir = list(satir)
+                    for i, donusum in donusumler:
+                        satir[i] = donusum(satir[i])
+                yield satir
+
+        return [baslik for baslik, _, _ in sutunlar], uret()
+
+    # ------------------------------------------------------------------
+    # CSV
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def csv_akisi(basliklar, satirlar):
+        """
+        UTF-8 (BOM'lu, Excel Türkçe ayarlarında doğru açılsın diye) CSV. Satırlar tampona
+        biriktirilip yaklaşık 64 KB'lık parçalar halinde verilir. Formül gibi başlayan metinlerin
+        önüne ' eklenir.
+        """
+        tampon = _SatirTamponu()
+        yazici = csv.writer(tampon, delimiter=getattr(settings, 'DISA_AKTARIM_CSV_AYIRICI', ';'))
+        yield '\ufeff'.encode('utf-8')
+        yazici.writerow(basliklar)
+        for satir in satirlar:
+            yazici.writerow(_csv_deger(deger) for deger in satir)
+            if tampon.boyut >= 65536:
+                yield tampon.bosalt().encode('utf-8')
+        yield tampon.bosalt().encode('utf-8')
+
+    # ------------------------------------------------------------------
+    # XLSX
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def xlsx_akisi(cls, sayfa_adi, basliklar, satirlar):
+        """
+        Tek sayfalık XLSX (Office Open XML). Paylaşılan dize tablosu yerine satır içi dizeler
+        kullanılır ve zip arşivi seek gerektirmeden (veri tanımlayıcılı) yazılır; böylece sayfa
+        XML'i satır satır sıkıştırılıp istemciye aktarılır, hiçbir aşamada tamamı bellekte tutulmaz.
+        """
+        tampon = _AkisTamponu()
+        with zipfile.ZipFile(tampon, 'w', compression=zipfile.ZIP_DEFLATED) as arsiv:
+            for dosya, icerik in _xlsx_sabit_dosyalar(sayfa_adi):
+                arsiv.writestr(dosya, icerik)
+            yield tampon.bosalt()
+
+            sutun_harfleri = [_sutun_harfi(i) for i in range(len(basliklar))]
+            with arsiv.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sayfa:
+                sayfa.write(_SAYFA_BASI)
+                sayfa.write(_xlsx_satir(1, sutun_harfleri, basliklar, stil=_STIL_BASLIK))
+                for satir_no, satir in enumerate(satirlar, start=2):
+                    sayfa.write(_xlsx_satir(satir_no, sutun_harfleri, satir))
+                    if tampon.boyut >= 65536:
+                        yield tampon.bosalt()
+                sayfa.write(_SAYFA_SONU)
+        yield tampon.bosalt()
+
+
+class _SatirTamponu:
+    """csv.writer için yazılabilir metin tamponu"""
+
+    def __init__(self):
+        self.parcalar = []
+        self.boyut = 0
+
+    def write(self, metin):
+        self.parcalar.append(metin)
+        self.boyut += len(metin)
+
+    def bosalt(self):
+        veri = ''.join(self.parcalar)
+        self.parcalar, self.boyut = [], 0
+        return veri
+
+
+class _AkisTamponu:
+    """
+    zipfile için seek edilemeyen çıkış akışı: yazılan baytları biriktirir, konumu sayar.
+    seek olmadığından zipfile yerel başlıkları geri dönüp düzeltmek yerine veri tanımlayıcısı yazar.
+    """
+
+    def __init__(self):
+        self.parcalar = []
+        self.boyut = 0
+        self.konum = 0
+
+    def write(self, veri):
+        veri = bytes(veri)
+        self.parcalar.append(veri)
+        self.boyut += len(veri)
+        self.konum += len(veri)
+        return len(veri)
+
+    def tell(self):
+        return self.konum
+
+    def flush(self):
+        pass
+
+    def bosalt(self):
+        veri = b''.join(self.parcalar)
+        self.parcalar, self.boyut = [], 0
+        return veri
+
+
+# Hesap tablolarının formül olarak yorumladığı ilk karakterler (CSV formül enjeksiyonu)
+_FORMUL_BASLANGICLARI = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _csv_deger(deger):
+    if isinstance(deger, datetime):
+        if timezone.is_aware(deger):
+            deger = timezone.localtime(deger)
+        return deger.strftime('%Y-%m-%d %H:%M')
+    if isinstance(deger, str) and deger.startswith(_FORMUL_BASLANGICLARI):
+        # Kullanıcı metni Excel'de formül olarak çalışmasın; sayılar (negatifler dahil) etkilenmez
+        return "'" + deger
+    return deger
+
+
+# XML 1.0'da izin verilmeyen denetim karakterleri
+_GECERSIZ_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+_EXCEL_BASLANGIC = date(1899, 12, 30)
+_STIL_BASLIK, _STIL_TARIH, _STIL_ZAMAN = 1, 2, 3
+
+_SAYFA_BASI = (
+    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    b'<sheetViews><sheetView workbookViewId="0"><pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" '
+    b'state="frozen"/></sheetView></sheetViews><sheetData>'
+)
+_SAYFA_SONU = b'</sheetData></worksheet>'
+
+
+def _sutun_harfi(indeks):
+    harfler = ''
+    indeks += 1
+    while indeks:
+        indeks, kalan = divmod(indeks - 1, 26)
+        harfler = chr(65 + kalan) + harfler
+    return harfler
+
+
+def _xlsx_hucre(ref, deger, stil=0):
+    stil_attr = f' s="{stil}"' if stil else ''
+    if isinstance(deger, bool):
+        return f'<c r="{ref}" t="b"{stil_attr}><v>{int(deger)}</v></c>'
+    if isinstance(deger, (int, float, Decimal)):
+        return f'<c r="{ref}"{stil_attr}><v>{deger}</v></c>'
+    if isinstance(deger, datetime):
+        if timezone.is_aware(deger):
+            deger = timezone.localtime(deger)
+        gun = deger - datetime.combine(_EXCEL_BASLANGIC, datetime.min.time(), tzinfo=deger.tzinfo)
+        return f'<c r="{ref}" s="{_STIL_ZAMAN}"><v>{gun.total_seconds() / 86400:.6f}</v></c>'
+    if isinstance(deger, date):
+        return f'<c r="{ref}" s="{_STIL_TARIH}"><v>{(deger - _EXCEL_BASLANGIC).days}</v></c>'
+    metin = escape(_GECERSIZ_XML.sub('', str(deger)))
+    return f'<c r="{ref}" t="inlineStr"{stil_attr}><is><t xml:space="preserve">{metin}</t></is></c>'
+
+
+def _xlsx_satir(satir_no, sutun_harfleri, degerler, stil=0):
+    hucreler = ''.join(
+        _xlsx_hucre(f'{harf}{satir_no}', deger, stil)
+        for harf, deger in zip(sutun_harfleri, degerler) if deger is not None and deger != ''
+    )
+    return f'<row r="{satir_no}">{hucreler}</row>'.encode('utf-8')
+
+
+def _xlsx_sabit_dosyalar(sayfa_adi):
+    # Excel sayfa adı: en fazla 31 karakter, []:*?/\ içeremez
+    sayfa_adi = escape(re.sub(r'[\[\]:*?/\\]', ' ', sayfa_adi)[:31], {'"': '&quot;'})
+    return [
+        ('[Content_Types].xml',
+         '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+         '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+         '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+         '<Default Extension="xml" ContentType="application/xml"/>'
+         '<Override PartName="/xl/workbook.xml" '
+         'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+         '<Override PartName="/xl/worksheets/sheet1.xml" '
+         'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+         '<Override PartName="/xl/styles.xml" '
+         'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+         '</Types>'),
+        ('_rels/.rels',
+         '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+         '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+         '<Relationship Id="rId1" '
+         'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+         'Target="xl/workbook.xml"/></Relationships>'),
+        ('xl/workbook.xml',
+         '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+         '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+         'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+         f'<sheets><sheet name="{sayfa_adi}" sheetId="1" r:id="rId1"/></sheets></workbook>'),
+        ('xl/_rels/workbook.xml.rels',
+         '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+         '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+         '<Relationship Id="rId1" '
+         'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+         'Target="worksheets/sheet1.xml"/>'
+         '<Relationship Id="rId2" '
+         'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+         'Target="styles.xml"/></Relationships>'),
+        # Stiller: 0 varsayılan, 1 kalın başlık, 2 tarih, 3 tarih-saat
+        ('xl/styles.xml',
+         '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+         '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+         '<numFmts count="2"><numFmt numFmtId="164" formatCode="yyyy-mm-dd"/>'
+         '<numFmt numFmtId="165" formatCode="yyyy-mm-dd hh:mm"/></numFmts>'
+         '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+         '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+         '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+         '<fill><patternFill patternType="gray125"/></fill></fills>'
+         '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+         '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+         '<cellXfs count="4"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+         '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+         '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+         '<xf numFmtId="165" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+         '</styleSheet>'),
+    ]
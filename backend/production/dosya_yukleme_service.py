@@ -0,0 +1,310 @@
+"""
+Dosya yükleme servisi - sipariş ve malzeme geliş evrakları için parçalı, devam ettirilebilir
+yükleme ve içerik özetine (sha256) göre tekilleştirilmiş saklama
+"""
+
+import hashlib
+import logging
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from .models import DosyaIcerigi, MalzemeGelis, ParcaliYukleme, Siparis, SiparisDosya, YuklemeParcasi
+
+logger = logging.getLogger(__name__)
+
+OKUMA_BOYUTU = 64 * 1024
+
+
+class DosyaYuklemeHatasi(Exception):
+    """Yükleme isteği reddedildiğinde istemciye gösterilecek hata"""
+
+
+class _OzetliOkuyucu:
+    """
+    Kaynağı okurken sha256 özetini ve bayt sayısını tutar; sinir aşılırsa okumayı keser.
+    django.core.files.File ile sarılıp depolamaya verilir, böylece veri parça parça yazılır.
+    """
+
+    def __init__(self, kaynak, sinir=None):
+        self.kaynak = kaynak
+        self.sinir = sinir
+        self.ozet = hashlib.sha256()
+        self.boyut = 0
+
+    def read(self, boyut=-1):
+        if boyut is None or boyut < 0:
+            boyut = OKUMA_BOYUTU
+        if self.sinir is not None:
+            # Sınırın bir bayt fazlası okunur ki fazla gönderilen veri fark edilsin
+            boyut = min(boyut, self.sinir + 1 - self.boyut)
+            if boyut <= 0:
+                return b''
+        veri = self.kaynak.read(boyut)
+        self.ozet.update(veri)
+        self.boyut += len(veri)
+        return veri
+
+    def hexdigest(self):
+        return self.ozet.hexdigest()
+
+
+class _ParcaZinciri:
+    """Yüklemenin parçalarını sırayla tek akış gibi okur"""
+
+    def __init__(self, parcalar):
+        self.parcalar = iter(parcalar)
+        self.acik = None
+
+    def read(self, boyut=-1):
+        while True:
+            if self.acik is None:
+                parca = next(self.parcalar, None)
+                if parca is None:
+                    return b''
+                self.acik = parca.dosya.storage.open(parca.dosya.name, 'rb')
+            veri = self.acik.read(boyut if boyut and boyut > 0 else OKUMA_BOYUTU)
+            if veri:
+                return veri
+            self.acik.close()
+            self.acik = None
+
+    def close(self):
+        if self.acik is not None:
+            self.acik.close()
+            self.acik = None
+
+
+class DosyaYuklemeService:
+    """
+    Parçalı yükleme akışı: baslat → parca_yaz (her parça ayrı PUT, istenen sırada, tekrar
+    gönderilebilir) → tamamla. Parçalar isteğin gövdesinden okunurken doğrudan depolamaya yazılır;
+    bellekte en fazla OKUMA_BOYUTU kadar veri tutulur. Yarıda kalan yükleme durum() ile sorgulanıp
+    eksik parçalardan devam ettirilir.
+
+    Tamamlanan dosya DosyaIcerigi olarak saklanır: aynı sha256'ya sahip içerik zaten varsa yeni
+    dosya yazılmaz, hedef kayıt mevcut dosyanın yolunu gösterir.
+    """
+
+    HEDEFLER = {
+        'siparis_dosyasi': Siparis,
+        'siparis_mektubu': Siparis,
+        'maliyet_hesabi': Siparis,
+        'evrak_dosyasi': MalzemeGelis,
+    }
+
+    # ------------------------------------------------------------------
+    # Parçalı yükleme
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def baslat(cls, dosya_adi, toplam_boyut, hedef, hedef_id, sha256='', aciklama='', olusturan=None):
+        """Yükleme oturumu açar; parça boyutu sunucu ayarıdır (PARCALI_YUKLEME_PARCA_BOYUTU)"""
+        if hedef not in cls.HEDEFLER:
+            raise DosyaYuklemeHatasi(f"Geçersiz hedef: {hedef}")
+        if not cls.HEDEFLER[hedef].objects.filter(pk=hedef_id).exists():
+            raise DosyaYuklemeHatasi("Hedef kayıt bulunamadı")
+        en_fazla = getattr(settings, 'PARCALI_YUKLEME_MAX_BOYUT', 1024 ** 3)
+        if not 0 < toplam_boyut <= en_fazla:
+            raise DosyaYuklemeHatasi(f"Dosya boyutu 1 ile {en_fazla} bayt arasında olmalı")
+        sha256 = (sha256 or '').lower()
+        if sha256 and (len(sha256) != 64 or not all(c in '0123456789abcdef' for c in sha256)):
+            raise DosyaYuklemeHatasi("Geçersiz SHA-256 özeti")
+        dosya_adi = get_valid_filename(os.path.basename(dosya_adi or '')) or 'dosya'
+        return ParcaliYukleme.objects.create(
+            dosya_adi=dosya_adi[-200:], toplam_boyut=toplam_boyut,
+            parca_boyutu=getattr(settings, 'PARCALI_YUKLEME_PARCA_BOYUTU', 5 * 1024 * 1024),
+            sha256=sha256, hedef=hedef, hedef_id=hedef_id, aciklama=aciklama[:200], olusturan=olusturan,
+        )
+
+    @classmethod
+    def parca_yaz(cls, yukleme, no, akis, sha256=None):
+        """
+        no numaralı parçayı akıştan okuyup depolamaya yazar. Boyut beklenenle, sha256 verildiyse
+        özet de eşleşmezse yeni yazılan dosya silinir ve hata verilir. Aynı parça yeniden
+        gönderilirse yeni dosya doğrulandıktan sonra eskisinin yerine geçer; doğrulanamazsa
+        eski parça olduğu gibi kalır.
+        """
+        if yukleme.durum != 'yukleniyor':
+            raise DosyaYuklemeHatasi("Yükleme tamamlanmış")
+        if not 0 <= no < yukleme.parca_sayisi:
+            raise DosyaYuklemeHatasi(f"Parça numarası 0 ile {yukleme.parca_sayisi - 1} arasında olmalı")
+        beklenen = yukleme.beklenen_boyut(no)
+
+        # Depolama aynı adda dosya varsa yeni ad üretir; eski parça bu aşamada silinmez
+        okuyucu = _OzetliOkuyucu(akis, sinir=beklenen)
+        yeni = YuklemeParcasi(yukleme=yukleme, no=no)
+        yeni.dosya.save(f'{no:05d}.part', File(okuyucu, name=f'{no:05d}.part'), save=False)
+        depolama = yeni.dosya.storage
+
+        hata = None
+        if okuyucu.boyut != beklenen:
+            hata = f"Parça {no} boyutu {beklenen} bayt olmalı, {okuyucu.boyut} bayt alındı"
+        elif sha256 and sha256.lower() != okuyucu.hexdigest():
+            hata = f"Parça {no} özeti eşleşmiyor"
+        if hata:
+            depolama.delete(yeni.dosya.name)
+            raise DosyaYuklemeHatasi(hata)
+
+        eski_adi = None
+        try:
+            with transaction.atomic():
+                parca = YuklemeParcasi.objects.select_for_update().filter(yukleme=yukleme, no=no).first()
+                if parca is None:
+                    parca = yeni
+                else:
+                    eski_adi = parca.dosya.name
+                    parca.dosya.name = yeni.dosya.name
+                parca.boyut = okuyucu.boyut
+                parca.sha256 = okuyucu.hexdigest()
+                parca.save()
+        except IntegrityError:
+            # Aynı parça eşzamanlı iki istekle ilk kez gönderildi; ilk yazılan kalır
+            depolama.delete(yeni.dosya.name)
+            parca = YuklemeParcasi.objects.get(yukleme=yukleme, no=no)
+        else:
+            if eski_adi and eski_adi != parca.dosya.name:
+                transaction.on_commit(lambda: depolama.delete(eski_adi))
+        ParcaliYukleme.objects.filter(pk=yukleme.pk).update(guncellenme_tarihi=timezone.now())
+        return parca
+
+    @staticmethod
+    def durum(yukleme):
+        """İstemcinin yüklemeye kaldığı yerden devam etmesi için oturum bilgisi"""
+        alinan = dict(yukleme.parcalar.values_list('no', 'sha256'))
+        return {
+            'id': str(yukleme.id),
+            'dosya_adi': yukleme.dosya_adi,
+            'durum': yukleme.durum,
+            'toplam_boyut': yukleme.toplam_boyut,
+            'parca_boyutu': yukleme.parca_boyutu,
+            'parca_sayisi': yukleme.parca_sayisi,
+            'alinan_parcalar': [{'no': no, 'sha256': alinan[no]} for no in sorted(alinan)],
+            'eksik_parcalar': [no for no in range(yukleme.parca_sayisi) if no not in alinan],
+            'icerik_sha256': yukleme.icerik.sha256 if yukleme.icerik_id else None,
+        }
+
+    @classmethod
+    def tamamla(cls, yukleme):
+        """
+        Parçaları birleştirir, tüm dosya özetini doğrular, içeriği tekilleştirip hedef kayda bağlar
+        ve parçaları siler: {'yukleme', 'sha256', 'boyut', 'tekrar', 'dosya', 'kayit_id'}.
+        """
+        with transaction.atomic():
+            yukleme = ParcaliYukleme.objects.select_for_update().get(pk=yukleme.pk)
+            if yukleme.durum == 'tamamlandi':
+                raise DosyaYuklemeHatasi("Yükleme zaten tamamlanmış")
+            parcalar = list(yukleme.parcalar.order_by('no'))
+            eksik = sorted(set(range(yukleme.parca_sayisi)) - {parca.no for parca in parcalar})
+            if eksik:
+                raise DosyaYuklemeHatasi(f"Eksik parçalar: {eksik}")
+
+            # 1. geçiş: özet. İçerik zaten varsa dosya hiç yazılmaz.
+            zincir = _ParcaZinciri(parcalar)
+            okuyucu = _OzetliOkuyucu(zincir)
+            try:
+                while okuyucu.read(OKUMA_BOYUTU):
+                    pass
+            finally:
+                zincir.close()
+            if yukleme.sha256 and yukleme.sha256 != okuyucu.hexdigest():
+                raise DosyaYuklemeHatasi("Dosya özeti eşleşmiyor; parçaları yeniden gönderin")
+
+            icerik, tekrar = cls._icerik_al(
+                okuyucu.hexdigest(), okuyucu.boyut, yukleme.dosya_adi, lambda: _ParcaZinciri(parcalar)
+            )
+            kayit_id = cls.hedefe_bagla(yukleme.hedef, yukleme.hedef_id, icerik, yukleme.aciklama)
+            yukleme.icerik = icerik
+            yukleme.durum = 'tamamlandi'
+            yukleme.save(update_fields=['icerik', 'durum', 'guncellenme_tarihi'])
+            transaction.on_commit(lambda: cls._parcalari_sil(parcalar))
+
+        logger.info(
+            f"Parçalı yükleme tamamlandı: {yukleme.dosya_adi} ({icerik.boyut} bayt, "
+            f"{'mevcut içerik kullanıldı' if tekrar else 'yeni içerik'})"
+        )
+        return {
+            'yukleme': str(yukleme.id), 'sha256': icerik.sha256, 'boyut': icerik.boyut,
+            'tekrar': tekrar, 'dosya': icerik.dosya.name, 'kayit_id': kayit_id,
+        }
+
+    @staticmethod
+    def _parcalari_sil(parcalar):
+        for parca in parcalar:
+            parca.dosya.delete(save=False)
+        YuklemeParcasi.objects.filter(pk__in=[parca.pk for parca in parcalar]).delete()
+
+    # ------------------------------------------------------------------
+    # Tekilleştirme
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _icerik_al(sha256, boyut, dosya_adi, akis_ac):
+        """(DosyaIcerigi, tekrar_mi). Yeni içerikte akis_ac() ile açılan akış depolamaya yazılır."""
+        mevcut = DosyaIcerigi.objects.filter(sha256=sha256).first()
+        if mevcut is None:
+            icerik = DosyaIcerigi(sha256=sha256, boyut=boyut)
+            akis = akis_ac()
+            try:
+                icerik.dosya.save(dosya_adi, File(akis, name=dosya_adi), save=False)
+            finally:
+                if hasattr(akis, 'close'):
+                    akis.close()
+            try:
+                with transaction.atomic():
+                    icerik.save()
+                return icerik, False
+            except IntegrityError:
+                # Aynı içerik eşzamanlı başka bir yüklemeyle kaydedildi
+                icerik.dosya.delete(save=False)
+                mevcut = DosyaIcerigi.objects.get(sha256=sha256)
+        return mevcut, True
+
+    @classmethod
+    def icerik_kaydet(cls, dosya):
+        """Tek istekte yüklenmiş dosyayı (UploadedFile) tekilleştirerek saklar: (DosyaIcerigi, tekrar_mi)"""
+        ozet = hashlib.sha256()
+        for parca in dosya.chunks():
+            ozet.update(parca)
+        dosya_adi = get_valid_filename(os.path.basename(dosya.name or '')) or 'dosya'
+
+        def akis_ac():
+            dosya.seek(0)
+            return dosya
+
+        return cls._icerik_al(ozet.hexdigest(), dosya.size, dosya_adi, akis_ac)
+
+    @staticmethod
+    def hedefe_bagla(hedef, hedef_id, icerik, aciklama=''):
+        """İçeriği hedef kayda bağlar, oluşturulan/güncellenen kaydın id'sini döndürür"""
+        if hedef == 'siparis_dosyasi':
+            return SiparisDosya.objects.create(siparis_id=hedef_id, dosya=icerik.dosya.name, aciklama=aciklama).pk
+        if hedef in ('siparis_mektubu', 'maliyet_hesabi'):
+            Siparis.objects.filter(pk=hedef_id).update(**{hedef: icerik.dosya.name, 'guncellenme_tarihi': timezone.now()})
+            return hedef_id
+        if hedef == 'evrak_dosyasi':
+            MalzemeGelis.objects.filter(pk=hedef_id).update(evrak_dosyasi=icerik.dosya.name)
+            return hedef_id
+        raise DosyaYuklemeHatasi(f"Geçersiz hedef: {hedef}")
+
+    # ------------------------------------------------------------------
+    # Bakım
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def eskileri_temizle(cls, saat=None):
+        """PARCALI_YUKLEME_SURESI_SAAT'ten uzun süredir ilerlemeyen yüklemeleri parçalarıyla siler"""
+        saat = saat if saat is not None else getattr(settings, 'PARCALI_YUKLEME_SURESI_SAAT', 48)
+        eskiler = ParcaliYukleme.objects.filter(
+            durum='yukleniyor', guncellenme_tarihi__lt=timezone.now() - timedelta(hours=saat)
+        )
+        for parca in YuklemeParcasi.objects.filter(yukleme__in=eskiler).iterator():
+            parca.dosya.delete(save=False)
+        silinen = eskiler.delete()[1].get(ParcaliYukleme._meta.label, 0)
+        logger.info(f"{silinen} yarım kalmış yükleme silindi")
+        return silinen
@@ -0,0 +1,21 @@
+# backend/production/filters.py
+
+import django_filters
+
+from .models import IsEmri
+
+
+class IsEmriFilter(django_filters.FilterSet):
+    """İş emri filtreleri - istasyon terminalleri ve planlama ekranları için"""
+    durum = django_filters.MultipleChoiceFilter(choices=IsEmri.DURUM_CHOICES)
+    oncelik = django_filters.MultipleChoiceFilter(choices=IsEmri.ONCELIK_CHOICES)
+    baslangic_min = django_filters.DateFilter(field_name='planlanan_baslangic_tarihi', lookup_expr='gte')
+    baslangic_max = django_filters.DateFilter(field_name='planlanan_baslangic_tarihi', lookup_expr='lte')
+    bitis_min = django_filters.DateFilter(field_name='planlanan_bitis_tarihi', lookup_expr='gte')
+    bitis_max = django_filters.DateFilter(field_name='planlanan_bitis_tarihi', lookup_expr='lte')
+    # Terminaller sadece son sorgudan sonra değişenleri çekebilsin
+    guncellenme_sonrasi = django_filters.IsoDateTimeFilter(field_name='guncellenme_tarihi', lookup_expr='gt')
+
+    class Meta:
+        model = IsEmri
+        fields = ['durum', 'oncelik', 'planlanan_istasyon', 'siparis', 'siparis_kalemi', 'urun', 'is_akisi', 'ana_emirNo']
@@ -0,0 +1,380 @@
+"""
+İş akışı servisi - görsel tasarımcı kaydı ve derlenmiş rota sürümlerinin yayını/yüklenmesi
+"""
+
+import logging
+import threading
+from collections import deque
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Max, OuterRef, Subquery
+
+from .models import (
+    IsAkisi, IsAkisiOperasyon, IsAkisiSurumu, IsEmri, IsIstasyonu, OperasyonSinifi, StandardIsAdimi,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class DerlenmisRota:
+    """
+    Topolojik sıralı, dizi tabanlı rota. i. operasyonun öncülleri
+    onceki_idx[onceki_ptr[i]:onceki_ptr[i + 1]] aralığındaki indekslerdir.
+    """
+    __slots__ = (
+        'is_akisi_id', 'surum_id', 'yayin_no', 'op_idleri', 'sira_nolari', 'adlar', 'istasyonlar',
+        'standart_sureler', 'hazirlik_sureleri', 'malzemeler', 'ara_urunler', 'onceki_ptr', 'onceki_idx',
+    )
+
+    def __init__(self, icerik, surum_id=None, yayin_no=None):
+        self.is_akisi_id = icerik['is_akisi']
+        self.surum_id = surum_id
+        self.yayin_no = yayin_no
+        self.op_idleri = icerik['op']
+        self.sira_nolari = icerik['sira']
+        self.adlar = icerik['ad']
+        self.istasyonlar = icerik['istasyon']
+        self.standart_sureler = icerik['sure']
+        self.hazirlik_sureleri = icerik['hazirlik']
+        self.malzemeler = icerik['malzeme']
+        self.ara_urunler = icerik['ara_urun']
+        self.onceki_ptr = icerik['ptr']
+        self.onceki_idx = icerik['idx']
+
+    def __len__(self):
+        return len(self.op_idleri)
+
+    def oncekiler(self, i):
+        """i. operasyonun öncüllerinin indeksleri"""
+        return self.onceki_idx[self.onceki_ptr[i]:self.onceki_ptr[i + 1]]
+
+    def sure(self, i, miktar=1):
+        """i. operasyonun dakika cinsinden süresi"""
+        return self.standart_sureler[i] * miktar + self.hazirlik_sureleri[i]
+
+    def kritik_yol_suresi(self, miktar=1):
+        """Sınırsız kapasitede rotanın en erken bitiş süresi (dakika)"""
+        bitis = [0.0] * len(self)
+        for i in range(len(self)):
+            bitis[i] = max((bitis[p] for p in self.oncekiler(i)), default=0.0) + self.sure(i, miktar)
+        return max(bitis, default=0.0)
+
+
+class IsAkisiTasarimHatasi(Exception):
+    """Tasarım kaydedilemediğinde kullanıcıya gösterilecek hata"""
+
+
+class IsAkisiService:
+    """Görsel iş akışı tasarımının kaydı"""
+
+    # Tasarımcıdan güncellenebilen operasyon alanları
+    GUNCELLENEN_ALANLAR = [
+        'standart_adim_id', 'operasyon_adi', 'istasyon_id', 'standart_sure',
+        'hazirlik_suresi', 'operasyon_malzemeleri', 'operasyon_ara_urunleri', 'sira_no', 'sinif',
+    ]
+
+    @classmethod
+    def tasarimi_kaydet(cls, is_akisi, adimlar, baglantilar):
+        """
+        Gönderilen adım/bağlantı grafiğini mevcut operasyonlarla karşılaştırıp
+        sadece değişen operasyon ve bağımlılıkları toplu olarak yazar.
+        Adımlar `op_id` ile mevcut operasyonlara eşlenir; `op_id` olmayanlar yeni operasyondur.
+        Bağlantılar {from, to} adım id'leri ile verilir ve `from` adımı `to` adımından önce gelir.
+        Dönüş: istemci adım id'si -> operasyon id eşlemesi ve değişiklik sayıları.
+        """
+        adim_idleri = [str(adim['id']) for adim in adimlar]
+        if len(set(adim_idleri)) != len(adim_idleri):
+            raise IsAkisiTasarimHatasi("Adım id'leri benzersiz olmalı")
+        sira = cls._topolojik_sira(adim_idleri, baglantilar)
+
+        with transaction.atomic():
+            mevcutlar = {
+                op.pk: op for op in IsAkisiOperasyon.objects.select_for_update().filter(
+                    is_akisi=is_akisi
+                ).order_by('sira_no')
+            }
+            eski_max_sira = max((op.sira_no for op in mevcutlar.values()), default=0)
+            standart_adimlar = StandardIsAdimi.objects.in_bulk(
+                {adim.get('standard_id') for adim in adimlar if adim.get('standard_id')}
+            )
+
+            varsayilan_istasyonlar = {}
+            for istasyon_id, tip in IsIstasyonu.objects.filter(aktif=True).order_by('kod').values_list('id', 'tip'):
+                varsayilan_istasyonlar.setdefault(tip, istasyon_id)
+
+            hedefler = {}  # adım id -> operasyon (mevcut veya yeni)
+            yeniler, degisenler = [], []
+            sira_degisenler = []
+            for adim in adimlar:
+                adim_id = str(adim['id'])
+                op = mevcutlar.get(cls._int_or_none(adim.get('op_id')))
+                degerler = cls._adim_degerleri(
+                    adim, standart_adimlar, varsayilan_istasyonlar, sira[adim_id], yeni=op is None
+                )
+                if op is None:
+                    op = IsAkisiOperasyon(is_akisi=is_akisi, **degerler)
+                    yeniler.append(op)
+                else:
+                    degisen = False
+                    if degerler.get('operasyon_adi', op.operasyon_adi) == op.operasyon_adi:
+                        # Sınıf yalnızca yeniden adlandırmada addan türetilir; elle seçilen sınıf korunur
+                        degerler.pop('sinif', None)
+                    for alan, deger in degerler.items():
+                        if alan == 'sira_no' and op.sira_no != deger:
+                            sira_degisenler.append(op)
+                        if getattr(op, alan) != deger:
+                            setattr(op, alan, deger)
+                            degisen = True
+                    if degisen:
+                        degisenler.append(op)
+                hedefler[adim_id] = op
+
+            for op in yeniler:
+                if op.istasyon_id is None:
+                    raise IsAkisiTasarimHatasi(f"'{op.operasyon_adi}' için uygun istasyon bulunamadı")
+
+            tutulanlar = {op.pk for op in hedefler.values() if op.pk}
+            silinecekler = [pk for pk in mevcutlar if pk not in tutulanlar]
+            if silinecekler:
+                # IsEmri.operasyon PROTECT: iş emri açılmış operasyon silinemez
+                kullanilan = set(
+                    IsEmri.objects.filter(operasyon_id__in=silinecekler).values_list('operasyon_id', flat=True)
+                )
+                if kullanilan:
+                    adlar = ', '.join(sorted(mevcutlar[pk].operasyon_adi for pk in kullanilan))
+                    raise IsAkisiTasarimHatasi(f"İş emri bağlı operasyonlar silinemez: {adlar}")
+                IsAkisiOperasyon.objects.filter(pk__in=silinecekler).delete()
+
+            # unique_together (is_akisi, sira_no) yer değiştirmelerde çakışmasın diye
+            # sırası değişenler önce boş bir aralığa taşınır
+            if sira_degisenler:
+                gecici_baslangic = max(eski_max_sira, len(adimlar)) + 1
+                gecici = [
+                    IsAkisiOperasyon(pk=op.pk, sira_no=gecici_baslangic + i)
+                    for i, op in enumerate(sira_degisenler)
+                ]
+                IsAkisiOperasyon.objects.bulk_update(gecici, ['sira_no'])
+
+            if degisenler:
+                IsAkisiOperasyon.objects.bulk_update(
+                    degisenler, [alan.removesuffix('_id') for alan in cls.GUNCELLENEN_ALANLAR]
+                )
+            # bulk_create save() çağırmaz; sira_no ve sinif yukarıda atandı
+            IsAkisiOperasyon.objects.bulk_create(yeniler)
+
+            eklenen_baglanti, silinen_baglanti = cls._baglantilari_esitle(
+                list(hedefler.values()), hedefler, baglantilar
+            )
+
+        sonuc = {
+            'operasyonlar': {adim_id: op.pk for adim_id, op in hedefler.items()},
+            'olusturulan': len(yeniler),
+            'guncellenen': len(degisenler),
+            'silinen': len(silinecekler),
+            'eklenen_baglanti': eklenen_baglanti,
+            'silinen_baglanti': silinen_baglanti,
+        }
+        logger.info(f"İş akışı {is_akisi.kod} kaydedildi: {sonuc}")
+        return sonuc
+
+    # ------------------------------------------------------------------
+    # Derlenmiş rota sürümleri
+    # ------------------------------------------------------------------
+
+    _rota_onbellegi = {}  # surum_id -> DerlenmisRota (sürümler değişmez)
+    _onbellek_kilidi = threading.Lock()
+    ONBELLEK_LIMITI = 2000
+
+    @classmethod
+    def derle(cls, is_akisi_idleri):
+        """Canlı operasyon ve bağımlılık tablolarından rota içeriği üretir: {is_akisi_id: icerik}"""
+        is_akisi_idleri = list(is_akisi_idleri)
+        operasyonlar = {}
+        for op in IsAkisiOperasyon.objects.filter(is_akisi_id__in=is_akisi_idleri).order_by('is_akisi_id', 'sira_no'):
+            operasyonlar.setdefault(op.is_akisi_id, []).append(op)
+
+        Through = IsAkisiOperasyon.onceki_operasyonlar.through
+        oncekiler = {}
+        for op_id, onceki_id in Through.objects.filter(
+            from_isakisioperasyon__is_akisi_id__in=is_akisi_idleri
+        ).values_list('from_isakisioperasyon_id', 'to_isakisioperasyon_id'):
+            oncekiler.setdefault(op_id, []).append(onceki_id)
+
+        sonuc = {}
+        for is_akisi_id in is_akisi_idleri:
+            ops = operasyonlar.get(is_akisi_id, [])
+            anahtarlar = [str(op.pk) for op in ops]
+            kenarlar = [
+                {'from': str(onceki_id), 'to': str(op.pk)}
+                for op in ops for onceki_id in oncekiler.get(op.pk, ())
+            ]
+            sira = cls._topolojik_sira(anahtarlar, kenarlar)
+            ops.sort(key=lambda op: sira[str(op.pk)])
+            indeks = {op.pk: i for i, op in enumerate(ops)}
+
+            ptr, idx = [0], []
+            for op in ops:
+                idx.extend(sorted(indeks[onceki_id] for onceki_id in oncekiler.get(op.pk, ())))
+                ptr.append(len(idx))
+            sonuc[is_akisi_id] = {
+                'is_akisi': is_akisi_id,
+                'op': [op.pk for op in ops],
+                'sira': [op.sira_no for op in ops],
+                'ad': [op.operasyon_adi for op in ops],
+                'istasyon': [op.istasyon_id for op in ops],
+                'sure': [float(op.standart_sure) for op in ops],
+                'hazirlik': [float(op.hazirlik_suresi) for op in ops],
+                'malzeme': [op.operasyon_malzemeleri for op in ops],
+                'ara_urun': [op.operasyon_ara_urunleri for op in ops],
+                'ptr': ptr,
+                'idx': idx,
+            }
+        return sonuc
+
+    @classmethod
+    def yayinla(cls, is_akisi, yayinlayan=None):
+        """İş akışının güncel halini yeni, değişmez bir sürüm olarak yayınlar"""
+        with transaction.atomic():
+            # Aynı akışın eşzamanlı yayınları yayin_no'da çakışmasın
+            IsAkisi.objects.select_for_update().filter(pk=is_akisi.pk).values_list('pk').get()
+            icerik = cls.derle([is_akisi.pk])[is_akisi.pk]
+            if not icerik['op']:
+                raise IsAkisiTasarimHatasi(f"{is_akisi.kod}: operasyonu olmayan iş akışı yayınlanamaz")
+            son_no = is_akisi.surumler.aggregate(son=Max('yayin_no'))['son'] or 0
+            surum = IsAkisiSurumu.objects.create(
+                is_akisi=is_akisi,
+                yayin_no=son_no + 1,
+                versiyon=is_akisi.versiyon,
+                operasyon_sayisi=len(icerik['op']),
+                veri=IsAkisiSurumu.paketle(icerik),
+                yayinlayan=yayinlayan,
+            )
+        logger.info(f"İş akışı {is_akisi.kod} yayınlandı: #{surum.yayin_no}")
+        return surum
+
+    @classmethod
+    def rotalari_yukle(cls, is_akisi_idleri, canli_yedek=True):
+        """
+        Her iş akışının son yayınlanmış rotasını tek sorguda yükler: {is_akisi_id: DerlenmisRota}.
+        Yayını olmayan akışlar canli_yedek açıksa canlı tablolardan derlenir.
+        """
+        is_akisi_idleri = set(is_akisi_idleri)
+        son_yayin = IsAkisiSurumu.objects.filter(
+            is_akisi=OuterRef('is_akisi')
+        ).order_by('-yayin_no').values('yayin_no')[:1]
+        satirlar = IsAkisiSurumu.objects.filter(
+            is_akisi_id__in=is_akisi_idleri, yayin_no=Subquery(son_yayin)
+        ).order_by().values_list('id', 'is_akisi_id', 'yayin_no', 'veri')
+
+        rotalar = {}
+        for surum_id, is_akisi_id, yayin_no, veri in satirlar:
+            with cls._onbellek_kilidi:
+                rota = cls._rota_onbellegi.get(surum_id)
+            if rota is None:
+                rota = DerlenmisRota(IsAkisiSurumu(veri=veri).icerik(), surum_id, yayin_no)
+                with cls._onbellek_kilidi:
+                    if len(cls._rota_onbellegi) >= cls.ONBELLEK_LIMITI:
+                        cls._rota_onbellegi.clear()
+                    cls._rota_onbellegi[surum_id] = rota
+            rotalar[is_akisi_id] = rota
+
+        eksikler = is_akisi_idleri - rotalar.keys()
+        if eksikler and canli_yedek:
+            for is_akisi_id, icerik in cls.derle(eksikler).items():
+                if icerik['op']:
+                    rotalar[is_akisi_id] = DerlenmisRota(icerik)
+        return rotalar
+
+    @classmethod
+    def _adim_degerleri(cls, adim, standart_adimlar, varsayilan_istasyonlar, sira_no, yeni):
+        """
+        Adımdan operasyon alanları. Yalnızca adımda gönderilen alanlar döner; gönderilmeyen alan mevcut
+        operasyonda korunur. Standart adım varsayılanları (ad, istasyon, süre) sadece yeni operasyona uygulanır.
+        """
+        standart = standart_adimlar.get(cls._int_or_none(adim.get('standard_id')))
+        degerler = {'sira_no': sira_no}
+        if 'standard_id' in adim:
+            degerler['standart_adim_id'] = standart.pk if standart else None
+        if adim.get('name'):
+            degerler['operasyon_adi'] = adim['name'][:100]
+        if cls._int_or_none(adim.get('istasyon_id')) is not None:
+            degerler['istasyon_id'] = cls._int_or_none(adim['istasyon_id'])
+        for alan in ('standart_sure', 'hazirlik_suresi'):
+            if adim.get(alan) is not None:
+                degerler[alan] = Decimal(str(adim[alan]))
+        if 'materials' in adim:
+            degerler['operasyon_malzemeleri'] = adim['materials'] or []
+        if 'subproducts' in adim:
+            degerler['operasyon_ara_urunleri'] = adim['subproducts'] or []
+
+        if yeni:
+            degerler.setdefault('operasyon_adi', standart.ad[:100] if standart else '')
+            # Adımda istasyon seçilmemişse standart adımın istasyon tipindeki ilk aktif istasyon
+            if 'istasyon_id' not in degerler and standart is not None:
+                degerler['istasyon_id'] = varsayilan_istasyonlar.get(standart.gerekli_istasyon_tipi)
+            degerler.setdefault(
+                'standart_sure', Decimal(str(standart.tahmini_sure_birim)) if standart else Decimal('0')
+            )
+            degerler.setdefault('hazirlik_suresi', Decimal('0'))
+        if 'operasyon_adi' in degerler:
+            # bulk_create/bulk_update save() çağırmaz; sınıf addan burada türetilir
+            degerler['sinif'] = OperasyonSinifi.addan(degerler['operasyon_adi'])
+        return degerler
+
+    @staticmethod
+    def _topolojik_sira(adim_idleri, baglantilar):
+        """Adımlara bağımlılık sırasına uygun 1..n sıra numarası verir, döngüde hata verir"""
+        sonrakiler = {adim_id: [] for adim_id in adim_idleri}
+        giris_derecesi = {adim_id: 0 for adim_id in adim_idleri}
+        for baglanti in baglantilar:
+            kaynak, hedef = str(baglanti['from']), str(baglanti['to'])
+            if kaynak not in sonrakiler or hedef not in sonrakiler:
+                raise IsAkisiTasarimHatasi("Bağlantı tanımsız bir adıma işaret ediyor")
+            sonrakiler[kaynak].append(hedef)
+            giris_derecesi[hedef] += 1
+
+        # Eşit durumda gönderim sırası korunur
+        konum = {adim_id: i for i, adim_id in enumerate(adim_idleri)}
+        kuyruk = deque(adim_id for adim_id in adim_idleri if giris_derecesi[adim_id] == 0)
+        sira = {}
+        while kuyruk:
+            adim_id = kuyruk.popleft()
+            sira[adim_id] = len(sira) + 1
+            for hedef in sorted(sonrakiler[adim_id], key=konum.get):
+                giris_derecesi[hedef] -= 1
+                if giris_derecesi[hedef] == 0:
+                    kuyruk.append(hedef)
+        if len(sira) != len(adim_idleri):
+            raise IsAkisiTasarimHatasi("İş akışında döngü var")
+        return sira
+
+    @staticmethod
+    def _baglantilari_esitle(operasyonlar, hedefler, baglantilar):
+        """Bağımlılık tablosunu sadece farkları yazarak gönderilen grafiğe eşitler"""
+        Through = IsAkisiOperasyon.onceki_operasyonlar.through
+        # Through satırı: from = operasyon, to = öncülü
+        istenen = {
+            (hedefler[str(b['to'])].pk, hedefler[str(b['from'])].pk) for b in baglantilar
+        }
+        mevcut = dict(
+            ((from_id, to_id), pk) for pk, from_id, to_id in Through.objects.filter(
+                from_isakisioperasyon_id__in=[op.pk for op in operasyonlar]
+            ).values_list('pk', 'from_isakisioperasyon_id', 'to_isakisioperasyon_id')
+        )
+        silinecek = [pk for kenar, pk in mevcut.items() if kenar not in istenen]
+        if silinecek:
+            Through.objects.filter(pk__in=silinecek).delete()
+        eklenecek = [
+            Through(from_isakisioperasyon_id=from_id, to_isakisioperasyon_id=to_id)
+            for from_id, to_id in istenen - mevcut.keys()
+        ]
+        Through.objects.bulk_create(eklenecek)
+        return len(eklenecek), len(silinecek)
+
+    @staticmethod
+    def _int_or_none(deger):
+        try:
+            return int(deger)
+        except (TypeError, ValueError):
+            return None
@@ -0,0 +1,160 @@
+"""
+İş emri oluşturma servisi - sipariş kalemlerini aktif iş akışlarına göre iş emirlerine açar
+"""
+
+import logging
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from django.db import transaction
+
+from .degisiklik_akisi_service import DegisiklikAkisiService
+from .is_akisi_service import DerlenmisRota, IsAkisiService
+from .istatistik_service import IstatistikService
+from .models import Siparis, SiparisKalem, IsAkisi, IsAkisiOperasyon, IsEmri
+from .sequence_service import SequenceService
+from .takvim_service import TakvimService
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+class IsEmriService:
+    """Siparişlerden toplu iş emri üretimi"""
+
+    # Bu durumdaki siparişler için iş emri açılmaz
+    HARIC_DURUMLAR = ['iptal', 'tamamlandi']
+
+    # İş emri açıldığında sipariş bu duruma çekilir
+    ONCEKI_DURUMLAR = ['beklemede', 'malzeme_planlandi']
+
+    @classmethod
+    def is_emirleri_olustur(cls, siparisler, olusturan=None):
+        """
+        Siparişlerin iş emri açılmamış kalemlerini iş emirlerine açar.
+        Her kalem için ürünün aktif iş akışının son yayınlanmış rotasındaki (yayın yoksa canlı
+        rotadaki) her operasyona bir iş emri oluşturulur, rota bağımlılıkları onceki_operasyonlar
+        olarak kopyalanır. Emirler rota sırasıyla, her biri öncülleri bittikten sonra operasyon
+        istasyonunun takvimine göre ileri doğru tarihlenir. Tekrar ve eşzamanlı çağrılması güvenlidir.
+        """
+        siparis_idleri = [s.pk if isinstance(s, Siparis) else s for s in siparisler]
+
+        with transaction.atomic():
+            # Eşzamanlı çağrılar aynı kalemlere ikinci kez emir açmasın: siparişler kilitlenir,
+            # emirsiz kalemler kilit alındıktan sonra okunur
+            list(Siparis.objects.select_for_update().filter(id__in=siparis_idleri).order_by('id').values_list('id'))
+            kalemler = list(
+                SiparisKalem.objects.filter(
+                    siparis_id__in=siparis_idleri,
+                    is_emirleri__isnull=True,
+                ).exclude(
+                    siparis__durum__in=cls.HARIC_DURUMLAR
+                ).order_by('siparis_id', 'id')
+            )
+            if not kalemler:
+                return {'is_emri_sayisi': 0, 'kalem_sayisi': 0, 'atlanan_kalemler': []}
+
+            rotalar = cls._rotalar({k.urun_id for k in kalemler})
+
+            atlanan = [k for k in kalemler if k.urun_id not in rotalar]
+            kalemler = [k for k in kalemler if k.urun_id in rotalar]
+            toplam_emir = sum(len(rotalar[k.urun_id]) for k in kalemler)
+            if not toplam_emir:
+                return {'is_emri_sayisi': 0, 'kalem_sayisi': 0, 'atlanan_kalemler': [k.pk for k in atlanan]}
+
+            # Tüm numaralar en fazla iki UPDATE ile ayrılır
+            emir_nolari = iter(SequenceService.ayir('IE', toplam_emir))
+            ana_emir_nolari = SequenceService.ayir('AIE', len(kalemler))
+
+            gun_basi = datetime.combine(date.today(), time())
+            emirler = []
+            kalem_emirleri = []  # (rota, kalemin emirleri rota sırasıyla)
+            for kalem, ana_emir_no in zip(kalemler, ana_emir_nolari):
+                rota = rotalar[kalem.urun_id]
+                miktar = Decimal(kalem.miktar)
+                kalem_emirleri.append((rota, []))
+                bitisler = []
+                for i in range(len(rota)):
+                    sure = (Decimal(str(rota.standart_sureler[i])) * miktar
+                            + Decimal(str(rota.hazirlik_sureleri[i])))
+                    # Rota topolojik sıralı: öncüllerin bitişi bu noktada bilinir
+                    baslangic = TakvimService.sonraki_calisma_ani(
+                        rota.istasyonlar[i], max((bitisler[p] for p in rota.oncekiler(i)), default=gun_basi)
+                    )
+                    bitis = TakvimService.dakika_ekle(rota.istasyonlar[i], baslangic, float(sure))
+                    bitisler.append(bitis)
+                    emir = IsEmri(
+                        emirNo=next(emir_nolari),
+                        ana_emirNo=ana_emir_no,
+                        siparis_id=kalem.siparis_id,
+                        siparis_kalemi_id=kalem.pk,
+                        urun_id=kalem.urun_id,
+                        is_akisi_id=rota.is_akisi_id,
+                        operasyon_id=rota.op_idleri[i],
+                        gerekli_malzemeler=rota.malzemeler[i],
+                        gerekli_ara_urunler=rota.ara_urunler[i],
+                        planlanan_miktar=kalem.miktar,
+                        planlanan_baslangic_tarihi=baslangic.date(),
+                        planlanan_baslangic_saati=baslangic.time(),
+                        planlanan_bitis_tarihi=bitis.date(),
+                        planlanan_bitis_saati=bitis.time(),
+                        planlanan_sure=sure,
+                        olusturan=olusturan,
+                    )
+                    emirler.append(emir)
+                    kalem_emirleri[-1][1].append(emir)
+            IsEmri.objects.bulk_create(emirler, batch_size=BATCH_SIZE)
+            DegisiklikAkisiService.kaydet(emirler, 'olustur')
+
+            # Rota DAG'ını tek through-tablo insert'i ile iş emirlerine taşı
+            Through = IsEmri.onceki_operasyonlar.through
+            baglantilar = [
+                Through(from_isemri_id=kalem_emri[i].pk, to_isemri_id=kalem_emri[onceki].pk)
+                for rota, kalem_emri in kalem_emirleri
+                for i in range(len(rota))
+                for onceki in rota.oncekiler(i)
+            ]
+            Through.objects.bulk_create(baglantilar, batch_size=BATCH_SIZE)
+
+            if Siparis.objects.filter(
+                id__in={k.siparis_id for k in kalemler},
+                durum__in=cls.ONCEKI_DURUMLAR,
+            ).update(durum='is_emirleri_olusturuldu'):
+                # Toplu güncelleme Siparis.save() çağırmaz; dashboard sayıları burada tazelenir
+                transaction.on_commit(IstatistikService.onbellegi_temizle)
+
+        logger.info(f"{len(emirler)} iş emri oluşturuldu ({len(kalemler)} kalem, {len(atlanan)} kalem iş akışı yok)")
+        return {
+            'is_emri_sayisi': len(emirler),
+            'kalem_sayisi': len(kalemler),
+            'atlanan_kalemler': [k.pk for k in atlanan],
+        }
+
+    @staticmethod
+    def _rotalar(urun_idleri):
+        """Ürün başına aktif iş akışının derlenmiş rotası: {urun_id: DerlenmisRota}"""
+        aktif_akislar = {}
+        for akis_id, urun_id in IsAkisi.objects.filter(
+            urun_id__in=urun_idleri, aktif=True
+        ).order_by('urun_id', '-id').values_list('id', 'urun_id'):
+            # Birden fazla aktif akış varsa en yenisi kullanılır
+            aktif_akislar.setdefault(urun_id, akis_id)
+
+        rotalar = IsAkisiService.rotalari_yukle(aktif_akislar.values())
+
+        # Yayından sonra silinmiş operasyonu olan sürümler yerine canlı rota kullanılır
+        op_idleri = {op_id for rota in rotalar.values() if rota.surum_id for op_id in rota.op_idleri}
+        if op_idleri:
+            mevcut = set(IsAkisiOperasyon.objects.filter(pk__in=op_idleri).values_list('pk', flat=True))
+            eskimis = [akis_id for akis_id, rota in rotalar.items()
+                       if rota.surum_id and not mevcut.issuperset(rota.op_idleri)]
+            if eskimis:
+                logger.warning(f"Eskimiş rota sürümleri atlandı, canlı rota kullanılıyor: {eskimis}")
+                for akis_id, icerik in IsAkisiService.derle(eskimis).items():
+                    if icerik['op']:
+                        rotalar[akis_id] = DerlenmisRota(icerik)
+                    else:
+                        rotalar.pop(akis_id)
+
+        return {urun_id: rotalar[akis_id] for urun_id, akis_id in aktif_akislar.items() if akis_id in rotalar}
@@ -0,0 +1,180 @@
+"""
+İstatistik servisi - dashboard panolarının okuduğu özet sayılar (MRP durumu, kritik malzemeler)
+"""
+
+import logging
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import MalzemeGelis, SatinAlmaKalemi, SatinAlmaSiparisi, Siparis, SiparisKalem, Urun, UrunRecete
+
+logger = logging.getLogger(__name__)
+
+
+class IstatistikService:
+    """
+    MRP özet istatistikleri. Sonuç MRP_ISTATISTIK_ONBELLEK_SURESI saniye önbelleklenir; sipariş
+    durumu değiştiğinde (Siparis.save/delete, toplu durum güncellemeleri) önbellek temizlenir.
+    """
+
+    ONBELLEK_ANAHTARI = 'istatistik:mrp'
+
+    # Malzemesi henüz tüketilmemiş siparişler; kritik malzeme ihtiyacı bunlardan hesaplanır
+    MALZEME_BEKLEYEN_DURUMLAR = ('beklemede', 'malzeme_planlandi', 'is_emirleri_olusturuldu')
+
+    @classmethod
+    def mrp_ozeti(cls):
+        """production_mrp_stats yanıtı (önbellekli)"""
+        ozet = cache.get(cls.ONBELLEK_ANAHTARI)
+        if ozet is None:
+            ozet = cls.mrp_ozeti_hesapla()
+            cache.set(cls.ONBELLEK_ANAHTARI, ozet, getattr(settings, 'MRP_ISTATISTIK_ONBELLEK_SURESI', 60))
+        return ozet
+
+    @classmethod
+    def onbellegi_temizle(cls):
+        cache.delete(cls.ONBELLEK_ANAHTARI)
+
+    @classmethod
+    def mrp_ozeti_hesapla(cls):
+        sayilar = cls.siparis_sayilari()
+        return {
+            'plannedOrders': sayilar['beklemede'],
+            'waitingMaterials': sayilar['malzeme_planlandi'],
+            'readyOrders': sayilar['is_emirleri_olusturuldu'],
+            'inProduction': sayilar['uretimde'],
+            'completed': sayilar['tamamlandi'],
+            'monthlyCompleted': sayilar['bu_ay_tamamlanan'],
+            'delayedOrders': sayilar['geciken'],
+            'avgDeliveryTime': sayilar['ortalama_teslim_gun'],
+            'criticalMaterials': cls.kritik_malzemeler(),
+        }
+
+    # ------------------------------------------------------------------
+    # Sipariş sayıları
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def siparis_sayilari():
+        """
+        Durum bazlı sayımlar, bu ay tamamlanan, geciken sipariş sayısı ve ortalama teslim süresi
+        tek gruplanmış sorguda. Teslim süresi tamamlanan siparişlerde sipariş tarihinden
+        tamamlanma tarihine kadar geçen gündür.
+        """
+        simdi = timezone.now()
+        ay_basi = simdi.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        tamamlanan = Q(durum='tamamlandi')
+        durum_sayilari = {
+            durum: Count('id', filter=Q(durum=durum))
+            for durum, _ in Siparis.DURUM_CHOICES
+        }
+        sonuc = Siparis.objects.order_by().aggregate(
+            **durum_sayilari,
+            bu_ay_tamamlanan=Count('id', filter=tamamlanan & Q(tamamlanma_tarihi__gte=ay_basi)),
+            geciken=Count('id', filter=Q(
+                durum__in=['uretimde', 'is_emirleri_olusturuldu'], tarih__lt=simdi.date()
+            )),
+            teslim_suresi=Avg(
+                ExpressionWrapper(TruncDate('tamamlanma_tarihi') - F('tarih'), output_field=DurationField()),
+                filter=tamamlanan & Q(tamamlanma_tarihi__isnull=False),
+            ),
+        )
+        teslim_suresi = sonuc.pop('teslim_suresi')
+        sonuc['ortalama_teslim_gun'] = round(teslim_suresi.total_seconds() / 86400, 1) if teslim_suresi else 0
+        return sonuc
+
+    # ------------------------------------------------------------------
+    # Kritik malzemeler
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def kritik_malzemeler(cls, limit=None):
+        """
+        Açık siparişlerin net malzeme eksikleri: [{'name', 'shortage', 'unit'}], en büyük eksik önce.
+        Reçeteler seviye seviye açılır; her kalemde brüt ihtiyaçtan stok ve açık satın alma miktarı
+        düşülür, yalnızca kalan net miktar alt malzemelere dağıtılır. Reçetesi olmayan kalemlerin
+        net ihtiyacı eksik olarak raporlanır.
+        """
+        limit = limit or getattr(settings, 'MRP_KRITIK_MALZEME_LIMIT', 10)
+        brut = defaultdict(Decimal)
+        for urun_id, miktar in SiparisKalem.objects.filter(
+            siparis__durum__in=cls.MALZEME_BEKLEYEN_DURUMLAR
+        ).order_by().values_list('urun_id').annotate(toplam=Sum('miktar')):
+            brut[urun_id] += Decimal(miktar or 0)
+        if not brut:
+            return []
+
+        receteler = defaultdict(list)
+        for urun_id, malzeme_id, miktar in UrunRecete.objects.order_by().values_list('urun_id', 'malzeme_id', 'miktar'):
+            receteler[urun_id].append((malzeme_id, miktar))
+        seviyeler = cls._seviyeler(brut, receteler)
+
+        urunler = {
+            urun_id: (ad, birim, stok)
+            for urun_id, ad, birim, stok in Urun.objects.filter(pk__in=seviyeler).order_by().values_list(
+                'id', 'ad', 'birim', 'stok_miktari'
+            )
+        }
+        acik_satinalma = cls.acik_satinalma_miktarlari({ad for ad, _, _ in urunler.values()})
+
+        eksikler = []
+        for urun_id in sorted(seviyeler, key=seviyeler.get):
+            if urun_id not in urunler:
+                continue
+            ad, birim, stok = urunler[urun_id]
+            net = brut[urun_id] - max(stok, 0) - acik_satinalma.get(ad, 0)
+            if net <= 0:
+                continue
+            if receteler.get(urun_id):
+                for malzeme_id, miktar in receteler[urun_id]:
+                    brut[malzeme_id] += net * miktar
+            else:
+                eksikler.append({'name': ad, 'shortage': float(net), 'unit': birim})
+
+        eksikler.sort(key=lambda m: -m['shortage'])
+        return eksikler[:limit]
+
+    @staticmethod
+    def _seviyeler(kok_urunler, receteler):
+        """
+        Düşük seviye kodları: her ürünün reçete ağacında göründüğü en derin seviye. Bir malzeme
+        ancak onu kullanan tüm üst kalemler netlendikten sonra netlenir.
+        """
+        seviyeler = {urun_id: 0 for urun_id in kok_urunler}
+        sinir = len(receteler) + 1
+        kuyruk = list(kok_urunler)
+        while kuyruk:
+            urun_id = kuyruk.pop()
+            seviye = seviyeler[urun_id] + 1
+            if seviye > sinir:
+                logger.warning(f"Reçetede döngü: ürün {urun_id} açılmadı")
+                continue
+            for malzeme_id, _ in receteler.get(urun_id, ()):
+                if seviyeler.get(malzeme_id, -1) < seviye:
+                    seviyeler[malzeme_id] = seviye
+                    kuyruk.append(malzeme_id)
+        return seviyeler
+
+    @classmethod
+    def acik_satinalma_miktarlari(cls, malzeme_adlari):
+        """Açık satın alma siparişlerinde yolda olan (sipariş edilen - gelen) miktar, malzeme adına göre"""
+        acik = Q(
+            siparis__durum__in=SatinAlmaSiparisi.ACIK_DURUMLAR, malzeme_ihtiyaci__malzeme_adi__in=malzeme_adlari
+        )
+        miktarlar = defaultdict(Decimal)
+        for ad, toplam in SatinAlmaKalemi.objects.filter(acik).order_by().values_list(
+            'malzeme_ihtiyaci__malzeme_adi'
+        ).annotate(toplam=Sum('miktar')):
+            miktarlar[ad] += toplam or 0
+        for ad, gelen in MalzemeGelis.objects.filter(
+            satinalma_kalemi__siparis__durum__in=SatinAlmaSiparisi.ACIK_DURUMLAR,
+            satinalma_kalemi__malzeme_ihtiyaci__malzeme_adi__in=malzeme_adlari,
+        ).order_by().values_list('satinalma_kalemi__malzeme_ihtiyaci__malzeme_adi').annotate(toplam=Sum('gelen_miktar')):
+            miktarlar[ad] -= gelen or 0
+        return {ad: max(miktar, Decimal(0)) for ad, miktar in miktarlar.items()}
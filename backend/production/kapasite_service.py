@@ -0,0 +1,266 @@
+"""
+Kapasite servisi - istasyon başına günlük kullanılabilir süre ve planlanmış yük tablosunu yönetir
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q, Sum
+
+from .models import IsEmri, IsIstasyonu, IstasyonGunlukYuk
+from .takvim_service import TakvimService
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+class KapasiteService:
+    """
+    İstasyon günlük yük tablosu (IstasyonGunlukYuk).
+    Bir iş emrinin süresi başlangıç anından itibaren istasyon çalışma takvimine göre günlere dağıtılır.
+    İş emri kaydedilip silindiğinde eski ve yeni dağılımın farkı tabloya yazılır;
+    toplu güncellemelerden ve takvim değişikliklerinden sonra tablo iş emirlerinden yeniden kurulur.
+    """
+
+    @staticmethod
+    def takvimler(istasyon_idleri, baslangic, bitis):
+        """Aralığı kapsayan istasyon çalışma takvimleri (TakvimService)"""
+        takvimler = TakvimService.takvimler(istasyon_idleri, baslangic)
+        if any(not t.kapsar(datetime.combine(bitis + timedelta(days=1), time())) for t in takvimler.values()):
+            takvimler = TakvimService.olustur(istasyon_idleri, baslangic, bitis)
+        return takvimler
+
+    @classmethod
+    def takvim_degisti(cls, istasyon_idleri=None, tarihler=None):
+        """
+        Vardiya, istisna, tatil veya çalışma saati değişince takvim önbelleğini temizler ve yükü
+        yeniden dağıtır: gün listesi verilmişse en erken günden itibaren, yoksa istasyonların tamamı.
+        """
+        TakvimService.onbellegi_temizle()
+        if tarihler is not None and not tarihler:
+            return 0
+        return cls.yeniden_hesapla(baslangic=min(tarihler) if tarihler else None, istasyon_idleri=istasyon_idleri)
+
+    # ------------------------------------------------------------------
+    # Artımlı güncelleme
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def kayitli_yuk(is_emri_id):
+        """İş emrinin veritabanındaki yük anahtarı (kaydetmeden önce okunur)"""
+        emir = IsEmri.objects.filter(pk=is_emri_id).only(*IsEmri.YUK_ALANLARI).first()
+        return emir.kapasite_yuku() if emir else None
+
+    @staticmethod
+    def yuk_dagilimi(yuk, takvim=None):
+        """
+        (istasyon_id, başlangıç anı, dakika) yükünün günlük dakikaları: [(tarih, Decimal), ...].
+        Günler kuruşa yuvarlanır, yuvarlama farkı son güne yazılır; böylece ekleme ve çıkarma aynı sayıları kullanır.
+        """
+        istasyon_id, an, dakika = yuk
+        gunler = TakvimService.gunlere_dagit(istasyon_id, an, dakika, takvim)
+        dagilim = [(tarih, Decimal(str(round(gun_dakikasi, 2)))) for tarih, gun_dakikasi in gunler[:-1]]
+        dagilim.append((gunler[-1][0], Decimal(dakika) - sum((d for _, d in dagilim), Decimal('0'))))
+        return dagilim
+
+    @classmethod
+    def yuk_tasi(cls, eski, yeni):
+        """Bir iş emrinin yükünü eski (istasyon, an, dakika) dağılımından yenisine taşır; yalnızca değişen günler yazılır"""
+        if eski == yeni:
+            return
+        farklar = defaultdict(lambda: [Decimal('0'), 0])
+        for yuk, isaret in ((eski, -1), (yeni, 1)):
+            if yuk:
+                for tarih, dakika in cls.yuk_dagilimi(yuk):
+                    fark = farklar[(yuk[0], tarih)]
+                    fark[0] += isaret * dakika
+                    fark[1] += isaret
+        cls._farklari_yaz(farklar)
+
+    @classmethod
+    def emirleri_yukten_cikar(cls, queryset):
+        """queryset.update öncesi çağrılır: emirlerin yükünü gruplanmış tek sorguyla düşer"""
+        cls._grup_yuku_ekle(queryset, -1)
+
+    @classmethod
+    def emirleri_yuke_ekle(cls, queryset):
+        """queryset.update sonrası çağrılır: emirlerin yeni yükünü ekler"""
+        cls._grup_yuku_ekle(queryset, 1)
+
+    @classmethod
+    def _grup_yuku_ekle(cls, queryset, isaret):
+        emirler = queryset.filter(
+            planlanan_istasyon__isnull=False
+        ).exclude(
+            durum__in=IsEmri.YUK_DISI_DURUMLAR
+        ).order_by().only(*IsEmri.YUK_ALANLARI)
+        farklar = {
+            anahtar: [isaret * dakika, isaret * adet]
+            for anahtar, (dakika, adet) in cls._gunluk_toplamlar(e.kapasite_yuku() for e in emirler).items()
+        }
+        cls._farklari_yaz(farklar)
+
+    @classmethod
+    def _gunluk_toplamlar(cls, yukler):
+        """Yüklerin günlere dağılmış toplamı: {(istasyon_id, tarih): [dakika, iş emri sayısı]}"""
+        yukler = list(yukler)
+        toplamlar = defaultdict(lambda: [Decimal('0'), 0])
+        if not yukler:
+            return toplamlar
+        # Takvimler tek seferde; aralık dışına taşan uzun işler için TakvimService takvimi uzatır
+        takvimler = cls.takvimler(
+            {y[0] for y in yukler}, min(y[1] for y in yukler).date(), max(y[1] for y in yukler).date()
+        )
+        for yuk in yukler:
+            for tarih, dakika in cls.yuk_dagilimi(yuk, takvimler[yuk[0]]):
+                toplam = toplamlar[(yuk[0], tarih)]
+                toplam[0] += dakika
+                toplam[1] += 1
+        return toplamlar
+
+    @classmethod
+    def _farklari_yaz(cls, farklar):
+        for (istasyon_id, tarih), (dakika, adet) in farklar.items():
+            if dakika or adet:
+                cls._yuk_ekle(istasyon_id, tarih, dakika, adet)
+
+    @classmethod
+    def _yuk_ekle(cls, istasyon_id, tarih, dakika, adet):
+        guncellenen = IstasyonGunlukYuk.objects.filter(istasyon_id=istasyon_id, tarih=tarih).update(
+            planlanan_dakika=F('planlanan_dakika') + dakika,
+            is_emri_sayisi=F('is_emri_sayisi') + adet,
+        )
+        if guncellenen or adet <= 0:
+            return
+
+        satir = IstasyonGunlukYuk(
+            istasyon_id=istasyon_id, tarih=tarih,
+            kullanilabilir_dakika=int(cls.takvimler([istasyon_id], tarih, tarih)[istasyon_id].gunluk_dakika(tarih)),
+            planlanan_dakika=dakika, is_emri_sayisi=adet,
+        )
+        try:
+            with transaction.atomic():
+                satir.save()
+        except IntegrityError:
+            # Eşzamanlı istek satırı bizden önce oluşturdu
+            IstasyonGunlukYuk.objects.filter(istasyon_id=istasyon_id, tarih=tarih).update(
+                planlanan_dakika=F('planlanan_dakika') + dakika,
+                is_emri_sayisi=F('is_emri_sayisi') + adet,
+            )
+
+    # ------------------------------------------------------------------
+    # Yeniden kurma
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def yeniden_hesapla(cls, baslangic=None, bitis=None, istasyon_idleri=None):
+        """
+        Yük tablosunu verilen aralık için iş emirlerinden baştan kurar, yazılan satır sayısını döndürür.
+        Aralıktan önce başlayıp içine taşan emirlerin yalnızca aralığa düşen günleri yazılır.
+        """
+        emirler = IsEmri.objects.filter(planlanan_istasyon__isnull=False).exclude(durum__in=IsEmri.YUK_DISI_DURUMLAR)
+        satirlar = IstasyonGunlukYuk.objects.all()
+        if baslangic:
+            # Aralığa taşan emirler: planlanan bitişi aralıkta olanlar ve bitişi güncel olmayabilecek yakın geçmiş başlangıçlar
+            geriye = timedelta(days=getattr(settings, 'TAKVIM_GECMIS_GUN', 60))
+            emirler = emirler.filter(
+                Q(planlanan_baslangic_tarihi__gte=baslangic - geriye) | Q(planlanan_bitis_tarihi__gte=baslangic)
+            )
+            satirlar = satirlar.filter(tarih__gte=baslangic)
+        if bitis:
+            emirler = emirler.filter(planlanan_baslangic_tarihi__lte=bitis)
+            satirlar = satirlar.filter(tarih__lte=bitis)
+        if istasyon_idleri is not None:
+            emirler = emirler.filter(planlanan_istasyon_id__in=istasyon_idleri)
+            satirlar = satirlar.filter(istasyon_id__in=istasyon_idleri)
+
+        toplamlar = {
+            (istasyon_id, tarih): toplam
+            for (istasyon_id, tarih), toplam in cls._gunluk_toplamlar(
+                e.kapasite_yuku() for e in emirler.order_by().only(*IsEmri.YUK_ALANLARI)
+            ).items()
+            if (not baslangic or tarih >= baslangic) and (not bitis or tarih <= bitis)
+        }
+        tarihler = [tarih for _, tarih in toplamlar]
+        takvimler = cls.takvimler(
+            {istasyon_id for istasyon_id, _ in toplamlar}, min(tarihler), max(tarihler)
+        ) if toplamlar else {}
+
+        yeni_satirlar = [
+            IstasyonGunlukYuk(
+                istasyon_id=istasyon_id,
+                tarih=tarih,
+                kullanilabilir_dakika=int(takvimler[istasyon_id].gunluk_dakika(tarih)),
+                planlanan_dakika=dakika,
+                is_emri_sayisi=adet,
+            )
+            for (istasyon_id, tarih), (dakika, adet) in toplamlar.items()
+        ]
+        with transaction.atomic():
+            satirlar.delete()
+            IstasyonGunlukYuk.objects.bulk_create(yeni_satirlar, batch_size=BATCH_SIZE)
+        logger.info(f"İstasyon yük tablosu yeniden hesaplandı: {len(yeni_satirlar)} satır")
+        return len(yeni_satirlar)
+
+    # ------------------------------------------------------------------
+    # Okuma
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def varsayilan_aralik():
+        """Panolarda kullanılan doluluk aralığı: bugünden itibaren KAPASITE_DOLULUK_GUN_SAYISI gün"""
+        bugun = date.today()
+        return bugun, bugun + timedelta(days=getattr(settings, 'KAPASITE_DOLULUK_GUN_SAYISI', 7) - 1)
+
+    @classmethod
+    def gunluk_yukler(cls, baslangic, bitis, istasyon_idleri=None):
+        """Aralıktaki yük satırları tek sorguda: {(istasyon_id, tarih): IstasyonGunlukYuk}"""
+        satirlar = IstasyonGunlukYuk.objects.filter(tarih__range=(baslangic, bitis)).order_by()
+        if istasyon_idleri is not None:
+            satirlar = satirlar.filter(istasyon_id__in=istasyon_idleri)
+        return {(s.istasyon_id, s.tarih): s for s in satirlar}
+
+    @classmethod
+    def doluluk(cls, istasyon_idleri=None, baslangic=None, bitis=None):
+        """
+        İstasyon başına aralıktaki toplam kullanılabilir/planlanan dakika ve doluluk yüzdesi.
+        Planlanan dakikalar yük tablosundan tek sorguda, kullanılabilir dakikalar çalışma takviminden
+        (kümülatif dizi üzerinde iki ikili arama) hesaplanır.
+        """
+        if baslangic is None or bitis is None:
+            baslangic, bitis = cls.varsayilan_aralik()
+
+        yukler = IstasyonGunlukYuk.objects.filter(tarih__range=(baslangic, bitis)).order_by()
+        if istasyon_idleri is not None:
+            yukler = yukler.filter(istasyon_id__in=istasyon_idleri)
+        else:
+            istasyon_idleri = list(IsIstasyonu.objects.order_by().values_list('id', flat=True))
+        planlanan = {
+            satir['istasyon_id']: satir
+            for satir in yukler.values('istasyon_id').annotate(dakika=Sum('planlanan_dakika'), adet=Sum('is_emri_sayisi'))
+        }
+
+        takvimler = cls.takvimler(istasyon_idleri, baslangic, bitis)
+        aralik_basi = datetime.combine(baslangic, time())
+        aralik_sonu = datetime.combine(bitis + timedelta(days=1), time())
+        sonuc = {}
+        for istasyon_id in istasyon_idleri:
+            kullanilabilir = int(takvimler[istasyon_id].calisma_dakikasi(aralik_basi, aralik_sonu))
+            satir = planlanan.get(istasyon_id, {})
+            dakika = float(satir.get('dakika') or 0)
+            if kullanilabilir:
+                oran = round(dakika * 100 / kullanilabilir, 1)
+            else:
+                oran = 100.0 if dakika else 0.0
+            sonuc[istasyon_id] = {
+                'kullanilabilir_dakika': kullanilabilir,
+                'planlanan_dakika': dakika,
+                'is_emri_sayisi': satir.get('adet') or 0,
+                'doluluk_orani': oran,
+            }
+        return sonuc
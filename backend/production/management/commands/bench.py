@@ -0,0 +1,284 @@
+# backend/production/management/commands/bench.py
+
+"""
+Planlama ve API sıcak noktaları için performans ölçümü.
+
+Ölçümler ayrı bir test veritabanında, generate_dataset ile üretilen sentetik
+veri üzerinde çalışır. Her ölçüm için sorgu sayısı, süre ve tepe bellek
+kullanımı JSON olarak yazılır ve kayıtlı baseline ile karşılaştırılır.
+
+Örnek:
+    python manage.py bench
+    python manage.py bench --orders 500 --output bench.json
+    python manage.py bench --update-baseline
+"""
+
+import io
+import json
+import sqlite3
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import mock
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+VARSAYILAN_BASELINE = Path(__file__).resolve().parents[2] / 'benchmarks' / 'baseline.json'
+
+
+class MikroFlyStandIn:
+    """pyodbc yerine kullanılan, Mikro Fly tablolarını taklit eden SQLite veritabanı"""
+
+    URI = 'file:mikro_fly_bench?mode=memory&cache=shared'
+
+    def __init__(self, musteri_sayisi, urun_sayisi):
+        # Bellek içi paylaşımlı veritabanı bu bağlantı açık kaldıkça yaşar
+        self._ana_baglanti = sqlite3.connect(self.URI, uri=True)
+        cursor = self._ana_baglanti.cursor()
+        cursor.execute('DROP TABLE IF EXISTS CARI_HESAPLAR')
+        cursor.execute('DROP TABLE IF EXISTS STOKLAR')
+        cursor.execute("""
+            CREATE TABLE CARI_HESAPLAR (
+                cari_kod TEXT, cari_unvan1 TEXT, cari_CepTel TEXT,
+                cari_EMail TEXT, cari_unvan2 TEXT, cari_iptal INTEGER
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE STOKLAR (
+                sto_kod TEXT, sto_isim TEXT, sto_birim1_ad TEXT, sto_min_stok INTEGER,
+                sto_pasif_fl INTEGER, sto_cins INTEGER, sto_iptal INTEGER
+            )
+        """)
+        cursor.executemany(
+            'INSERT INTO CARI_HESAPLAR VALUES (?, ?, ?, ?, ?, 0)',
+            [(f'120.{i:05d}', f'Mikro Cari {i}', '', f'cari{i}@ornek.com', f'Adres {i}')
+             for i in range(1, musteri_sayisi + 1)]
+        )
+        cursor.executemany(
+            'INSERT INTO STOKLAR VALUES (?, ?, ?, ?, 0, ?, 0)',
+            [(f'STK{i:05d}', f'Mikro Stok {i}', ['AD', 'KG', 'M', 'LT'][i % 4], i % 50, i % 3)
+             for i in range(1, urun_sayisi + 1)]
+        )
+        self._ana_baglanti.commit()
+
+    def connect(self, conn_str, timeout=None):
+        return sqlite3.connect(self.URI, uri=True)
+
+    def kapat(self):
+        self._ana_baglanti.close()
+
+
+class Command(BaseCommand):
+    help = 'Planlama ve API sıcak noktalarını ölçer, sonuçları baseline ile karşılaştırır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=20, help='Sentetik sipariş sayısı')
+        parser.add_argument('--depth', type=int, default=3, help='Reçete derinliği')
+        parser.add_argument('--stations', type=int, default=8, help='İstasyon sayısı')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--readiness-orders', type=int, default=50,
+                            help='hesapla_uretim_hazir_tarihi ölçümünde kullanılacak iş emri sayısı')
+        parser.add_argument('--mikro-fly-rows', type=int, default=100,
+                            help='Mikro Fly stand-in tablolarındaki satır sayısı')
+        parser.add_argument('--repeat', type=int, default=1, help='Süre ölçümü için tekrar sayısı (en iyisi alınır)')
+        parser.add_argument('--output', default='bench_sonuclari.json', help='Sonuç JSON dosyası')
+        parser.add_argument('--baseline', default=str(VARSAYILAN_BASELINE), help='Baseline JSON dosyası')
+        parser.add_argument('--update-baseline', action='store_true', help='Sonuçları baseline olarak kaydet')
+        parser.add_argument('--query-tolerance', type=float, default=0.10,
+                            help='Sorgu sayısı için izin verilen artış oranı')
+        parser.add_argument('--time-tolerance', type=float, default=1.00,
+                            help='Süre için izin verilen artış oranı (makine farkları nedeniyle geniş)')
+        parser.add_argument('--memory-tolerance', type=float, default=0.50,
+                            help='Tepe bellek için izin verilen artış oranı')
+
+    def handle(self, *args, **options):
+        self.options = options
+        eski_ad = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            call_command(
+                'generate_dataset',
+                orders=options['orders'], depth=options['depth'],
+                stations=options['stations'], seed=options['seed'],
+                stdout=io.StringIO(),
+            )
+            sonuclar = self._olcumleri_calistir()
+        finally:
+            connection.creation.destroy_test_db(eski_ad, verbosity=0)
+
+        rapor = {
+            'parametreler': {
+                'orders': options['orders'],
+                'depth': options['depth'],
+                'stations': options['stations'],
+                'seed': options['seed'],
+                'readiness_orders': options['readiness_orders'],
+                'mikro_fly_rows': options['mikro_fly_rows'],
+            },
+            'sonuclar': sonuclar,
+        }
+        Path(options['output']).write_text(json.dumps(rapor, indent=2, ensure_ascii=False), encoding='utf-8')
+        self._tablo_yaz(sonuclar)
+        self.stdout.write(f"Sonuçlar yazıldı: {options['output']}")
+
+        if options['update_baseline']:
+            Path(options['baseline']).parent.mkdir(parents=True, exist_ok=True)
+            Path(options['baseline']).write_text(json.dumps(rapor, indent=2, ensure_ascii=False), encoding='utf-8')
+            self.stdout.write(self.style.SUCCESS(f"Baseline güncellendi: {options['baseline']}"))
+            return
+
+        self._baseline_karsilastir(rapor)
+
+    # ------------------------------------------------------------------
+    # Ölçümler
+    # ------------------------------------------------------------------
+
+    def _olcumleri_calistir(self):
+        from backend.production import views
+        from backend.production.admin import MalzemePlanlamaAdmin, MalzemePlanlama, UretimPlanlamaAdmin, UretimPlanlama
+        from backend.production.models import Siparis, IsEmri
+
+        yonetici = User.objects.create_superuser('bench', 'bench@ornek.com', 'bench')
+        rf = RequestFactory()
+        api_rf = APIRequestFactory()
+
+        def calculate_materials():
+            siparisler = Siparis.objects.exclude(durum='iptal').prefetch_related('kalemler__urun')
+            MalzemePlanlamaAdmin(MalzemePlanlama, admin.site).calculate_materials(siparisler)
+
+        def uretim_hazir_tarihi():
+            emirler = IsEmri.objects.select_related(
+                'operasyon', 'siparis_kalemi__siparis', 'urun'
+            ).order_by('id')[:self.options['readiness_orders']]
+            for emir in emirler:
+                emir.hesapla_uretim_hazir_tarihi()
+
+        def gantt_changelist():
+            request = rf.get('/admin/production/uretimplanlama/')
+            request.user = yonetici
+            response = UretimPlanlamaAdmin(UretimPlanlama, admin.site).changelist_view(request)
+            assert response.status_code == 200
+
+        def api_listesi(viewset_sinifi, url):
+            def calistir():
+                response = viewset_sinifi.as_view({'get': 'list'})(api_rf.get(url))
+                response.render()
+                assert response.status_code == 200, response.status_code
+            return calistir
+
+        def mikro_fly_sync(viewset_sinifi, metod_adi):
+            def calistir():
+                getattr(viewset_sinifi(), metod_adi)()
+            return calistir
+
+        olcumler = [
+            ('calculate_materials', calculate_materials),
+            ('hesapla_uretim_hazir_tarihi', uretim_hazir_tarihi),
+            ('gantt_changelist_view', gantt_changelist),
+            ('siparis_viewset_list', api_listesi(views.SiparisViewSet, '/api/siparisler/')),
+            ('bom_template_viewset_list', api_listesi(views.BOMTemplateViewSet, '/api/bom-templates/')),
+            ('mikro_fly_musteri_sync', mikro_fly_sync(views.MusteriViewSet, '_sync_customers_from_mikro_fly')),
+            ('mikro_fly_urun_sync', mikro_fly_sync(views.UrunViewSet, '_sync_products_from_mikro_fly')),
+        ]
+
+        stand_in = MikroFlyStandIn(self.options['mikro_fly_rows'], self.options['mikro_fly_rows'])
+        sonuclar = {}
+        try:
+            with mock.patch.object(views, 'pyodbc', stand_in), mock.patch.object(views, 'PYODBC_AVAILABLE', True):
+                for ad, fonksiyon in olcumler:
+                    sonuclar[ad] = self._olc(fonksiyon, self.options['repeat'])
+                    self.stdout.write(f'  {ad}: tamam')
+        finally:
+            stand_in.kapat()
+        return sonuclar
+
+    def _olc(self, fonksiyon, tekrar):
+        """
+        Sorgu sayısı ilk, süre en iyi çalıştırmadan alınır. Tepe bellek ayrı bir çalıştırmada
+        ölçülür: tracemalloc her bellek ayırmayı izlediğinden açıkken ölçülen süre birkaç kat şişer.
+        """
+        sureler = []
+        sorgu_sayisi = None
+        for _ in range(tekrar):
+            with self._geri_alinan_islem(), CaptureQueriesContext(connection) as sorgular:
+                baslangic = time.perf_counter()
+                fonksiyon()
+                sureler.append(time.perf_counter() - baslangic)
+            if sorgu_sayisi is None:
+                sorgu_sayisi = len(sorgular.captured_queries)
+
+        tracemalloc.start()
+        try:
+            with self._geri_alinan_islem():
+                fonksiyon()
+            _, tepe_bellek = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return {
+            'sorgu_sayisi': sorgu_sayisi,
+            'sure_ms': round(min(sureler) * 1000, 2),
+            'tepe_bellek_kb': round(tepe_bellek / 1024, 1),
+        }
+
+    @staticmethod
+    @contextmanager
+    def _geri_alinan_islem():
+        """Veri değiştiren ölçümler (Mikro Fly senkronu) her çalıştırmada aynı başlangıç durumunu görür"""
+        with transaction.atomic():
+            yield
+            transaction.set_rollback(True)
+
+    # ------------------------------------------------------------------
+    # Raporlama
+    # ------------------------------------------------------------------
+
+    def _tablo_yaz(self, sonuclar):
+        self.stdout.write(f"{'Ölçüm':<32}{'Sorgu':>8}{'Süre (ms)':>12}{'Bellek (KB)':>14}")
+        for ad, sonuc in sonuclar.items():
+            self.stdout.write(
+                f"{ad:<32}{sonuc['sorgu_sayisi']:>8}{sonuc['sure_ms']:>12}{sonuc['tepe_bellek_kb']:>14}"
+            )
+
+    def _baseline_karsilastir(self, rapor):
+        baseline_yolu = Path(self.options['baseline'])
+        if not baseline_yolu.exists():
+            self.stdout.write(self.style.WARNING(
+                f'Baseline bulunamadı ({baseline_yolu}); karşılaştırma atlandı. "--update-baseline" ile oluşturun.'
+            ))
+            return
+
+        baseline = json.loads(baseline_yolu.read_text(encoding='utf-8'))
+        if baseline.get('parametreler') != rapor['parametreler']:
+            raise CommandError(
+                'Baseline farklı parametrelerle alınmış; karşılaştırma anlamsız olur. '
+                f"Baseline: {baseline.get('parametreler')}"
+            )
+
+        kontroller = [
+            ('sorgu_sayisi', self.options['query_tolerance']),
+            ('sure_ms', self.options['time_tolerance']),
+            ('tepe_bellek_kb', self.options['memory_tolerance']),
+        ]
+        gerilemeler = []
+        for ad, sonuc in rapor['sonuclar'].items():
+            onceki = baseline['sonuclar'].get(ad)
+            if onceki is None:
+                continue
+            for metrik, tolerans in kontroller:
+                sinir = onceki[metrik] * (1 + tolerans)
+                if sonuc[metrik] > sinir:
+                    gerilemeler.append(
+                        f'{ad}.{metrik}: {sonuc[metrik]} > {onceki[metrik]} (tolerans %{tolerans * 100:.0f})'
+                    )
+
+        if gerilemeler:
+            raise CommandError('Performans gerilemesi tespit edildi:\n  ' + '\n  '.join(gerilemeler))
+        self.stdout.write(self.style.SUCCESS('Baseline ile karşılaştırma başarılı, gerileme yok.'))
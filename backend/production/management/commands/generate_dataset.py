@@ -0,0 +1,576 @@
+# backend/production/management/commands/generate_dataset.py
+
+"""
+Performans testleri için sentetik üretim verisi oluşturur.
+
+Örnek:
+    python manage.py generate_dataset --orders 500 --depth 3 --stations 12
+    python manage.py generate_dataset --temizle
+"""
+
+import random
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from backend.production.istatistik_service import IstatistikService
+from backend.production.kapasite_service import KapasiteService
+from backend.production.models import (
+    Musteri, Urun, UrunRecete, BOMTemplate, Siparis, SiparisKalem,
+    MalzemeIhtiyac, Tedarikci, SatinAlmaSiparisi, SatinAlmaKalemi,
+    SatinAlmaTeslimGuncelleme, MalzemeGelis, StandardIsAdimi,
+    IsIstasyonu, IsAkisi, IsAkisiOperasyon, IsEmri, OperasyonSinifi,
+)
+
+# Üretilen tüm kayıtların kodları bu önekle başlar (temizleme için)
+ONEK = 'GEN'
+MALZEME_IHTIYAC_ISARETI = '[generate_dataset]'
+BATCH_SIZE = 1000
+
+ISTASYON_SABLONLARI = [
+    ('AG Sargı', 'makine', Decimal('9.00')),
+    ('YG Sargı', 'makine', Decimal('9.00')),
+    ('Kesim', 'makine', Decimal('8.00')),
+    ('Montaj', 'montaj', Decimal('9.00')),
+    ('Kurutma Fırını', 'makine', Decimal('24.00')),
+    ('Test', 'kalite_kontrol', Decimal('9.00')),
+    ('Boya', 'el_iscilik', Decimal('8.00')),
+    ('Paketleme', 'paketleme', Decimal('8.00')),
+]
+
+STANDART_ADIMLAR = [
+    ('kesim', 'Kesim', 'makine'),
+    ('isleme', 'İşleme', 'makine'),
+    ('montaj', 'Montaj', 'montaj'),
+    ('kalite', 'Test', 'kalite_kontrol'),
+    ('paketleme', 'Paketleme', 'paketleme'),
+    ('boya', 'Boyama', 'el_iscilik'),
+    ('kaynak', 'Kaynak', 'makine'),
+    ('tornalama', 'Tornalama', 'makine'),
+    ('frezeleme', 'Frezeleme', 'makine'),
+    ('zimpara', 'Zımpara', 'el_iscilik'),
+]
+
+HAMMADDE_ADLARI = ['Çelik Sac', 'Bakır Tel', 'Transformatör Yağı', 'İzolasyon Kağıdı', 'Cıvata', 'Alüminyum Profil', 'Boya', 'Conta']
+HAMMADDE_BIRIMLERI = ['kg', 'm', 'lt', 'adet', 'adet', 'm', 'lt', 'adet']
+
+SIPARIS_DURUM_AGIRLIKLARI = [
+    ('beklemede', 20),
+    ('malzeme_planlandi', 20),
+    ('is_emirleri_olusturuldu', 25),
+    ('uretimde', 20),
+    ('tamamlandi', 10),
+    ('iptal', 5),
+]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark ve performans testleri için sabit seed ile sentetik üretim verisi oluşturur'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=200, help='Oluşturulacak satış siparişi sayısı')
+        parser.add_argument('--depth', type=int, default=3, help='Reçete (BOM) derinliği (en az 1)')
+        parser.add_argument('--stations', type=int, default=8, help='İş istasyonu sayısı')
+        parser.add_argument('--seed', type=int, default=42, help='Rastgele sayı üreteci seed değeri')
+        parser.add_argument('--temizle', action='store_true', help='Önceden üretilmiş sentetik veriyi sil')
+
+    def handle(self, *args, **options):
+        if options['temizle']:
+            self._temizle()
+            return
+
+        if options['orders'] < 1 or options['depth'] < 1 or options['stations'] < 1:
+            raise CommandError('--orders, --depth ve --stations en az 1 olmalıdır')
+
+        if Musteri.objects.filter(kod__startswith=f'{ONEK}-').exists():
+            raise CommandError('Sentetik veri zaten mevcut. Önce "--temizle" ile silin.')
+
+        self.rng = random.Random(options['seed'])
+        self.bugun = timezone.now().date()
+
+        with transaction.atomic():
+            sayilar = self._olustur(options['orders'], options['depth'], options['stations'])
+
+        for model_adi, adet in sayilar.items():
+            self.stdout.write(f'  {model_adi}: {adet}')
+        self.stdout.write(self.style.SUCCESS('Sentetik veri oluşturuldu.'))
+
+    # ------------------------------------------------------------------
+    # Temizleme
+    # ------------------------------------------------------------------
+
+    def _temizle(self):
+        with transaction.atomic():
+            # PROTECT ilişkileri nedeniyle silme sırası önemli
+            IsEmri.objects.filter(emirNo__startswith=f'{ONEK}-').delete()
+            Siparis.objects.filter(siparis_no__startswith=f'{ONEK}-').delete()
+            SatinAlmaSiparisi.objects.filter(siparis_no__startswith=f'{ONEK}-').delete()
+            MalzemeIhtiyac.objects.filter(notlar=MALZEME_IHTIYAC_ISARETI).delete()
+            Tedarikci.objects.filter(kod__startswith=f'{ONEK}-').delete()
+            IsAkisi.objects.filter(kod__startswith=f'{ONEK}-').delete()
+            IsIstasyonu.objects.filter(kod__startswith=f'{ONEK}-').delete()
+            StandardIsAdimi.objects.filter(kod__startswith=f'{ONEK}-').delete()
+            BOMTemplate.objects.filter(bom_tanimi__startswith=f'{ONEK}-').delete()
+            Urun.objects.filter(kod__startswith=f'{ONEK}-').delete()
+            Musteri.objects.filter(kod__startswith=f'{ONEK}-').delete()
+        self.stdout.write(self.style.SUCCESS('Sentetik veri silindi.'))
+
+    # ------------------------------------------------------------------
+    # Oluşturma
+    # ------------------------------------------------------------------
+
+    def _olustur(self, siparis_sayisi, derinlik, istasyon_sayisi):
+        musteriler = self._musteriler(max(10, siparis_sayisi // 5))
+        istasyonlar = self._istasyonlar(istasyon_sayisi)
+        adimlar = self._standart_adimlar()
+        seviyeler = self._urunler(siparis_sayisi, derinlik)
+        receteler = self._receteler(seviyeler)
+        bom_sayisi = self._bom_templates(seviyeler, receteler)
+        rotalar = self._is_akislari(seviyeler, istasyonlar, adimlar)
+        siparisler, kalemler = self._siparisler(siparis_sayisi, musteriler, seviyeler[0])
+        is_emri_sayisi = self._is_emirleri(siparisler, kalemler, rotalar)
+        # İş emirleri bulk_create ile açıldığı için istasyon yükleri toplu kurulur
+        KapasiteService.yeniden_hesapla(istasyon_idleri=[i.pk for i in istasyonlar])
+        ihtiyaclar = self._malzeme_ihtiyaclari(siparisler, kalemler, receteler)
+        satinalma = self._satinalma(ihtiyaclar)
+
+        return {
+            'Musteri': len(musteriler),
+            'IsIstasyonu': len(istasyonlar),
+            'Urun': sum(len(s) for s in seviyeler),
+            'UrunRecete': sum(len(r) for r in receteler.values()),
+            'BOMTemplate': bom_sayisi,
+            'IsAkisi': len(rotalar),
+            'IsAkisiOperasyon': sum(len(ops) for ops in rotalar.values()),
+            'Siparis': len(siparisler),
+            'SiparisKalem': len(kalemler),
+            'IsEmri': is_emri_sayisi,
+            'MalzemeIhtiyac': len(ihtiyaclar),
+            **satinalma,
+        }
+
+    def _musteriler(self, adet):
+        musteriler = [
+            Musteri(
+                kod=f'{ONEK}-M{i:05d}',
+                ad=f'Sentetik Müşteri {i}',
+                ulke=self.rng.choice(['TR', 'TR', 'TR', 'DE', 'IQ', 'AZ', 'GB']),
+                email=f'musteri{i}@ornek.com',
+            )
+            for i in range(1, adet + 1)
+        ]
+        return Musteri.objects.bulk_create(musteriler, batch_size=BATCH_SIZE)
+
+    def _istasyonlar(self, adet):
+        istasyonlar = []
+        for i in range(1, adet + 1):
+            ad, tip, saat = ISTASYON_SABLONLARI[(i - 1) % len(ISTASYON_SABLONLARI)]
+            istasyonlar.append(IsIstasyonu(
+                kod=f'{ONEK}-IST{i:03d}',
+                ad=f'{ad} {(i - 1) // len(ISTASYON_SABLONLARI) + 1}',
+                tip=tip,
+                sinif=OperasyonSinifi.addan(ad),  # bulk_create save() çağırmaz
+                gunluk_calisma_saati=saat,
+                saatlik_maliyet=Decimal(self.rng.randint(200, 900)),
+            ))
+        return IsIstasyonu.objects.bulk_create(istasyonlar, batch_size=BATCH_SIZE)
+
+    def _standart_adimlar(self):
+        adimlar = [
+            StandardIsAdimi(
+                kod=f'{ONEK}-SA{i:02d}',
+                ad=ad,
+                kategori=kategori,
+                tahmini_sure_birim=Decimal(self.rng.randint(5, 120)),
+                gerekli_istasyon_tipi=istasyon_tipi,
+            )
+            for i, (kategori, ad, istasyon_tipi) in enumerate(STANDART_ADIMLAR, start=1)
+        ]
+        return StandardIsAdimi.objects.bulk_create(adimlar)
+
+    def _urunler(self, siparis_sayisi, derinlik):
+        """Seviye listesi döndürür: [bitmiş ürünler, ara ürün seviyeleri..., hammaddeler]"""
+        seviyeler = []
+        bitmis_sayisi = max(5, siparis_sayisi // 10)
+        ara_sayisi = max(5, bitmis_sayisi)
+        hammadde_sayisi = max(20, 10 * derinlik)
+
+        sayac = 0
+
+        def urun(kategori, ad, birim):
+            nonlocal sayac
+            sayac += 1
+            return Urun(
+                kod=f'{ONEK}-U{sayac:06d}',
+                ad=ad,
+                kategori=kategori,
+                birim=birim,
+                stok_miktari=self.rng.randint(0, 500),
+                minimum_stok=self.rng.randint(0, 100),
+            )
+
+        seviyeler.append([urun('bitmis_urun', f'Trafo {i} kVA', 'adet') for i in range(1, bitmis_sayisi + 1)])
+        for seviye in range(1, derinlik):
+            seviyeler.append([
+                urun('ara_urun', f'Ara Ürün S{seviye}-{i}', 'adet') for i in range(1, ara_sayisi + 1)
+            ])
+        hammaddeler = []
+        for i in range(1, hammadde_sayisi + 1):
+            indeks = (i - 1) % len(HAMMADDE_ADLARI)
+            hammaddeler.append(urun('hammadde', f'{HAMMADDE_ADLARI[indeks]} {i}', HAMMADDE_BIRIMLERI[indeks]))
+        seviyeler.append(hammaddeler)
+
+        tumu = [u for seviye in seviyeler for u in seviye]
+        Urun.objects.bulk_create(tumu, batch_size=BATCH_SIZE)
+        return seviyeler
+
+    def _receteler(self, seviyeler):
+        """Her ürün için alt seviyelerden 2-4 bileşenli reçete; {urun_id: [(malzeme, miktar), ...]}"""
+        receteler = {}
+        kayitlar = []
+        for indeks, seviye in enumerate(seviyeler[:-1]):
+            bir_alt = seviyeler[indeks + 1]
+            alt_tumu = [u for s in seviyeler[indeks + 1:] for u in s]
+            alt_urunler = {u.pk: u for u in alt_tumu}
+            for urun in seviye:
+                # En az bir bileşen bir alt seviyeden gelir, böylece derinlik korunur
+                secilenler = {self.rng.choice(bir_alt).pk: None}
+                hedef = self.rng.randint(2, 4)
+                while len(secilenler) < min(hedef, len(alt_tumu)):
+                    secilenler[self.rng.choice(alt_tumu).pk] = None
+                receteler[urun.pk] = []
+                for malzeme_id in secilenler:
+                    miktar = Decimal(self.rng.randint(1, 20))
+                    receteler[urun.pk].append((alt_urunler[malzeme_id], miktar))
+                    kayitlar.append(UrunRecete(urun_id=urun.pk, malzeme_id=malzeme_id, miktar=miktar))
+        UrunRecete.objects.bulk_create(kayitlar, batch_size=BATCH_SIZE)
+        return receteler
+
+    def _bom_templates(self, seviyeler, receteler):
+        urunler = {u.pk: u for seviye in seviyeler for u in seviye}
+        sablonlar = []
+        for urun_id, bilesenler in receteler.items():
+            urun = urunler[urun_id]
+            sablonlar.append(BOMTemplate(
+                bom_tanimi=f'{ONEK}-{urun.ad}',
+                eslestirilen_urun_id=urun_id,
+                malzemeler=[
+                    {
+                        'malzeme_adi': malzeme.ad,
+                        'tur': 'ara_urun' if malzeme.kategori == 'ara_urun' else 'hammadde',
+                        'miktar': float(miktar),
+                        'birim': malzeme.birim,
+                    }
+                    for malzeme, miktar in bilesenler
+                ],
+            ))
+        BOMTemplate.objects.bulk_create(sablonlar, batch_size=BATCH_SIZE)
+        return len(sablonlar)
+
+    def _is_akislari(self, seviyeler, istasyonlar, adimlar):
+        """Bitmiş ve ara ürünler için operasyon DAG'ları; {urun_id: [operasyon, ...]}"""
+        uretilenler = [u for seviye in seviyeler[:-1] for u in seviye]
+        akislar = [
+            IsAkisi(
+                kod=f'{ONEK}-WF{i:05d}',
+                ad=f'{urun.ad} Rotası',
+                urun_id=urun.pk,
+                tip=self.rng.choice(['seri', 'paralel']),
+            )
+            for i, urun in enumerate(uretilenler, start=1)
+        ]
+        IsAkisi.objects.bulk_create(akislar, batch_size=BATCH_SIZE)
+
+        operasyonlar = []
+        akis_operasyonlari = {}
+        for akis in akislar:
+            ops = []
+            for sira in range(1, self.rng.randint(4, 8) + 1):
+                adim = self.rng.choice(adimlar)
+                ops.append(IsAkisiOperasyon(
+                    is_akisi_id=akis.pk,
+                    istasyon_id=self.rng.choice(istasyonlar).pk,
+                    standart_adim_id=adim.pk,
+                    sira_no=sira,  # bulk_create save() çağırmaz, sıra no elle atanır
+                    operasyon_adi=adim.ad,
+                    sinif=OperasyonSinifi.addan(adim.ad),
+                    standart_sure=Decimal(self.rng.randint(10, 240)),
+                    hazirlik_suresi=Decimal(self.rng.choice([0, 15, 30, 60])),
+                    kritik=self.rng.random() < 0.3,
+                ))
+            akis_operasyonlari[akis] = ops
+            operasyonlar.extend(ops)
+        IsAkisiOperasyon.objects.bulk_create(operasyonlar, batch_size=BATCH_SIZE)
+
+        # Bağımlılıklar: her operasyon bir öncekine, bazen daha eski bir operasyona da bağlı
+        Through = IsAkisiOperasyon.onceki_operasyonlar.through
+        baglantilar = []
+        for ops in akis_operasyonlari.values():
+            for indeks in range(1, len(ops)):
+                oncekiler = {ops[indeks - 1].pk}
+                if indeks >= 2 and self.rng.random() < 0.3:
+                    oncekiler.add(ops[self.rng.randint(0, indeks - 2)].pk)
+                for onceki_id in oncekiler:
+                    baglantilar.append(Through(
+                        from_isakisioperasyon_id=ops[indeks].pk,
+                        to_isakisioperasyon_id=onceki_id,
+                    ))
+        Through.objects.bulk_create(baglantilar, batch_size=BATCH_SIZE)
+
+        return {akis.urun_id: ops for akis, ops in akis_operasyonlari.items()}
+
+    def _siparisler(self, adet, musteriler, bitmis_urunler):
+        durumlar = [d for d, _ in SIPARIS_DURUM_AGIRLIKLARI]
+        agirliklar = [a for _, a in SIPARIS_DURUM_AGIRLIKLARI]
+
+        siparisler = []
+        for i in range(1, adet + 1):
+            musteri = self.rng.choice(musteriler)
+            tarih = self.bugun - timedelta(days=self.rng.randint(0, 180))
+            durum = self.rng.choices(durumlar, agirliklar)[0]
+            tamamlanma = None
+            if durum == 'tamamlandi':
+                gun = min(tarih + timedelta(days=self.rng.randint(7, 60)), self.bugun)
+                tamamlanma = timezone.make_aware(datetime.combine(gun, time(17, 0)))
+            siparisler.append(Siparis(
+                musteri_id=musteri.pk,
+                siparis_no=f'{ONEK}-SIP{i:06d}',
+                tarih=tarih,
+                durum=durum,
+                tamamlanma_tarihi=tamamlanma,
+                musteri_ulke=musteri.ulke,
+                son_kullanici_ulke=musteri.ulke,
+            ))
+        Siparis.objects.bulk_create(siparisler, batch_size=BATCH_SIZE)
+        # bulk_create Siparis.save() çağırmaz; dashboard sayıları işlem bitince tazelenir
+        transaction.on_commit(IstatistikService.onbellegi_temizle)
+
+        kalemler = []
+        for siparis in siparisler:
+            for urun in self.rng.sample(bitmis_urunler, k=min(len(bitmis_urunler), self.rng.randint(1, 5))):
+                doviz = self.rng.choice(['USD', 'USD', 'EUR', 'TRY'])
+                kur = {'USD': Decimal('1'), 'EUR': Decimal('1.08'), 'TRY': Decimal('0.03')}[doviz]
+                birim_fiyat = Decimal(self.rng.randint(1000, 50000))
+                kalemler.append(SiparisKalem(
+                    siparis_id=siparis.pk,
+                    urun_id=urun.pk,
+                    miktar=self.rng.randint(1, 20),
+                    doviz=doviz,
+                    birim_fiyat=birim_fiyat,
+                    kur=kur,
+                    # bulk_create save() çağırmadığı için USD fiyatı burada hesaplanır
+                    birim_fiyat_usd=birim_fiyat * kur,
+                    teslim_tarihi=siparis.tarih + timedelta(days=self.rng.randint(30, 120)),
+                    son_kullanici_ulke=siparis.son_kullanici_ulke,
+                ))
+        SiparisKalem.objects.bulk_create(kalemler, batch_size=BATCH_SIZE)
+        return siparisler, kalemler
+
+    def _is_emirleri(self, siparisler, kalemler, rotalar):
+        uretimdeki = {
+            s.pk: s for s in siparisler
+            if s.durum in ('is_emirleri_olusturuldu', 'uretimde', 'tamamlandi')
+        }
+        emirler = []
+        emir_operasyonlari = []  # (kalem_indeksi, operasyon) - bağımlılıkları kurmak için
+        sayac = 0
+        for kalem_indeksi, kalem in enumerate(kalemler):
+            siparis = uretimdeki.get(kalem.siparis_id)
+            if siparis is None:
+                continue
+            ana_no = f'{ONEK}-AIE{kalem_indeksi + 1:06d}'
+            baslangic = self.bugun + timedelta(days=self.rng.randint(-10, 30))
+            for op in rotalar[kalem.urun_id]:
+                sayac += 1
+                if siparis.durum == 'tamamlandi':
+                    durum = 'tamamlandi'
+                elif siparis.durum == 'uretimde':
+                    durum = self.rng.choice(['hazir', 'basladi', 'devam_ediyor', 'tamamlandi'])
+                else:
+                    durum = self.rng.choice(['planlandi', 'malzeme_bekliyor', 'hazir'])
+                planli = self.rng.random() < 0.7
+                tarih = baslangic + timedelta(days=op.sira_no - 1)
+                emirler.append(IsEmri(
+                    emirNo=f'{ONEK}-IE{sayac:07d}',
+                    ana_emirNo=ana_no,
+                    siparis_id=siparis.pk,
+                    siparis_kalemi_id=kalem.pk,
+                    urun_id=kalem.urun_id,
+                    is_akisi_id=op.is_akisi_id,
+                    operasyon_id=op.pk,
+                    planlanan_miktar=kalem.miktar,
+                    uretilen_miktar=kalem.miktar if durum == 'tamamlandi' else 0,
+                    planlanan_istasyon_id=op.istasyon_id if planli else None,
+                    planlanan_baslangic_tarihi=tarih,
+                    planlanan_bitis_tarihi=tarih,
+                    planlanan_sure=op.standart_sure + op.hazirlik_suresi,
+                    durum=durum,
+                    oncelik=self.rng.choice(['dusuk', 'normal', 'normal', 'yuksek', 'acil']),
+                ))
+                emir_operasyonlari.append((kalem_indeksi, op))
+        IsEmri.objects.bulk_create(emirler, batch_size=BATCH_SIZE)
+
+        # Rota DAG'ını iş emirlerine taşı
+        emir_haritasi = {
+            (kalem_indeksi, op.pk): emir
+            for emir, (kalem_indeksi, op) in zip(emirler, emir_operasyonlari)
+        }
+        rota_oncekileri = {}
+        Through = IsAkisiOperasyon.onceki_operasyonlar.through
+        for satir in Through.objects.filter(
+            from_isakisioperasyon__in=[op.pk for _, op in emir_operasyonlari]
+        ).values_list('from_isakisioperasyon_id', 'to_isakisioperasyon_id'):
+            rota_oncekileri.setdefault(satir[0], []).append(satir[1])
+
+        EmirThrough = IsEmri.onceki_operasyonlar.through
+        baglantilar = []
+        for emir, (kalem_indeksi, op) in zip(emirler, emir_operasyonlari):
+            for onceki_op_id in rota_oncekileri.get(op.pk, []):
+                onceki = emir_haritasi.get((kalem_indeksi, onceki_op_id))
+                if onceki is not None:
+                    baglantilar.append(EmirThrough(from_isemri_id=emir.pk, to_isemri_id=onceki.pk))
+        EmirThrough.objects.bulk_create(baglantilar, batch_size=BATCH_SIZE)
+        return len(emirler)
+
+    def _malzeme_ihtiyaclari(self, siparisler, kalemler, receteler):
+        planlananlar = {s.pk: s for s in siparisler if s.durum not in ('beklemede', 'iptal')}
+
+        patlatma_onbellegi = {}
+
+        def hammaddeler(urun_id):
+            """Birim ürün için {hammadde: miktar} (önbellekli BOM patlatma)"""
+            if urun_id in patlatma_onbellegi:
+                return patlatma_onbellegi[urun_id]
+            sonuc = {}
+            for malzeme, miktar in receteler.get(urun_id, []):
+                if malzeme.kategori == 'hammadde':
+                    sonuc[malzeme] = sonuc.get(malzeme, 0) + miktar
+                else:
+                    for alt, alt_miktar in hammaddeler(malzeme.pk).items():
+                        sonuc[alt] = sonuc.get(alt, 0) + alt_miktar * miktar
+            patlatma_onbellegi[urun_id] = sonuc
+            return sonuc
+
+        toplamlar = {}
+        for kalem in kalemler:
+            siparis = planlananlar.get(kalem.siparis_id)
+            if siparis is None:
+                continue
+            for hammadde, miktar in hammaddeler(kalem.urun_id).items():
+                anahtar = (siparis.siparis_no, hammadde.pk)
+                if anahtar not in toplamlar:
+                    toplamlar[anahtar] = [hammadde, Decimal('0')]
+                toplamlar[anahtar][1] += miktar * kalem.miktar
+
+        ihtiyaclar = [
+            MalzemeIhtiyac(
+                malzeme_adi=hammadde.ad,
+                miktar=miktar,
+                birim=hammadde.birim,
+                islem_tipi='satin_al' if self.rng.random() < 0.7 else 'stoktan_kullan',
+                durum='beklemede',
+                ilgili_siparisler=[siparis_no],
+                ilgili_urunler=[],
+                notlar=MALZEME_IHTIYAC_ISARETI,
+            )
+            for (siparis_no, _), (hammadde, miktar) in toplamlar.items()
+        ]
+        MalzemeIhtiyac.objects.bulk_create(ihtiyaclar, batch_size=BATCH_SIZE)
+        return ihtiyaclar
+
+    def _satinalma(self, ihtiyaclar):
+        satin_alinacaklar = [i for i in ihtiyaclar if i.islem_tipi == 'satin_al']
+        tedarikciler = Tedarikci.objects.bulk_create([
+            Tedarikci(kod=f'{ONEK}-T{i:04d}', ad=f'Sentetik Tedarikçi {i}')
+            for i in range(1, max(5, len(satin_alinacaklar) // 40) + 1)
+        ], batch_size=BATCH_SIZE)
+
+        # Satın alma siparişleri: her biri en fazla 5 kalem
+        siparisler = []
+        gruplar = []
+        for indeks in range(0, len(satin_alinacaklar), 5):
+            grup = satin_alinacaklar[indeks:indeks + 5]
+            tarih = self.bugun - timedelta(days=self.rng.randint(0, 120))
+            teslim = tarih + timedelta(days=self.rng.randint(7, 45))
+            siparisler.append(SatinAlmaSiparisi(
+                siparis_no=f'{ONEK}-SA{len(siparisler) + 1:06d}',
+                tedarikci_id=self.rng.choice(tedarikciler).pk,
+                tarih=tarih,
+                teslim_tarihi=teslim,
+                guncel_teslim_tarihi=teslim,
+                toplam_tutar=Decimal('0'),
+            ))
+            gruplar.append(grup)
+        SatinAlmaSiparisi.objects.bulk_create(siparisler, batch_size=BATCH_SIZE)
+
+        kalemler = []
+        for siparis, grup in zip(siparisler, gruplar):
+            toplam = Decimal('0')
+            for ihtiyac in grup:
+                birim_fiyat = Decimal(self.rng.randint(5, 500))
+                kalem = SatinAlmaKalemi(
+                    siparis_id=siparis.pk,
+                    malzeme_ihtiyaci_id=ihtiyac.pk,
+                    miktar=ihtiyac.miktar,
+                    birim_fiyat=birim_fiyat,
+                    toplam_fiyat=ihtiyac.miktar * birim_fiyat,
+                )
+                toplam += kalem.toplam_fiyat
+                kalemler.append(kalem)
+            siparis.toplam_tutar = toplam
+        SatinAlmaKalemi.objects.bulk_create(kalemler, batch_size=BATCH_SIZE)
+        SatinAlmaSiparisi.objects.bulk_update(siparisler, ['toplam_tutar'], batch_size=BATCH_SIZE)
+        MalzemeIhtiyac.objects.filter(
+            pk__in=[i.pk for i in satin_alinacaklar]
+        ).update(durum='siparis_verildi')
+
+        # Teslim tarihi revizyonları
+        guncellemeler = []
+        for siparis in siparisler:
+            if self.rng.random() < 0.25:
+                yeni = siparis.teslim_tarihi + timedelta(days=self.rng.randint(1, 20))
+                guncellemeler.append(SatinAlmaTeslimGuncelleme(
+                    siparis_id=siparis.pk,
+                    eski_teslim_tarihi=siparis.teslim_tarihi,
+                    yeni_teslim_tarihi=yeni,
+                    aciklama='Sentetik revizyon',
+                ))
+                siparis.guncel_teslim_tarihi = yeni
+        SatinAlmaTeslimGuncelleme.objects.bulk_create(guncellemeler, batch_size=BATCH_SIZE)
+        SatinAlmaSiparisi.objects.bulk_update(siparisler, ['guncel_teslim_tarihi'], batch_size=BATCH_SIZE)
+
+        # Malzeme gelişleri: kalemlerin bir kısmı tam, bir kısmı kısmi gelir
+        siparis_haritasi = {s.pk: s for s in siparisler}
+        gelisler = []
+        for kalem in kalemler:
+            zar = self.rng.random()
+            if zar < 0.35:
+                continue
+            siparis = siparis_haritasi[kalem.siparis_id]
+            oran = Decimal('1') if zar < 0.8 else Decimal(self.rng.randint(20, 90)) / 100
+            gelen = (kalem.miktar * oran).quantize(Decimal('0.01'))
+            if gelen <= 0:
+                continue
+            gelisler.append(MalzemeGelis(
+                satinalma_siparisi_id=siparis.pk,
+                satinalma_kalemi_id=kalem.pk,
+                gelen_miktar=gelen,
+                gelis_tarihi=siparis.teslim_tarihi + timedelta(days=self.rng.randint(-5, 15)),
+                birim_fiyat=kalem.birim_fiyat,
+                para_birimi='TRY',
+                # bulk_create save() çağırmadığı için toplam tutar burada hesaplanır
+                toplam_tutar=kalem.birim_fiyat * gelen,
+                irsaliye_no=f'{ONEK}-IRS{len(gelisler) + 1:06d}',
+            ))
+        MalzemeGelis.objects.bulk_create(gelisler, batch_size=BATCH_SIZE)
+
+        return {
+            'Tedarikci': len(tedarikciler),
+            'SatinAlmaSiparisi': len(siparisler),
+            'SatinAlmaKalemi': len(kalemler),
+            'SatinAlmaTeslimGuncelleme': len(guncellemeler),
+            'MalzemeGelis': len(gelisler),
+        }
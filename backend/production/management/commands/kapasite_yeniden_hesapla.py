@@ -0,0 +1,35 @@
+# backend/production/management/commands/kapasite_yeniden_hesapla.py
+
+"""
+İstasyon günlük yük tablosunu iş emirlerinden yeniden kurar.
+Toplu veri aktarımı veya queryset.update/delete ile yapılan değişikliklerden sonra çalıştırılır.
+
+Örnek:
+    python manage.py kapasite_yeniden_hesapla
+    python manage.py kapasite_yeniden_hesapla --baslangic 2025-01-01 --bitis 2025-12-31
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.production.kapasite_service import KapasiteService
+
+
+class Command(BaseCommand):
+    help = 'İstasyon günlük kapasite/yük tablosunu iş emirlerinden yeniden hesaplar'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--baslangic', help='Başlangıç tarihi (YYYY-MM-DD)')
+        parser.add_argument('--bitis', help='Bitiş tarihi (YYYY-MM-DD)')
+        parser.add_argument('--istasyon', type=int, action='append', help='Sadece bu istasyon (tekrarlanabilir)')
+
+    def handle(self, *args, **options):
+        try:
+            baslangic = date.fromisoformat(options['baslangic']) if options['baslangic'] else None
+            bitis = date.fromisoformat(options['bitis']) if options['bitis'] else None
+        except ValueError:
+            raise CommandError('Tarihler YYYY-MM-DD biçiminde olmalıdır')
+
+        satir_sayisi = KapasiteService.yeniden_hesapla(baslangic, bitis, options['istasyon'])
+        self.stdout.write(self.style.SUCCESS(f'İstasyon yük tablosu yeniden hesaplandı: {satir_sayisi} satır'))
@@ -0,0 +1,21 @@
+# backend/production/management/commands/metrik_ozet_al.py
+
+"""
+Dashboard KPI'larının günlük anlık görüntüsünü GunlukMetrik tablosuna yazar.
+Gün sonunda zamanlanmış görev olarak çalıştırılır; aynı gün tekrar çalıştırılırsa o günün satırları yenilenir.
+
+Örnek:
+    python manage.py metrik_ozet_al
+"""
+
+from django.core.management.base import BaseCommand
+
+from backend.production.metrik_service import MetrikService
+
+
+class Command(BaseCommand):
+    help = 'Dashboard metriklerinin günlük anlık görüntüsünü alır'
+
+    def handle(self, *args, **options):
+        yazilan = MetrikService.ozet_al()
+        self.stdout.write(self.style.SUCCESS(f'{yazilan} metrik satırı yazıldı'))
@@ -0,0 +1,27 @@
+# backend/production/management/commands/planlama_degisiklik_temizle.py
+
+"""
+Gantt canlı akışının planlama değişiklik kayıtlarından saklama süresini aşanları siler.
+Günlük zamanlanmış görev olarak çalıştırılır; akışı bundan eski bir sıradan isteyen ekranlar yenilenir.
+
+Örnek:
+    python manage.py planlama_degisiklik_temizle
+    python manage.py planlama_degisiklik_temizle --gun 3
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.production.degisiklik_akisi_service import DegisiklikAkisiService
+
+
+class Command(BaseCommand):
+    help = 'Saklama süresinden eski planlama değişiklik kayıtlarını siler'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--gun', type=int, help='Bu kadar günden eski kayıtlar silinir (varsayılan PLANLAMA_DEGISIKLIK_SAKLAMA_GUN)')
+
+    def handle(self, *args, **options):
+        if options['gun'] is not None and options['gun'] < 0:
+            raise CommandError('--gun negatif olamaz')
+        silinen = DegisiklikAkisiService.temizle(options['gun'])
+        self.stdout.write(self.style.SUCCESS(f'{silinen} planlama değişiklik kaydı silindi'))
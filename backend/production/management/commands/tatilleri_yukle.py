@@ -0,0 +1,34 @@
+# backend/production/management/commands/tatilleri_yukle.py
+
+"""
+Türkiye resmi tatillerini (arife günleri yarım gün) TatilGunu tablosuna yükler.
+
+Örnek:
+    python manage.py tatilleri_yukle
+    python manage.py tatilleri_yukle --yil 2026 --yil 2027
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from backend.production.takvim_service import DINI_BAYRAMLAR, TakvimService
+
+
+class Command(BaseCommand):
+    help = 'Türkiye resmi tatillerini çalışma takvimine yükler'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--yil', type=int, action='append', help='Yüklenecek yıl (varsayılan: bu yıl ve sonraki yıl)')
+
+    def handle(self, *args, **options):
+        yillar = options['yil'] or [date.today().year, date.today().year + 1]
+        for yil in yillar:
+            if yil not in DINI_BAYRAMLAR:
+                self.stdout.write(self.style.WARNING(
+                    f'{yil} için dini bayram tarihleri tanımlı değil; sadece sabit tatiller yüklenecek'
+                ))
+        eklenen, guncellenen = TakvimService.resmi_tatilleri_yukle(yillar)
+        self.stdout.write(self.style.SUCCESS(
+            f'Tatiller yüklendi ({", ".join(map(str, yillar))}): {eklenen} yeni, {guncellenen} güncellenen'
+        ))
@@ -0,0 +1,21 @@
+# backend/production/management/commands/tedarik_sureleri_hesapla.py
+
+"""
+TedarikSuresi tablosunu geçmiş malzeme gelişlerinden baştan kurar.
+Tablo her gelişte kendiliğinden güncellenir; komut ilk kurulumda veya toplu veri aktarımından sonra çalıştırılır.
+
+Örnek:
+    python manage.py tedarik_sureleri_hesapla
+"""
+
+from django.core.management.base import BaseCommand
+
+from backend.production.tedarik_suresi_service import TedarikSuresiService
+
+
+class Command(BaseCommand):
+    help = 'Tedarikçi/malzeme tedarik sürelerini geçmiş gelişlerden yeniden hesaplar'
+
+    def handle(self, *args, **options):
+        yazilan = TedarikSuresiService.tumunu_hesapla()
+        self.stdout.write(self.style.SUCCESS(f'{yazilan} tedarik süresi satırı yazıldı'))
@@ -0,0 +1,27 @@
+# backend/production/management/commands/yarim_yuklemeleri_temizle.py
+
+"""
+Tamamlanmadan bırakılmış parçalı yüklemeleri depolamadaki parçalarıyla birlikte siler.
+Günlük zamanlanmış görev olarak çalıştırılır; silinen yükleme istemci tarafından baştan başlatılır.
+
+Örnek:
+    python manage.py yarim_yuklemeleri_temizle
+    python manage.py yarim_yuklemeleri_temizle --saat 12
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.production.dosya_yukleme_service import DosyaYuklemeService
+
+
+class Command(BaseCommand):
+    help = 'Süresi geçmiş yarım kalmış parçalı yüklemeleri siler'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--saat', type=int, help='Bu kadar saattir ilerlemeyen yüklemeler silinir (varsayılan PARCALI_YUKLEME_SURESI_SAAT)')
+
+    def handle(self, *args, **options):
+        if options['saat'] is not None and options['saat'] < 0:
+            raise CommandError('--saat negatif olamaz')
+        silinen = DosyaYuklemeService.eskileri_temizle(options['saat'])
+        self.stdout.write(self.style.SUCCESS(f'{silinen} yarım kalmış yükleme silindi'))
@@ -0,0 +1,136 @@
+"""
+Metrik servisi - dashboard KPI'larını günlük olarak GunlukMetrik tablosuna yazar ve
+panolara son durum ile trend serilerini bu tablodan sunar
+"""
+
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Max, Q
+from django.utils import timezone
+
+from .istatistik_service import IstatistikService
+from .models import GunlukMetrik, IsEmri, MalzemeGelis, Siparis
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+class MetrikService:
+    """
+    Günlük KPI anlık görüntüleri. Sayımlar çalıştırıldığı andaki durumu, oranlar ise son
+    METRIK_PERFORMANS_PENCERESI_GUN günü yansıtır. Aynı gün için tekrar çalıştırmak satırları yeniler.
+    """
+
+    WIP_DURUMLARI = ('basladi', 'devam_ediyor')
+
+    # ------------------------------------------------------------------
+    # Toplama
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def ozet_al(cls, tarih=None):
+        """Verilen gün (varsayılan bugün) için tüm metrikleri hesaplar, yazılan satır sayısını döndürür"""
+        tarih = tarih or timezone.localdate()
+        satirlar = [
+            GunlukMetrik(tarih=tarih, metrik=metrik, anahtar=str(anahtar), etiket=etiket[:200], deger=deger)
+            for metrik, anahtar, etiket, deger in cls.metrikleri_hesapla(tarih)
+        ]
+        with transaction.atomic():
+            GunlukMetrik.objects.filter(tarih=tarih).delete()
+            GunlukMetrik.objects.bulk_create(satirlar, batch_size=BATCH_SIZE)
+        logger.info(f"{tarih} için {len(satirlar)} metrik satırı yazıldı")
+        return len(satirlar)
+
+    @classmethod
+    def metrikleri_hesapla(cls, tarih):
+        """(metrik, anahtar, etiket, deger) dörtlüleri"""
+        pencere_basi = tarih - timedelta(days=getattr(settings, 'METRIK_PERFORMANS_PENCERESI_GUN', 30))
+        yield from cls._siparis_durumlari()
+        yield from cls._istasyon_wip()
+        yield from cls._zamaninda_teslim(pencere_basi, tarih)
+        yield from cls._tedarikci_performansi(pencere_basi, tarih)
+        for malzeme in IstatistikService.kritik_malzemeler(limit=getattr(settings, 'METRIK_MALZEME_LIMIT', 50)):
+            yield 'malzeme_eksigi', malzeme['name'], malzeme['unit'], Decimal(str(malzeme['shortage']))
+
+    @staticmethod
+    def _siparis_durumlari():
+        sayilar = dict(Siparis.objects.order_by().values_list('durum').annotate(adet=Count('id')))
+        for durum, etiket in Siparis.DURUM_CHOICES:
+            yield 'siparis_durum', durum, etiket, sayilar.get(durum, 0)
+
+    @classmethod
+    def _istasyon_wip(cls):
+        for istasyon_id, ad, adet in IsEmri.objects.filter(
+            durum__in=cls.WIP_DURUMLARI, planlanan_istasyon__isnull=False
+        ).order_by().values_list('planlanan_istasyon_id', 'planlanan_istasyon__ad').annotate(adet=Count('id')):
+            yield 'istasyon_wip', istasyon_id, ad, adet
+
+    @staticmethod
+    def _zamaninda_teslim(baslangic, bitis):
+        """
+        Pencerede tamamlanan siparişlerden tamamlanma günü (tamamlanma_tarihi; sonraki düzenlemeler
+        etkilemez) en geç kalem teslim tarihini aşmayanların oranı
+        """
+        siparisler = Siparis.objects.filter(
+            durum='tamamlandi', tamamlanma_tarihi__date__gt=baslangic, tamamlanma_tarihi__date__lte=bitis
+        ).order_by().annotate(son_teslim=Max('kalemler__teslim_tarihi')).values_list('tamamlanma_tarihi', 'son_teslim')
+        toplam = zamaninda = 0
+        for tamamlanma, son_teslim in siparisler:
+            toplam += 1
+            if son_teslim is None or timezone.localtime(tamamlanma).date() <= son_teslim:
+                zamaninda += 1
+        if toplam:
+            yield 'zamaninda_teslim', '', f'{toplam} sipariş', round(Decimal(zamaninda * 100) / toplam, 2)
+
+    @staticmethod
+    def _tedarikci_performansi(baslangic, bitis):
+        """Tedarikçi başına pencerede gelen teslimatlardan sipariş teslim tarihine yetişenlerin oranı"""
+        for tedarikci_id, ad, toplam, zamaninda in MalzemeGelis.objects.filter(
+            gelis_tarihi__gt=baslangic, gelis_tarihi__lte=bitis
+        ).order_by().values_list(
+            'satinalma_siparisi__tedarikci_id', 'satinalma_siparisi__tedarikci__ad'
+        ).annotate(
+            toplam=Count('id'),
+            zamaninda=Count('id', filter=Q(gelis_tarihi__lte=F('satinalma_siparisi__teslim_tarihi'))),
+        ):
+            yield 'tedarikci_zamaninda', tedarikci_id, ad, round(Decimal(zamaninda * 100) / toplam, 2)
+
+    # ------------------------------------------------------------------
+    # Okuma
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def son_durum():
+        """En son anlık görüntü: {'tarih': ..., 'metrikler': {metrik: [{'anahtar', 'etiket', 'deger'}]}}"""
+        tarih = GunlukMetrik.objects.order_by('-tarih').values_list('tarih', flat=True).first()
+        metrikler = defaultdict(list)
+        if tarih:
+            for metrik, anahtar, etiket, deger in GunlukMetrik.objects.filter(tarih=tarih).order_by(
+                'metrik', '-deger', 'anahtar'
+            ).values_list('metrik', 'anahtar', 'etiket', 'deger'):
+                metrikler[metrik].append({'anahtar': anahtar, 'etiket': etiket, 'deger': float(deger)})
+        return {'tarih': tarih, 'metrikler': metrikler}
+
+    @staticmethod
+    def trend(metrik, baslangic, bitis, anahtar=None):
+        """
+        Metriğin aralıktaki günlük serileri, anahtar başına:
+        {anahtar: {'etiket': ..., 'degerler': [(tarih, deger), ...]}}
+        """
+        satirlar = GunlukMetrik.objects.filter(metrik=metrik, tarih__range=(baslangic, bitis))
+        if anahtar is not None:
+            satirlar = satirlar.filter(anahtar=anahtar)
+        seriler = {}
+        for tarih, satir_anahtari, etiket, deger in satirlar.order_by('tarih').values_list(
+            'tarih', 'anahtar', 'etiket', 'deger'
+        ):
+            seri = seriler.setdefault(satir_anahtari, {'etiket': etiket, 'degerler': []})
+            seri['etiket'] = etiket
+            seri['degerler'].append((tarih, float(deger)))
+        return seriler
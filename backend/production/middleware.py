@@ -1,23 +1,55 @@
 import base64
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.http import HttpResponse
 from django.conf import settings
+from django.db import connection
+from django.utils import timezone
 import os
 
-class BasicAuthMiddleware:
+class AsyncUyumluMiddleware:
+    """
+    Hem WSGI hem ASGI altında çalışan middleware tabanı. Zincir async ise __acall__ kullanılır;
+    sync middleware ASGI altında her isteği thread'e aktarıp async view'lerin faydasını yok eder.
+    """
+    async_capable = True
+    sync_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.sync_call(request)
+
+
+class BasicAuthMiddleware(AsyncUyumluMiddleware):
+    def sync_call(self, request):
+        return self.engelle(request) or self.get_response(request)
+
+    async def __acall__(self, request):
+        return self.engelle(request) or await self.get_response(request)
+
+    def engelle(self, request):
+        """Kimlik doğrulaması gereken istekte 401 yanıtı, aksi halde None döndürür"""
         # Sadece production ortamında basic auth uygula
         if not getattr(settings, 'BASIC_AUTH_ENABLED', False):
-            return self.get_response(request)
+            return None
         
         # Admin ve API endpointleri için basic auth kontrolü
         if request.path.startswith('/admin/') or request.path.startswith('/api/'):
             if not self.is_authenticated(request):
                 return self.authentication_required()
         
-        return self.get_response(request)
+        return None
 
     def is_authenticated(self, request):
         auth_header = request.META.get('HTTP_AUTHORIZATION')
@@ -46,29 +78,201 @@ class BasicAuthMiddleware:
         return response
 
 
-class AutoAdminLoginMiddleware:
+class AutoAdminLoginMiddleware(AsyncUyumluMiddleware):
     """
     Development only middleware to auto-login admin user
     for seamless frontend-admin integration
     """
-    def __init__(self, get_response):
-        self.get_response = get_response
+    def sync_call(self, request):
+        if self.aktif(request):
+            self.giris_yap(request)
+        return self.get_response(request)
 
-    def __call__(self, request):
+    async def __acall__(self, request):
+        if self.aktif(request):
+            # request.user ve login veritabanına gider, async bağlamda thread'e aktarılır
+            await sync_to_async(self.giris_yap)(request)
+        return await self.get_response(request)
+
+    def aktif(self, request):
         # Only work in DEBUG mode for admin pages
-        if getattr(settings, 'DEBUG', False) and request.path.startswith('/admin/'):
-            if not request.user.is_authenticated:
-                # Try to get or create admin user
-                try:
-                    from django.contrib.auth import login
-                    from django.contrib.auth.models import User
-                    
-                    admin_user = User.objects.filter(is_superuser=True).first()
-                    if admin_user:
-                        # Auto login admin user
-                        login(request, admin_user, backend='django.contrib.auth.backends.ModelBackend')
-                except Exception as e:
-                    print(f"Auto admin login failed: {e}")
-        
-        response = self.get_response(request)
-        return response
\ No newline at end of file
+        return getattr(settings, 'DEBUG', False) and request.path.startswith('/admin/')
+
+    def giris_yap(self, request):
+        if not request.user.is_authenticated:
+            # Try to get or create admin user
+            try:
+                from django.contrib.auth import login
+                from django.contrib.auth.models import User
+                
+                admin_user = User.objects.filter(is_superuser=True).first()
+                if admin_user:
+                    # Auto login admin user
+                    login(request, admin_user, backend='django.contrib.auth.backends.ModelBackend')
+            except Exception as e:
+                print(f"Auto admin login failed: {e}")
+
+
+class QueryProfileBuffer:
+    """
+    Profil kayıtlarını tutan, thread-safe sabit boyutlu halka tampon. Tampon süreç belleğindedir:
+    çok süreçli sunucularda (gunicorn/uwsgi işçileri) her işçi yalnızca kendi örneklerini görür,
+    rapor yanıtı veren işçinin örneklerinden oluşur ve yeniden başlatmada silinir.
+    """
+
+    def __init__(self, boyut):
+        self._kayitlar = deque(maxlen=boyut)
+        self._kilit = threading.Lock()
+
+    def ekle(self, kayit):
+        with self._kilit:
+            self._kayitlar.append(kayit)
+
+    def temizle(self):
+        with self._kilit:
+            self._kayitlar.clear()
+
+    def kayitlar(self):
+        with self._kilit:
+            return list(self._kayitlar)
+
+    def rapor(self, limit=20, siralama='toplam_db_ms'):
+        """Kayıtları endpoint bazında toplar, en kötüden iyiye sıralı döndürür"""
+        endpointler = {}
+        for kayit in self.kayitlar():
+            ozet = endpointler.setdefault(kayit['endpoint'], {
+                'endpoint': kayit['endpoint'],
+                'istek_sayisi': 0,
+                'toplam_sorgu': 0,
+                'max_sorgu': 0,
+                'toplam_db_ms': 0.0,
+                'toplam_sure_ms': 0.0,
+                'max_sure_ms': 0.0,
+                'tekrarlanan_sorgular': {},
+            })
+            ozet['istek_sayisi'] += 1
+            ozet['toplam_sorgu'] += kayit['sorgu_sayisi']
+            ozet['max_sorgu'] = max(ozet['max_sorgu'], kayit['sorgu_sayisi'])
+            ozet['toplam_db_ms'] += kayit['db_ms']
+            ozet['toplam_sure_ms'] += kayit['sure_ms']
+            ozet['max_sure_ms'] = max(ozet['max_sure_ms'], kayit['sure_ms'])
+            for parmak_izi, adet in kayit['tekrarlanan_sorgular'].items():
+                ozet['tekrarlanan_sorgular'][parmak_izi] = max(
+                    ozet['tekrarlanan_sorgular'].get(parmak_izi, 0), adet
+                )
+
+        sonuc = []
+        for ozet in endpointler.values():
+            n = ozet['istek_sayisi']
+            ozet['ort_sorgu'] = round(ozet['toplam_sorgu'] / n, 1)
+            ozet['ort_db_ms'] = round(ozet['toplam_db_ms'] / n, 2)
+            ozet['ort_sure_ms'] = round(ozet['toplam_sure_ms'] / n, 2)
+            ozet['toplam_db_ms'] = round(ozet['toplam_db_ms'], 2)
+            ozet['toplam_sure_ms'] = round(ozet['toplam_sure_ms'], 2)
+            ozet['max_sure_ms'] = round(ozet['max_sure_ms'], 2)
+            # En çok tekrarlanan sorgular N+1 belirtisidir
+            ozet['tekrarlanan_sorgular'] = [
+                {'sql': sql, 'max_tekrar': adet}
+                for sql, adet in sorted(ozet['tekrarlanan_sorgular'].items(), key=lambda x: -x[1])[:5]
+            ]
+            sonuc.append(ozet)
+
+        sonuc.sort(key=lambda x: x.get(siralama, 0), reverse=True)
+        return sonuc[:limit]
+
+
+_SQL_METIN = re.compile(r"'(?:[^']|'')*'")
+_SQL_SAYI = re.compile(r'\b\d+(?:\.\d+)?\b')
+_SQL_IN_LISTESI = re.compile(r'\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)')
+_SQL_BOSLUK = re.compile(r'\s+')
+
+
+def sql_parmak_izi(sql):
+    """Parametre değerlerinden arındırılmış, normalize edilmiş SQL döndürür"""
+    sql = _SQL_METIN.sub('?', sql)
+    sql = _SQL_SAYI.sub('?', sql)
+    sql = _SQL_IN_LISTESI.sub('(...)', sql)
+    return _SQL_BOSLUK.sub(' ', sql).strip()
+
+
+query_profile_buffer = QueryProfileBuffer(getattr(settings, 'QUERY_PROFILING_BUFFER_SIZE', 500))
+
+# settings.QUERY_PROFILING_SAMPLE_RATE tanımlı değilse
+VARSAYILAN_ORNEKLEME_ORANI = 0.1
+
+
+class QueryProfilingMiddleware(AsyncUyumluMiddleware):
+    """
+    İstek başına sorgu sayısı, DB süresi, tekrarlanan sorgular ve toplam süreyi ölçer.
+    QUERY_PROFILING_ENABLED ile açılır, QUERY_PROFILING_SAMPLE_RATE oranında örnekler.
+    Örnekler süreç başına tampona yazılır (bkz. QueryProfileBuffer).
+    """
+    def sync_call(self, request):
+        if not self._ornekle():
+            return self.get_response(request)
+
+        sorgular = []
+        baslangic = time.perf_counter()
+        with connection.execute_wrapper(self._sorgu_olcer(sorgular)):
+            response = self.get_response(request)
+        self._kaydet(request, response, sorgular, time.perf_counter() - baslangic)
+        return response
+
+    async def __acall__(self, request):
+        if not self._ornekle():
+            return await self.get_response(request)
+
+        # Veritabanı bağlantıları thread'e bağlıdır; ORM çağrıları isteğin sync_to_async thread'inde
+        # çalıştığından sarmalayıcı o thread'in bağlantısına takılır
+        sorgular = []
+        olcer = self._sorgu_olcer(sorgular)
+        baslangic = time.perf_counter()
+        await sync_to_async(self._sarmalayici_tak)(olcer)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(self._sarmalayici_cikar)(olcer)
+        self._kaydet(request, response, sorgular, time.perf_counter() - baslangic)
+        return response
+
+    def _ornekle(self):
+        if not getattr(settings, 'QUERY_PROFILING_ENABLED', False):
+            return False
+        return random.random() < getattr(settings, 'QUERY_PROFILING_SAMPLE_RATE', VARSAYILAN_ORNEKLEME_ORANI)
+
+    @staticmethod
+    def _sorgu_olcer(sorgular):
+        def sorgu_olc(execute, sql, params, many, context):
+            baslangic = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                sorgular.append((sql, time.perf_counter() - baslangic))
+        return sorgu_olc
+
+    @staticmethod
+    def _sarmalayici_tak(olcer):
+        connection.execute_wrappers.append(olcer)
+
+    @staticmethod
+    def _sarmalayici_cikar(olcer):
+        connection.execute_wrappers.remove(olcer)
+
+    def _kaydet(self, request, response, sorgular, sure):
+        parmak_izleri = Counter(sql_parmak_izi(sql) for sql, _ in sorgular)
+        query_profile_buffer.ekle({
+            'endpoint': self._endpoint(request),
+            'zaman': timezone.now().isoformat(),
+            'durum_kodu': response.status_code,
+            'sorgu_sayisi': len(sorgular),
+            'db_ms': sum(s for _, s in sorgular) * 1000,
+            'sure_ms': sure * 1000,
+            'tekrarlanan_sorgular': {sql: adet for sql, adet in parmak_izleri.items() if adet > 1},
+        })
+
+    def _endpoint(self, request):
+        match = getattr(request, 'resolver_match', None)
+        yol = match.route if match and match.route else request.path
+        # Router regex rotalarındaki ^ ve $ işaretlerini temizle
+        yol = yol.replace('^', '').replace('$', '')
+        return f'{request.method} /{yol.lstrip("/")}'
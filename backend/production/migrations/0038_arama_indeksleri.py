@@ -0,0 +1,50 @@
+from django.db import migrations
+
+# Typeahead (/ara/) önek aramaları için kod/ad indeksleri.
+# PostgreSQL: istartswith UPPER(kolon::text) LIKE ürettiği için trigram GIN indeksi.
+# SQLite: büyük/küçük harf duyarsız LIKE optimizasyonu için NOCASE indeksi.
+ARAMA_KOLONLARI = [
+    ('production_musteri', 'kod'),
+    ('production_musteri', 'ad'),
+    ('production_urun', 'kod'),
+    ('production_urun', 'ad'),
+]
+
+
+def _indeks_adi(tablo, kolon):
+    return f'{tablo}_{kolon}_ara_idx'
+
+
+def indeksleri_olustur(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for tablo, kolon in ARAMA_KOLONLARI:
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS {_indeks_adi(tablo, kolon)} '
+                f'ON {tablo} USING gin ((UPPER({kolon}::text)) gin_trgm_ops)'
+            )
+    elif vendor == 'sqlite':
+        for tablo, kolon in ARAMA_KOLONLARI:
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS {_indeks_adi(tablo, kolon)} '
+                f'ON {tablo} ({kolon} COLLATE NOCASE)'
+            )
+
+
+def indeksleri_kaldir(apps, schema_editor):
+    if schema_editor.connection.vendor not in ('postgresql', 'sqlite'):
+        return
+    for tablo, kolon in ARAMA_KOLONLARI:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {_indeks_adi(tablo, kolon)}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0037_bomtemplate'),
+    ]
+
+    operations = [
+        migrations.RunPython(indeksleri_olustur, indeksleri_kaldir),
+    ]
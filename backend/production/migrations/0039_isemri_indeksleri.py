@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0038_arama_indeksleri'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='isemri',
+            index=models.Index(fields=['planlanan_istasyon', 'durum'], name='isemri_istasyon_durum_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='isemri',
+            index=models.Index(fields=['planlanan_baslangic_tarihi'], name='isemri_baslangic_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='isemri',
+            index=models.Index(fields=['ana_emirNo'], name='isemri_ana_emirno_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='isemri',
+            index=models.Index(fields=['guncellenme_tarihi'], name='isemri_guncellenme_idx'),
+        ),
+    ]
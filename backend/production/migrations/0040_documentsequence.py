@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0039_isemri_indeksleri'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('onek', models.CharField(max_length=20, unique=True, verbose_name='Önek')),
+                ('son_deger', models.BigIntegerField(default=0, verbose_name='Son Değer')),
+                ('guncellenme_tarihi', models.DateTimeField(auto_now=True, verbose_name='Güncellenme Tarihi')),
+            ],
+            options={
+                'verbose_name': 'Belge Numara Sayacı',
+                'verbose_name_plural': 'Belge Numara Sayaçları',
+                'ordering': ['onek'],
+            },
+        ),
+    ]
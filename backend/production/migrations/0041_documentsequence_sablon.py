@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:20
+
+from django.db import migrations, models
+
+
+def mevcut_sablonlari_koru(apps, schema_editor):
+    # 0040 ile açılan sayaçlar önceki sabit biçimde devam etsin
+    DocumentSequence = apps.get_model('production', 'DocumentSequence')
+    DocumentSequence.objects.filter(onek='IE').update(sablon='IE-{numara:07d}')
+    DocumentSequence.objects.filter(onek='AIE').update(sablon='AIE-{numara:06d}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0040_documentsequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentsequence',
+            name='blok_boyutu',
+            field=models.PositiveIntegerField(default=100, help_text='Her veritabanı erişiminde ayrılıp bellekte tutulan numara sayısı', verbose_name='Blok Boyutu'),
+        ),
+        migrations.AddField(
+            model_name='documentsequence',
+            name='sablon',
+            field=models.CharField(default='{onek}-{numara:06d}', help_text='Kullanılabilir alanlar: {onek}, {numara}, {tarih}. Örnek: SA-{tarih:%Y}-{numara:05d}', max_length=100, verbose_name='Numara Şablonu'),
+        ),
+        migrations.RunPython(mevcut_sablonlari_koru, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0041_documentsequence_sablon'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IsAkisiSurumu',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('yayin_no', models.PositiveIntegerField(verbose_name='Yayın No')),
+                ('versiyon', models.CharField(max_length=10, verbose_name='Versiyon')),
+                ('operasyon_sayisi', models.PositiveSmallIntegerField(default=0, verbose_name='Operasyon Sayısı')),
+                ('veri', models.BinaryField(help_text='zlib ile sıkıştırılmış JSON', verbose_name='Derlenmiş Rota')),
+                ('yayin_tarihi', models.DateTimeField(auto_now_add=True, verbose_name='Yayın Tarihi')),
+                ('is_akisi', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='surumler', to='production.isakisi', verbose_name='İş Akışı')),
+                ('yayinlayan', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Yayınlayan')),
+            ],
+            options={
+                'verbose_name': 'İş Akışı Sürümü',
+                'verbose_name_plural': 'İş Akışı Sürümleri',
+                'ordering': ['is_akisi', '-yayin_no'],
+                'unique_together': {('is_akisi', 'yayin_no')},
+            },
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def yukleri_olustur(apps, schema_editor):
+    """Mevcut planlı iş emirlerinden ilk yük tablosunu kurar (henüz tatil kaydı yok)"""
+    IsEmri = apps.get_model('production', 'IsEmri')
+    IsIstasyonu = apps.get_model('production', 'IsIstasyonu')
+    IstasyonGunlukYuk = apps.get_model('production', 'IstasyonGunlukYuk')
+
+    calisma_saatleri = dict(IsIstasyonu.objects.values_list('id', 'gunluk_calisma_saati'))
+    gruplar = IsEmri.objects.filter(
+        planlanan_istasyon__isnull=False
+    ).exclude(
+        durum__in=['tamamlandi', 'iptal']
+    ).order_by().values('planlanan_istasyon_id', 'planlanan_baslangic_tarihi').annotate(
+        dakika=Sum('planlanan_sure'), adet=Count('id')
+    )
+    IstasyonGunlukYuk.objects.bulk_create([
+        IstasyonGunlukYuk(
+            istasyon_id=g['planlanan_istasyon_id'],
+            tarih=g['planlanan_baslangic_tarihi'],
+            kullanilabilir_dakika=(
+                int(calisma_saatleri[g['planlanan_istasyon_id']] * 60)
+                if g['planlanan_baslangic_tarihi'].weekday() < 5 else 0
+            ),
+            planlanan_dakika=g['dakika'] or 0,
+            is_emri_sayisi=g['adet'],
+        )
+        for g in gruplar
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0042_isakisisurumu'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TatilGunu',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tarih', models.DateField(unique=True, verbose_name='Tarih')),
+                ('ad', models.CharField(max_length=100, verbose_name='Tatil Adı')),
+                ('calisma_orani', models.DecimalField(decimal_places=2, default=0, help_text='0: tam gün tatil, 0.5: yarım gün', max_digits=3, verbose_name='Çalışma Oranı')),
+            ],
+            options={
+                'verbose_name': 'Tatil Günü',
+                'verbose_name_plural': 'Tatil Günleri',
+                'ordering': ['tarih'],
+            },
+        ),
+        migrations.CreateModel(
+            name='IstasyonGunlukYuk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tarih', models.DateField(verbose_name='Tarih')),
+                ('kullanilabilir_dakika', models.PositiveIntegerField(default=0, verbose_name='Kullanılabilir Dakika')),
+                ('planlanan_dakika', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Planlanan Dakika')),
+                ('is_emri_sayisi', models.IntegerField(default=0, verbose_name='İş Emri Sayısı')),
+                ('istasyon', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='gunluk_yukler', to='production.isistasyonu', verbose_name='İstasyon')),
+            ],
+            options={
+                'verbose_name': 'İstasyon Günlük Yükü',
+                'verbose_name_plural': 'İstasyon Günlük Yükleri',
+                'ordering': ['istasyon', 'tarih'],
+                'indexes': [models.Index(fields=['tarih', 'istasyon'], name='istasyon_yuk_tarih_idx')],
+                'unique_together': {('istasyon', 'tarih')},
+            },
+        ),
+        migrations.RunPython(yukleri_olustur, migrations.RunPython.noop),
+    ]
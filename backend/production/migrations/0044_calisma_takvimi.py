@@ -0,0 +1,50 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0043_istasyon_kapasite'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VardiyaDeseni',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kod', models.CharField(max_length=20, unique=True, verbose_name='Desen Kodu')),
+                ('ad', models.CharField(max_length=100, verbose_name='Desen Adı')),
+                ('vardiyalar', models.JSONField(default=dict, verbose_name='Vardiyalar')),
+                ('aktif', models.BooleanField(default=True, verbose_name='Aktif')),
+            ],
+            options={
+                'verbose_name': 'Vardiya Deseni',
+                'verbose_name_plural': 'Vardiya Desenleri',
+                'ordering': ['kod'],
+            },
+        ),
+        migrations.AddField(
+            model_name='isistasyonu',
+            name='vardiya_deseni',
+            field=models.ForeignKey(blank=True, help_text="Boşsa hafta içi 08:00'den itibaren günlük çalışma saati kadar çalışılır", null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='istasyonlar', to='production.vardiyadeseni', verbose_name='Vardiya Deseni'),
+        ),
+        migrations.CreateModel(
+            name='TakvimIstisnasi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tarih', models.DateField(verbose_name='Tarih')),
+                ('vardiyalar', models.JSONField(blank=True, default=list, verbose_name='Vardiyalar')),
+                ('aciklama', models.CharField(blank=True, max_length=200, verbose_name='Açıklama')),
+                ('istasyon', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='takvim_istisnalari', to='production.isistasyonu', verbose_name='İstasyon')),
+            ],
+            options={
+                'verbose_name': 'Takvim İstisnası',
+                'verbose_name_plural': 'Takvim İstisnaları',
+                'ordering': ['tarih'],
+                'unique_together': {('istasyon', 'tarih')},
+            },
+        ),
+    ]
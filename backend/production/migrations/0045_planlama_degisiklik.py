@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0044_calisma_takvimi'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlanlamaDegisiklik',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_emri_id', models.PositiveBigIntegerField(verbose_name='İş Emri')),
+                ('islem', models.CharField(choices=[('olustur', 'Oluşturuldu'), ('guncelle', 'Güncellendi'), ('sil', 'Silindi')], max_length=10, verbose_name='İşlem')),
+                ('veri', models.JSONField(blank=True, default=dict, verbose_name='Plan')),
+                ('zaman', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Zaman')),
+            ],
+            options={
+                'verbose_name': 'Planlama Değişikliği',
+                'verbose_name_plural': 'Planlama Değişiklikleri',
+                'ordering': ['id'],
+            },
+        ),
+    ]
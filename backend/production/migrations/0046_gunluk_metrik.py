@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0045_planlama_degisiklik'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GunlukMetrik',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tarih', models.DateField(verbose_name='Tarih')),
+                ('metrik', models.CharField(choices=[('siparis_durum', 'Duruma Göre Sipariş Sayısı'), ('istasyon_wip', 'İstasyondaki Devam Eden İş Emri'), ('zamaninda_teslim', 'Zamanında Teslim Oranı (%)'), ('tedarikci_zamaninda', 'Tedarikçi Zamanında Teslim Oranı (%)'), ('malzeme_eksigi', 'Malzeme Eksiği')], max_length=30, verbose_name='Metrik')),
+                ('anahtar', models.CharField(blank=True, default='', max_length=200, verbose_name='Anahtar')),
+                ('etiket', models.CharField(blank=True, max_length=200, verbose_name='Etiket')),
+                ('deger', models.DecimalField(decimal_places=2, max_digits=14, verbose_name='Değer')),
+            ],
+            options={
+                'verbose_name': 'Günlük Metrik',
+                'verbose_name_plural': 'Günlük Metrikler',
+                'ordering': ['-tarih', 'metrik', 'anahtar'],
+                'indexes': [models.Index(fields=['metrik', 'tarih'], name='gunluk_metrik_trend_idx')],
+                'unique_together': {('tarih', 'metrik', 'anahtar')},
+            },
+        ),
+    ]
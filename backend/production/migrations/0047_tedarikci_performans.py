@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0046_gunluk_metrik'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TedarikciPerformans',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ay', models.DateField(verbose_name='Ay')),
+                ('siparis_sayisi', models.PositiveIntegerField(default=0, verbose_name='Sipariş Sayısı')),
+                ('vadesi_gelen', models.PositiveIntegerField(default=0, verbose_name='Vadesi Gelen')),
+                ('zamaninda', models.PositiveIntegerField(default=0, verbose_name='Zamanında Teslim')),
+                ('toplam_kayma_gun', models.PositiveIntegerField(default=0, verbose_name='Toplam Gecikme (gün)')),
+                ('revizyon_sayisi', models.PositiveIntegerField(default=0, verbose_name='Teslim Tarihi Revizyonu')),
+                ('siparis_miktari', models.DecimalField(decimal_places=2, default=0, max_digits=16, verbose_name='Sipariş Miktarı')),
+                ('karsilanan_miktar', models.DecimalField(decimal_places=2, default=0, max_digits=16, verbose_name='Karşılanan Miktar')),
+                ('acik_siparis', models.PositiveIntegerField(default=0, verbose_name='Açık Sipariş')),
+                ('hesaplama_zamani', models.DateTimeField(auto_now=True, verbose_name='Hesaplama Zamanı')),
+                ('tedarikci', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aylik_performans', to='production.tedarikci', verbose_name='Tedarikçi')),
+            ],
+            options={
+                'verbose_name': 'Tedarikçi Performansı',
+                'verbose_name_plural': 'Tedarikçi Performansları',
+                'ordering': ['-ay', 'tedarikci'],
+                'indexes': [models.Index(fields=['ay'], name='tedarikci_perf_ay_idx')],
+                'unique_together': {('tedarikci', 'ay')},
+            },
+        ),
+    ]
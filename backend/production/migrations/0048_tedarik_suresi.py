@@ -0,0 +1,34 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0047_tedarikci_performans'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TedarikSuresi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('malzeme_adi', models.CharField(blank=True, max_length=200, verbose_name='Malzeme Adı')),
+                ('gozlem_sayisi', models.PositiveIntegerField(default=0, verbose_name='Gözlem Sayısı')),
+                ('medyan_gun', models.PositiveIntegerField(default=0, verbose_name='Medyan (gün)')),
+                ('p90_gun', models.PositiveIntegerField(default=0, verbose_name='P90 (gün)')),
+                ('son_gelis_tarihi', models.DateField(blank=True, null=True, verbose_name='Son Geliş Tarihi')),
+                ('guncellenme_tarihi', models.DateTimeField(auto_now=True, verbose_name='Güncellenme Tarihi')),
+                ('tedarikci', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tedarik_sureleri', to='production.tedarikci', verbose_name='Tedarikçi')),
+            ],
+            options={
+                'verbose_name': 'Tedarik Süresi',
+                'verbose_name_plural': 'Tedarik Süreleri',
+                'ordering': ['malzeme_adi', 'tedarikci'],
+                'indexes': [models.Index(fields=['malzeme_adi', 'tedarikci'], name='tedarik_suresi_malzeme_idx')],
+                'unique_together': {('tedarikci', 'malzeme_adi')},
+            },
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:00
+
+from django.db import migrations, models
+
+
+def _siniflandir(ad):
+    # OperasyonSinifi.addan'ın bu migration anındaki kopyası
+    ad = (ad or '').replace('I', 'ı').lower()
+    if 'sargı' in ad or 'sargi' in ad:
+        return 100 if 'ag' in ad else 200 if 'yg' in ad else 250
+    for anahtar, sinif in (('montaj', 300), ('kurutma', 400), ('test', 500)):
+        if anahtar in ad:
+            return sinif
+    return 900
+
+
+def mevcut_kayitlari_siniflandir(apps, schema_editor):
+    """Mevcut istasyon ve operasyonların sınıfını eski ad taramasına göre yazar"""
+    for model_adi, alan in (('IsIstasyonu', 'ad'), ('IsAkisiOperasyon', 'operasyon_adi')):
+        model = apps.get_model('production', model_adi)
+        gruplar = {}
+        for pk, ad in model.objects.values_list('pk', alan):
+            gruplar.setdefault(_siniflandir(ad), []).append(pk)
+        for sinif, idler in gruplar.items():
+            model.objects.filter(pk__in=idler).update(sinif=sinif)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0048_tedarik_suresi'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OperasyonSinifPolitikasi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sinif', models.PositiveSmallIntegerField(choices=[(100, 'AG Sargı'), (200, 'YG Sargı'), (250, 'Sargı'), (300, 'Montaj'), (400, 'Kurutma'), (500, 'Test'), (900, 'Diğer')], unique=True, verbose_name='Sınıf')),
+                ('malzeme_kontrolu', models.BooleanField(default=True, help_text='Kapalıysa operasyon stoktan çalışır ve malzeme açısından bugün hazır sayılır', verbose_name='Malzeme Kontrolü')),
+                ('kalemsiz_tedarik_bekle', models.BooleanField(default=False, help_text='Sipariş kalemine bağlı olmayan iş emirleri genel tedarik süresi kadar bekler', verbose_name='Sipariş Kalemi Yoksa Tedarik Bekle')),
+                ('aciklama', models.CharField(blank=True, max_length=200, verbose_name='Açıklama')),
+            ],
+            options={
+                'verbose_name': 'Operasyon Sınıfı Politikası',
+                'verbose_name_plural': 'Operasyon Sınıfı Politikaları',
+                'ordering': ['sinif'],
+            },
+        ),
+        migrations.AddField(
+            model_name='isakisioperasyon',
+            name='sinif',
+            field=models.PositiveSmallIntegerField(blank=True, choices=[(100, 'AG Sargı'), (200, 'YG Sargı'), (250, 'Sargı'), (300, 'Montaj'), (400, 'Kurutma'), (500, 'Test'), (900, 'Diğer')], db_index=True, help_text='Malzeme hazırlık politikası; boş bırakılırsa operasyon adından belirlenir', null=True, verbose_name='Sınıf'),
+        ),
+        migrations.AddField(
+            model_name='isistasyonu',
+            name='sinif',
+            field=models.PositiveSmallIntegerField(blank=True, choices=[(100, 'AG Sargı'), (200, 'YG Sargı'), (250, 'Sargı'), (300, 'Montaj'), (400, 'Kurutma'), (500, 'Test'), (900, 'Diğer')], db_index=True, help_text='Gantt sırası; boş bırakılırsa istasyon adından belirlenir', null=True, verbose_name='Sınıf'),
+        ),
+        migrations.RunPython(mevcut_kayitlari_siniflandir, migrations.RunPython.noop),
+    ]
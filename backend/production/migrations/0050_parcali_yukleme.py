@@ -0,0 +1,81 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:08
+
+import backend.production.models
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0049_operasyon_sinifi'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DosyaIcerigi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True, verbose_name='SHA-256')),
+                ('boyut', models.PositiveBigIntegerField(verbose_name='Boyut (bayt)')),
+                ('dosya', models.FileField(max_length=255, upload_to=backend.production.models.dosya_icerigi_yolu, verbose_name='Dosya')),
+                ('kullanim_sayisi', models.PositiveIntegerField(default=1, verbose_name='Yüklenme Sayısı')),
+                ('olusturulma_tarihi', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')),
+            ],
+            options={
+                'verbose_name': 'Dosya İçeriği',
+                'verbose_name_plural': 'Dosya İçerikleri',
+                'ordering': ['-olusturulma_tarihi'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ParcaliYukleme',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('dosya_adi', models.CharField(max_length=200, verbose_name='Dosya Adı')),
+                ('toplam_boyut', models.PositiveBigIntegerField(verbose_name='Toplam Boyut (bayt)')),
+                ('parca_boyutu', models.PositiveIntegerField(verbose_name='Parça Boyutu (bayt)')),
+                ('sha256', models.CharField(blank=True, max_length=64, verbose_name='Beklenen SHA-256')),
+                ('hedef', models.CharField(choices=[('siparis_dosyasi', 'Sipariş Ek Dosyası'), ('siparis_mektubu', 'Sipariş Mektubu'), ('maliyet_hesabi', 'Maliyet Hesap Tablosu'), ('evrak_dosyasi', 'Malzeme Geliş Evrakı')], max_length=20, verbose_name='Hedef')),
+                ('hedef_id', models.PositiveIntegerField(verbose_name='Hedef Kayıt')),
+                ('aciklama', models.CharField(blank=True, max_length=200, verbose_name='Açıklama')),
+                ('durum', models.CharField(choices=[('yukleniyor', 'Yükleniyor'), ('tamamlandi', 'Tamamlandı')], default='yukleniyor', max_length=20, verbose_name='Durum')),
+                ('olusturulma_tarihi', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')),
+                ('guncellenme_tarihi', models.DateTimeField(auto_now=True, verbose_name='Güncellenme Tarihi')),
+                ('icerik', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='yuklemeler', to='production.dosyaicerigi', verbose_name='İçerik')),
+                ('olusturan', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Oluşturan')),
+            ],
+            options={
+                'verbose_name': 'Parçalı Yükleme',
+                'verbose_name_plural': 'Parçalı Yüklemeler',
+                'ordering': ['-olusturulma_tarihi'],
+            },
+        ),
+        migrations.CreateModel(
+            name='YuklemeParcasi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('no', models.PositiveIntegerField(verbose_name='Parça No')),
+                ('boyut', models.PositiveIntegerField(verbose_name='Boyut (bayt)')),
+                ('sha256', models.CharField(max_length=64, verbose_name='SHA-256')),
+                ('dosya', models.FileField(max_length=255, upload_to=backend.production.models.yukleme_parcasi_yolu, verbose_name='Parça Dosyası')),
+                ('yukleme', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='parcalar', to='production.parcaliyukleme', verbose_name='Yükleme')),
+            ],
+            options={
+                'verbose_name': 'Yükleme Parçası',
+                'verbose_name_plural': 'Yükleme Parçaları',
+                'ordering': ['yukleme', 'no'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='parcaliyukleme',
+            index=models.Index(fields=['durum', 'guncellenme_tarihi'], name='parcali_yukleme_durum_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='yuklemeparcasi',
+            unique_together={('yukleme', 'no')},
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:27
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def tamamlananlari_doldur(apps, schema_editor):
+    """Mevcut tamamlanmış siparişlerde bilinen en iyi yaklaşım son güncelleme zamanıdır"""
+    Siparis = apps.get_model('production', 'Siparis')
+    Siparis.objects.filter(durum='tamamlandi').update(tamamlanma_tarihi=F('guncellenme_tarihi'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0050_parcali_yukleme'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='siparis',
+            name='tamamlanma_tarihi',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, help_text='Sipariş tamamlandı durumuna geçtiğinde yazılır; teslim süresi metrikleri bundan hesaplanır', null=True, verbose_name='Tamamlanma Tarihi'),
+        ),
+        migrations.RunPython(tamamlananlari_doldur, migrations.RunPython.noop),
+    ]
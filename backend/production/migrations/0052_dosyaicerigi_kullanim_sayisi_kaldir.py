@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0051_siparis_tamamlanma_tarihi'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='dosyaicerigi',
+            name='kullanim_sayisi',
+        ),
+    ]
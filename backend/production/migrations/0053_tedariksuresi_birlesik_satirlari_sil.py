@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-19 17:05
+
+from django.db import migrations
+
+
+def birlesik_satirlari_sil(apps, schema_editor):
+    """Malzeme ve genel tahminler artık tedarikçi+malzeme satırlarından okunurken birleştiriliyor"""
+    TedarikSuresi = apps.get_model('production', 'TedarikSuresi')
+    TedarikSuresi.objects.filter(tedarikci__isnull=True).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0052_dosyaicerigi_kullanim_sayisi_kaldir'),
+    ]
+
+    operations = [
+        migrations.RunPython(birlesik_satirlari_sil, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,114 @@
+"""
+Mikro Fly V17 servisi - ODBC bağlantı bilgisi ve senkronizasyon durumu.
+ODBC çağrıları bloklayıcıdır; async görünümler bunları thread havuzunda çalıştırır.
+"""
+
+import asyncio
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .models import Musteri
+
+try:
+    import pyodbc
+    PYODBC_AVAILABLE = True
+except ImportError:
+    # pyodbc not available (production environment)
+    pyodbc = None
+    PYODBC_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class MikroFlyService:
+    """Mikro Fly bağlantısı ve durum bilgisi"""
+
+    BAGLANTI_ZAMAN_ASIMI = 5  # saniye, pyodbc login timeout
+
+    @staticmethod
+    def baglanti_dizesi():
+        """Mikro Fly veritabanı bağlantı string'ini oluştur"""
+        server = getattr(settings, 'MIKRO_FLY_SERVER', 'localhost')
+        database = getattr(settings, 'MIKRO_FLY_DATABASE', 'MikroFly_V17')
+        username = getattr(settings, 'MIKRO_FLY_USERNAME', 'sa')
+        password = getattr(settings, 'MIKRO_FLY_PASSWORD', '')
+
+        # Domain kullanıcısı kontrolü - Windows Authentication kullan
+        if '\\' in username:
+            return f"""
+                DRIVER={{SQL Server}};
+                SERVER={server};
+                DATABASE={database};
+                Trusted_Connection=yes;
+            """
+        else:
+            return f"""
+                DRIVER={{SQL Server}};
+                SERVER={server};
+                DATABASE={database};
+                UID={username};
+                PWD={password};
+                Trusted_Connection=no;
+            """
+
+    @classmethod
+    def uzak_durum(cls):
+        """Tek bağlantıyla erişim testi ve aktif cari sayısı: (bagli, musteri_sayisi)"""
+        if not PYODBC_AVAILABLE:
+            logger.warning("pyodbc not available - skipping MikroFly connection test")
+            return False, 0
+        try:
+            with pyodbc.connect(cls.baglanti_dizesi(), timeout=cls.BAGLANTI_ZAMAN_ASIMI) as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT COUNT(*) FROM CARI_HESAPLAR WHERE cari_iptal = 0")
+                sonuc = cursor.fetchone()
+                return True, (sonuc[0] if sonuc else 0)
+        except Exception as e:
+            logger.warning(f"Mikro Fly bağlantı testi başarısız: {str(e)}")
+            return False, 0
+
+    @staticmethod
+    def yerel_durum():
+        """Son senkronizasyon zamanı ve Mikro Fly kodlu müşteri sayısı"""
+        son_senkron = Musteri.objects.filter(
+            mikro_fly_sync_tarihi__isnull=False
+        ).order_by('-mikro_fly_sync_tarihi').values_list('mikro_fly_sync_tarihi', flat=True).first()
+        return son_senkron, Musteri.objects.filter(mikro_fly_kodu__isnull=False).count()
+
+    @staticmethod
+    def _durum_yaniti(yerel, uzak):
+        son_senkron, senkron_sayisi = yerel
+        bagli, mikro_sayisi = uzak
+        return {
+            'last_sync': son_senkron.isoformat() if son_senkron else None,
+            'is_connected': bagli,
+            'mikro_fly_version': 'V17',
+            'total_customers_in_mikro': mikro_sayisi,
+            'total_customers_synced': senkron_sayisi,
+        }
+
+    @classmethod
+    def durum(cls):
+        return cls._durum_yaniti(cls.yerel_durum(), cls.uzak_durum())
+
+    @classmethod
+    async def adurum(cls):
+        """
+        durum()'un async karşılığı. ODBC çağrısı ORM thread'ini meşgul etmemesi için ayrı thread
+        havuzunda, yerel sorgularla paralel çalışır; MIKRO_FLY_DURUM_ZAMAN_ASIMI aşılırsa bağlı değil sayılır.
+        """
+        zaman_asimi = getattr(settings, 'MIKRO_FLY_DURUM_ZAMAN_ASIMI', 10)
+
+        async def uzak():
+            try:
+                return await asyncio.wait_for(
+                    sync_to_async(cls.uzak_durum, thread_sensitive=False)(), timeout=zaman_asimi
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"Mikro Fly durum kontrolü {zaman_asimi} sn içinde yanıt vermedi")
+                return False, 0
+
+        yerel, uzak_sonuc = await asyncio.gather(sync_to_async(cls.yerel_durum)(), uzak())
+        return cls._durum_yaniti(yerel, uzak_sonuc)
@@ -1,6 +1,13 @@
 # backend/production/models.py
 
-from django.db import models
+import json
+import uuid
+import zlib
+from collections import namedtuple
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from django.db import connections, models, router, transaction
 from django.core.validators import RegexValidator
 from django.utils import timezone
 from django.contrib.auth.models import User
@@ -589,6 +596,10 @@ class Siparis(models.Model):
     )
     olusturulma_tarihi = models.DateTimeField(auto_now_add=True)
     guncellenme_tarihi = models.DateTimeField(auto_now=True)
+    tamamlanma_tarihi = models.DateTimeField(
+        null=True, blank=True, db_index=True, editable=False, verbose_name='Tamamlanma Tarihi',
+        help_text='Sipariş tamamlandı durumuna geçtiğinde yazılır; teslim süresi metrikleri bundan hesaplanır'
+    )
     
     class Meta:
         verbose_name = 'Sipariş'
@@ -597,6 +608,30 @@ class Siparis(models.Model):
     
     def __str__(self):
         return f"{self.siparis_no} - {self.musteri.ad}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Durum değişikliğinde dashboard istatistik önbelleğini temizlemek için kayıtlı durumu sakla
+        if 'durum' in field_names:
+            instance._durum = instance.durum
+        return instance
+
+    def save(self, *args, **kwargs):
+        durum_degisti = self._state.adding or self.durum != getattr(self, '_durum', None)
+        if durum_degisti:
+            if self.durum != 'tamamlandi':
+                self.tamamlanma_tarihi = None
+            elif not self.tamamlanma_tarihi:
+                self.tamamlanma_tarihi = timezone.now()
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'durum' in update_fields:
+                kwargs['update_fields'] = {*update_fields, 'tamamlanma_tarihi'}
+        super().save(*args, **kwargs)
+        self._durum = self.durum
+        if durum_degisti:
+            from .istatistik_service import IstatistikService
+            transaction.on_commit(IstatistikService.onbellegi_temizle)
     
     def toplam_tutar(self):
         """USD cinsinden toplam tutar"""
@@ -701,7 +736,109 @@ class SiparisDosya(models.Model):
     
     def __str__(self):
         return f"{self.siparis.siparis_no} - {self.dosya.name}"
-    
+
+
+def dosya_icerigi_yolu(instance, filename):
+    return f"dosya_icerikleri/{instance.sha256[:2]}/{instance.sha256}/{filename}"
+
+
+def yukleme_parcasi_yolu(instance, filename):
+    return f"parcali_yuklemeler/{instance.yukleme_id}/{filename}"
+
+
+class DosyaIcerigi(models.Model):
+    """
+    İçerik özetine (sha256) göre bir kez saklanan dosya. Aynı içerik (ör. aynı irsaliye PDF'i)
+    ikinci kez yüklendiğinde yeni dosya yazılmaz; kayıtlar bu dosyanın yolunu paylaşır.
+    """
+    sha256 = models.CharField(max_length=64, unique=True, verbose_name="SHA-256")
+    boyut = models.PositiveBigIntegerField(verbose_name="Boyut (bayt)")
+    dosya = models.FileField(upload_to=dosya_icerigi_yolu, max_length=255, verbose_name="Dosya")
+    olusturulma_tarihi = models.DateTimeField(auto_now_add=True, verbose_name="Oluşturulma Tarihi")
+
+    class Meta:
+        verbose_name = "Dosya İçeriği"
+        verbose_name_plural = "Dosya İçerikleri"
+        ordering = ['-olusturulma_tarihi']
+
+    def __str__(self):
+        return f"{self.sha256[:12]} - {self.dosya.name}"
+
+
+class ParcaliYukleme(models.Model):
+    """
+    Büyük dosyalar için devam ettirilebilir yükleme oturumu. Parçalar ayrı isteklerle doğrudan
+    depolamaya yazılır; tamamlanınca içerik özetiyle tekilleştirilip hedef kayda bağlanır.
+    """
+
+    HEDEF_CHOICES = [
+        ('siparis_dosyasi', 'Sipariş Ek Dosyası'),
+        ('siparis_mektubu', 'Sipariş Mektubu'),
+        ('maliyet_hesabi', 'Maliyet Hesap Tablosu'),
+        ('evrak_dosyasi', 'Malzeme Geliş Evrakı'),
+    ]
+
+    DURUM_CHOICES = [
+        ('yukleniyor', 'Yükleniyor'),
+        ('tamamlandi', 'Tamamlandı'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    dosya_adi = models.CharField(max_length=200, verbose_name="Dosya Adı")
+    toplam_boyut = models.PositiveBigIntegerField(verbose_name="Toplam Boyut (bayt)")
+    parca_boyutu = models.PositiveIntegerField(verbose_name="Parça Boyutu (bayt)")
+    # İstemcinin bildirdiği tüm dosya özeti; verilirse tamamlamada doğrulanır
+    sha256 = models.CharField(max_length=64, blank=True, verbose_name="Beklenen SHA-256")
+    hedef = models.CharField(max_length=20, choices=HEDEF_CHOICES, verbose_name="Hedef")
+    hedef_id = models.PositiveIntegerField(verbose_name="Hedef Kayıt")
+    aciklama = models.CharField(max_length=200, blank=True, verbose_name="Açıklama")
+    durum = models.CharField(max_length=20, choices=DURUM_CHOICES, default='yukleniyor', verbose_name="Durum")
+    icerik = models.ForeignKey(
+        DosyaIcerigi, on_delete=models.SET_NULL, null=True, blank=True, related_name='yuklemeler', verbose_name="İçerik"
+    )
+    olusturan = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, verbose_name="Oluşturan")
+    olusturulma_tarihi = models.DateTimeField(auto_now_add=True, verbose_name="Oluşturulma Tarihi")
+    guncellenme_tarihi = models.DateTimeField(auto_now=True, verbose_name="Güncellenme Tarihi")
+
+    class Meta:
+        verbose_name = "Parçalı Yükleme"
+        verbose_name_plural = "Parçalı Yüklemeler"
+        ordering = ['-olusturulma_tarihi']
+        indexes = [
+            models.Index(fields=['durum', 'guncellenme_tarihi'], name='parcali_yukleme_durum_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.dosya_adi} ({self.get_durum_display()})"
+
+    @property
+    def parca_sayisi(self):
+        return max(-(-self.toplam_boyut // self.parca_boyutu), 1)
+
+    def beklenen_boyut(self, no):
+        """no numaralı (0'dan başlayan) parçanın bayt sayısı; son parça kalan kısımdır"""
+        if no == self.parca_sayisi - 1:
+            return self.toplam_boyut - no * self.parca_boyutu
+        return self.parca_boyutu
+
+
+class YuklemeParcasi(models.Model):
+    """Parçalı yüklemenin depolamaya yazılmış bir parçası"""
+    yukleme = models.ForeignKey(ParcaliYukleme, on_delete=models.CASCADE, related_name='parcalar', verbose_name="Yükleme")
+    no = models.PositiveIntegerField(verbose_name="Parça No")
+    boyut = models.PositiveIntegerField(verbose_name="Boyut (bayt)")
+    sha256 = models.CharField(max_length=64, verbose_name="SHA-256")
+    dosya = models.FileField(upload_to=yukleme_parcasi_yolu, max_length=255, verbose_name="Parça Dosyası")
+
+    class Meta:
+        verbose_name = "Yükleme Parçası"
+        verbose_name_plural = "Yükleme Parçaları"
+        ordering = ['yukleme', 'no']
+        unique_together = ['yukleme', 'no']
+
+    def __str__(self):
+        return f"{self.yukleme_id} #{self.no}"
+
 class MalzemeIhtiyac(models.Model):
     """Malzeme planlama sonucu oluşan ihtiyaç kaydı"""
     
@@ -775,6 +912,8 @@ class SatinAlmaSiparisi(models.Model):
         ('tamamlandi', 'Tamamlandı'),
         ('iptal', 'İptal')
     ]
+    # Henüz tamamı gelmemiş siparişler
+    ACIK_DURUMLAR = ('bekliyor', 'kismi')
     
     siparis_no = models.CharField(max_length=50, unique=True, verbose_name="Sipariş No")
     tedarikci = models.ForeignKey(Tedarikci, on_delete=models.PROTECT, verbose_name="Tedarikçi")
@@ -801,6 +940,39 @@ class SatinAlmaSiparisi(models.Model):
     
     def __str__(self):
         return f"{self.siparis_no} - {self.tedarikci.ad}"
+
+    # Tedarikçi karnesi satırını belirleyen alanlar (tedarikçi, ilk teslim tarihinin ayı, durum)
+    KARNE_ALANLARI = ('tedarikci_id', 'teslim_tarihi', 'durum')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if all(alan in field_names for alan in cls.KARNE_ALANLARI):
+            instance._karne = instance.karne_anahtari()
+        return instance
+
+    def karne_anahtari(self):
+        return (
+            self.tedarikci_id,
+            self._meta.get_field('teslim_tarihi').to_python(self.teslim_tarihi),
+            self.durum,
+        )
+
+    def save(self, *args, **kwargs):
+        ekleniyor = self._state.adding
+        super().save(*args, **kwargs)
+        # Karne önbelleğinden yalnızca siparişin eski ve yeni tedarikçi-ay satırları silinir;
+        # bu alanlar değişmediyse önbelleğe dokunulmaz
+        from .tedarikci_performans_service import TedarikciPerformansService
+        eski = getattr(self, '_karne', None)
+        yeni = self.karne_anahtari()
+        if eski is None and not ekleniyor:
+            # Alanları ertelenmiş yüklenen kayıt: önceki ay bilinmiyor
+            TedarikciPerformansService.gecersiz_kil(self.tedarikci_id)
+        elif yeni != eski:
+            for tedarikci_id, teslim_tarihi, _ in {eski, yeni} - {None}:
+                TedarikciPerformansService.gecersiz_kil(tedarikci_id, teslim_tarihi)
+        self._karne = yeni
     
     @property
     def toplam_kalem_sayisi(self):
@@ -952,6 +1124,11 @@ class SatinAlmaTeslimGuncelleme(models.Model):
     def __str__(self):
         return f"{self.siparis.siparis_no} - {self.yeni_teslim_tarihi}"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        from .tedarikci_performans_service import TedarikciPerformansService
+        TedarikciPerformansService.gecersiz_kil(self.siparis.tedarikci_id, self.siparis.teslim_tarihi)
+
 class MalzemeGelis(models.Model):
     """Satın alma siparişlerine karşı gelen malzeme kayıtları"""
     
@@ -1106,6 +1283,22 @@ class MalzemeGelis(models.Model):
         
         # Malzeme gelişi kaydedildikten sonra sipariş durumunu kontrol et
         self._check_and_update_order_status()
+
+        from .tedarikci_performans_service import TedarikciPerformansService
+        from .tedarik_suresi_service import TedarikSuresiService
+        siparis = self.satinalma_siparisi
+        TedarikciPerformansService.gecersiz_kil(siparis.tedarikci_id, siparis.teslim_tarihi)
+        TedarikSuresiService.gelis_kaydedildi(siparis.tedarikci_id, self.satinalma_kalemi.malzeme_ihtiyaci.malzeme_adi)
+
+    def delete(self, *args, **kwargs):
+        from .tedarikci_performans_service import TedarikciPerformansService
+        from .tedarik_suresi_service import TedarikSuresiService
+        siparis = self.satinalma_siparisi
+        malzeme_adi = self.satinalma_kalemi.malzeme_ihtiyaci.malzeme_adi
+        sonuc = super().delete(*args, **kwargs)
+        TedarikciPerformansService.gecersiz_kil(siparis.tedarikci_id, siparis.teslim_tarihi)
+        TedarikSuresiService.gelis_kaydedildi(siparis.tedarikci_id, malzeme_adi)
+        return sonuc
     
     def _check_and_update_order_status(self):
         """Sipariş durumunu kontrol et ve gerekiyorsa güncelle"""
@@ -1159,6 +1352,80 @@ class MalzemeGelis(models.Model):
             pass
         return ""
 
+
+class TedarikciPerformans(models.Model):
+    """
+    Tedarikçi teslimat karnesinin aylık önbelleği (tedarikci_performans_service yazar).
+    Ay, satın alma siparişinin ilk verilen teslim tarihinin ayıdır. Oranlar aylar üzerinde doğru
+    toplanabilsin diye sayaç ve toplamlar saklanır.
+    """
+    tedarikci = models.ForeignKey(Tedarikci, on_delete=models.CASCADE, related_name='aylik_performans', verbose_name="Tedarikçi")
+    ay = models.DateField(verbose_name="Ay")
+    siparis_sayisi = models.PositiveIntegerField(default=0, verbose_name="Sipariş Sayısı")
+    # Teslimi gelmiş ya da teslim tarihi geçmiş siparişler; zamanında oranının paydası
+    vadesi_gelen = models.PositiveIntegerField(default=0, verbose_name="Vadesi Gelen")
+    zamaninda = models.PositiveIntegerField(default=0, verbose_name="Zamanında Teslim")
+    toplam_kayma_gun = models.PositiveIntegerField(default=0, verbose_name="Toplam Gecikme (gün)")
+    revizyon_sayisi = models.PositiveIntegerField(default=0, verbose_name="Teslim Tarihi Revizyonu")
+    siparis_miktari = models.DecimalField(max_digits=16, decimal_places=2, default=0, verbose_name="Sipariş Miktarı")
+    karsilanan_miktar = models.DecimalField(max_digits=16, decimal_places=2, default=0, verbose_name="Karşılanan Miktar")
+    # Açık sipariş varsa değerler gün geçtikçe değişir; bu satırlar ertesi gün yeniden hesaplanır
+    acik_siparis = models.PositiveIntegerField(default=0, verbose_name="Açık Sipariş")
+    hesaplama_zamani = models.DateTimeField(auto_now=True, verbose_name="Hesaplama Zamanı")
+
+    class Meta:
+        verbose_name = "Tedarikçi Performansı"
+        verbose_name_plural = "Tedarikçi Performansları"
+        ordering = ['-ay', 'tedarikci']
+        unique_together = ['tedarikci', 'ay']
+        indexes = [
+            models.Index(fields=['ay'], name='tedarikci_perf_ay_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.tedarikci_id} - {self.ay:%Y-%m}"
+
+    @property
+    def zamaninda_orani(self):
+        return round(self.zamaninda * 100 / self.vadesi_gelen, 1) if self.vadesi_gelen else None
+
+    @property
+    def ortalama_kayma_gun(self):
+        return round(self.toplam_kayma_gun / self.vadesi_gelen, 1) if self.vadesi_gelen else None
+
+    @property
+    def doluluk_orani(self):
+        return round(float(self.karsilanan_miktar * 100 / self.siparis_miktari), 1) if self.siparis_miktari else None
+
+
+class TedarikSuresi(models.Model):
+    """
+    Gerçekleşen malzeme gelişlerinden öğrenilen tedarik süreleri (tedarik_suresi_service yazar).
+    Gözlem, tamamı gelmiş bir satın alma kaleminin sipariş tarihinden son gelişine geçen gündür.
+    Satırlar tedarikçi+malzeme bazındadır; malzeme ve genel tahminler okunurken bu satırlardan birleştirilir.
+    """
+    tedarikci = models.ForeignKey(
+        Tedarikci, on_delete=models.CASCADE, null=True, blank=True, related_name='tedarik_sureleri', verbose_name="Tedarikçi"
+    )
+    malzeme_adi = models.CharField(max_length=200, blank=True, verbose_name="Malzeme Adı")
+    gozlem_sayisi = models.PositiveIntegerField(default=0, verbose_name="Gözlem Sayısı")
+    medyan_gun = models.PositiveIntegerField(default=0, verbose_name="Medyan (gün)")
+    p90_gun = models.PositiveIntegerField(default=0, verbose_name="P90 (gün)")
+    son_gelis_tarihi = models.DateField(null=True, blank=True, verbose_name="Son Geliş Tarihi")
+    guncellenme_tarihi = models.DateTimeField(auto_now=True, verbose_name="Güncellenme Tarihi")
+
+    class Meta:
+        verbose_name = "Tedarik Süresi"
+        verbose_name_plural = "Tedarik Süreleri"
+        ordering = ['malzeme_adi', 'tedarikci']
+        unique_together = ['tedarikci', 'malzeme_adi']
+        indexes = [
+            models.Index(fields=['malzeme_adi', 'tedarikci'], name='tedarik_suresi_malzeme_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.malzeme_adi or 'Tüm malzemeler'} / {self.tedarikci_id or 'Tüm tedarikçiler'}: {self.medyan_gun}-{self.p90_gun} gün"
+
 # =============================================================================
 # ÜRETİM MODÜLÜ
 # =============================================================================
@@ -1221,6 +1488,39 @@ class StandardIsAdimi(models.Model):
     def __str__(self):
         return f"{self.kod} - {self.ad}"
 
+class OperasyonSinifi(models.IntegerChoices):
+    """
+    İstasyon ve operasyon sınıfı. Değerler Gantt'taki istasyon sırasıdır; malzeme hazırlık
+    politikası da sınıfa bağlıdır (OperasyonSinifPolitikasi).
+    """
+    AG_SARGI = 100, 'AG Sargı'
+    YG_SARGI = 200, 'YG Sargı'
+    SARGI = 250, 'Sargı'
+    MONTAJ = 300, 'Montaj'
+    KURUTMA = 400, 'Kurutma'
+    TEST = 500, 'Test'
+    DIGER = 900, 'Diğer'
+
+    @classmethod
+    def addan(cls, ad):
+        """Sınıfı seçilmemiş kayıtlar için addan tahmin (yalnızca kayıt sırasında çalışır)"""
+        ad = (ad or '').replace('I', 'ı').lower()
+        if 'sargı' in ad or 'sargi' in ad:
+            if 'ag' in ad:
+                return cls.AG_SARGI
+            if 'yg' in ad:
+                return cls.YG_SARGI
+            return cls.SARGI
+        for anahtar, sinif in (('montaj', cls.MONTAJ), ('kurutma', cls.KURUTMA), ('test', cls.TEST)):
+            if anahtar in ad:
+                return sinif
+        return cls.DIGER
+
+    @property
+    def sargi_mi(self):
+        return self in (OperasyonSinifi.AG_SARGI, OperasyonSinifi.YG_SARGI, OperasyonSinifi.SARGI)
+
+
 class IsIstasyonu(models.Model):
     """Üretim iş istasyonları (makineler, el işçiliği vb.)"""
     
@@ -1245,6 +1545,10 @@ class IsIstasyonu(models.Model):
     ad = models.CharField(max_length=100, verbose_name="İstasyon Adı")
     tip = models.CharField(max_length=20, choices=ISTASYON_TIPLERI, verbose_name="İstasyon Tipi")
     durum = models.CharField(max_length=20, choices=DURUM_CHOICES, default='aktif', verbose_name="Durum")
+    sinif = models.PositiveSmallIntegerField(
+        choices=OperasyonSinifi.choices, null=True, blank=True, db_index=True,
+        verbose_name="Sınıf", help_text="Gantt sırası; boş bırakılırsa istasyon adından belirlenir"
+    )
     
     # Konum ve Fiziksel Bilgiler
     lokasyon = models.CharField(max_length=100, blank=True, verbose_name="Lokasyon/Adres")
@@ -1270,6 +1574,12 @@ class IsIstasyonu(models.Model):
         default=1,
         verbose_name="Gerekli Operatör Sayısı"
     )
+    vardiya_deseni = models.ForeignKey(
+        'VardiyaDeseni', on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='istasyonlar',
+        verbose_name="Vardiya Deseni",
+        help_text="Boşsa hafta içi 08:00'den itibaren günlük çalışma saati kadar çalışılır"
+    )
     
     # Sistem Bilgileri
     aktif = models.BooleanField(default=True, verbose_name="Aktif")
@@ -1306,9 +1616,208 @@ class IsIstasyonu(models.Model):
     
     @property
     def doluluk_orani(self):
-        """Mevcut doluluk oranı (şimdilik sabit, ileride gerçek verilerle hesaplanacak)"""
-        # TODO: Gerçek iş emirleri üzerinden hesapla
-        return 0
+        """
+        Önümüzdeki günlerdeki doluluk oranı yüzdesi (istasyon günlük yük tablosundan).
+        Her çağrı bir sorgu çalıştırır; listelerde KapasiteService.doluluk toplu kullanılmalı.
+        """
+        from .kapasite_service import KapasiteService
+        return KapasiteService.doluluk([self.pk]).get(self.pk, {}).get('doluluk_orani', 0)
+
+    # Günlük kapasiteyi belirleyen alanlar; değişirlerse yük satırları yeniden dağıtılır
+    TAKVIM_ALANLARI = ('gunluk_calisma_saati', 'vardiya_deseni_id')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if all(alan in field_names for alan in cls.TAKVIM_ALANLARI):
+            instance._takvim = instance.takvim_anahtari()
+        return instance
+
+    def takvim_anahtari(self):
+        return (
+            self._meta.get_field('gunluk_calisma_saati').to_python(self.gunluk_calisma_saati),
+            self.vardiya_deseni_id,
+        )
+
+    def save(self, *args, **kwargs):
+        ekleniyor = self._state.adding
+        if self.sinif is None:
+            self.sinif = OperasyonSinifi.addan(self.ad)
+        super().save(*args, **kwargs)
+        # Yalnızca çalışma saati veya vardiya değiştiyse bugünden itibarenki yük satırlarının kapasitesi
+        # tazelenir; yeni istasyonun henüz yük satırı yoktur, ad/durum gibi düzenlemeler takvime dokunmaz
+        eski = getattr(self, '_takvim', None)
+        yeni = self.takvim_anahtari()
+        if not ekleniyor and eski != yeni:
+            from .kapasite_service import KapasiteService
+            KapasiteService.takvim_degisti(istasyon_idleri=[self.pk], tarihler=[date.today()])
+        self._takvim = yeni
+
+
+class TatilGunu(models.Model):
+    """Resmi tatil ve yarım gün takvimi - istasyon kapasitesinden düşülür"""
+
+    tarih = models.DateField(unique=True, verbose_name="Tarih")
+    ad = models.CharField(max_length=100, verbose_name="Tatil Adı")
+    calisma_orani = models.DecimalField(
+        max_digits=3, decimal_places=2, default=0,
+        verbose_name="Çalışma Oranı",
+        help_text="0: tam gün tatil, 0.5: yarım gün"
+    )
+
+    class Meta:
+        verbose_name = "Tatil Günü"
+        verbose_name_plural = "Tatil Günleri"
+        ordering = ['tarih']
+
+    def __str__(self):
+        return f"{self.tarih:%d.%m.%Y} - {self.ad}"
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        from .kapasite_service import KapasiteService
+        KapasiteService.takvim_degisti(tarihler=[self.tarih])
+
+    def delete(self, *args, **kwargs):
+        tarih = self.tarih
+        sonuc = super().delete(*args, **kwargs)
+        from .kapasite_service import KapasiteService
+        KapasiteService.takvim_degisti(tarihler=[tarih])
+        return sonuc
+
+
+def vardiya_araliklari_dogrula(araliklar):
+    """[["08:00", "12:00"], ...] biçimini doğrular; bitiş başlangıçtan küçükse vardiya gece yarısını geçer"""
+    from django.core.exceptions import ValidationError
+    if not isinstance(araliklar, list):
+        raise ValidationError("Vardiyalar [[başlangıç, bitiş], ...] listesi olmalı")
+    for aralik in araliklar:
+        if not (isinstance(aralik, (list, tuple)) and len(aralik) == 2):
+            raise ValidationError(f"Geçersiz vardiya: {aralik}")
+        for saat in aralik:
+            try:
+                saat_str = str(saat)
+                if saat_str != '24:00':
+                    datetime.strptime(saat_str, '%H:%M')
+            except ValueError:
+                raise ValidationError(f"Geçersiz saat: {saat} (SS:DD olmalı)")
+        if aralik[0] == aralik[1]:
+            raise ValidationError(f"Boş vardiya: {aralik}")
+
+
+class VardiyaDeseni(models.Model):
+    """
+    Haftalık vardiya düzeni. vardiyalar: {"0": [["08:00", "12:00"], ["13:00", "18:00"]], ...}
+    anahtarlar haftanın günü (0 = Pazartesi), tanımlanmayan günler çalışılmaz.
+    """
+
+    kod = models.CharField(max_length=20, unique=True, verbose_name="Desen Kodu")
+    ad = models.CharField(max_length=100, verbose_name="Desen Adı")
+    vardiyalar = models.JSONField(default=dict, verbose_name="Vardiyalar")
+    aktif = models.BooleanField(default=True, verbose_name="Aktif")
+
+    class Meta:
+        verbose_name = "Vardiya Deseni"
+        verbose_name_plural = "Vardiya Desenleri"
+        ordering = ['kod']
+
+    def __str__(self):
+        return f"{self.kod} - {self.ad}"
+
+    def clean(self):
+        from django.core.exceptions import ValidationError
+        if not isinstance(self.vardiyalar, dict):
+            raise ValidationError({'vardiyalar': "Haftanın günlerine göre sözlük olmalı"})
+        for gun, araliklar in self.vardiyalar.items():
+            if str(gun) not in {str(i) for i in range(7)}:
+                raise ValidationError({'vardiyalar': f"Geçersiz gün: {gun} (0-6)"})
+            vardiya_araliklari_dogrula(araliklar)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        from .kapasite_service import KapasiteService
+        KapasiteService.takvim_degisti(istasyon_idleri=list(self.istasyonlar.values_list('pk', flat=True)))
+
+
+class TakvimIstisnasi(models.Model):
+    """
+    Belirli bir gün için vardiya düzenini ezer (fazla mesai, bakım, tatilde çalışma).
+    İstasyon boşsa tüm istasyonlara uygulanır; boş vardiya listesi o gün çalışılmadığını belirtir.
+    """
+
+    istasyon = models.ForeignKey(
+        IsIstasyonu, on_delete=models.CASCADE, null=True, blank=True,
+        related_name='takvim_istisnalari',
+        verbose_name="İstasyon"
+    )
+    tarih = models.DateField(verbose_name="Tarih")
+    vardiyalar = models.JSONField(default=list, blank=True, verbose_name="Vardiyalar")
+    aciklama = models.CharField(max_length=200, blank=True, verbose_name="Açıklama")
+
+    class Meta:
+        verbose_name = "Takvim İstisnası"
+        verbose_name_plural = "Takvim İstisnaları"
+        ordering = ['tarih']
+        unique_together = ['istasyon', 'tarih']
+
+    def __str__(self):
+        return f"{self.tarih:%d.%m.%Y} - {self.istasyon or 'Tüm istasyonlar'}"
+
+    def clean(self):
+        vardiya_araliklari_dogrula(self.vardiyalar)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        from .kapasite_service import KapasiteService
+        KapasiteService.takvim_degisti(
+            istasyon_idleri=[self.istasyon_id] if self.istasyon_id else None, tarihler=[self.tarih]
+        )
+
+    def delete(self, *args, **kwargs):
+        istasyon_id, tarih = self.istasyon_id, self.tarih
+        sonuc = super().delete(*args, **kwargs)
+        from .kapasite_service import KapasiteService
+        KapasiteService.takvim_degisti(istasyon_idleri=[istasyon_id] if istasyon_id else None, tarihler=[tarih])
+        return sonuc
+
+
+class IstasyonGunlukYuk(models.Model):
+    """
+    İstasyon başına günlük kapasite ve planlanmış yük.
+    Planlanan dakikalar iş emri planlandıkça/taşındıkça artımlı güncellenir;
+    sadece yükü olan günler için satır tutulur.
+    """
+
+    istasyon = models.ForeignKey(
+        IsIstasyonu, on_delete=models.CASCADE,
+        related_name='gunluk_yukler',
+        verbose_name="İstasyon"
+    )
+    tarih = models.DateField(verbose_name="Tarih")
+    kullanilabilir_dakika = models.PositiveIntegerField(default=0, verbose_name="Kullanılabilir Dakika")
+    planlanan_dakika = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0,
+        verbose_name="Planlanan Dakika"
+    )
+    is_emri_sayisi = models.IntegerField(default=0, verbose_name="İş Emri Sayısı")
+
+    class Meta:
+        verbose_name = "İstasyon Günlük Yükü"
+        verbose_name_plural = "İstasyon Günlük Yükleri"
+        ordering = ['istasyon', 'tarih']
+        unique_together = ['istasyon', 'tarih']
+        indexes = [
+            models.Index(fields=['tarih', 'istasyon'], name='istasyon_yuk_tarih_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.istasyon_id} - {self.tarih}: {self.planlanan_dakika}/{self.kullanilabilir_dakika} dk"
+
+    @property
+    def doluluk_orani(self):
+        if not self.kullanilabilir_dakika:
+            return 100 if self.planlanan_dakika else 0
+        return round(float(self.planlanan_dakika) * 100 / self.kullanilabilir_dakika, 1)
 
 
 class IsAkisi(models.Model):
@@ -1393,6 +1902,10 @@ class IsAkisiOperasyon(models.Model):
     # Operasyon Bilgileri
     sira_no = models.PositiveSmallIntegerField(verbose_name="Sıra No", editable=False)
     operasyon_adi = models.CharField(max_length=100, verbose_name="Operasyon Adı")
+    sinif = models.PositiveSmallIntegerField(
+        choices=OperasyonSinifi.choices, null=True, blank=True, db_index=True,
+        verbose_name="Sınıf", help_text="Malzeme hazırlık politikası; boş bırakılırsa operasyon adından belirlenir"
+    )
     aciklama = models.TextField(blank=True, verbose_name="Açıklama")
     
     # Süre ve Kapasite
@@ -1462,9 +1975,23 @@ class IsAkisiOperasyon(models.Model):
             )['max_sira']
             
             self.sira_no = (max_sira or 0) + 1
+        if self.sinif is None:
+            self.sinif = OperasyonSinifi.addan(self.operasyon_adi)
         
         super().save(*args, **kwargs)
     
+    @property
+    def css_sinifi(self):
+        """Gantt kartı rengi için CSS sınıfı (op-sargi, op-montaj, ...)"""
+        if self.sinif is None:
+            return 'other'
+        sinif = OperasyonSinifi(self.sinif)
+        if sinif.sargi_mi:
+            return 'sargi'
+        return {
+            OperasyonSinifi.MONTAJ: 'montaj', OperasyonSinifi.KURUTMA: 'kurutma', OperasyonSinifi.TEST: 'test',
+        }.get(sinif, 'other')
+    
     @property
     def toplam_sure(self):
         """Toplam süre (hazırlık + standart)"""
@@ -1487,6 +2014,88 @@ class IsAkisiOperasyon(models.Model):
         return True
 
 
+class OperasyonSinifPolitikasi(models.Model):
+    """
+    Operasyon sınıfı başına malzeme hazırlık politikası. Kaydı olmayan sınıflar
+    OperasyonPolitikaService.VARSAYILANLAR ile çalışır.
+    """
+    sinif = models.PositiveSmallIntegerField(choices=OperasyonSinifi.choices, unique=True, verbose_name="Sınıf")
+    malzeme_kontrolu = models.BooleanField(
+        default=True, verbose_name="Malzeme Kontrolü",
+        help_text="Kapalıysa operasyon stoktan çalışır ve malzeme açısından bugün hazır sayılır"
+    )
+    kalemsiz_tedarik_bekle = models.BooleanField(
+        default=False, verbose_name="Sipariş Kalemi Yoksa Tedarik Bekle",
+        help_text="Sipariş kalemine bağlı olmayan iş emirleri genel tedarik süresi kadar bekler"
+    )
+    aciklama = models.CharField(max_length=200, blank=True, verbose_name="Açıklama")
+
+    class Meta:
+        verbose_name = "Operasyon Sınıfı Politikası"
+        verbose_name_plural = "Operasyon Sınıfı Politikaları"
+        ordering = ['sinif']
+
+    def __str__(self):
+        return self.get_sinif_display()
+
+    def save(self, *args, **kwargs):
+        from .operasyon_politika_service import OperasyonPolitikaService
+        super().save(*args, **kwargs)
+        transaction.on_commit(OperasyonPolitikaService.onbellegi_temizle)
+
+    def delete(self, *args, **kwargs):
+        from .operasyon_politika_service import OperasyonPolitikaService
+        sonuc = super().delete(*args, **kwargs)
+        transaction.on_commit(OperasyonPolitikaService.onbellegi_temizle)
+        return sonuc
+
+
+class IsAkisiSurumu(models.Model):
+    """
+    Yayınlanmış iş akışının değişmez, derlenmiş rota görüntüsü.
+    Operasyonlar topolojik sırada diziler halinde, öncüller CSR (ptr/idx) dizileriyle tutulur;
+    planlama ve iş emri üretimi M2M gezmek yerine bu tek satırı okur.
+    """
+    is_akisi = models.ForeignKey(
+        IsAkisi, on_delete=models.CASCADE,
+        related_name='surumler',
+        verbose_name="İş Akışı"
+    )
+    yayin_no = models.PositiveIntegerField(verbose_name="Yayın No")
+    versiyon = models.CharField(max_length=10, verbose_name="Versiyon")
+    operasyon_sayisi = models.PositiveSmallIntegerField(default=0, verbose_name="Operasyon Sayısı")
+    veri = models.BinaryField(verbose_name="Derlenmiş Rota", help_text="zlib ile sıkıştırılmış JSON")
+    yayinlayan = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True,
+        verbose_name="Yayınlayan"
+    )
+    yayin_tarihi = models.DateTimeField(auto_now_add=True, verbose_name="Yayın Tarihi")
+
+    class Meta:
+        verbose_name = "İş Akışı Sürümü"
+        verbose_name_plural = "İş Akışı Sürümleri"
+        ordering = ['is_akisi', '-yayin_no']
+        unique_together = ['is_akisi', 'yayin_no']
+
+    def __str__(self):
+        return f"{self.is_akisi.kod} v{self.versiyon} #{self.yayin_no}"
+
+    def save(self, *args, **kwargs):
+        """Yayınlanmış sürüm değiştirilemez"""
+        if self.pk is not None:
+            raise ValueError("Yayınlanmış iş akışı sürümü değiştirilemez")
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def paketle(icerik):
+        """Rota sözlüğünü sıkıştırılmış bayta çevirir"""
+        return zlib.compress(json.dumps(icerik, separators=(',', ':')).encode('utf-8'), 6)
+
+    def icerik(self):
+        """Sıkıştırılmış rotayı sözlük olarak döndürür"""
+        return json.loads(zlib.decompress(bytes(self.veri)).decode('utf-8'))
+
+
 class IsEmri(models.Model):
     """Üretim iş emirleri - Her operasyon için ayrı iş emri"""
     
@@ -1598,17 +2207,126 @@ class IsEmri(models.Model):
         verbose_name = "İş Emri"
         verbose_name_plural = "İş Emirleri"
         ordering = ['-olusturulma_tarihi']
+        indexes = [
+            # İstasyon terminallerinin sık kullandığı filtreler
+            models.Index(fields=['planlanan_istasyon', 'durum'], name='isemri_istasyon_durum_idx'),
+            models.Index(fields=['planlanan_baslangic_tarihi'], name='isemri_baslangic_idx'),
+            models.Index(fields=['ana_emirNo'], name='isemri_ana_emirno_idx'),
+            models.Index(fields=['guncellenme_tarihi'], name='isemri_guncellenme_idx'),
+        ]
     
     def __str__(self):
         return f"{self.emirNo} - {self.operasyon.operasyon_adi} ({self.planlanan_miktar} adet)"
     
+    # Bu durumdaki emirler istasyon kapasitesi tüketmez
+    YUK_DISI_DURUMLAR = ('tamamlandi', 'iptal')
+    YUK_ALANLARI = (
+        'planlanan_istasyon_id', 'planlanan_baslangic_tarihi', 'planlanan_baslangic_saati', 'planlanan_sure', 'durum',
+    )
+    # Gantt değişiklik akışına yazılan alanlar (PlanlamaDegisiklik)
+    PLAN_ALANLARI = YUK_ALANLARI + ('emirNo', 'planlanan_bitis_tarihi', 'planlanan_bitis_saati')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Kayıtta yük ve plan farkını bulabilmek için veritabanındaki hallerini sakla
+        if all(alan in field_names for alan in cls.YUK_ALANLARI):
+            instance._yuk = instance.kapasite_yuku()
+        if all(alan in field_names for alan in cls.PLAN_ALANLARI):
+            instance._plan = instance.plan_ozeti()
+        return instance
+
+    def plan_ozeti(self):
+        """Gantt'ın bir kartı yamalamak için ihtiyaç duyduğu plan bilgisi (JSON'a yazılabilir)"""
+        def an(tarih, saat):
+            if isinstance(tarih, str):
+                tarih = date.fromisoformat(tarih)
+            if isinstance(saat, str):
+                saat = time.fromisoformat(saat)
+            return datetime.combine(tarih, saat).isoformat(timespec='minutes') if tarih and saat else None
+
+        return {
+            'emirNo': self.emirNo,
+            'istasyon': self.planlanan_istasyon_id,
+            'baslangic': an(self.planlanan_baslangic_tarihi, self.planlanan_baslangic_saati),
+            'bitis': an(self.planlanan_bitis_tarihi, self.planlanan_bitis_saati),
+            'sure': float(self.planlanan_sure or 0),
+            'durum': self.durum,
+        }
+
+    def planlanan_baslangic_ani(self):
+        """Planlanan başlangıç tarih ve saati (saat girilmemişse 08:00)"""
+        saat = self.planlanan_baslangic_saati
+        if isinstance(saat, str):
+            saat = time.fromisoformat(saat)
+        tarih = self.planlanan_baslangic_tarihi
+        if isinstance(tarih, str):
+            tarih = date.fromisoformat(tarih)
+        elif isinstance(tarih, datetime):
+            tarih = tarih.date()
+        return datetime.combine(tarih, saat or time(8, 0))
+
+    def kapasite_yuku(self):
+        """İstasyon yüküne katkısı: (istasyon_id, başlangıç anı, dakika) ya da planlı değilse None"""
+        if not self.planlanan_istasyon_id or self.durum in self.YUK_DISI_DURUMLAR:
+            return None
+        return (self.planlanan_istasyon_id, self.planlanan_baslangic_ani(), Decimal(self.planlanan_sure or 0))
+
     def save(self, *args, **kwargs):
-        """Kayıt sırasında iş emri no oluştur"""
+        """Kayıt sırasında iş emri no oluştur, istasyon günlük yükünü güncelle"""
         if not self.emirNo:
-            from datetime import datetime
-            self.emirNo = f"IE-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
-        super().save(*args, **kwargs)
-    
+            from .sequence_service import SequenceService
+            self.emirNo = SequenceService.sonraki('IE')
+
+        from .kapasite_service import KapasiteService
+        from .degisiklik_akisi_service import DegisiklikAkisiService
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and not {
+            'planlanan_istasyon', 'planlanan_baslangic_tarihi', 'planlanan_baslangic_saati',
+            'planlanan_bitis_tarihi', 'planlanan_bitis_saati', 'planlanan_sure', 'durum',
+        } & set(update_fields):
+            super().save(*args, **kwargs)
+            return
+
+        with transaction.atomic():
+            yeni_kayit = self._state.adding
+            if yeni_kayit:
+                eski = None
+            elif hasattr(self, '_yuk'):
+                eski = self._yuk
+            else:
+                eski = KapasiteService.kayitli_yuk(self.pk)
+            super().save(*args, **kwargs)
+            self._yuk = self.kapasite_yuku()
+            KapasiteService.yuk_tasi(eski, self._yuk)
+
+            plan = self.plan_ozeti()
+            if plan != getattr(self, '_plan', None):
+                DegisiklikAkisiService.kaydet_emir(self, 'olustur' if yeni_kayit else 'guncelle', plan)
+                self._plan = plan
+
+    def takvime_gore_bitis(self):
+        """Planlanan başlangıçtan itibaren planlanan süre kadar istasyon çalışma zamanı sonrası bitiş anı"""
+        from .takvim_service import TakvimService
+        return TakvimService.dakika_ekle(
+            self.planlanan_istasyon_id, self.planlanan_baslangic_ani(), float(self.planlanan_sure or 0)
+        )
+
+    def takvime_gore_zamanla(self, istasyon, tarih):
+        """
+        Emri istasyonda verilen günün (çalışılmayan günse sonraki iş gününün) ilk çalışma anına
+        yerleştirir; bitiş tarih ve saatini istasyon takvimine göre hesaplar. Kaydetmez.
+        """
+        from .takvim_service import TakvimService
+        baslangic = TakvimService.sonraki_calisma_ani(istasyon.pk, datetime.combine(tarih, time()))
+        self.planlanan_istasyon = istasyon
+        self.planlanan_baslangic_tarihi = baslangic.date()
+        self.planlanan_baslangic_saati = baslangic.time()
+        bitis = self.takvime_gore_bitis()
+        self.planlanan_bitis_tarihi = bitis.date()
+        self.planlanan_bitis_saati = bitis.time()
+        return baslangic, bitis
+
     @property
     def tamamlanma_orani(self):
         """Tamamlanma oranı yüzdesi"""
@@ -1693,101 +2411,76 @@ class IsEmri(models.Model):
         return timezone.now().date()
     
     def hesapla_malzeme_hazir_tarihi(self):
-        """Bu operasyon için gerekli malzemelerin hazır olacağı tarihi hesaplar"""
-        from datetime import datetime, timedelta
+        """
+        Bu operasyon için gerekli malzemelerin hazır olacağı tarihi hesaplar. Operasyon sınıfının
+        politikası malzeme kontrolü gerektiriyorsa açık satın alma siparişi olan malzemeler siparişin
+        (güncel) teslim tarihini, henüz sipariş verilmemiş ihtiyaçlar öğrenilmiş tedarik süresini
+        (TedarikSuresi) bekler.
+        """
+        from datetime import timedelta
         from django.utils import timezone
-        from django.db.models import Q
-        
-        # print(f"MATERIAL DATE CALLED for IsEmri ID: {self.id}")
-        
+        from .operasyon_politika_service import OperasyonPolitikaService
+        from .tedarik_suresi_service import TedarikSuresiService
+
+        bugun = timezone.now().date()
+
         # Operasyon yoksa bugün hazır
         if not self.operasyon:
-            # print(f"No operation for IsEmri {self.id}, returning today")
-            return timezone.now().date()
-        
-        # Bu sipariş için malzeme ihtiyaçlarını bul
+            return bugun
+
+        politika = OperasyonPolitikaService.politika(self.operasyon.sinif)
+
+        # Stoktan çalışan sınıflar (varsayılan: montaj/kurutma/test) - bugün hazır
+        if not politika.malzeme_kontrolu:
+            return bugun
+
+        # Sipariş kalemi yoksa ihtiyaçlar bilinmez; politikaya göre (varsayılan: sargı) genel tedarik süresi beklenir
         if not (self.siparis_kalemi and self.siparis_kalemi.siparis):
-            # Sipariş kalemi yoksa operasyon tipine göre karar ver
-            if self.operasyon:
-                op_adi = str(self.operasyon.operasyon_adi).lower()
-                if 'sargı' in op_adi:
-                    # Sargı operasyonları için genel malzeme tarihi (25.08.2025)
-                    from datetime import date
-                    return date(2025, 8, 25)
-                elif any(x in op_adi for x in ['montaj', 'kurutma', 'test']):
-                    # Montaj/kurutma/test için stoktan - bugün hazır
-                    return timezone.now().date()
-            return timezone.now().date()
-            
-        # Montaj/kurutma/test operasyonları için malzeme kontrolü yapma
-        if self.operasyon:
-            op_adi = str(self.operasyon.operasyon_adi).lower()
-            if any(x in op_adi for x in ['montaj', 'kurutma', 'test']):
-                # print(f"OVERRIDE - {op_adi} operasyonu için stoktan malzeme")
-                return timezone.now().date()
-            
+            if politika.kalemsiz_tedarik_bekle:
+                return bugun + timedelta(days=TedarikSuresiService.genel_sure())
+            return bugun
+
         # Bu siparişle ilgili malzeme ihtiyaçlarını bul
-        
-        # SQLite JSON contains desteklemediği için tüm malzeme ihtiyaçlarını getir ve filtrele
-        import json
-        
-        malzeme_ihtiyaclar = MalzemeIhtiyac.objects.all()
-        siparis_no = self.siparis_kalemi.siparis.siparis_no
-        
-        en_gec_tarih = timezone.now().date()
-        bulunan_ihtiyac = 0
-        bulunan_kalem = 0
-        
-        # Debug: Toplam kayıt sayıları
-        # print(f"DEBUG - Total MalzemeIhtiyac: {malzeme_ihtiyaclar.count()}")
-        # print(f"DEBUG - Siparis NO: {siparis_no}")
-        
-        for ihtiyac in malzeme_ihtiyaclar:
-            # JSON field'ında sipariş numarası var mı kontrol et
-            try:
-                ilgili_siparisler = ihtiyac.ilgili_siparisler or []
-                if siparis_no not in str(ilgili_siparisler):
-                    continue
-                bulunan_ihtiyac += 1
-                # print(f"DEBUG - Found requirement ID: {ihtiyac.id}")
-            except:
-                continue
-                
-            # Stoktan kullanılacak malzemeler için tarih hesaplaması yapma
-            if ihtiyac.islem_tipi == 'stoktan_kullan':
-                # print(f"SKIP - Stoktan kullan ID {ihtiyac.id}")
-                continue
-            else:
-                # print(f"PROCESS - Satin al ID {ihtiyac.id}")
-                
-                # Bu malzeme için satın alma siparişlerini bul
-                satinalma_kalemleri = SatinAlmaKalemi.objects.filter(
-                    malzeme_ihtiyaci=ihtiyac,
-                    siparis__durum__in=['bekliyor', 'onaylandi', 'gonderildi']
-                )
-                
-                # print(f"DEBUG - Item count for requirement ID {ihtiyac.id}: {satinalma_kalemleri.count()}")
-                
-                # En erken gelecek malzeme tarihini al
-                for kalem in satinalma_kalemleri:
-                    bulunan_kalem += 1
-                    # SatinAlmaKalemi'nden sipariş tarihini al
-                    siparis_teslim = kalem.siparis.guncel_teslim_tarihi or kalem.siparis.teslim_tarihi
-                    # print(f"DEBUG - Kalem teslim tarihi: {siparis_teslim}")
-                    if siparis_teslim and siparis_teslim > en_gec_tarih:
-                        en_gec_tarih = siparis_teslim
-        
-        # print(f"DEBUG - Found requirements: {bulunan_ihtiyac}, Found items: {bulunan_kalem}")
-        # print(f"DEBUG - Final tarih: {en_gec_tarih}")
-        
-        # Eğer hiç malzeme verisi bulunamadıysa sipariş durumuna göre default tarih ver
-        if bulunan_ihtiyac == 0:
-            # print("DEBUG - No material requirements found, using default date")
-            if self.siparis_kalemi.siparis.durum == 'malzeme_planlandi':
-                return timezone.now().date() + timedelta(days=7)
-            else:
-                return timezone.now().date() + timedelta(days=14)
-                
+        # SQLite JSON contains desteklemediği için ilgili_siparisler veritabanında metin olarak ön
+        # filtrelenir (SQLite Türkçe karakterleri \uXXXX olarak saklar), kesin eşleşme Python'da yapılır
+        siparis = self.siparis_kalemi.siparis
+        ihtiyaclar = [
+            ihtiyac for ihtiyac in MalzemeIhtiyac.objects.filter(
+                models.Q(ilgili_siparisler__icontains=siparis.siparis_no)
+                | models.Q(ilgili_siparisler__icontains=json.dumps(siparis.siparis_no)[1:-1])
+            ).only('id', 'malzeme_adi', 'islem_tipi', 'durum', 'ilgili_siparisler')
+            if siparis.siparis_no in (ihtiyac.ilgili_siparisler or [])
+        ]
+
+        # Hiç malzeme verisi yoksa: malzemesi planlanmış siparişler tipik (medyan),
+        # diğerleri temkinli (p90) genel tedarik süresini bekler
+        if not ihtiyaclar:
+            olcu = 'medyan_gun' if siparis.durum == 'malzeme_planlandi' else 'p90_gun'
+            return bugun + timedelta(days=TedarikSuresiService.genel_sure(olcu))
+
+        # Stoktan kullanılacak malzemeler için tarih hesaplaması yapma
+        satin_alinacak = {
+            ihtiyac.id: ihtiyac.malzeme_adi for ihtiyac in ihtiyaclar
+            if ihtiyac.islem_tipi != 'stoktan_kullan' and ihtiyac.durum not in ('tamamlandi', 'iptal')
+        }
+
+        en_gec_tarih = bugun
+        siparisli = set()
+        for ihtiyac_id, durum, teslim_tarihi, guncel_teslim_tarihi in SatinAlmaKalemi.objects.filter(
+            malzeme_ihtiyaci_id__in=satin_alinacak
+        ).exclude(siparis__durum='iptal').values_list(
+            'malzeme_ihtiyaci_id', 'siparis__durum', 'siparis__teslim_tarihi', 'siparis__guncel_teslim_tarihi'
+        ):
+            siparisli.add(ihtiyac_id)
+            if durum in SatinAlmaSiparisi.ACIK_DURUMLAR:
+                en_gec_tarih = max(en_gec_tarih, guncel_teslim_tarihi or teslim_tarihi)
+
+        # Satın alma siparişi henüz verilmemiş ihtiyaçlar: malzemenin öğrenilmiş tedarik süresi
+        siparissiz = {ad for ihtiyac_id, ad in satin_alinacak.items() if ihtiyac_id not in siparisli}
+        if siparissiz:
+            en_uzun = max(TedarikSuresiService.tahmini_sureler(siparissiz).values())
+            en_gec_tarih = max(en_gec_tarih, bugun + timedelta(days=en_uzun))
+
         return en_gec_tarih
     
     def hesapla_bagimlillik_hazir_tarihi(self):
@@ -1812,13 +2505,17 @@ class IsEmri(models.Model):
             if onceki_emir.planlanan_bitis_tarihi:
                 hazir_tarihleri.append(onceki_emir.planlanan_bitis_tarihi)
             else:
-                # Yoksa bu operasyonun süresi + başlangıç tarihi
+                # Yoksa başlangıçtan itibaren istasyon takvimine göre süre kadar çalışma
                 if onceki_emir.planlanan_baslangic_tarihi and onceki_emir.planlanan_sure:
-                    from datetime import timedelta
-                    bitis = onceki_emir.planlanan_baslangic_tarihi + timedelta(
-                        minutes=float(onceki_emir.planlanan_sure or 0)
-                    )
-                    hazir_tarihleri.append(bitis)
+                    from .takvim_service import TakvimUfkuHatasi
+                    try:
+                        hazir_tarihleri.append(onceki_emir.takvime_gore_bitis().date())
+                    except TakvimUfkuHatasi:
+                        # İstasyonun hiç çalışma zamanı yoksa kesintisiz süre varsayılır
+                        from datetime import timedelta
+                        hazir_tarihleri.append((onceki_emir.planlanan_baslangic_ani() + timedelta(
+                            minutes=float(onceki_emir.planlanan_sure)
+                        )).date())
         
         return max(hazir_tarihleri) if hazir_tarihleri else None
     
@@ -1923,6 +2620,143 @@ class IsEmri(models.Model):
         elif simdi > self.planlanan_bitis:
             return 'gecikmede'
         return 'zamaninda'
-    
 
 
+NumaraBlogu = namedtuple('NumaraBlogu', ['ilk', 'son', 'sablon'])
+
+
+class PlanlamaDegisiklik(models.Model):
+    """
+    İş emri planlama değişikliklerinin yalnızca eklenen akışı. id sıra numarasıdır; Gantt ekranları
+    son gördükleri numaradan sonraki kayıtları alıp (SSE veya uzun yoklama) kartları yamalar.
+    """
+
+    ISLEMLER = [
+        ('olustur', 'Oluşturuldu'),
+        ('guncelle', 'Güncellendi'),
+        ('sil', 'Silindi'),
+    ]
+
+    # İş emri silindiğinde de akışta kalması için FK değil
+    is_emri_id = models.PositiveBigIntegerField(verbose_name="İş Emri")
+    islem = models.CharField(max_length=10, choices=ISLEMLER, verbose_name="İşlem")
+    veri = models.JSONField(default=dict, blank=True, verbose_name="Plan")
+    zaman = models.DateTimeField(auto_now_add=True, db_index=True, verbose_name="Zaman")
+
+    class Meta:
+        verbose_name = "Planlama Değişikliği"
+        verbose_name_plural = "Planlama Değişiklikleri"
+        ordering = ['id']
+
+    def __str__(self):
+        return f"#{self.id} {self.get_islem_display()} - iş emri {self.is_emri_id}"
+
+    def save(self, *args, **kwargs):
+        """Akış yalnızca eklenir, kayıt değiştirilemez"""
+        if self.pk is not None:
+            raise ValueError("Planlama değişiklik kaydı değiştirilemez")
+        super().save(*args, **kwargs)
+
+
+class GunlukMetrik(models.Model):
+    """
+    Dashboard KPI'larının günlük anlık görüntüsü (metrik_ozet_al komutu yazar).
+    Trend grafikleri (metrik, tarih) indeksi üzerinde tek aralık taramasıyla okunur.
+    """
+
+    METRIKLER = [
+        ('siparis_durum', 'Duruma Göre Sipariş Sayısı'),
+        ('istasyon_wip', 'İstasyondaki Devam Eden İş Emri'),
+        ('zamaninda_teslim', 'Zamanında Teslim Oranı (%)'),
+        ('tedarikci_zamaninda', 'Tedarikçi Zamanında Teslim Oranı (%)'),
+        ('malzeme_eksigi', 'Malzeme Eksiği'),
+    ]
+
+    tarih = models.DateField(verbose_name="Tarih")
+    metrik = models.CharField(max_length=30, choices=METRIKLER, verbose_name="Metrik")
+    # Genel metriklerde boş; istasyon/tedarikçi id'si, sipariş durumu veya malzeme adı
+    anahtar = models.CharField(max_length=200, blank=True, default='', verbose_name="Anahtar")
+    etiket = models.CharField(max_length=200, blank=True, verbose_name="Etiket")
+    deger = models.DecimalField(max_digits=14, decimal_places=2, verbose_name="Değer")
+
+    class Meta:
+        verbose_name = "Günlük Metrik"
+        verbose_name_plural = "Günlük Metrikler"
+        ordering = ['-tarih', 'metrik', 'anahtar']
+        unique_together = ['tarih', 'metrik', 'anahtar']
+        indexes = [
+            models.Index(fields=['metrik', 'tarih'], name='gunluk_metrik_trend_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.tarih} {self.metrik} {self.anahtar}: {self.deger}"
+
+
+class DocumentSequence(models.Model):
+    """Belge numarası sayaçları - numaraları tek UPDATE ile blok halinde ayırır"""
+    onek = models.CharField(max_length=20, unique=True, verbose_name="Önek")
+    son_deger = models.BigIntegerField(default=0, verbose_name="Son Değer")
+    sablon = models.CharField(
+        max_length=100, default='{onek}-{numara:06d}',
+        verbose_name="Numara Şablonu",
+        help_text="Kullanılabilir alanlar: {onek}, {numara}, {tarih}. Örnek: SA-{tarih:%Y}-{numara:05d}"
+    )
+    blok_boyutu = models.PositiveIntegerField(
+        default=100,
+        verbose_name="Blok Boyutu",
+        help_text="Her veritabanı erişiminde ayrılıp bellekte tutulan numara sayısı"
+    )
+    guncellenme_tarihi = models.DateTimeField(auto_now=True, verbose_name="Güncellenme Tarihi")
+
+    class Meta:
+        verbose_name = "Belge Numara Sayacı"
+        verbose_name_plural = "Belge Numara Sayaçları"
+        ordering = ['onek']
+
+    def __str__(self):
+        return f"{self.onek}: {self.son_deger}"
+
+    @classmethod
+    def blok_ayir(cls, onek, adet=None, varsayilan_sablon=None, using=None):
+        """
+        Önek için `adet` (verilmezse blok_boyutu) numaralık blok ayırır. Sayaç tek bir
+        UPDATE ... RETURNING ile artırılıp okunur; satır kilidi yalnızca bu ifade süresince
+        (çağıran bir transaction içindeyse onun sonuna kadar) tutulur.
+        """
+        if adet is not None and adet < 1:
+            raise ValueError("Blok boyutu en az 1 olmalı")
+        using = using or router.db_for_write(cls)
+        sonuc = cls._artir(onek, adet, using)
+        if sonuc is None:
+            varsayilanlar = {'sablon': varsayilan_sablon} if varsayilan_sablon else {}
+            cls.objects.using(using).get_or_create(onek=onek, defaults=varsayilanlar)
+            sonuc = cls._artir(onek, adet, using)
+        son, adet, sablon = sonuc
+        return NumaraBlogu(son - adet + 1, son, sablon)
+
+    @classmethod
+    def _artir(cls, onek, adet, using):
+        """Sayacı artırır: (son_deger, ayrılan adet, sablon); sayaç yoksa None"""
+        baglanti = connections[using]
+        if not baglanti.features.can_return_columns_from_insert:
+            # RETURNING desteklemeyen veritabanları: artırma ve okuma aynı transaction'da
+            with transaction.atomic(using=using):
+                satir = cls.objects.using(using).filter(onek=onek).values_list('blok_boyutu', 'sablon').first()
+                if satir is None:
+                    return None
+                artis = adet or satir[0]
+                cls.objects.using(using).filter(onek=onek).update(
+                    son_deger=models.F('son_deger') + artis, guncellenme_tarihi=timezone.now()
+                )
+                son = cls.objects.using(using).filter(onek=onek).values_list('son_deger', flat=True).get()
+            return son, artis, satir[1]
+        tablo = baglanti.ops.quote_name(cls._meta.db_table)
+        # auto_now ham SQL'de çalışmaz; zaman damgası veritabanının beklediği biçime çevrilip elle yazılır
+        simdi = cls._meta.get_field('guncellenme_tarihi').get_db_prep_value(timezone.now(), baglanti)
+        with baglanti.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {tablo} SET son_deger = son_deger + COALESCE(%s, blok_boyutu), guncellenme_tarihi = %s "
+                f"WHERE onek = %s RETURNING son_deger, COALESCE(%s, blok_boyutu), sablon",
+                [adet, simdi, onek, adet],
+            )
+            return cursor.fetchone()
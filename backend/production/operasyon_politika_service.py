@@ -0,0 +1,56 @@
+"""
+Operasyon politika servisi - operasyon sınıfı başına malzeme hazırlık politikası
+"""
+
+import logging
+from collections import namedtuple
+
+from django.core.cache import cache
+
+from .models import OperasyonSinifi, OperasyonSinifPolitikasi
+
+logger = logging.getLogger(__name__)
+
+Politika = namedtuple('Politika', ['malzeme_kontrolu', 'kalemsiz_tedarik_bekle'])
+
+
+class OperasyonPolitikaService:
+    """
+    Sınıf → politika eşlemesi. OperasyonSinifPolitikasi kayıtları varsayılanları ezer; eşleme
+    önbelleklenir ve kayıt değişince temizlenir. Hazır tarihi hesabı iş emri başına buradan okur.
+    """
+
+    ONBELLEK_ANAHTARI = 'operasyon_politikalari'
+
+    # Sargı malzemesi satın alınır; montaj, kurutma ve test stoktan çalışır
+    VARSAYILANLAR = {
+        OperasyonSinifi.AG_SARGI: Politika(True, True),
+        OperasyonSinifi.YG_SARGI: Politika(True, True),
+        OperasyonSinifi.SARGI: Politika(True, True),
+        OperasyonSinifi.MONTAJ: Politika(False, False),
+        OperasyonSinifi.KURUTMA: Politika(False, False),
+        OperasyonSinifi.TEST: Politika(False, False),
+        OperasyonSinifi.DIGER: Politika(True, False),
+    }
+
+    @classmethod
+    def politikalar(cls):
+        """{sinif: Politika} (önbellekli)"""
+        politikalar = cache.get(cls.ONBELLEK_ANAHTARI)
+        if politikalar is None:
+            politikalar = dict(cls.VARSAYILANLAR)
+            for sinif, malzeme_kontrolu, kalemsiz_tedarik_bekle in OperasyonSinifPolitikasi.objects.values_list(
+                'sinif', 'malzeme_kontrolu', 'kalemsiz_tedarik_bekle'
+            ):
+                politikalar[sinif] = Politika(malzeme_kontrolu, kalemsiz_tedarik_bekle)
+            cache.set(cls.ONBELLEK_ANAHTARI, politikalar, None)
+        return politikalar
+
+    @classmethod
+    def politika(cls, sinif):
+        politikalar = cls.politikalar()
+        return politikalar.get(sinif, politikalar[OperasyonSinifi.DIGER])
+
+    @classmethod
+    def onbellegi_temizle(cls):
+        cache.delete(cls.ONBELLEK_ANAHTARI)
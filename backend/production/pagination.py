@@ -0,0 +1,76 @@
+# backend/production/pagination.py
+
+from django.conf import settings
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+class KeysetPagination(CursorPagination):
+    """
+    İndeksli kolon üzerinden keyset (cursor) sayfalama.
+    COUNT(*) ve OFFSET yapmadığı için derin sayfalar ilk sayfa kadar ucuzdur.
+    Sıralama view'daki `keyset_ordering` ile belirlenir, tekil bir kolon olmalıdır. OrderingFilter'ın
+    başka bir sıralaması istenirse sessizce yok sayılmaz, 400 döner (sayfa numaralı sayfalamada geçerlidir).
+    """
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    ordering = '-id'
+
+    def __init__(self):
+        self.page_size = getattr(settings, 'KEYSET_PAGE_SIZE', 100)
+        self.max_page_size = getattr(settings, 'KEYSET_MAX_PAGE_SIZE', 1000)
+
+    def get_ordering(self, request, queryset, view):
+        # OrderingFilter'ın indekssiz sıralamaları keyset'i bozmasın
+        ordering = getattr(view, 'keyset_ordering', self.ordering)
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        ordering = tuple(ordering)
+        istenen = request.query_params.get(api_settings.ORDERING_PARAM)
+        if istenen and tuple(alan.strip() for alan in istenen.split(',')) != ordering:
+            raise ValidationError({api_settings.ORDERING_PARAM: (
+                f"Keyset sayfalama yalnızca '{','.join(ordering)}' sıralamasını destekler; "
+                f"diğer sıralamalar için sayfa numaralı sayfalamayı kullanın"
+            )})
+        return ordering
+
+
+class KeysetOptionalMixin:
+    """
+    Mevcut sayfa numaralı sözleşmeyi koruyarak `?sayfalama=cursor` ile keyset sayfalamaya geçiş sağlar.
+    Frontend'in count/page kullandığı endpointler için.
+    """
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            request = getattr(self, 'request', None)
+            if request is not None and request.query_params.get('sayfalama') == 'cursor':
+                self._paginator = KeysetPagination()
+            elif self.pagination_class is None:
+                self._paginator = None
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+
+class SecenekMixin:
+    """
+    Dropdown'lar için sadece id ve etiket döndüren hafif `secenekler` endpoint'i.
+    Etiket `secenek_alanlari` değerlerinin birleşimidir; arama/filtreler uygulanır.
+    """
+    secenek_alanlari = ('ad',)
+
+    @action(detail=False, methods=['get'])
+    def secenekler(self, request):
+        """Dropdown için id + etiket listesi"""
+        limit = getattr(settings, 'SECENEK_LIMIT', 5000)
+        queryset = self.filter_queryset(self.get_queryset())
+        satirlar = queryset.values_list('id', *self.secenek_alanlari)[:limit]
+        return Response([
+            {'id': satir[0], 'label': ' - '.join(str(deger) for deger in satir[1:] if deger)}
+            for satir in satirlar
+        ])
@@ -0,0 +1,183 @@
+"""
+Bağımlılıksız PDF yazıcı - standart Helvetica yazı tipleriyle metin, çizgi ve dolu dikdörtgen.
+Türkçe karakterler cp1254 kodlamasıyla (WinAnsi + ğĞıİşŞ farkları) yazılır.
+
+Django'ya bağımlı değildir; PDF işlem havuzundaki süreçler yalnızca bu modülü ve sayfa şablonlarını yükler.
+"""
+
+import unicodedata
+import zlib
+
+A4 = (595, 842)
+
+# Helvetica / Helvetica-Bold AFM genişlikleri (1/1000 em), ASCII 32-126
+_GENISLIK = {
+    False: [
+        278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+        556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+        1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+        667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+        333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+        556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+    ],
+    True: [
+        278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+        556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+        975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+        667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+        333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+        611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+    ],
+}
+
+# cp1254'ün WinAnsi'den (cp1252) farklı konumları
+_FONT_KODLAMASI = (
+    b'<< /Type /Encoding /BaseEncoding /WinAnsiEncoding '
+    b'/Differences [208 /Gbreve 221 /Idotaccent 222 /Scedilla 240 /gbreve 253 /dotlessi 254 /scedilla] >>'
+)
+_FONTLAR = ((b'F1', b'Helvetica'), (b'F2', b'Helvetica-Bold'))
+
+
+def _karakter_genisligi(karakter, kalin):
+    if karakter == '…':
+        return 1000
+    kod = ord(karakter)
+    if not 32 <= kod <= 126:
+        # Aksanlı harfler taban harfin genişliğiyle ölçülür (ç→c, İ→I, ı→i ...)
+        taban = unicodedata.normalize('NFKD', karakter)[:1]
+        kod = ord('i') if karakter == 'ı' else ord(taban) if taban and 32 <= ord(taban) <= 126 else ord('n')
+    return _GENISLIK[kalin][kod - 32]
+
+
+def metin_genisligi(metin, boyut, kalin=False):
+    return sum(_karakter_genisligi(k, kalin) for k in metin) * boyut / 1000
+
+
+def sigdir(metin, genislik, boyut, kalin=False):
+    """Metni verilen genişliğe sığacak şekilde sonuna '…' koyarak kısaltır"""
+    metin = ' '.join(str(metin).split())
+    if metin_genisligi(metin, boyut, kalin) <= genislik:
+        return metin
+    sinir = genislik - metin_genisligi('…', boyut, kalin)
+    toplam = 0
+    for i, karakter in enumerate(metin):
+        toplam += _karakter_genisligi(karakter, kalin) * boyut / 1000
+        if toplam > sinir:
+            return metin[:i].rstrip() + '…'
+    return metin
+
+
+def _pdf_dizesi(metin):
+    veri = str(metin).encode('cp1254', errors='replace')
+    return b'(' + veri.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+def _bilgi_dizesi(metin):
+    """Belge bilgi sözlüğü dizeleri yazı tipi kodlaması kullanmaz; UTF-16BE yazılır"""
+    return b'<' + ('\ufeff' + str(metin)).encode('utf-16-be').hex().upper().encode('ascii') + b'>'
+
+
+def _sayi(deger):
+    return (f'{deger:.2f}'.rstrip('0').rstrip('.') or '0').encode('ascii')
+
+
+class Katman:
+    """
+    Sayfa içerik akışı parçası. Bir kez çizilip bayt olarak saklanabilir ve farklı sayfalara,
+    istenirse dikey kaydırılarak (yerlestir) tekrar eklenebilir.
+    """
+
+    def __init__(self):
+        self.komutlar = []
+
+    def metin(self, x, y, metin, boyut=10, kalin=False, hiza='sol', renk=None):
+        if not metin:
+            return
+        metin = str(metin)
+        if hiza != 'sol':
+            genislik = metin_genisligi(metin, boyut, kalin)
+            x -= genislik if hiza == 'sag' else genislik / 2
+        renk_komutu = b' '.join(_sayi(c) for c in renk) + b' rg ' if renk else b''
+        self.komutlar.append(
+            b'BT ' + renk_komutu + b'/' + _FONTLAR[kalin][0] + b' ' + _sayi(boyut) + b' Tf '
+            + _sayi(x) + b' ' + _sayi(y) + b' Td ' + _pdf_dizesi(metin) + b' Tj ET'
+            + (b' 0 g' if renk else b'')
+        )
+
+    def cizgi(self, x1, y1, x2, y2, kalinlik=0.5, gri=0):
+        self.komutlar.append(
+            _sayi(gri) + b' G ' + _sayi(kalinlik) + b' w ' + _sayi(x1) + b' ' + _sayi(y1) + b' m '
+            + _sayi(x2) + b' ' + _sayi(y2) + b' l S 0 G'
+        )
+
+    def dikdortgen(self, x, y, genislik, yukseklik, renk):
+        self.komutlar.append(
+            b' '.join(_sayi(c) for c in renk) + b' rg ' + _sayi(x) + b' ' + _sayi(y) + b' '
+            + _sayi(genislik) + b' ' + _sayi(yukseklik) + b' re f 0 g'
+        )
+
+    def yerlestir(self, katman_baytlari, dy=0):
+        """Önceden çizilmiş katmanı dy kadar kaydırarak ekler"""
+        if dy:
+            self.komutlar.append(b'q 1 0 0 1 0 ' + _sayi(dy) + b' cm ' + katman_baytlari + b' Q')
+        else:
+            self.komutlar.append(katman_baytlari)
+
+    def bayt(self):
+        return b'\n'.join(self.komutlar)
+
+
+def sayfa_sikistir(icerik):
+    """Sayfa içerik akışını FlateDecode ile sıkıştırır (işlem havuzunda yapılır)"""
+    return zlib.compress(icerik, 6)
+
+
+def pdf_olustur(sayfalar, boyut=A4, baslik=''):
+    """
+    Sıkıştırılmış sayfa içerik akışlarından tek PDF dosyası. Nesne sırası: katalog, sayfa ağacı,
+    iki yazı tipi, bilgi sözlüğü ve sayfa başına (sayfa, içerik) çifti.
+    """
+    nesneler = []
+
+    def ekle(govde):
+        nesneler.append(govde)
+        return len(nesneler)
+
+    katalog = ekle(b'<< /Type /Catalog /Pages 2 0 R >>')
+    ekle(None)  # sayfa ağacı, çocuklar bilinince doldurulur
+    font_ref = b' '.join(
+        b'/' + ad + b' ' + str(ekle(
+            b'<< /Type /Font /Subtype /Type1 /BaseFont /' + yazi_tipi + b' /Encoding ' + _FONT_KODLAMASI + b' >>'
+        )).encode() + b' 0 R'
+        for ad, yazi_tipi in _FONTLAR
+    )
+    bilgi = ekle(b'<< /Producer (uretim-planlama) /Title ' + _pdf_dizesi(baslik) + b' >>')
+    kaynaklar = b'<< /Font << ' + font_ref + b' >> >>'
+    kutu = b'[0 0 ' + str(boyut[0]).encode() + b' ' + str(boyut[1]).encode() + b']'
+
+    cocuklar = []
+    for akis in sayfalar:
+        icerik = ekle(b'<< /Length ' + str(len(akis)).encode() + b' /Filter /FlateDecode >>\nstream\n'
+                      + akis + b'\nendstream')
+        cocuklar.append(ekle(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox ' + kutu + b' /Resources ' + kaynaklar
+            + b' /Contents ' + str(icerik).encode() + b' 0 R >>'
+        ))
+    nesneler[1] = (b'<< /Type /Pages /Count ' + str(len(cocuklar)).encode() + b' /Kids ['
+                   + b' '.join(str(no).encode() + b' 0 R' for no in cocuklar) + b'] >>')
+
+    cikti = [b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n']
+    konum = len(cikti[0])
+    konumlar = []
+    for no, govde in enumerate(nesneler, start=1):
+        parca = str(no).encode() + b' 0 obj\n' + govde + b'\nendobj\n'
+        konumlar.append(konum)
+        cikti.append(parca)
+        konum += len(parca)
+    cikti.append(b'xref\n0 ' + str(len(nesneler) + 1).encode() + b'\n0000000000 65535 f \n')
+    cikti.extend(f'{k:010d} 00000 n \n'.encode() for k in konumlar)
+    cikti.append(
+        b'trailer\n<< /Size ' + str(len(nesneler) + 1).encode() + b' /Root ' + str(katalog).encode()
+        + b' 0 R /Info ' + str(bilgi).encode() + b' 0 R >>\nstartxref\n' + str(konum).encode() + b'\n%%EOF\n'
+    )
+    return b''.join(cikti)
@@ -0,0 +1,669 @@
+"""
+Planlama servisi - sürükle-bırak taşımalarında artımlı yeniden planlama ve canlı veriye dokunmayan
+what-if simülasyonları
+"""
+
+import heapq
+import logging
+import multiprocessing
+import os
+import threading
+import time as zaman
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, time, timedelta
+
+import django
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .degisiklik_akisi_service import DegisiklikAkisiService
+from .is_akisi_service import IsAkisiService
+from .kapasite_service import KapasiteService
+from .models import IsAkisi, IsEmri, IsIstasyonu
+from .takvim_service import TakvimService, TakvimUfkuHatasi
+
+logger = logging.getLogger(__name__)
+
+_havuz = None
+_havuz_kilidi = threading.Lock()
+
+# Çizelgede önce yerleşenler: başlamış emirler, acil siparişler, diğerleri
+SIRA_BASLAMIS, SIRA_ACIL, SIRA_NORMAL = 0, 1, 2
+BASLAMIS_DURUMLAR = ('basladi', 'devam_ediyor')
+ONCELIK_SIRASI = {'acil': 0, 'yuksek': 1, 'normal': 2, 'dusuk': 3}
+
+
+class PlanlamaHatasi(Exception):
+    """Planlama işlemi uygulanamıyor; mesaj kullanıcıya gösterilir"""
+
+
+class SimulasyonHatasi(PlanlamaHatasi):
+    """Senaryodaki değişiklik uygulanamıyor"""
+
+
+class PlanModeli:
+    """
+    Planın bellekteki, süreçler arası taşınabilir (pickle) kopyası.
+    emirler: {id: {...}} sözlükleri, takvimler: {istasyon_id: CalismaTakvimi}
+    """
+
+    def __init__(self, emirler, takvimler, siparis_nolari, simdi):
+        self.emirler = emirler
+        self.takvimler = takvimler
+        self.siparis_nolari = siparis_nolari
+        self.simdi = simdi
+
+
+class PlanlamaService:
+    """Artımlı yeniden planlama ve what-if simülasyonları"""
+
+    PLAN_ALANLARI = [
+        'planlanan_istasyon', 'planlanan_baslangic_tarihi', 'planlanan_baslangic_saati',
+        'planlanan_bitis_tarihi', 'planlanan_bitis_saati',
+    ]
+
+    # ------------------------------------------------------------------
+    # Artımlı yeniden planlama (Gantt sürükle-bırak)
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def tasi_ve_yay(cls, emir, istasyon, tarih):
+        """
+        Emri istasyonda verilen günün ilk çalışma anına taşır ve etkisini ileriye yayar: taşınan emirle
+        çakışan istasyon kuyruğu ve öncülü artık daha geç biten ardıllar (sonraki_operasyonlar) gerektiği
+        kadar ileri kaydırılır; çakışma kalmayınca yayılım durur. Emirler hiçbir zaman öne çekilmez.
+        Değişen emirleri döndürür, ilk eleman taşınan emirdir.
+        """
+        if emir.durum in IsEmri.YUK_DISI_DURUMLAR:
+            raise PlanlamaHatasi(f"{emir.emirNo} {emir.get_durum_display().lower()} durumunda, taşınamaz")
+        baslangic, bitis = emir.takvime_gore_zamanla(istasyon, tarih)
+        yayilim = _Yayilim(baslangic.date())
+        yayilim.yukle([emir.pk])
+        yayilim.yerlestir(emir.pk, istasyon.pk, baslangic, bitis)
+        yayilim.yay(emir.pk)
+
+        with transaction.atomic():
+            cls.plani_yaz(yayilim.degisenler())
+        return [yayilim.ozet(emir_id) for emir_id in yayilim.sira]
+
+    @classmethod
+    def plani_yaz(cls, satirlar):
+        """
+        [(emir_id, istasyon_id, baslangic, bitis)] planını tek bulk_update ile yazar.
+        İstasyon günlük yükü güncelleme öncesi ve sonrası gruplanmış sorgularla taşınır. bulk_update
+        auto_now uygulamadığı için guncellenme_tarihi elle yazılır; terminallerin ?guncellenme_sonrasi=
+        delta sorgusu taşınan ve kaydırılan emirleri böyle görür.
+        """
+        if not satirlar:
+            return 0
+        simdi = timezone.now()
+        emirler = [
+            IsEmri(
+                pk=emir_id, planlanan_istasyon_id=istasyon_id,
+                planlanan_baslangic_tarihi=baslangic.date(), planlanan_baslangic_saati=baslangic.time(),
+                planlanan_bitis_tarihi=bitis.date(), planlanan_bitis_saati=bitis.time(),
+                guncellenme_tarihi=simdi,
+            )
+            for emir_id, istasyon_id, baslangic, bitis in satirlar
+        ]
+        queryset = IsEmri.objects.filter(pk__in=[e.pk for e in emirler])
+        KapasiteService.emirleri_yukten_cikar(queryset)
+        IsEmri.objects.bulk_update(emirler, [*cls.PLAN_ALANLARI, 'guncellenme_tarihi'], batch_size=500)
+        KapasiteService.emirleri_yuke_ekle(queryset)
+        DegisiklikAkisiService.kaydet_idler([e.pk for e in emirler])
+        return len(emirler)
+
+    @classmethod
+    def toplu_planla(cls, hareketler):
+        """
+        [{'order_id', 'station_id', 'date'}] taşımalarını birlikte doğrular ve tek işlemde uygular;
+        station_id boşsa emrin planı kaldırılır. Her taşıma tasi_ve_yay gibi istasyon kuyruğunu ve ardılları
+        ileri kaydırır; aynı istasyon ve güne düşen emirler listedeki sırayla arka arkaya dizilir.
+        Geçersiz ya da takvime sığmayan hareket varsa hiçbiri yazılmaz. (uygulandi, sonuçlar) döndürür.
+        """
+        sonuclar, gecerli, emir_idleri, istasyon_idleri = [], [], set(), set()
+        for hareket in hareketler:
+            sonuc = {'order_id': hareket.get('order_id') if isinstance(hareket, dict) else None, 'success': False}
+            sonuclar.append(sonuc)
+            try:
+                emir_id = int(hareket['order_id'])
+                istasyon_id = int(hareket['station_id']) if hareket.get('station_id') else None
+                tarih = date.fromisoformat(hareket['date']) if istasyon_id else None
+            except (KeyError, TypeError, ValueError):
+                sonuc['error'] = 'order_id, station_id ve date (YYYY-MM-DD) gerekli'
+                continue
+            if emir_id in emir_idleri:
+                sonuc['error'] = 'İş emri listede birden fazla kez var'
+                continue
+            emir_idleri.add(emir_id)
+            if istasyon_id:
+                istasyon_idleri.add(istasyon_id)
+            gecerli.append((sonuc, emir_id, istasyon_id, tarih))
+
+        emirler = IsEmri.objects.only('emirNo', 'durum').in_bulk(emir_idleri)
+        istasyonlar = set(IsIstasyonu.objects.filter(pk__in=istasyon_idleri).values_list('id', flat=True))
+        tarihler = [tarih for _, _, _, tarih in gecerli if tarih]
+        yayilim = _Yayilim(min(tarihler) if tarihler else date.today())
+        yayilim.yukle(list(emirler))
+        sonraki_bos = {}  # (istasyon_id, tarih) -> bu toplu işlemde o güne dizilen son emrin bitişi
+        tasinanlar = {}  # emir_id -> sonuç
+        for sonuc, emir_id, istasyon_id, tarih in gecerli:
+            emir = emirler.get(emir_id)
+            if emir is None:
+                sonuc['error'] = 'İş emri bulunamadı'
+                continue
+            if emir.durum in IsEmri.YUK_DISI_DURUMLAR:
+                sonuc['error'] = f"{emir.emirNo} {emir.get_durum_display().lower()} durumunda, taşınamaz"
+                continue
+            if istasyon_id and istasyon_id not in istasyonlar:
+                sonuc['error'] = 'İstasyon bulunamadı'
+                continue
+
+            sonuc['emirNo'] = emir.emirNo
+            if istasyon_id is None:
+                yayilim.kaldir(emir_id)
+                sonuc.update(success=True, planlanan_baslangic=None, planlanan_bitis=None)
+                continue
+            try:
+                an = sonraki_bos.get((istasyon_id, tarih)) or datetime.combine(tarih, time())
+                baslangic = TakvimService.sonraki_calisma_ani(istasyon_id, an)
+                bitis = TakvimService.dakika_ekle(istasyon_id, baslangic, yayilim.emirler[emir_id][3])
+                yayilim.yerlestir(emir_id, istasyon_id, baslangic, bitis)
+                yayilim.yay(emir_id)
+            except (TakvimUfkuHatasi, PlanlamaHatasi) as hata:
+                sonuc['error'] = str(hata)
+                continue
+            sonraki_bos[(istasyon_id, tarih)] = bitis
+            sonuc['success'] = True
+            tasinanlar[emir_id] = sonuc
+
+        # Sonraki hareketlerin kaydırmaları dahil son yerleşim
+        for emir_id, sonuc in tasinanlar.items():
+            _, baslangic, bitis = yayilim.emirler[emir_id][:3]
+            sonuc.update(planlanan_baslangic=baslangic.isoformat(), planlanan_bitis=bitis.isoformat())
+
+        # Listede birlikte taşınan öncül/ardıl çiftlerinde sıra bozulduysa uyar (yazmayı engellemez)
+        if len(tasinanlar) > 1:
+            Through = IsEmri.onceki_operasyonlar.through
+            for ardil_id, onceki_id in Through.objects.filter(
+                from_isemri_id__in=tasinanlar.keys(), to_isemri_id__in=tasinanlar.keys()
+            ).values_list('from_isemri_id', 'to_isemri_id'):
+                if yayilim.emirler[ardil_id][1] < yayilim.emirler[onceki_id][2]:
+                    tasinanlar[ardil_id]['uyari'] = f"Öncül {emirler[onceki_id].emirNo} bitmeden başlıyor"
+
+        uygulandi = all(s['success'] for s in sonuclar)
+        if uygulandi:
+            degisenler = [
+                satir for satir in yayilim.degisenler() if tuple(satir[1:]) != yayilim.ilk_hali[satir[0]]
+            ]
+            with transaction.atomic():
+                cls.plani_yaz(degisenler)
+        return uygulandi, sonuclar
+
+    # ------------------------------------------------------------------
+    # What-if simülasyonu
+    # ------------------------------------------------------------------
+
+    DEGISIKLIK_TIPLERI = ('acil_siparis', 'istasyon_bakim', 'emir_tasi', 'sure_degistir')
+
+    @classmethod
+    def simule_et(cls, senaryolar, simdi=None):
+        """
+        Her senaryo {'ad': str, 'degisiklikler': [...]} için mevcut plana göre farkı döndürür.
+        Birden fazla senaryo SIMULASYON_ISCI_SAYISI süreçli kalıcı havuzda paralel çalıştırılır.
+        """
+        model = cls.plani_yukle(simdi)
+        # Veritabanı gerektiren çözümlemeler (acil sipariş rotaları) ana süreçte yapılır
+        hazir = [(s.get('ad') or f'Senaryo {i + 1}', cls._cozumle(model, s.get('degisiklikler') or []))
+                 for i, s in enumerate(senaryolar)]
+        temel = cizelgele(model, [])
+
+        havuz = cls.havuz() if len(hazir) > 1 else None
+        if havuz is not None:
+            sonuclar = list(havuz.map(_senaryo_calistir, [(model, temel, ad, d) for ad, d in hazir]))
+        else:
+            sonuclar = [_senaryo_calistir((model, temel, ad, d)) for ad, d in hazir]
+        return sonuclar
+
+    @staticmethod
+    def havuz():
+        """
+        Süreç başına tek, ilk kullanımda açılan simülasyon havuzu (spawn: fork edilmiş bağlantı ve
+        kilit taşımaz). İşçiler Django'yu bir kez kurar; plan modeli pickle ile gelir, veritabanına dokunulmaz.
+        """
+        global _havuz
+        isci_sayisi = getattr(settings, 'SIMULASYON_ISCI_SAYISI', 4)
+        if isci_sayisi < 2:
+            return None
+        with _havuz_kilidi:
+            if _havuz is None:
+                _havuz = ProcessPoolExecutor(
+                    max_workers=isci_sayisi, mp_context=multiprocessing.get_context('spawn'),
+                    initializer=django.setup,
+                )
+            return _havuz
+
+    @staticmethod
+    def havuzu_kapat():
+        global _havuz
+        with _havuz_kilidi:
+            if _havuz is not None:
+                _havuz.shutdown()
+                _havuz = None
+
+    @classmethod
+    def plani_yukle(cls, simdi=None):
+        """Açık iş emirlerini, öncüllerini ve istasyon takvimlerini birkaç sorguda belleğe alır"""
+        simdi = simdi or datetime.now().replace(second=0, microsecond=0)
+        satirlar = IsEmri.objects.exclude(durum__in=IsEmri.YUK_DISI_DURUMLAR).order_by().values_list(
+            'id', 'emirNo', 'siparis_id', 'siparis__siparis_no', 'siparis_kalemi_id', 'siparis_kalemi__teslim_tarihi',
+            'planlanan_istasyon_id', 'planlanan_baslangic_tarihi', 'planlanan_baslangic_saati',
+            'planlanan_sure', 'durum', 'oncelik',
+        )
+        emirler, siparis_nolari = {}, {}
+        for (emir_id, emir_no, siparis_id, siparis_no, kalem_id, teslim, istasyon_id,
+             bas_tarih, bas_saat, sure, durum, oncelik) in satirlar:
+            emirler[emir_id] = {
+                'id': emir_id,
+                'emir_no': emir_no,
+                'siparis': siparis_id,
+                'kalem': kalem_id,
+                'teslim': teslim,
+                'istasyon': istasyon_id,
+                'baslangic': datetime.combine(bas_tarih, bas_saat or time(8, 0)),
+                'sure': float(sure or 0),
+                'sira': SIRA_BASLAMIS if durum in BASLAMIS_DURUMLAR else SIRA_NORMAL,
+                'oncelik': ONCELIK_SIRASI.get(oncelik, 2),
+                'oncekiler': [],
+            }
+            siparis_nolari[siparis_id] = siparis_no
+
+        Through = IsEmri.onceki_operasyonlar.through
+        for emir_id, onceki_id in Through.objects.filter(
+            from_isemri_id__in=emirler.keys()
+        ).values_list('from_isemri_id', 'to_isemri_id').iterator(chunk_size=5000):
+            if onceki_id in emirler:
+                emirler[emir_id]['oncekiler'].append(onceki_id)
+
+        istasyon_idleri = set(IsIstasyonu.objects.values_list('id', flat=True))
+        takvimler = TakvimService.takvimler(istasyon_idleri, simdi)
+        return PlanModeli(emirler, takvimler, siparis_nolari, simdi)
+
+    @classmethod
+    def _cozumle(cls, model, degisiklikler):
+        """Senaryo değişikliklerini doğrular, veritabanı gerektirenleri saf veriye çevirir"""
+        cozulmus = []
+        for i, degisiklik in enumerate(degisiklikler):
+            tip = degisiklik.get('tip')
+            if tip not in cls.DEGISIKLIK_TIPLERI:
+                raise SimulasyonHatasi(f"{i + 1}. değişiklik: geçersiz tip '{tip}'")
+            try:
+                if tip == 'acil_siparis':
+                    cozulmus.append(cls._acil_siparis(i, degisiklik, model))
+                elif tip == 'istasyon_bakim':
+                    istasyon = int(degisiklik['istasyon'])
+                    if istasyon not in model.takvimler:
+                        raise SimulasyonHatasi(f"{i + 1}. değişiklik: istasyon bulunamadı")
+                    baslangic = datetime.fromisoformat(degisiklik['baslangic'])
+                    bitis = datetime.fromisoformat(degisiklik['bitis'])
+                    if bitis <= baslangic:
+                        raise SimulasyonHatasi(f"{i + 1}. değişiklik: bakım bitişi başlangıçtan sonra olmalı")
+                    cozulmus.append({'tip': tip, 'istasyon': istasyon, 'baslangic': baslangic, 'bitis': bitis})
+                elif tip == 'emir_tasi':
+                    emir = int(degisiklik['emir'])
+                    if emir not in model.emirler:
+                        raise SimulasyonHatasi(f"{i + 1}. değişiklik: açık iş emri bulunamadı")
+                    istasyon = int(degisiklik.get('istasyon') or model.emirler[emir]['istasyon'] or 0)
+                    if istasyon not in model.takvimler:
+                        raise SimulasyonHatasi(f"{i + 1}. değişiklik: istasyon bulunamadı")
+                    cozulmus.append({
+                        'tip': tip, 'emir': emir, 'istasyon': istasyon,
+                        'tarih': date.fromisoformat(degisiklik['tarih']) if degisiklik.get('tarih') else None,
+                    })
+                else:
+                    emir = int(degisiklik['emir'])
+                    if emir not in model.emirler:
+                        raise SimulasyonHatasi(f"{i + 1}. değişiklik: açık iş emri bulunamadı")
+                    cozulmus.append({'tip': tip, 'emir': emir, 'sure': float(degisiklik['sure'])})
+            except (KeyError, TypeError, ValueError) as e:
+                raise SimulasyonHatasi(f"{i + 1}. değişiklik ({tip}): eksik veya geçersiz alan {e}")
+        return cozulmus
+
+    @staticmethod
+    def _acil_siparis(i, degisiklik, model):
+        urun = int(degisiklik['urun'])
+        miktar = float(degisiklik.get('miktar') or 1)
+        akis_id = IsAkisi.objects.filter(urun_id=urun, aktif=True).order_by('-id').values_list('id', flat=True).first()
+        rota = IsAkisiService.rotalari_yukle([akis_id]).get(akis_id) if akis_id else None
+        if rota is None:
+            raise SimulasyonHatasi(f"{i + 1}. değişiklik: ürünün aktif iş akışı yok")
+        eksik = {ist for ist in rota.istasyonlar if ist not in model.takvimler}
+        if eksik:
+            raise SimulasyonHatasi(f"{i + 1}. değişiklik: rotadaki istasyonlar bulunamadı: {sorted(eksik)}")
+        return {
+            'tip': 'acil_siparis',
+            'anahtar': f'acil-{i + 1}',
+            'teslim': date.fromisoformat(degisiklik['teslim_tarihi']) if degisiklik.get('teslim_tarihi') else None,
+            'istasyonlar': list(rota.istasyonlar),
+            'sureler': [rota.sure(j, miktar) for j in range(len(rota))],
+            'adlar': list(rota.adlar),
+            'oncekiler': [list(rota.oncekiler(j)) for j in range(len(rota))],
+        }
+
+
+class _Yayilim:
+    """
+    tasi_ve_yay için bellekteki çalışma kopyası. Emirler ve istasyon kuyrukları yalnızca
+    yayılım eriştikçe (taşınan günden itibaren) yüklenir.
+    """
+
+    def __init__(self, ilk_tarih):
+        self.ilk_tarih = ilk_tarih
+        self.emirler = {}  # id -> [istasyon_id, baslangic, bitis, sure, emir_no, sabit]
+        self.kuyruklar = {}  # istasyon_id -> emir id kümesi
+        self.sira = []  # değişen emirler, değişme sırasıyla
+        self.ilk_hali = {}
+        self.ardillar = {}  # emir id -> ardıl emir idleri (sonraki_operasyonlar)
+        self.sinir = getattr(settings, 'PLANLAMA_YAYILIM_SINIRI', 500)
+
+    def yukle(self, emir_idleri=None, istasyon_id=None):
+        satirlar = IsEmri.objects.exclude(durum__in=IsEmri.YUK_DISI_DURUMLAR).order_by()
+        if istasyon_id is not None:
+            satirlar = satirlar.filter(planlanan_istasyon_id=istasyon_id, planlanan_baslangic_tarihi__gte=self.ilk_tarih)
+        else:
+            satirlar = satirlar.filter(pk__in=[i for i in emir_idleri if i not in self.emirler])
+        for emir_id, emir_no, ist, bas_tarih, bas_saat, sure, durum in satirlar.values_list(
+            'id', 'emirNo', 'planlanan_istasyon_id', 'planlanan_baslangic_tarihi', 'planlanan_baslangic_saati',
+            'planlanan_sure', 'durum',
+        ):
+            if emir_id in self.emirler:
+                continue
+            baslangic = datetime.combine(bas_tarih, bas_saat or time(8, 0))
+            sure = float(sure or 0)
+            bitis = TakvimService.dakika_ekle(ist, baslangic, sure) if ist else baslangic
+            self.emirler[emir_id] = [ist, baslangic, bitis, sure, emir_no, durum in BASLAMIS_DURUMLAR]
+            if ist in self.kuyruklar:
+                self.kuyruklar[ist].add(emir_id)
+
+    def ardillari_yukle(self, emir_idleri):
+        """Henüz bilinmeyen emirlerin ardıllarını tek sorguda okur, ardıl emirleri de birlikte yükler"""
+        eksik = [emir_id for emir_id in emir_idleri if emir_id not in self.ardillar]
+        if not eksik:
+            return
+        for emir_id in eksik:
+            self.ardillar[emir_id] = []
+        Through = IsEmri.onceki_operasyonlar.through
+        for ardil_id, onceki_id in Through.objects.filter(to_isemri_id__in=eksik).values_list(
+            'from_isemri_id', 'to_isemri_id'
+        ):
+            self.ardillar[onceki_id].append(ardil_id)
+        yeni = [ardil_id for emir_id in eksik for ardil_id in self.ardillar[emir_id] if ardil_id not in self.emirler]
+        if yeni:
+            self.yukle(yeni)
+
+    def kuyruk(self, istasyon_id):
+        if istasyon_id not in self.kuyruklar:
+            self.kuyruklar[istasyon_id] = {
+                emir_id for emir_id, e in self.emirler.items() if e[0] == istasyon_id
+            }
+            self.yukle(istasyon_id=istasyon_id)
+        return self.kuyruklar[istasyon_id]
+
+    def yerlestir(self, emir_id, istasyon_id, baslangic, bitis):
+        emir = self.emirler[emir_id]
+        if emir_id not in self.ilk_hali:
+            if len(self.sira) >= self.sinir:
+                raise PlanlamaHatasi(
+                    f"Taşıma {self.sinir} emirden fazlasını etkiliyor; toplu yeniden planlama kullanın"
+                )
+            self.ilk_hali[emir_id] = tuple(emir[:3])
+            self.sira.append(emir_id)
+        if emir[0] != istasyon_id:
+            self.kuyruklar.get(emir[0], set()).discard(emir_id)
+            self.kuyruk(istasyon_id).add(emir_id)
+        emir[0], emir[1], emir[2] = istasyon_id, baslangic, bitis
+
+    def kaldir(self, emir_id):
+        """Emrin istasyon planını kaldırır; tarihleri olduğu gibi kalır"""
+        emir = self.emirler[emir_id]
+        if emir_id not in self.ilk_hali:
+            self.ilk_hali[emir_id] = tuple(emir[:3])
+            self.sira.append(emir_id)
+        self.kuyruklar.get(emir[0], set()).discard(emir_id)
+        emir[0] = None
+
+    def kaydir(self, emir_id, en_erken):
+        """Emri en_erken anından sonra, istasyonda o an süren başka emir bitene kadar ileri kaydırır"""
+        istasyon_id, _, _, sure, _, _ = self.emirler[emir_id]
+        kuyruk = self.kuyruk(istasyon_id)
+        baslangic = TakvimService.sonraki_calisma_ani(istasyon_id, en_erken)
+        while True:
+            suren = max(
+                (self.emirler[d][2] for d in kuyruk
+                 if d != emir_id and self.emirler[d][1] <= baslangic < self.emirler[d][2]),
+                default=None,
+            )
+            if suren is None:
+                break
+            baslangic = TakvimService.sonraki_calisma_ani(istasyon_id, suren)
+        self.yerlestir(emir_id, istasyon_id, baslangic, TakvimService.dakika_ekle(istasyon_id, baslangic, sure))
+
+    def yay(self, ilk_emir_id):
+        yigin = [(self.emirler[ilk_emir_id][1], ilk_emir_id)]
+        while yigin:
+            baslangic, emir_id = heapq.heappop(yigin)
+            istasyon_id, guncel_baslangic, bitis = self.emirler[emir_id][:3]
+            if baslangic != guncel_baslangic:
+                continue  # bu emir sonradan yeniden kaydırıldı; güncel hali yığında
+
+            # Emrin aralığında başlayan kuyruk emirleri, başlangıç sırasıyla
+            cakisanlar = sorted(
+                (self.emirler[d][1], d) for d in self.kuyruk(istasyon_id)
+                if d != emir_id and not self.emirler[d][5] and guncel_baslangic <= self.emirler[d][1] < bitis
+            )
+            # Yığında bekleyenlerin ardılları da aynı sorguda okunur: emir başına değil, seviye başına bir sorgu
+            self.ardillari_yukle([emir_id, *(d for _, d in yigin)])
+            ardillar = self.ardillar[emir_id]
+            gec_kalanlar = [
+                (self.emirler[d][1], d) for d in ardillar
+                if d in self.emirler and self.emirler[d][0] and not self.emirler[d][5] and self.emirler[d][1] < bitis
+            ]
+            for _, diger_id in cakisanlar + gec_kalanlar:
+                if self.emirler[diger_id][1] < bitis:
+                    self.kaydir(diger_id, bitis)
+                    heapq.heappush(yigin, (self.emirler[diger_id][1], diger_id))
+
+    def degisenler(self):
+        return [(emir_id, *self.emirler[emir_id][:3]) for emir_id in self.sira]
+
+    def ozet(self, emir_id):
+        istasyon_id, baslangic, bitis, _, emir_no, _ = self.emirler[emir_id]
+        eski = self.ilk_hali[emir_id]
+        return {
+            'id': emir_id,
+            'emirNo': emir_no,
+            'istasyon_id': istasyon_id,
+            'eski_istasyon_id': eski[0],
+            'planlanan_baslangic': baslangic.isoformat(),
+            'planlanan_bitis': bitis.isoformat(),
+            'eski_baslangic': eski[1].isoformat(),
+            'tarih': baslangic.date().isoformat(),
+        }
+
+
+# ----------------------------------------------------------------------
+# Saf çizelgeleme (veritabanı kullanmaz; işçi süreçlerinde çalışır)
+# ----------------------------------------------------------------------
+
+def _senaryo_calistir(is_paketi):
+    model, temel, ad, degisiklikler = is_paketi
+    baslangic = zaman.perf_counter()
+    senaryo = cizelgele(model, degisiklikler)
+    fark = plan_farki(model, temel, senaryo)
+    fark['ad'] = ad
+    fark['sure_ms'] = round((zaman.perf_counter() - baslangic) * 1000, 1)
+    fark['isci_pid'] = os.getpid()
+    return fark
+
+
+def _calisma_ekle(takvim, an, dakika):
+    """Takvime göre bitiş; takvim dışına taşarsa kesintisiz süre"""
+    try:
+        return takvim.dakika_ekle(an, dakika)
+    except TakvimUfkuHatasi:
+        return an + timedelta(minutes=dakika)
+
+
+def _ilk_calisma_ani(takvim, an):
+    try:
+        return takvim.sonraki_calisma_ani(an)
+    except TakvimUfkuHatasi:
+        return an
+
+
+def cizelgele(model, degisiklikler):
+    """
+    Öncelik sıralı liste çizelgeleme: emirler öncül sırası korunarak (sıra, planlanan başlangıç, öncelik)
+    anahtarıyla istasyonlara yerleştirilir; her emir öncülleri bittikten ve istasyon boşaldıktan sonra
+    takvimdeki ilk çalışma anında başlar. {emir_id: (istasyon, baslangic, bitis, sure)} döndürür.
+    """
+    emirler = {emir_id: dict(e) for emir_id, e in model.emirler.items()}
+    bakimlar = defaultdict(list)
+    for degisiklik in degisiklikler:
+        tip = degisiklik['tip']
+        if tip == 'istasyon_bakim':
+            bakimlar[degisiklik['istasyon']].append((degisiklik['baslangic'], degisiklik['bitis']))
+        elif tip == 'emir_tasi':
+            emir = emirler[degisiklik['emir']]
+            emir['istasyon'] = degisiklik['istasyon']
+            if degisiklik['tarih']:
+                emir['baslangic'] = datetime.combine(degisiklik['tarih'], time())
+        elif tip == 'sure_degistir':
+            emirler[degisiklik['emir']]['sure'] = degisiklik['sure']
+        elif tip == 'acil_siparis':
+            anahtarlar = [(degisiklik['anahtar'], j) for j in range(len(degisiklik['istasyonlar']))]
+            for j, anahtar in enumerate(anahtarlar):
+                emirler[anahtar] = {
+                    'id': anahtar, 'emir_no': f"{degisiklik['anahtar']}/{degisiklik['adlar'][j]}",
+                    'siparis': degisiklik['anahtar'], 'kalem': degisiklik['anahtar'], 'teslim': degisiklik['teslim'],
+                    'istasyon': degisiklik['istasyonlar'][j], 'baslangic': model.simdi,
+                    'sure': degisiklik['sureler'][j], 'sira': SIRA_ACIL, 'oncelik': 0,
+                    'oncekiler': [anahtarlar[k] for k in degisiklik['oncekiler'][j]],
+                }
+    for pencereler in bakimlar.values():
+        pencereler.sort()
+
+    # Topolojik sıra + öncelik kuyruğu; istasyonsuz (planlanmamış) emirler çizelgeye girmez
+    ardillar = defaultdict(list)
+    bekleyen = {}
+    for emir_id, emir in emirler.items():
+        bekleyen[emir_id] = len(emir['oncekiler'])
+        for onceki in emir['oncekiler']:
+            ardillar[onceki].append(emir_id)
+
+    def anahtar(emir):
+        return (emir['sira'], emir['baslangic'], emir['oncelik'], str(emir['id']))
+
+    kuyruk = [(anahtar(e), emir_id) for emir_id, e in emirler.items() if not bekleyen[emir_id]]
+    heapq.heapify(kuyruk)
+    istasyon_bos = {}
+    hazir_anlari = defaultdict(lambda: model.simdi)
+    sonuc = {}
+    while kuyruk:
+        _, emir_id = heapq.heappop(kuyruk)
+        emir = emirler[emir_id]
+        bitis = hazir_anlari[emir_id]
+        istasyon = emir['istasyon']
+        if istasyon is not None and istasyon in model.takvimler:
+            takvim = model.takvimler[istasyon]
+            if emir['sira'] == SIRA_BASLAMIS:
+                baslangic = emir['baslangic']
+            else:
+                baslangic = max(emir['baslangic'], model.simdi, hazir_anlari[emir_id], istasyon_bos.get(istasyon, model.simdi))
+                baslangic = _ilk_calisma_ani(takvim, baslangic)
+            bitis = _calisma_ekle(takvim, baslangic, emir['sure'])
+            for bakim_bas, bakim_bit in bakimlar.get(istasyon, ()):
+                if baslangic < bakim_bit and bitis > bakim_bas:
+                    baslangic = _ilk_calisma_ani(takvim, bakim_bit)
+                    bitis = _calisma_ekle(takvim, baslangic, emir['sure'])
+            istasyon_bos[istasyon] = max(istasyon_bos.get(istasyon, bitis), bitis)
+            sonuc[emir_id] = (istasyon, baslangic, bitis, emir['sure'])
+        for ardil in ardillar[emir_id]:
+            hazir_anlari[ardil] = max(hazir_anlari[ardil], bitis)
+            bekleyen[ardil] -= 1
+            if not bekleyen[ardil]:
+                heapq.heappush(kuyruk, (anahtar(emirler[ardil]), ardil))
+    return sonuc
+
+
+def plan_farki(model, temel, senaryo):
+    """İki çizelge arasındaki farkı raporlar: geciken emirler/sipariş kalemleri ve istasyon günlük yük farkı"""
+    geciken, one_cekilen = [], 0
+    for emir_id, (_, _, eski_bitis, _) in temel.items():
+        yeni_bitis = senaryo[emir_id][2] if emir_id in senaryo else eski_bitis
+        fark = (yeni_bitis - eski_bitis).total_seconds() / 60
+        if fark > 0.5:
+            geciken.append({
+                'emir': emir_id,
+                'emir_no': model.emirler[emir_id]['emir_no'],
+                'eski_bitis': eski_bitis,
+                'yeni_bitis': yeni_bitis,
+                'gecikme_dakika': round(fark, 1),
+            })
+        elif fark < -0.5:
+            one_cekilen += 1
+    geciken.sort(key=lambda g: -g['gecikme_dakika'])
+
+    # Sipariş kalemi tamamlanma anı = kalemin son emrinin bitişi; acil sipariş emirleri (anahtar, j) ile tutulur
+    eski_kalemler, yeni_kalemler, acil = {}, {}, {}
+    for cizelge, kalemler in ((temel, eski_kalemler), (senaryo, yeni_kalemler)):
+        for emir_id, (_, _, bitis, _) in cizelge.items():
+            if emir_id not in model.emirler:
+                acil[emir_id[0]] = max(acil.get(emir_id[0], bitis), bitis)
+                continue
+            kalem = model.emirler[emir_id]['kalem']
+            if kalem is not None:
+                kalemler[kalem] = max(kalemler.get(kalem, bitis), bitis)
+    kalem_bilgisi = {e['kalem']: e for e in model.emirler.values() if e['kalem'] is not None}
+
+    geciken_kalemler = []
+    for kalem, eski_bitis in eski_kalemler.items():
+        yeni_bitis = yeni_kalemler.get(kalem, eski_bitis)
+        if yeni_bitis <= eski_bitis:
+            continue
+        bilgi = kalem_bilgisi[kalem]
+        teslim = bilgi['teslim']
+        geciken_kalemler.append({
+            'siparis': bilgi['siparis'],
+            'siparis_no': model.siparis_nolari.get(bilgi['siparis']),
+            'siparis_kalemi': kalem,
+            'teslim_tarihi': teslim,
+            'eski_bitis': eski_bitis,
+            'yeni_bitis': yeni_bitis,
+            'teslim_asildi': bool(teslim and yeni_bitis.date() > teslim),
+            'yeni_teslim_asimi': bool(teslim and yeni_bitis.date() > teslim >= eski_bitis.date()),
+        })
+    geciken_kalemler.sort(key=lambda k: (not k['yeni_teslim_asimi'], k['yeni_bitis']))
+
+    # İstasyon günlük yük farkı: emir süresi istasyon takvimine göre çalışma günlerine dağıtılır
+    # (IstasyonGunlukYuk ile aynı kural, KapasiteService.yuk_dagilimi)
+    yuk = defaultdict(float)
+    for cizelge, isaret in ((temel, -1), (senaryo, 1)):
+        for istasyon, baslangic, _, sure in cizelge.values():
+            for tarih, dakika in KapasiteService.yuk_dagilimi((istasyon, baslangic, sure), model.takvimler[istasyon]):
+                yuk[(istasyon, tarih)] += isaret * float(dakika)
+    yuk_farki = [
+        {'istasyon': istasyon, 'tarih': tarih, 'fark_dakika': round(dakika, 1)}
+        for (istasyon, tarih), dakika in sorted(yuk.items()) if abs(dakika) > 0.5
+    ]
+
+    return {
+        'geciken_emir_sayisi': len(geciken),
+        'one_cekilen_emir_sayisi': one_cekilen,
+        'geciken_emirler': geciken,
+        'geciken_siparis_kalemleri': geciken_kalemler,
+        'istasyon_yuk_farki': yuk_farki,
+        'acil_siparis_bitisleri': [{'anahtar': k, 'bitis': v} for k, v in sorted(acil.items())],
+    }
@@ -0,0 +1,159 @@
+"""
+Satın alma siparişi PDF şablonu - admin/satinalma_siparisi_print.html yerleşiminin PDF karşılığı.
+Her belgede aynı kalan kısımlar (başlık, etiketler, tablo başlığı, teslim şartları, imza alanı)
+süreç başına bir kez çizilip içerik akışı baytı olarak önbelleklenir; belge başına yalnızca
+değerler ve kalem satırları çizilir.
+
+Django'ya bağımlı değildir; PDF işlem havuzunda çalışır.
+"""
+
+from functools import lru_cache
+
+from .pdf_yazici import Katman, sayfa_sikistir, sigdir
+
+SOL, SAG = 50, 545
+KOYU = (0.173, 0.243, 0.314)
+KIRMIZI = (0.906, 0.298, 0.235)
+ACIK = (0.973, 0.976, 0.98)
+BEYAZ = (1, 1, 1)
+
+SATIR_YUKSEKLIGI = 18
+ALT_SINIR = 60
+ILK_TABLO_Y = 580
+DEVAM_TABLO_Y = 765
+KAPANIS_YUKSEKLIGI = 255
+
+# Sütunlar: (başlık, x, hizalama, genişlik)
+SUTUNLAR = [
+    ('Malzeme', 56, 'sol', 235),
+    ('Miktar', 330, 'orta', 70),
+    ('Birim', 395, 'orta', 50),
+    ('Birim Fiyat', 475, 'sag', 75),
+    ('Toplam', 540, 'sag', 85),
+]
+
+TESLIM_SARTLARI = [
+    'Malzemeler belirtilen teslim tarihinde teslim edilecektir.',
+    'Teslim adresi firma adresimizdir.',
+    'Faturalar mal ile birlikte teslim edilecektir.',
+]
+
+
+@lru_cache(maxsize=None)
+def _tablo_basligi():
+    """Tablo başlık şeridi, üst kenarı y=0"""
+    katman = Katman()
+    katman.dikdortgen(SOL, -20, SAG - SOL, 20, KOYU)
+    for baslik, x, hiza, _ in SUTUNLAR:
+        katman.metin(x, -14, baslik, boyut=10, kalin=True, hiza=hiza, renk=BEYAZ)
+    return katman.bayt()
+
+
+@lru_cache(maxsize=None)
+def _ilk_sayfa(sirket_adi):
+    katman = Katman()
+    katman.metin(297.5, 790, sirket_adi, boyut=20, kalin=True, hiza='orta', renk=KOYU)
+    katman.metin(297.5, 766, 'SATIN ALMA SİPARİŞİ', boyut=14, hiza='orta', renk=KOYU)
+    katman.cizgi(SOL, 736, SAG, 736, kalinlik=1.5)
+
+    for x, baslik, etiketler in (
+        (SOL, 'Tedarikçi Bilgileri', ('Firma:', 'Kod:', 'Telefon:', 'E-posta:', 'Adres:')),
+        (305, 'Sipariş Bilgileri', ('Tarih:', 'Teslim Tarihi:', 'Oluşturan:')),
+    ):
+        katman.dikdortgen(x, 610, 240, 112, ACIK)
+        katman.metin(x + 8, 706, baslik, boyut=12, kalin=True, renk=KOYU)
+        katman.cizgi(x + 8, 700, x + 232, 700, gri=0.85)
+        for i, etiket in enumerate(etiketler):
+            katman.metin(x + 8, 686 - i * 15, etiket, boyut=9, kalin=True)
+    katman.yerlestir(_tablo_basligi(), ILK_TABLO_Y)
+    return katman.bayt()
+
+
+@lru_cache(maxsize=None)
+def _devam_sayfasi(sirket_adi):
+    katman = Katman()
+    katman.metin(SOL, 800, f'{sirket_adi} - SATIN ALMA SİPARİŞİ', boyut=10, kalin=True, renk=KOYU)
+    katman.cizgi(SOL, 792, SAG, 792)
+    return katman.bayt()
+
+
+@lru_cache(maxsize=None)
+def _kapanis():
+    """Toplam etiketleri, teslim şartları ve imza alanı; üst kenarı y=0"""
+    katman = Katman()
+    katman.cizgi(SOL, -4, SAG, -4, kalinlik=1.5)
+    katman.metin(440, -22, 'Ara Toplam:', boyut=11, kalin=True, hiza='sag')
+    katman.metin(440, -40, 'KDV (%20):', boyut=11, kalin=True, hiza='sag')
+    katman.metin(440, -62, 'GENEL TOPLAM:', boyut=13, kalin=True, hiza='sag', renk=KIRMIZI)
+    katman.cizgi(SOL, -80, SAG, -80, gri=0.85)
+    katman.metin(SOL, -100, 'Teslim Şartları:', boyut=10, kalin=True)
+    for i, sart in enumerate(TESLIM_SARTLARI):
+        katman.metin(SOL + 10, -116 - i * 14, f'•  {sart}', boyut=9)
+    for orta, baslik in ((160, 'Satın Alma Yetkilisi'), (435, 'Onaylayan')):
+        katman.cizgi(orta - 90, -200, orta + 90, -200)
+        katman.metin(orta, -214, baslik, boyut=9, kalin=True, hiza='orta')
+    katman.metin(435, -228, 'Yetkili İmza', boyut=9, hiza='orta')
+    return katman.bayt()
+
+
+def _kalem_satiri(katman, y, kalem, sira):
+    if sira % 2:
+        katman.dikdortgen(SOL, y - 5, SAG - SOL, SATIR_YUKSEKLIGI, ACIK)
+    for (_, x, hiza, genislik), deger in zip(SUTUNLAR, kalem):
+        katman.metin(x, y, sigdir(deger, genislik, 9), boyut=9, hiza=hiza)
+    katman.cizgi(SOL, y - 5, SAG, y - 5, kalinlik=0.3, gri=0.85)
+
+
+def sayfalari_ciz(belge, sirket_adi):
+    """
+    Tek siparişin sıkıştırılmış sayfa içerik akışları. belge, SatinAlmaPdfService.belge_verileri
+    sözlüğüdür (tüm değerler biçimlenmiş metin).
+    """
+    sayfalar = []
+    sayfa = Katman()
+    sayfa.yerlestir(_ilk_sayfa(sirket_adi))
+    sayfa.metin(297.5, 746, belge['siparis_no'], boyut=13, hiza='orta', renk=KIRMIZI)
+    tedarikci = belge['tedarikci']
+    for i, deger in enumerate((tedarikci['ad'], tedarikci['kod'], tedarikci['telefon'], tedarikci['email'],
+                               tedarikci['adres'])):
+        sayfa.metin(SOL + 70, 686 - i * 15, sigdir(deger, 160, 9), boyut=9)
+    for i, deger in enumerate((belge['tarih'], belge['teslim_tarihi'], belge['olusturan'])):
+        sayfa.metin(305 + 80, 686 - i * 15, sigdir(deger, 150, 9), boyut=9)
+
+    y = ILK_TABLO_Y - 20 - 14
+    for sira, kalem in enumerate(belge['kalemler']):
+        if y < ALT_SINIR:
+            sayfalar.append(sayfa)
+            sayfa = Katman()
+            sayfa.yerlestir(_devam_sayfasi(sirket_adi))
+            sayfa.metin(SAG, 800, belge['siparis_no'], boyut=10, hiza='sag', renk=KIRMIZI)
+            sayfa.yerlestir(_tablo_basligi(), DEVAM_TABLO_Y)
+            y = DEVAM_TABLO_Y - 20 - 14
+        _kalem_satiri(sayfa, y, kalem, sira)
+        y -= SATIR_YUKSEKLIGI
+
+    ust = y + 4
+    if ust - KAPANIS_YUKSEKLIGI < ALT_SINIR - 20:
+        sayfalar.append(sayfa)
+        sayfa = Katman()
+        sayfa.yerlestir(_devam_sayfasi(sirket_adi))
+        sayfa.metin(SAG, 800, belge['siparis_no'], boyut=10, hiza='sag', renk=KIRMIZI)
+        ust = DEVAM_TABLO_Y
+    sayfa.yerlestir(_kapanis(), ust - 8)
+    ust -= 8
+    sayfa.metin(SAG, ust - 22, belge['ara_toplam'], boyut=11, hiza='sag')
+    sayfa.metin(SAG, ust - 40, belge['kdv'], boyut=11, hiza='sag')
+    sayfa.metin(SAG, ust - 62, belge['genel_toplam'], boyut=13, kalin=True, hiza='sag', renk=KIRMIZI)
+    sayfa.metin(160, ust - 228, belge['olusturan'], boyut=9, hiza='orta')
+    for orta in (160, 435):
+        sayfa.metin(orta, ust - 242, belge['bugun'], boyut=9, hiza='orta')
+    sayfalar.append(sayfa)
+
+    for no, sayfa in enumerate(sayfalar, start=1):
+        sayfa.metin(SAG, 30, f'Sayfa {no} / {len(sayfalar)}', boyut=8, hiza='sag')
+    return [sayfa_sikistir(sayfa.bayt()) for sayfa in sayfalar]
+
+
+def belgeleri_ciz(belgeler, sirket_adi):
+    """İşlem havuzu görevi: belge listesinin sayfaları, belge sırasıyla"""
+    return [sayfalari_ciz(belge, sirket_adi) for belge in belgeler]
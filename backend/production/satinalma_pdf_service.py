@@ -0,0 +1,161 @@
+"""
+Satın alma siparişi PDF servisi - bir ya da birden çok siparişi sunucuda PDF'e çevirir.
+Veriler tüm siparişler için iki sorguda okunur; sayfalar işlem havuzunda çizilir, web süreci
+yalnızca sonuçları tek PDF'te birleştirir ya da sipariş başına PDF'lerle zip oluşturur.
+"""
+
+import io
+import logging
+import multiprocessing
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import SatinAlmaKalemi, SatinAlmaSiparisi
+from .pdf_yazici import pdf_olustur
+from .satinalma_pdf_sablonu import belgeleri_ciz
+
+logger = logging.getLogger(__name__)
+
+_havuz = None
+_havuz_kilidi = threading.Lock()
+
+
+def _tutar(deger):
+    """1234.5 → '1.234,50'"""
+    return f'{Decimal(deger or 0):,.2f}'.replace(',', '_').replace('.', ',').replace('_', '.')
+
+
+def _tarih(deger):
+    return deger.strftime('%d.%m.%Y') if deger else ''
+
+
+class SatinAlmaPdfService:
+    """
+    Toplu sipariş PDF'i. Sayfa şablonunun sabit kısımları her işçi süreçte bir kez çizilip
+    önbellekte tutulur (satinalma_pdf_sablonu); işçilere yalnızca biçimlenmiş metinlerden oluşan
+    belge sözlükleri gönderilir, böylece işçiler Django ve veritabanı bağlantısı açmaz.
+
+    PDF_ISLEM_SAYISI işçi süreç sayısıdır; 0 ise sayfalar istek sürecinde çizilir.
+    """
+
+    BICIMLER = ('pdf', 'zip')
+    KDV_ORANI = Decimal('0.20')
+
+    @staticmethod
+    def havuz():
+        """Süreç başına tek, ilk kullanımda açılan işlem havuzu (spawn: fork edilmiş bağlantı taşımaz)"""
+        global _havuz
+        islem_sayisi = getattr(settings, 'PDF_ISLEM_SAYISI', 2)
+        if not islem_sayisi:
+            return None
+        with _havuz_kilidi:
+            if _havuz is None:
+                _havuz = ProcessPoolExecutor(
+                    max_workers=islem_sayisi, mp_context=multiprocessing.get_context('spawn')
+                )
+            return _havuz
+
+    @staticmethod
+    def havuzu_kapat():
+        global _havuz
+        with _havuz_kilidi:
+            if _havuz is not None:
+                _havuz.shutdown()
+                _havuz = None
+
+    @classmethod
+    def belge_verileri(cls, siparis_idleri):
+        """
+        Siparişlerin çizime hazır sözlükleri, istenen sırayla. Siparişler tedarikçi ve oluşturanla
+        birlikte tek sorguda, tüm kalemler malzeme ihtiyacıyla birleştirilmiş tek sorguda okunur.
+        """
+        siparis_idleri = list(dict.fromkeys(int(pk) for pk in siparis_idleri))
+        siparisler = SatinAlmaSiparisi.objects.select_related('tedarikci', 'olusturan').in_bulk(siparis_idleri)
+        kalemler = {pk: [] for pk in siparisler}
+        for siparis_id, malzeme_adi, birim, miktar, birim_fiyat, toplam_fiyat in SatinAlmaKalemi.objects.filter(
+            siparis_id__in=siparisler
+        ).order_by('siparis_id', 'id').values_list(
+            'siparis_id', 'malzeme_ihtiyaci__malzeme_adi', 'malzeme_ihtiyaci__birim',
+            'miktar', 'birim_fiyat', 'toplam_fiyat',
+        ):
+            kalemler[siparis_id].append(
+                (malzeme_adi, _tutar(miktar), birim, f'{_tutar(birim_fiyat)} TL', f'{_tutar(toplam_fiyat)} TL')
+            )
+
+        bugun = _tarih(timezone.localdate())
+        belgeler = []
+        for pk in siparis_idleri:
+            siparis = siparisler.get(pk)
+            if siparis is None:
+                continue
+            tedarikci = siparis.tedarikci
+            olusturan = siparis.olusturan
+            ara_toplam = siparis.toplam_tutar or Decimal('0')
+            kdv = ara_toplam * cls.KDV_ORANI
+            belgeler.append({
+                'siparis_no': siparis.siparis_no,
+                'tedarikci': {
+                    'ad': tedarikci.ad, 'kod': tedarikci.kod, 'telefon': tedarikci.telefon,
+                    'email': tedarikci.email, 'adres': tedarikci.adres,
+                },
+                'tarih': _tarih(siparis.tarih),
+                'teslim_tarihi': _tarih(siparis.teslim_tarihi),
+                'olusturan': (olusturan.get_full_name() or olusturan.username) if olusturan else '',
+                'kalemler': kalemler[pk],
+                'ara_toplam': f'{_tutar(ara_toplam)} TL',
+                'kdv': f'{_tutar(kdv)} TL',
+                'genel_toplam': f'{_tutar(ara_toplam + kdv)} TL',
+                'bugun': bugun,
+            })
+        return belgeler
+
+    @classmethod
+    def sayfalar(cls, belgeler):
+        """Belge başına sıkıştırılmış sayfa listesi; belgeler işçilere eşit parçalar halinde dağıtılır"""
+        sirket_adi = getattr(settings, 'SIRKET_ADI', 'ŞİRKET ADI')
+        havuz = cls.havuz()
+        if havuz is None or len(belgeler) < 2:
+            return belgeleri_ciz(belgeler, sirket_adi)
+        boyut = -(-len(belgeler) // getattr(settings, 'PDF_ISLEM_SAYISI', 2))
+        parcalar = [belgeler[i:i + boyut] for i in range(0, len(belgeler), boyut)]
+        sonuc = []
+        for parca_sonucu in havuz.map(belgeleri_ciz, parcalar, [sirket_adi] * len(parcalar)):
+            sonuc.extend(parca_sonucu)
+        return sonuc
+
+    @classmethod
+    def olustur(cls, siparis_idleri, bicim='pdf'):
+        """
+        Seçilen siparişlerin çıktısı: (içerik, content_type, dosya_adi).
+        'pdf' tüm siparişleri tek dosyada birleştirir, 'zip' sipariş başına ayrı PDF içerir.
+        """
+        if bicim not in cls.BICIMLER:
+            raise ValueError(f"Geçersiz PDF biçimi: {bicim}")
+        belgeler = cls.belge_verileri(siparis_idleri)
+        if not belgeler:
+            raise ValueError("Yazdırılacak satın alma siparişi bulunamadı")
+        sayfalar = cls.sayfalar(belgeler)
+        logger.info(f"{len(belgeler)} satın alma siparişi için {sum(map(len, sayfalar))} PDF sayfası çizildi")
+
+        if bicim == 'zip':
+            tampon = io.BytesIO()
+            with zipfile.ZipFile(tampon, 'w', zipfile.ZIP_STORED) as arsiv:
+                for belge, belge_sayfalari in zip(belgeler, sayfalar):
+                    arsiv.writestr(
+                        f"{belge['siparis_no']}.pdf",
+                        pdf_olustur(belge_sayfalari, baslik=f"Satın Alma Siparişi {belge['siparis_no']}"),
+                    )
+            tarih = timezone.localdate().strftime('%Y%m%d')
+            return tampon.getvalue(), 'application/zip', f'satinalma_siparisleri_{tarih}.zip'
+
+        tum_sayfalar = [sayfa for belge_sayfalari in sayfalar for sayfa in belge_sayfalari]
+        if len(belgeler) == 1:
+            dosya_adi = f"{belgeler[0]['siparis_no']}.pdf"
+        else:
+            dosya_adi = f"satinalma_siparisleri_{timezone.localdate().strftime('%Y%m%d')}.pdf"
+        return pdf_olustur(tum_sayfalar, baslik='Satın Alma Siparişleri'), 'application/pdf', dosya_adi
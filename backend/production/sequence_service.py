@@ -0,0 +1,104 @@
+"""
+Belge numarası servisi - DocumentSequence bloklarını bellekte tutarak çakışmasız numara üretir
+"""
+
+import logging
+import os
+import threading
+from datetime import date
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .models import DocumentSequence
+
+logger = logging.getLogger(__name__)
+
+
+class SequenceService:
+    """
+    Önek başına numara dağıtıcı.
+    Numaralar veritabanında blok halinde ayrılır, blok tükenene kadar veritabanına gidilmez.
+    Farklı süreçler farklı bloklardan numara alır; numaralar benzersizdir ama süreçler
+    arasında kesin artan sırada olmayabilir ve kullanılmayan numaralar boşluk bırakır.
+
+    DOCUMENT_SEQUENCE_DB aynı veritabanına açılmış ayrı bir bağlantı takma adıysa numaralar
+    her zaman o bağlantıda (autocommit) ayrılır; çağıranın transaction'ı sayaç satırını
+    commit'e kadar kilitlemez.
+    """
+
+    # Ayarlarda tanımlı değilse ilk oluşturmada kullanılacak şablonlar
+    VARSAYILAN_SABLONLAR = {
+        'IE': 'IE-{numara:07d}',
+        'AIE': 'AIE-{numara:06d}',
+        'SA': 'SA-{tarih:%Y}-{numara:05d}',
+        'SIP': 'SIP-{tarih:%Y}-{numara:05d}',
+    }
+
+    _bloklar = {}  # onek -> [siradaki, son, sablon]
+    _kilit = threading.Lock()
+    _pid = os.getpid()
+
+    @classmethod
+    def sonraki(cls, onek):
+        """Önek için sıradaki belge numarasını döndürür"""
+        return cls.ayir(onek, 1)[0]
+
+    @classmethod
+    def ayir(cls, onek, adet):
+        """Önek için `adet` adet biçimlendirilmiş belge numarası döndürür"""
+        numaralar, sablon = cls._numaralar(onek, adet)
+        bugun = date.today()
+        return [sablon.format(onek=onek, numara=numara, tarih=bugun) for numara in numaralar]
+
+    @classmethod
+    def onbellegi_temizle(cls):
+        """Bellekteki blokları bırakır (kalan numaralar kullanılmaz)"""
+        with cls._kilit:
+            cls._bloklar.clear()
+
+    @classmethod
+    def _numaralar(cls, onek, adet):
+        with cls._kilit:
+            # Fork edilen süreç üst sürecin bloklarını kullanmamalı
+            if cls._pid != os.getpid():
+                cls._bloklar.clear()
+                cls._pid = os.getpid()
+
+            numaralar = []
+            blok = cls._bloklar.get(onek)
+            sablon = blok[2] if blok else None
+            if blok:
+                alinan = min(adet, blok[1] - blok[0] + 1)
+                numaralar.extend(range(blok[0], blok[0] + alinan))
+                blok[0] += alinan
+
+            eksik = adet - len(numaralar)
+            if eksik:
+                varsayilan = cls._varsayilan_sablon(onek)
+                using = cls._veritabani()
+                if connections[using].in_atomic_block:
+                    # Aynı bağlantıda dış transaction geri alınırsa ayrılan blok da geri alınır;
+                    # bu yüzden transaction içinde sadece gereken kadar ayrılır, bellekte tutulmaz
+                    yeni = DocumentSequence.blok_ayir(onek, eksik, varsayilan, using=using)
+                    numaralar.extend(range(yeni.ilk, yeni.son + 1))
+                else:
+                    yeni = DocumentSequence.blok_ayir(onek, None, varsayilan, using=using)
+                    if yeni.son - yeni.ilk + 1 < eksik:
+                        ek = DocumentSequence.blok_ayir(onek, eksik, varsayilan, using=using)
+                        numaralar.extend(range(ek.ilk, ek.son + 1))
+                        cls._bloklar[onek] = [yeni.ilk, yeni.son, yeni.sablon]
+                    else:
+                        numaralar.extend(range(yeni.ilk, yeni.ilk + eksik))
+                        cls._bloklar[onek] = [yeni.ilk + eksik, yeni.son, yeni.sablon]
+                sablon = yeni.sablon
+            return numaralar, sablon
+
+    @staticmethod
+    def _veritabani():
+        return getattr(settings, 'DOCUMENT_SEQUENCE_DB', DEFAULT_DB_ALIAS)
+
+    @classmethod
+    def _varsayilan_sablon(cls, onek):
+        sablonlar = getattr(settings, 'DOCUMENT_SEQUENCE_SABLONLARI', {})
+        return sablonlar.get(onek) or cls.VARSAYILAN_SABLONLAR.get(onek)
@@ -7,6 +7,22 @@ from .models import (
 )
 
 
+class SparseFieldsMixin:
+    """GET isteklerinde `?fields=a,b` ile sadece istenen alanları döndürür"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method != 'GET':
+            return
+        alanlar = request.query_params.get('fields')
+        if not alanlar:
+            return
+        istenen = {alan.strip() for alan in alanlar.split(',') if alan.strip()}
+        for alan in set(self.fields) - istenen:
+            self.fields.pop(alan)
+
+
 
 class MusteriSerializer(serializers.ModelSerializer):
     class Meta:
@@ -174,10 +190,10 @@ class IsAkisiSerializer(serializers.ModelSerializer):
         return obj.operasyonlar.count()
 
 
-class IsEmriSerializer(serializers.ModelSerializer):
+class IsEmriSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """İş Emri Serializer"""
     durum_display = serializers.CharField(source='get_durum_display', read_only=True)
-    istasyon_adi = serializers.CharField(source='istasyon.ad', read_only=True)
+    istasyon_adi = serializers.CharField(source='planlanan_istasyon.ad', read_only=True, default=None)
     urun_adi = serializers.CharField(source='urun.ad', read_only=True)
     siparis_no = serializers.CharField(source='siparis.siparis_no', read_only=True)
     musteri_adi = serializers.CharField(source='siparis.musteri.ad', read_only=True)
@@ -0,0 +1,35 @@
+"""
+Model sinyalleri - tek tek delete() çağrılmadan silinen kayıtlar için yan tablo bakımı.
+Kademeli silmeler (Sipariş → kalem → iş emri) ve queryset.delete() model delete() metodunu
+çağırmaz; Django bu kayıtlar için de pre_delete/post_delete gönderir.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import receiver
+
+from .models import IsEmri, Siparis
+
+
+@receiver(pre_delete, sender=IsEmri)
+def is_emri_silinecek(sender, instance, **kwargs):
+    """Silmeden önce emrin yük anahtarı okunur (Collector tüm alanları yüklediği için çoğunlukla hazırdır)"""
+    if not hasattr(instance, '_yuk'):
+        from .kapasite_service import KapasiteService
+        instance._yuk = KapasiteService.kayitli_yuk(instance.pk)
+
+
+@receiver(post_delete, sender=IsEmri)
+def is_emri_silindi(sender, instance, **kwargs):
+    """Silinen emrin yükü istasyon günlük yük tablosundan düşülür, Gantt akışına 'sil' yazılır"""
+    from .degisiklik_akisi_service import DegisiklikAkisiService
+    from .kapasite_service import KapasiteService
+    KapasiteService.yuk_tasi(getattr(instance, '_yuk', None), None)
+    DegisiklikAkisiService.kaydet_silinen([instance.pk])
+
+
+@receiver(post_delete, sender=Siparis)
+def siparis_silindi(sender, instance, **kwargs):
+    """Sipariş sayıları değişti; dashboard istatistik önbelleği işlem bitince temizlenir"""
+    from .istatistik_service import IstatistikService
+    transaction.on_commit(IstatistikService.onbellegi_temizle)
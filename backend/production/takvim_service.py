@@ -0,0 +1,393 @@
+"""
+Çalışma takvimi servisi - istasyon vardiyaları, resmi tatiller ve istisnalardan
+kümülatif çalışma dakikası dizileri üretir; zaman hesapları ikili arama ile yapılır
+"""
+
+import logging
+import threading
+import time as zaman
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+
+from .models import IsIstasyonu, TakvimIstisnasi, TatilGunu
+
+logger = logging.getLogger(__name__)
+
+# Resmi tatiller: (ay, gün, ad, çalışma oranı). Arife günleri yarım gündür.
+SABIT_TATILLER = [
+    (1, 1, 'Yılbaşı', Decimal('0')),
+    (4, 23, 'Ulusal Egemenlik ve Çocuk Bayramı', Decimal('0')),
+    (5, 1, 'Emek ve Dayanışma Günü', Decimal('0')),
+    (5, 19, 'Atatürk\'ü Anma, Gençlik ve Spor Bayramı', Decimal('0')),
+    (7, 15, 'Demokrasi ve Milli Birlik Günü', Decimal('0')),
+    (8, 30, 'Zafer Bayramı', Decimal('0')),
+    (10, 28, 'Cumhuriyet Bayramı Arifesi', Decimal('0.5')),
+    (10, 29, 'Cumhuriyet Bayramı', Decimal('0')),
+]
+
+# Dini bayramlar Hicri takvime göre her yıl kayar: yıl -> [(ilk gün, gün sayısı, ad)]
+DINI_BAYRAMLAR = {
+    2025: [(date(2025, 3, 30), 3, 'Ramazan Bayramı'), (date(2025, 6, 6), 4, 'Kurban Bayramı')],
+    2026: [(date(2026, 3, 20), 3, 'Ramazan Bayramı'), (date(2026, 5, 27), 4, 'Kurban Bayramı')],
+    2027: [(date(2027, 3, 9), 3, 'Ramazan Bayramı'), (date(2027, 5, 16), 4, 'Kurban Bayramı')],
+}
+
+
+class TakvimUfkuHatasi(Exception):
+    """İstenen an önceden hesaplanan takvim aralığının dışında"""
+
+
+class CalismaTakvimi:
+    """
+    Bir istasyonun sıralı çalışma aralıkları ve her aralığın başındaki kümülatif çalışma dakikası.
+    'an + N çalışma dakikası' ve 'iki an arası çalışma dakikası' ikili arama ile O(log n) hesaplanır.
+    """
+
+    def __init__(self, araliklar, ufuk_baslangic, ufuk_bitis):
+        self.ufuk_baslangic = ufuk_baslangic
+        self.ufuk_bitis = ufuk_bitis
+        self.baslangiclar = []
+        self.bitisler = []
+        self.kumulatif = []  # aralık başındaki toplam çalışma dakikası
+        self.kumulatif_bitis = []  # aralık sonundaki toplam çalışma dakikası
+        toplam = 0.0
+        for baslangic, bitis in araliklar:
+            self.baslangiclar.append(baslangic)
+            self.bitisler.append(bitis)
+            self.kumulatif.append(toplam)
+            toplam += (bitis - baslangic).total_seconds() / 60
+            self.kumulatif_bitis.append(toplam)
+        self.toplam = toplam
+
+    def kapsar(self, an):
+        return self.ufuk_baslangic <= an <= self.ufuk_bitis
+
+    def ofset(self, an):
+        """Ufuk başından `an`a kadar geçen çalışma dakikası"""
+        if not self.kapsar(an):
+            raise TakvimUfkuHatasi(f"{an} takvim aralığı dışında")
+        i = bisect_right(self.baslangiclar, an) - 1
+        if i < 0:
+            return 0.0
+        return self.kumulatif[i] + (min(an, self.bitisler[i]) - self.baslangiclar[i]).total_seconds() / 60
+
+    def an(self, ofset):
+        """Ufuk başından `ofset` çalışma dakikası sonra gelen an (aralık sonuna denk gelirse aralık sonu)"""
+        if ofset > self.toplam or not self.baslangiclar:
+            raise TakvimUfkuHatasi(f"{ofset:.0f} çalışma dakikası takvim aralığını aşıyor")
+        i = bisect_left(self.kumulatif_bitis, ofset)
+        return self.baslangiclar[i] + timedelta(minutes=ofset - self.kumulatif[i])
+
+    def dakika_ekle(self, an, dakika):
+        """`an`dan itibaren `dakika` çalışma dakikası sonra biten an"""
+        if dakika <= 0:
+            return an
+        return self.an(self.ofset(an) + float(dakika))
+
+    def calisma_dakikasi(self, baslangic, bitis):
+        """İki an arasındaki çalışma dakikası"""
+        if bitis <= baslangic:
+            return 0.0
+        return self.ofset(bitis) - self.ofset(baslangic)
+
+    def gunluk_dakika(self, tarih):
+        """Verilen takvim günündeki çalışma dakikası"""
+        gun_basi = datetime.combine(tarih, time())
+        return self.calisma_dakikasi(gun_basi, gun_basi + timedelta(days=1))
+
+    def gunlere_dagit(self, an, dakika):
+        """
+        `an`dan başlayan `dakika` çalışma dakikalık işin günlere düşen kısmı: [(tarih, dakika), ...].
+        Takvim ufkunda karşılanamayan kalan kısım son çalışılan güne, hiç çalışma zamanı yoksa
+        başlangıç gününe yazılır.
+        """
+        dakika = float(dakika)
+        if dakika <= 0 or not self.kapsar(an):
+            return [(an.date(), dakika)]
+        onceki = self.ofset(an)
+        bitis = min(onceki + dakika, self.toplam)
+        dagilim = []
+        gun = an.date()
+        while onceki < bitis:
+            gun_sonu = datetime.combine(gun + timedelta(days=1), time())
+            gun_sonu = min(self.ofset(gun_sonu) if self.kapsar(gun_sonu) else self.toplam, bitis)
+            if gun_sonu > onceki:
+                dagilim.append((gun, gun_sonu - onceki))
+                onceki = gun_sonu
+            gun += timedelta(days=1)
+        if not dagilim:
+            return [(an.date(), dakika)]
+        kalan = dakika - sum(d for _, d in dagilim)
+        if kalan > 0:
+            dagilim[-1] = (dagilim[-1][0], dagilim[-1][1] + kalan)
+        return dagilim
+
+    def sonraki_calisma_ani(self, an):
+        """`an` çalışma zamanıysa kendisi, değilse sonraki vardiya başı"""
+        i = bisect_right(self.bitisler, an)
+        if i >= len(self.baslangiclar):
+            raise TakvimUfkuHatasi(f"{an} sonrasında takvimde çalışma zamanı yok")
+        return max(an, self.baslangiclar[i])
+
+
+class TakvimService:
+    """
+    İstasyon başına CalismaTakvimi üretir ve süreç içinde önbellekler.
+    Gün önceliği: istasyon istisnası > genel istisna > resmi tatil > vardiya deseni.
+    Vardiya deseni olmayan istasyon KAPASITE_CALISMA_GUNLERI günlerinde 08:00'den itibaren
+    gunluk_calisma_saati kadar çalışır.
+    """
+
+    _onbellek = {}  # istasyon_id (None = varsayılan) -> (oluşturulma, CalismaTakvimi)
+    _kilit = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Zaman hesapları
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def dakika_ekle(cls, istasyon_id, an, dakika):
+        """İstasyon takvimine göre `an` + `dakika` çalışma dakikası"""
+        takvim = cls.takvim(istasyon_id, an)
+        try:
+            return takvim.dakika_ekle(an, dakika)
+        except TakvimUfkuHatasi:
+            # Çok uzun işler: takvim ihtiyaç kadar uzatılır
+            gun = max(cls._ufuk_gun() * 2, int(float(dakika) / 60) + cls._ufuk_gun())
+            takvim = cls._olustur_ve_sakla(istasyon_id, an.date(), an.date() + timedelta(days=gun))
+            return takvim.dakika_ekle(an, dakika)
+
+    @classmethod
+    def gunlere_dagit(cls, istasyon_id, an, dakika, takvim=None):
+        """
+        İstasyon takvimine göre işin günlük dakikaları; verilen takvim `an`ı kapsamıyorsa önbellekten
+        alınır, iş ufku aşıyorsa takvim dakika_ekle'deki gibi uzatılır.
+        """
+        if takvim is None or not takvim.kapsar(an):
+            takvim = cls.takvim(istasyon_id, an)
+        if takvim.toplam and takvim.ofset(an) + float(dakika) > takvim.toplam:
+            gun = max(cls._ufuk_gun() * 2, int(float(dakika) / 60) + cls._ufuk_gun())
+            if takvim.ufuk_bitis.date() <= an.date() + timedelta(days=gun):
+                takvim = cls._olustur_ve_sakla(istasyon_id, an.date(), an.date() + timedelta(days=gun))
+        return takvim.gunlere_dagit(an, dakika)
+
+    @classmethod
+    def calisma_dakikasi(cls, istasyon_id, baslangic, bitis):
+        """İstasyon takvimine göre iki an arasındaki çalışma dakikası"""
+        takvim = cls.takvim(istasyon_id, baslangic)
+        if not takvim.kapsar(bitis):
+            takvim = cls._olustur_ve_sakla(istasyon_id, min(baslangic, bitis).date(), max(baslangic, bitis).date())
+        return takvim.calisma_dakikasi(baslangic, bitis)
+
+    @classmethod
+    def sonraki_calisma_ani(cls, istasyon_id, an):
+        return cls.takvim(istasyon_id, an).sonraki_calisma_ani(an)
+
+    # ------------------------------------------------------------------
+    # Takvim oluşturma ve önbellek
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def takvim(cls, istasyon_id=None, an=None):
+        """İstasyonun (None: varsayılan) `an`ı kapsayan takvimi"""
+        return cls.takvimler([istasyon_id], an)[istasyon_id]
+
+    @classmethod
+    def takvimler(cls, istasyon_idleri, an=None):
+        """Birden çok istasyonun takvimi; önbellekte olmayanlar birlikte oluşturulur"""
+        an = an or datetime.now()
+        if isinstance(an, date) and not isinstance(an, datetime):
+            an = datetime.combine(an, time())
+        simdi = zaman.monotonic()
+        sure = getattr(settings, 'TAKVIM_ONBELLEK_SURESI', 300)
+
+        sonuc, eksikler = {}, []
+        with cls._kilit:
+            for istasyon_id in set(istasyon_idleri):
+                kayit = cls._onbellek.get(istasyon_id)
+                if kayit and simdi - kayit[0] < sure and kayit[1].kapsar(an):
+                    sonuc[istasyon_id] = kayit[1]
+                else:
+                    eksikler.append(istasyon_id)
+        if eksikler:
+            baslangic = min(an.date(), date.today()) - timedelta(days=getattr(settings, 'TAKVIM_GECMIS_GUN', 60))
+            bitis = max(an.date(), date.today()) + timedelta(days=cls._ufuk_gun())
+            sonuc.update(cls._olustur_ve_sakla_toplu(eksikler, baslangic, bitis))
+        return sonuc
+
+    @classmethod
+    def onbellegi_temizle(cls):
+        with cls._kilit:
+            cls._onbellek.clear()
+
+    @classmethod
+    def _olustur_ve_sakla(cls, istasyon_id, baslangic, bitis):
+        return cls._olustur_ve_sakla_toplu([istasyon_id], baslangic, bitis)[istasyon_id]
+
+    @classmethod
+    def _olustur_ve_sakla_toplu(cls, istasyon_idleri, baslangic, bitis):
+        takvimler = cls.olustur(istasyon_idleri, baslangic, bitis)
+        simdi = zaman.monotonic()
+        with cls._kilit:
+            for istasyon_id, takvim in takvimler.items():
+                cls._onbellek[istasyon_id] = (simdi, takvim)
+        return takvimler
+
+    @classmethod
+    def olustur(cls, istasyon_idleri, baslangic, bitis):
+        """[baslangic, bitis] günleri için takvimleri üç sorguda oluşturur (önbelleğe yazmaz)"""
+        istasyonlar = IsIstasyonu.objects.filter(
+            pk__in=[i for i in istasyon_idleri if i is not None]
+        ).select_related('vardiya_deseni').order_by().only(
+            'id', 'gunluk_calisma_saati', 'vardiya_deseni__vardiyalar', 'vardiya_deseni__aktif'
+        )
+        desenler = {}
+        for istasyon in istasyonlar:
+            if istasyon.vardiya_deseni and istasyon.vardiya_deseni.aktif:
+                desenler[istasyon.pk] = cls._desen_normalize(istasyon.vardiya_deseni.vardiyalar)
+            else:
+                desenler[istasyon.pk] = cls._saatten_desen(istasyon.gunluk_calisma_saati)
+        for istasyon_id in istasyon_idleri:
+            # Silinmiş istasyon: hiç çalışma zamanı olmayan takvim
+            if istasyon_id is not None:
+                desenler.setdefault(istasyon_id, {})
+        if None in istasyon_idleri:
+            # Varsayılan takvim (Gantt başlıkları vb.): ayarda desen yoksa hafta içi 9 saat
+            varsayilan = getattr(settings, 'VARSAYILAN_VARDIYA_DESENI', None)
+            desenler[None] = cls._desen_normalize(varsayilan) if varsayilan else cls._saatten_desen(9)
+
+        tatiller = dict(TatilGunu.objects.filter(tarih__range=(baslangic, bitis)).values_list('tarih', 'calisma_orani'))
+        istisnalar = {}
+        for istasyon_id, tarih, vardiyalar in TakvimIstisnasi.objects.filter(
+            tarih__range=(baslangic, bitis)
+        ).order_by().values_list('istasyon_id', 'tarih', 'vardiyalar'):
+            istisnalar[(istasyon_id, tarih)] = cls._araliklar_normalize(vardiyalar)
+
+        ufuk_baslangic = datetime.combine(baslangic, time())
+        ufuk_bitis = datetime.combine(bitis + timedelta(days=1), time())
+        gunler = [baslangic + timedelta(days=i) for i in range((bitis - baslangic).days + 1)]
+        takvimler = {}
+        for istasyon_id, desen in desenler.items():
+            araliklar = []
+            for gun in gunler:
+                gun_araliklari = istisnalar.get((istasyon_id, gun))
+                if gun_araliklari is None:
+                    gun_araliklari = istisnalar.get((None, gun))
+                if gun_araliklari is None:
+                    gun_araliklari = desen.get(gun.weekday(), [])
+                    if gun in tatiller:
+                        gun_araliklari = cls._oranla_kisalt(gun_araliklari, tatiller[gun])
+                gun_basi = datetime.combine(gun, time())
+                for bas, bit in gun_araliklari:
+                    araliklar.append((gun_basi + bas, gun_basi + bit))
+            takvimler[istasyon_id] = CalismaTakvimi(
+                cls._birlestir(araliklar, ufuk_bitis), ufuk_baslangic, ufuk_bitis
+            )
+        return takvimler
+
+    @staticmethod
+    def _ufuk_gun():
+        return getattr(settings, 'TAKVIM_UFUK_GUN', 400)
+
+    @staticmethod
+    def _sure(saat):
+        if str(saat) == '24:00':
+            return timedelta(days=1)
+        deger = datetime.strptime(str(saat), '%H:%M')
+        return timedelta(hours=deger.hour, minutes=deger.minute)
+
+    @classmethod
+    def _araliklar_normalize(cls, araliklar):
+        """[["22:00", "06:00"]] -> gün başına göre timedelta çiftleri (gece yarısını geçen vardiya ertesi güne taşar)"""
+        sonuc = []
+        for bas, bit in araliklar or []:
+            bas, bit = cls._sure(bas), cls._sure(bit)
+            if bit <= bas:
+                bit += timedelta(days=1)
+            sonuc.append((bas, bit))
+        return sorted(sonuc)
+
+    @classmethod
+    def _desen_normalize(cls, vardiyalar):
+        return {int(gun): cls._araliklar_normalize(araliklar) for gun, araliklar in (vardiyalar or {}).items()}
+
+    @staticmethod
+    def _saatten_desen(gunluk_calisma_saati):
+        """Vardiya deseni yoksa: çalışma günlerinde 08:00'den itibaren günlük çalışma saati kadar"""
+        saat = min(Decimal(gunluk_calisma_saati or 0), Decimal(24))
+        if not saat:
+            return {}
+        sure = timedelta(minutes=int(saat * 60))
+        baslangic = min(timedelta(hours=8), timedelta(days=1) - sure)
+        calisma_gunleri = getattr(settings, 'KAPASITE_CALISMA_GUNLERI', (0, 1, 2, 3, 4))
+        return {gun: [(baslangic, baslangic + sure)] for gun in calisma_gunleri}
+
+    @staticmethod
+    def _oranla_kisalt(araliklar, oran):
+        """Yarım gün gibi kısmi tatillerde günün ilk `oran` kadarı çalışılır"""
+        oran = Decimal(oran)
+        if oran <= 0:
+            return []
+        if oran >= 1:
+            return araliklar
+        kalan = sum((bit - bas for bas, bit in araliklar), timedelta()) * float(oran)
+        sonuc = []
+        for bas, bit in araliklar:
+            if kalan <= timedelta():
+                break
+            sonuc.append((bas, min(bit, bas + kalan)))
+            kalan -= bit - bas
+        return sonuc
+
+    @staticmethod
+    def _birlestir(araliklar, ufuk_bitis):
+        """Çakışan/bitişik aralıkları birleştirir, ufuk sonunda keser"""
+        sonuc = []
+        for bas, bit in sorted(araliklar):
+            bit = min(bit, ufuk_bitis)
+            if bas >= bit:
+                continue
+            if sonuc and bas <= sonuc[-1][1]:
+                sonuc[-1] = (sonuc[-1][0], max(sonuc[-1][1], bit))
+            else:
+                sonuc.append((bas, bit))
+        return sonuc
+
+    # ------------------------------------------------------------------
+    # Resmi tatiller
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def resmi_tatiller(cls, yil):
+        """Yılın resmi tatilleri: [(tarih, ad, çalışma oranı)]"""
+        tatiller = [(date(yil, ay, gun), ad, oran) for ay, gun, ad, oran in SABIT_TATILLER]
+        if yil not in DINI_BAYRAMLAR:
+            logger.warning(f"{yil} için dini bayram tarihleri tanımlı değil, sadece sabit tatiller yüklenecek")
+        for ilk_gun, gun_sayisi, ad in DINI_BAYRAMLAR.get(yil, []):
+            tatiller.append((ilk_gun - timedelta(days=1), f'{ad} Arifesi', Decimal('0.5')))
+            for i in range(gun_sayisi):
+                tatiller.append((ilk_gun + timedelta(days=i), f'{ad} {i + 1}. Gün', Decimal('0')))
+        return sorted(tatiller)
+
+    @classmethod
+    def resmi_tatilleri_yukle(cls, yillar):
+        """Resmi tatilleri TatilGunu tablosuna yazar (elle girilmiş kayıtların adı/oranı güncellenir)"""
+        from .kapasite_service import KapasiteService
+        tatiller = [tatil for yil in yillar for tatil in cls.resmi_tatiller(yil)]
+        mevcut = TatilGunu.objects.in_bulk([t[0] for t in tatiller], field_name='tarih')
+        yeniler, degisenler = [], []
+        for tarih, ad, oran in tatiller:
+            kayit = mevcut.get(tarih)
+            if kayit is None:
+                yeniler.append(TatilGunu(tarih=tarih, ad=ad, calisma_orani=oran))
+            elif (kayit.ad, kayit.calisma_orani) != (ad, oran):
+                kayit.ad, kayit.calisma_orani = ad, oran
+                degisenler.append(kayit)
+        TatilGunu.objects.bulk_create(yeniler)
+        TatilGunu.objects.bulk_update(degisenler, ['ad', 'calisma_orani'])
+        # bulk işlemler save() çağırmaz; takvim ve kapasite burada tazelenir
+        KapasiteService.takvim_degisti(tarihler=[t[0] for t in tatiller])
+        return len(yeniler), len(degisenler)
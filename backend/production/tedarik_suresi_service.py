@@ -0,0 +1,145 @@
+"""
+Tedarik süresi servisi - gerçekleşen malzeme gelişlerinden tedarikçi/malzeme bazında
+sipariş→geliş süresi dağılımı (medyan, p90) ve siparişi verilmemiş ihtiyaçlar için süre tahmini
+"""
+
+import logging
+import math
+import statistics
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import F, Max, Sum
+
+from .models import SatinAlmaKalemi, TedarikSuresi
+
+logger = logging.getLogger(__name__)
+
+
+class TedarikSuresiService:
+    """
+    Öğrenilmiş tedarik süreleri tedarikçi+malzeme satırları olarak tutulur; her malzeme gelişinde
+    yalnızca gelişin satırı yeniden hesaplanır, diğer tedarikçilerin gelişleri taranmaz. Dağılım her
+    satır için en yeni TEDARIK_SURESI_GOZLEM_SAYISI gözlemden çıkarılır; böylece tedarikçi davranışı
+    değiştikçe tahmin de kayar.
+
+    Tahminde tedarikçi+malzeme satırı, yoksa malzemenin tüm tedarikçi satırlarının, o da yoksa tüm
+    satırların gözlem sayısıyla ağırlıklı ortalaması kullanılır; her düzeyde en az
+    TEDARIK_SURESI_MIN_GOZLEM gözlem aranır, hiç veri yoksa TEDARIK_SURESI_VARSAYILAN_GUN. Birleşik
+    düzeyler okuma anında hesaplandığından her geliş tahmine hemen yansır.
+    """
+
+    OLCULER = ('medyan_gun', 'p90_gun')
+
+    # ------------------------------------------------------------------
+    # Öğrenme
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def gozlemler(tedarikci_id=None, malzeme_adi=''):
+        """
+        Tamamı gelmiş satın alma kalemlerinin sipariş tarihinden son gelişine geçen gün sayıları,
+        en yeni gelişten başlayarak: ([gun, ...], son_gelis_tarihi)
+        """
+        kalemler = SatinAlmaKalemi.objects.exclude(siparis__durum='iptal')
+        if tedarikci_id:
+            kalemler = kalemler.filter(siparis__tedarikci_id=tedarikci_id)
+        if malzeme_adi:
+            kalemler = kalemler.filter(malzeme_ihtiyaci__malzeme_adi=malzeme_adi)
+        satirlar = kalemler.order_by().values('id', 'miktar', 'siparis__tarih').annotate(
+            gelen=Sum('gelisler__gelen_miktar'), son=Max('gelisler__gelis_tarihi'),
+        ).filter(gelen__gte=F('miktar')).order_by('-son', '-id').values_list(
+            'siparis__tarih', 'son'
+        )[:getattr(settings, 'TEDARIK_SURESI_GOZLEM_SAYISI', 100)]
+        satirlar = list(satirlar)
+        return [max((son - siparis_tarihi).days, 0) for siparis_tarihi, son in satirlar], (
+            satirlar[0][1] if satirlar else None
+        )
+
+    @staticmethod
+    def dagilim(gunler):
+        """(medyan, p90) gün; p90 en yakın sıra yöntemiyle, ikisi de gözlenmiş bir değer"""
+        sirali = sorted(gunler)
+        return statistics.median_high(sirali), sirali[math.ceil(len(sirali) * 0.9) - 1]
+
+    @classmethod
+    def hesapla(cls, tedarikci_id=None, malzeme_adi=''):
+        """Tek satırı gözlemlerden yeniden yazar; gözlem kalmadıysa satırı siler"""
+        gunler, son_gelis = cls.gozlemler(tedarikci_id, malzeme_adi)
+        if not gunler:
+            TedarikSuresi.objects.filter(tedarikci_id=tedarikci_id, malzeme_adi=malzeme_adi).delete()
+            return None
+        medyan, p90 = cls.dagilim(gunler)
+        satir, _ = TedarikSuresi.objects.update_or_create(
+            tedarikci_id=tedarikci_id, malzeme_adi=malzeme_adi,
+            defaults={'gozlem_sayisi': len(gunler), 'medyan_gun': medyan, 'p90_gun': p90, 'son_gelis_tarihi': son_gelis},
+        )
+        return satir
+
+    @classmethod
+    def gelis_kaydedildi(cls, tedarikci_id, malzeme_adi):
+        """MalzemeGelis kaydı/silinmesi sonrası tedarikçi+malzeme satırını günceller"""
+        return cls.hesapla(tedarikci_id, malzeme_adi)
+
+    @classmethod
+    def tumunu_hesapla(cls):
+        """Tabloyu geçmiş gelişlerden baştan kurar, yazılan satır sayısını döndürür"""
+        ciftler = set(SatinAlmaKalemi.objects.filter(gelisler__isnull=False).exclude(
+            siparis__durum='iptal'
+        ).order_by().values_list('siparis__tedarikci_id', 'malzeme_ihtiyaci__malzeme_adi').distinct())
+        TedarikSuresi.objects.all().delete()
+        yazilan = sum(1 for anahtar in ciftler if cls.hesapla(*anahtar))
+        logger.info(f"{yazilan} tedarik süresi satırı yazıldı")
+        return yazilan
+
+    # ------------------------------------------------------------------
+    # Tahmin
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _agirlikli(toplam, gozlem):
+        """Gözlem sayısıyla ağırlıklı ortalama gün, yukarı yuvarlanmış"""
+        return math.ceil(toplam / gozlem)
+
+    @classmethod
+    def tahmini_sureler(cls, malzeme_adlari, tedarikci_id=None, olcu=None):
+        """
+        {malzeme_adi: gün}. Boş malzeme adı genel süreyi verir. olcu 'medyan_gun' ya da 'p90_gun'
+        (varsayılan TEDARIK_SURESI_TAHMIN_OLCUSU). Malzemelerin satırları ve genel toplam iki sorguda okunur.
+        """
+        olcu = olcu or getattr(settings, 'TEDARIK_SURESI_TAHMIN_OLCUSU', 'p90_gun')
+        if olcu not in cls.OLCULER:
+            raise ValueError(f"Geçersiz tedarik süresi ölçüsü: {olcu}")
+        malzeme_adlari = set(malzeme_adlari)
+        en_az = getattr(settings, 'TEDARIK_SURESI_MIN_GOZLEM', 3)
+
+        ozel, malzeme = {}, defaultdict(lambda: [0, 0])  # ad -> gün; ad -> [gün * gözlem, gözlem]
+        for satir_tedarikci, ad, gozlem, gun in TedarikSuresi.objects.filter(
+            malzeme_adi__in=malzeme_adlari - {''}
+        ).values_list('tedarikci_id', 'malzeme_adi', 'gozlem_sayisi', olcu):
+            if tedarikci_id and satir_tedarikci == tedarikci_id and gozlem >= en_az:
+                ozel[ad] = gun
+            malzeme[ad][0] += gun * gozlem
+            malzeme[ad][1] += gozlem
+
+        genel = TedarikSuresi.objects.aggregate(toplam=Sum(F(olcu) * F('gozlem_sayisi')), gozlem=Sum('gozlem_sayisi'))
+        if (genel['gozlem'] or 0) >= en_az:
+            varsayilan = cls._agirlikli(genel['toplam'], genel['gozlem'])
+        else:
+            varsayilan = getattr(settings, 'TEDARIK_SURESI_VARSAYILAN_GUN', 14)
+
+        sureler = {}
+        for ad in malzeme_adlari:
+            toplam, gozlem = malzeme.get(ad, (0, 0))
+            if ad in ozel:
+                sureler[ad] = ozel[ad]
+            elif gozlem >= en_az:
+                sureler[ad] = cls._agirlikli(toplam, gozlem)
+            else:
+                sureler[ad] = varsayilan
+        return sureler
+
+    @classmethod
+    def genel_sure(cls, olcu=None):
+        """Malzeme bilinmediğinde kullanılan, tüm gelişlerden öğrenilen süre (gün)"""
+        return cls.tahmini_sureler([''], olcu=olcu)['']
@@ -0,0 +1,215 @@
+"""
+Tedarikçi performans servisi - satın alma siparişlerinin teslim tarihi, tarih revizyonları ve
+gerçekleşen malzeme gelişlerinden tedarikçi karnesi (zamanında %, gecikme, revizyon, doluluk)
+"""
+
+import logging
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import (
+    Case, Count, DecimalField, DurationField, ExpressionWrapper, F, FloatField, IntegerField, Max, OuterRef, Q,
+    Subquery, Sum, Value, When, Window,
+)
+from django.db.models.functions import Coalesce, Least, NullIf, Rank, RowNumber, TruncMonth
+from django.utils import timezone
+
+from .models import (
+    MalzemeGelis, SatinAlmaKalemi, SatinAlmaSiparisi, SatinAlmaTeslimGuncelleme, TedarikciPerformans,
+)
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+def ay_basi(tarih):
+    return tarih.replace(day=1)
+
+
+class TedarikciPerformansService:
+    """
+    Tedarikçi karnesi. Sipariş başına ölçüler alt sorgularla, tedarikçi-ay toplamları pencere
+    fonksiyonlarıyla tek SQL'de hesaplanır ve TedarikciPerformans tablosunda önbelleklenir.
+    Geliş, tarih revizyonu veya sipariş değişince ilgili satırlar silinir ve ilk okumada yeniden hesaplanır.
+
+    Ölçüler (ay: ilk verilen teslim tarihinin ayı):
+      - zamanında %: tamamlanan siparişlerden son gelişi ilk teslim tarihini aşmayanlar / vadesi gelenler
+        (tamamlanan + teslim tarihi geçmiş açık siparişler)
+      - ortalama gecikme: vadesi gelen sipariş başına gecikme günü (açık siparişlerde bugüne kadar)
+      - revizyon: teslim tarihini gerçekten değiştiren SatinAlmaTeslimGuncelleme kayıtları
+      - doluluk %: kalem başına min(gelen, sipariş edilen) toplamı / sipariş edilen toplamı
+    """
+
+    # ------------------------------------------------------------------
+    # Hesaplama
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def siparis_olculeri(siparisler, bugun=None):
+        """Satın alma siparişlerine karne ölçülerini ekler (tedarikçi-ay gruplamasından önceki adım)"""
+        bugun = bugun or timezone.localdate()
+        son_gelis = MalzemeGelis.objects.filter(satinalma_siparisi=OuterRef('pk')).order_by().values(
+            'satinalma_siparisi'
+        ).annotate(son=Max('gelis_tarihi')).values('son')
+        revizyon = SatinAlmaTeslimGuncelleme.objects.filter(siparis=OuterRef('pk')).exclude(
+            yeni_teslim_tarihi=F('eski_teslim_tarihi')
+        ).order_by().values('siparis').annotate(adet=Count('id')).values('adet')
+        kalem_gelen = MalzemeGelis.objects.filter(satinalma_kalemi=OuterRef('pk')).order_by().values(
+            'satinalma_kalemi'
+        ).annotate(toplam=Sum('gelen_miktar')).values('toplam')
+        kalemler = SatinAlmaKalemi.objects.filter(siparis=OuterRef('pk')).order_by().values('siparis')
+        miktar_alani = DecimalField(max_digits=16, decimal_places=2)
+
+        tamamlandi = Q(durum='tamamlandi', son_gelis__isnull=False)
+        gecikmis_acik = Q(durum__in=SatinAlmaSiparisi.ACIK_DURUMLAR, teslim_tarihi__lt=bugun)
+        return siparisler.exclude(durum='iptal').annotate(
+            ay=TruncMonth('teslim_tarihi'),
+            son_gelis=Subquery(son_gelis),
+            revizyon=Coalesce(Subquery(revizyon), 0),
+            siparis_edilen=Coalesce(
+                Subquery(kalemler.annotate(toplam=Sum('miktar')).values('toplam')), Value(0), output_field=miktar_alani
+            ),
+            karsilanan=Coalesce(
+                Subquery(kalemler.annotate(toplam=Sum(
+                    Least(Coalesce(Subquery(kalem_gelen), Value(0), output_field=miktar_alani), F('miktar'))
+                )).values('toplam')),
+                Value(0), output_field=miktar_alani,
+            ),
+        ).annotate(
+            vadesi_geldi=Case(When(tamamlandi | gecikmis_acik, then=1), default=0, output_field=IntegerField()),
+            zamaninda_mi=Case(
+                When(tamamlandi & Q(son_gelis__lte=F('teslim_tarihi')), then=1), default=0, output_field=IntegerField()
+            ),
+            kayma=Case(
+                When(tamamlandi & Q(son_gelis__gt=F('teslim_tarihi')), then=F('son_gelis') - F('teslim_tarihi')),
+                When(gecikmis_acik, then=Value(bugun) - F('teslim_tarihi')),
+                default=Value(timedelta(0)), output_field=DurationField(),
+            ),
+            acik=Case(When(durum__in=SatinAlmaSiparisi.ACIK_DURUMLAR, then=1), default=0, output_field=IntegerField()),
+        )
+
+    @classmethod
+    def aylik_toplamlar(cls, siparisler, bugun=None):
+        """
+        Tedarikçi-ay başına tek satır: pencere fonksiyonları bölümün toplamlarını her siparişe
+        taşır, RowNumber ile bölümün ilk satırı alınır
+        """
+        bolum = {'partition_by': [F('tedarikci_id'), F('ay')]}
+        return cls.siparis_olculeri(siparisler, bugun).annotate(
+            satir=Window(RowNumber(), order_by=F('id').asc(), **bolum),
+            b_siparis=Window(Count('id'), **bolum),
+            b_vadesi_gelen=Window(Sum('vadesi_geldi'), **bolum),
+            b_zamaninda=Window(Sum('zamaninda_mi'), **bolum),
+            b_kayma=Window(Sum('kayma'), **bolum),
+            b_revizyon=Window(Sum('revizyon'), **bolum),
+            b_siparis_edilen=Window(Sum('siparis_edilen'), **bolum),
+            b_karsilanan=Window(Sum('karsilanan'), **bolum),
+            b_acik=Window(Sum('acik'), **bolum),
+        ).filter(satir=1).values_list(
+            'tedarikci_id', 'ay', 'b_siparis', 'b_vadesi_gelen', 'b_zamaninda', 'b_kayma', 'b_revizyon',
+            'b_siparis_edilen', 'b_karsilanan', 'b_acik',
+        )
+
+    @classmethod
+    def hesapla(cls, tedarikci_idleri, baslangic, bitis):
+        """Verilen tedarikçilerin [baslangic, bitis] aylarındaki karne satırlarını yeniden yazar"""
+        siparisler = SatinAlmaSiparisi.objects.filter(
+            tedarikci_id__in=tedarikci_idleri, teslim_tarihi__gte=ay_basi(baslangic), teslim_tarihi__lte=bitis
+        )
+        satirlar = [
+            TedarikciPerformans(
+                tedarikci_id=tedarikci_id, ay=ay, siparis_sayisi=siparis, vadesi_gelen=vadesi_gelen or 0,
+                zamaninda=zamaninda or 0, toplam_kayma_gun=kayma.days if kayma else 0, revizyon_sayisi=revizyon or 0,
+                siparis_miktari=siparis_edilen or 0, karsilanan_miktar=karsilanan or 0, acik_siparis=acik or 0,
+            )
+            for (tedarikci_id, ay, siparis, vadesi_gelen, zamaninda, kayma, revizyon,
+                 siparis_edilen, karsilanan, acik) in cls.aylik_toplamlar(siparisler)
+        ]
+        with transaction.atomic():
+            TedarikciPerformans.objects.filter(
+                tedarikci_id__in=tedarikci_idleri, ay__gte=ay_basi(baslangic), ay__lte=bitis
+            ).delete()
+            TedarikciPerformans.objects.bulk_create(satirlar, batch_size=BATCH_SIZE)
+        return len(satirlar)
+
+    @classmethod
+    def guncelle(cls, baslangic, bitis):
+        """
+        Aralıkta siparişi olup önbellekte bulunmayan ya da açık siparişi olup bugünden önce
+        hesaplanmış tedarikçi-ay satırlarını hesaplar
+        """
+        baslangic = ay_basi(baslangic)
+        bugun_basi = timezone.make_aware(datetime.combine(timezone.localdate(), time()))
+        gerekli = set(SatinAlmaSiparisi.objects.exclude(durum='iptal').filter(
+            teslim_tarihi__gte=baslangic, teslim_tarihi__lte=bitis
+        ).order_by().annotate(ay=TruncMonth('teslim_tarihi')).values_list('tedarikci_id', 'ay').distinct())
+        gecerli = set(TedarikciPerformans.objects.filter(ay__gte=baslangic, ay__lte=bitis).filter(
+            Q(acik_siparis=0) | Q(hesaplama_zamani__gte=bugun_basi)
+        ).values_list('tedarikci_id', 'ay'))
+        eksik = gerekli - gecerli
+        if not eksik:
+            return 0
+        aylar = [ay for _, ay in eksik]
+        son_ay = max(aylar)
+        return cls.hesapla(
+            {tedarikci_id for tedarikci_id, _ in eksik}, min(aylar),
+            (son_ay + timedelta(days=31)).replace(day=1) - timedelta(days=1),
+        )
+
+    @staticmethod
+    def gecersiz_kil(tedarikci_id, tarih=None):
+        """Tedarikçinin (tarih verilirse yalnızca o ayın) önbellek satırlarını siler"""
+        satirlar = TedarikciPerformans.objects.filter(tedarikci_id=tedarikci_id)
+        if tarih:
+            satirlar = satirlar.filter(ay=ay_basi(tarih))
+        satirlar.delete()
+
+    # ------------------------------------------------------------------
+    # Okuma
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def siralama(cls, baslangic, bitis, limit=None):
+        """
+        Aralıktaki tedarikçi karneleri, en iyiden kötüye sıralı ve Rank ile numaralı.
+        Önce önbellek tamamlanır, ardından aylık satırlar tek gruplanmış sorguda toplanır.
+        """
+        cls.guncelle(baslangic, bitis)
+        oran = FloatField()
+        satirlar = TedarikciPerformans.objects.filter(ay__gte=ay_basi(baslangic), ay__lte=bitis).order_by().values(
+            'tedarikci_id', 'tedarikci__ad', 'tedarikci__kod'
+        ).annotate(
+            toplam_siparis=Sum('siparis_sayisi'),
+            toplam_vadesi_gelen=Sum('vadesi_gelen'),
+            toplam_zamaninda=Sum('zamaninda'),
+            toplam_revizyon=Sum('revizyon_sayisi'),
+            zamaninda_orani=Sum('zamaninda') * Value(100.0) / NullIf(Sum('vadesi_gelen'), 0),
+            ortalama_kayma_gun=Sum('toplam_kayma_gun') * Value(1.0) / NullIf(Sum('vadesi_gelen'), 0),
+            doluluk_orani=ExpressionWrapper(
+                Sum('karsilanan_miktar') * Value(100.0) / NullIf(Sum('siparis_miktari'), 0), output_field=oran
+            ),
+        ).annotate(
+            sira=Window(Rank(), order_by=[
+                F('zamaninda_orani').desc(nulls_last=True), F('ortalama_kayma_gun').asc(nulls_last=True),
+                F('doluluk_orani').desc(nulls_last=True),
+            ]),
+        ).order_by('sira', 'tedarikci__ad')
+        if limit:
+            satirlar = satirlar[:limit]
+        return [
+            {
+                'sira': s['sira'],
+                'tedarikci_id': s['tedarikci_id'],
+                'ad': s['tedarikci__ad'],
+                'kod': s['tedarikci__kod'],
+                'siparis_sayisi': s['toplam_siparis'],
+                'vadesi_gelen': s['toplam_vadesi_gelen'],
+                'zamaninda': s['toplam_zamaninda'],
+                'zamaninda_orani': None if s['zamaninda_orani'] is None else round(s['zamaninda_orani'], 1),
+                'ortalama_kayma_gun': None if s['ortalama_kayma_gun'] is None else round(s['ortalama_kayma_gun'], 1),
+                'revizyon_sayisi': s['toplam_revizyon'],
+                'doluluk_orani': None if s['doluluk_orani'] is None else round(s['doluluk_orani'], 1),
+            }
+            for s in satirlar
+        ]
@@ -1,3 +1,1937 @@
-from django.test import TestCase
+import csv
+import os
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .currency_service import CurrencyService
+from .degisiklik_akisi_service import DegisiklikAkisiService
+from .is_akisi_service import DerlenmisRota, IsAkisiService, IsAkisiTasarimHatasi
+from .is_emri_service import IsEmriService
+from .istatistik_service import IstatistikService
+from .kapasite_service import KapasiteService
+from .metrik_service import MetrikService
+from .middleware import query_profile_buffer
+from .mikro_fly_service import MikroFlyService
+from .models import (
+    Musteri, Urun, Siparis, SiparisKalem, IsIstasyonu, IsAkisi, IsAkisiOperasyon, IsAkisiSurumu, IsEmri,
+    DocumentSequence, StandardIsAdimi, TatilGunu, IstasyonGunlukYuk, VardiyaDeseni, TakvimIstisnasi,
+    PlanlamaDegisiklik, UrunRecete, Tedarikci, SatinAlmaSiparisi, SatinAlmaKalemi, MalzemeIhtiyac, MalzemeGelis,
+    GunlukMetrik, SatinAlmaTeslimGuncelleme, TedarikciPerformans, TedarikSuresi,
+    OperasyonSinifi, OperasyonSinifPolitikasi, DosyaIcerigi, ParcaliYukleme, YuklemeParcasi, SiparisDosya
+)
+from .operasyon_politika_service import OperasyonPolitikaService
+from .planlama_service import PlanlamaHatasi, PlanlamaService, cizelgele
+from .sequence_service import SequenceService
+from .takvim_service import TakvimService
+from .tedarik_suresi_service import TedarikSuresiService
+from .tedarikci_performans_service import TedarikciPerformansService
+
+
+def temel_kayitlar(istasyon_tipi='makine', **istasyon_alanlari):
+    """Testlerin ortak başlangıcı: (MST001 müşterisi, URN001 trafosu, IST01 'Sargı 1' istasyonu)"""
+    musteri = Musteri.objects.create(kod='MST001', ad='Test Müşteri')
+    urun = Urun.objects.create(kod='URN001', ad='Trafo', kategori='bitmis_urun', birim='adet')
+    istasyon = IsIstasyonu.objects.create(kod='IST01', ad='Sargı 1', tip=istasyon_tipi, **istasyon_alanlari)
+    return musteri, urun, istasyon
+
+
+def sargi_akisi(urun, istasyon, operasyon_adi='Sargı', standart_sure=60):
+    """Ürün için tek operasyonlu AKS01 iş akışı: (is_akisi, operasyon)"""
+    is_akisi = IsAkisi.objects.create(kod='AKS01', ad='Trafo Akışı', urun=urun)
+    operasyon = IsAkisiOperasyon.objects.create(
+        is_akisi=is_akisi, istasyon=istasyon, operasyon_adi=operasyon_adi, standart_sure=standart_sure
+    )
+    return is_akisi, operasyon
+
+
+class IsEmriAPITest(TestCase):
+    """İş emri API'sinin sorgu sayısı satır sayısından bağımsız olmalı"""
+
+    @classmethod
+    def setUpTestData(cls):
+        musteri, cls.urun, cls.istasyon = temel_kayitlar('sargi')
+        diger_istasyon = IsIstasyonu.objects.create(kod='IST02', ad='Montaj 1', tip='montaj')
+        is_akisi, cls.operasyon = sargi_akisi(cls.urun, cls.istasyon)
+        cls.siparis = Siparis.objects.create(musteri=musteri, siparis_no='SIP-001')
+
+        onceki = None
+        for i in range(12):
+            emir = IsEmri.objects.create(
+                emirNo=f'IE-{i:04d}', ana_emirNo='AIE-001',
+                siparis=cls.siparis, urun=cls.urun, is_akisi=is_akisi, operasyon=cls.operasyon,
+                planlanan_istasyon=cls.istasyon if i % 2 else diger_istasyon,
+                durum='planlandi' if i < 8 else 'tamamlandi',
+            )
+            if onceki:
+                emir.onceki_operasyonlar.add(onceki)
+            onceki = emir
+
+    def test_liste_sorgu_sayisi_sabit(self):
+        # Keyset: 1 sayfa sorgusu + 1 öncül operasyon prefetch (COUNT yok)
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/is-emirleri/?sayfalama=cursor&page_size=3')
+        self.assertEqual(len(response.json()['results']), 3)
+
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/is-emirleri/?sayfalama=cursor&page_size=12')
+        self.assertEqual(len(response.json()['results']), 12)
+
+    def test_varsayilan_sayfa_numarali_sozlesme(self):
+        yanit = self.client.get('/api/is-emirleri/?ordering=emirNo').json()
+        self.assertEqual(yanit['count'], 12)
+        self.assertEqual(yanit['results'][0]['emirNo'], 'IE-0000')
+        self.assertEqual(self.client.get('/api/siparis-kalemleri/').json()['count'], 0)
+
+    def test_keyset_desteklenmeyen_siralama_reddedilir(self):
+        yanit = self.client.get('/api/is-emirleri/?sayfalama=cursor&ordering=oncelik')
+        self.assertEqual(yanit.status_code, 400)
+        self.assertIn('ordering', yanit.json())
+        self.assertEqual(self.client.get('/api/is-emirleri/?sayfalama=cursor&ordering=-id').status_code, 200)
+
+    def test_sparse_fields_prefetch_atlanir(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/is-emirleri/?sayfalama=cursor&fields=id,emirNo,istasyon_adi')
+        satir = response.json()['results'][0]
+        self.assertEqual(set(satir), {'id', 'emirNo', 'istasyon_adi'})
+
+    def test_filtreler(self):
+        response = self.client.get(
+            f'/api/is-emirleri/?planlanan_istasyon={self.istasyon.id}&durum=planlandi&ana_emirNo=AIE-001'
+        )
+        self.assertEqual(response.status_code, 200)
+        sonuclar = response.json()['results']
+        self.assertEqual(len(sonuclar), 4)
+        self.assertTrue(all(s['istasyon_adi'] == 'Sargı 1' for s in sonuclar))
+
+
+class KatalogAPITest(TestCase):
+    """Müşteri/ürün listelerinde keyset sayfalama, dropdown seçenekleri ve önek araması"""
+
+    @classmethod
+    def setUpTestData(cls):
+        for kod, ad, aktif in [
+            ('MST003', 'Gamma Enerji', True), ('MST001', 'Alfa Trafo', True), ('MST005', 'Epsilon Metal', False),
+            ('MST002', 'Beta Elektrik', True), ('MST004', 'Delta Pano', True),
+        ]:
+            Musteri.objects.create(kod=kod, ad=ad, aktif=aktif)
+        for kod, ad, kategori in [
+            ('TRF-100', 'Trafo 100 kVA', 'bitmis_urun'), ('TRF-250', 'Trafo 250 kVA', 'bitmis_urun'),
+            ('HAM-01', 'Bakir Tel', 'hammadde'), ('HAM-02', 'Kuru Trafo Yagi', 'hammadde'),
+        ]:
+            Urun.objects.create(kod=kod, ad=ad, kategori=kategori, birim='adet')
+
+    def test_keyset_sayfalari_kod_sirasiyla_gezer(self):
+        url = '/api/musteriler/?sayfalama=cursor&page_size=2'
+        kodlar = []
+        while url:
+            yanit = self.client.get(url).json()
+            self.assertNotIn('count', yanit)
+            kodlar.extend(satir['kod'] for satir in yanit['results'])
+            url = yanit['next']
+        self.assertEqual(kodlar, ['MST001', 'MST002', 'MST003', 'MST004', 'MST005'])
+
+        # Filtreler keyset sayfalamada da uygulanır
+        yanit = self.client.get('/api/musteriler/?sayfalama=cursor&aktif=false').json()
+        self.assertEqual([satir['kod'] for satir in yanit['results']], ['MST005'])
+
+    def test_secenekler_etiket_ve_filtre(self):
+        with self.assertNumQueries(1):
+            yanit = self.client.get('/api/musteriler/secenekler/?aktif=true&ordering=kod')
+        self.assertEqual(yanit.json()[0], {'id': Musteri.objects.get(kod='MST001').id, 'label': 'MST001 - Alfa Trafo'})
+        self.assertEqual(len(yanit.json()), 4)
+
+        with override_settings(SECENEK_LIMIT=2):
+            self.assertEqual(len(self.client.get('/api/urunler/secenekler/').json()), 2)
+
+    def test_onek_aramasi(self):
+        yanit = self.client.get('/api/urunler/ara/?q=trafo')
+        # Kod ya da adın başıyla eşleşir, koda göre sıralanır; adın ortasındaki "Trafo" eşleşmez
+        self.assertEqual([satir['kod'] for satir in yanit.json()], ['TRF-100', 'TRF-250'])
+        self.assertEqual(set(yanit.json()[0]), {'id', 'kod', 'ad'})
+
+        self.assertEqual([satir['kod'] for satir in self.client.get('/api/urunler/ara/?q=ham&kategori=hammadde').json()],
+                         ['HAM-01', 'HAM-02'])
+        # Pasif müşteriler typeahead'de çıkmaz
+        self.assertEqual(self.client.get('/api/musteriler/ara/?q=eps').json(), [])
+
+        with override_settings(ARAMA_MAX_LIMIT=3):
+            self.assertEqual(len(self.client.get('/api/urunler/ara/?limit=100').json()), 3)
+        self.assertEqual(self.client.get('/api/urunler/ara/?limit=abc').status_code, 400)
+
+    def test_arama_etag(self):
+        yanit = self.client.get('/api/musteriler/ara/?q=MST')
+        self.assertEqual(yanit.status_code, 200)
+        etag = yanit['ETag']
+        self.assertIn('private', yanit['Cache-Control'])
+        self.assertIn('max-age=300', yanit['Cache-Control'])
+
+        tekrar = self.client.get('/api/musteriler/ara/?q=MST', headers={'If-None-Match': etag})
+        self.assertEqual(tekrar.status_code, 304)
+        self.assertEqual(tekrar['ETag'], etag)
+
+        # Sonuç değişince ETag da değişir
+        Musteri.objects.filter(kod='MST004').update(ad='Delta Pano AŞ')
+        yanit = self.client.get('/api/musteriler/ara/?q=MST', headers={'If-None-Match': etag})
+        self.assertEqual(yanit.status_code, 200)
+        self.assertNotEqual(yanit['ETag'], etag)
+
+
+class IsEmriServiceTest(TestCase):
+    """Siparişlerden toplu iş emri üretimi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        musteri, cls.urun, istasyon = temel_kayitlar('sargi')
+        akissiz_urun = Urun.objects.create(kod='URN002', ad='Pano', kategori='bitmis_urun', birim='adet')
+        is_akisi = IsAkisi.objects.create(kod='AKS01', ad='Trafo Akışı', urun=cls.urun)
+        # AG ve YG sargı paralel, montaj ikisini bekler
+        ag = IsAkisiOperasyon.objects.create(is_akisi=is_akisi, istasyon=istasyon, operasyon_adi='AG Sargı', standart_sure=30)
+        yg = IsAkisiOperasyon.objects.create(is_akisi=is_akisi, istasyon=istasyon, operasyon_adi='YG Sargı', standart_sure=40)
+        montaj = IsAkisiOperasyon.objects.create(
+            is_akisi=is_akisi, istasyon=istasyon, operasyon_adi='Montaj', standart_sure=60, hazirlik_suresi=15
+        )
+        montaj.onceki_operasyonlar.add(ag, yg)
+
+        cls.siparis = Siparis.objects.create(musteri=musteri, siparis_no='SIP-001')
+        for urun, miktar in [(cls.urun, 2), (cls.urun, 3), (akissiz_urun, 1)]:
+            SiparisKalem.objects.create(
+                siparis=cls.siparis, urun=urun, miktar=miktar, birim_fiyat=100, teslim_tarihi='2030-01-01'
+            )
+
+    def test_is_emirleri_rota_ile_olusturulur(self):
+        with self.captureOnCommitCallbacks() as geri_cagirmalar:
+            sonuc = IsEmriService.is_emirleri_olustur([self.siparis])
+        # Sipariş durumu toplu güncellendi; dashboard istatistikleri temizlenir
+        self.assertIn(IstatistikService.onbellegi_temizle, geri_cagirmalar)
+        self.assertEqual(sonuc['is_emri_sayisi'], 6)
+        self.assertEqual(len(sonuc['atlanan_kalemler']), 1)
+
+        montajlar = IsEmri.objects.filter(operasyon__operasyon_adi='Montaj')
+        self.assertEqual(montajlar.count(), 2)
+        for montaj in montajlar:
+            oncekiler = montaj.onceki_operasyonlar.all()
+            self.assertEqual(len(oncekiler), 2)
+            # Bağımlılıklar aynı kalemin emirlerine bağlanmalı
+            self.assertTrue(all(o.ana_emirNo == montaj.ana_emirNo for o in oncekiler))
+            self.assertEqual(montaj.planlanan_sure, 60 * montaj.planlanan_miktar + 15)
+            # Rota sırasıyla tarihlenir: montaj iki sargı da bittikten sonra başlar
+            bitisler = [datetime.combine(o.planlanan_bitis_tarihi, o.planlanan_bitis_saati) for o in oncekiler]
+            self.assertGreaterEqual(montaj.planlanan_baslangic_ani(), max(bitisler))
+            self.assertGreater(max(bitisler), min(o.planlanan_baslangic_ani() for o in oncekiler))
+
+        self.assertEqual(IsEmri.objects.values('emirNo').distinct().count(), 6)
+        self.siparis.refresh_from_db()
+        self.assertEqual(self.siparis.durum, 'is_emirleri_olusturuldu')
+
+    def test_tekrar_cagrilmasi_guvenli(self):
+        IsEmriService.is_emirleri_olustur([self.siparis.pk])
+        sonuc = IsEmriService.is_emirleri_olustur([self.siparis.pk])
+        self.assertEqual(sonuc['is_emri_sayisi'], 0)
+        self.assertEqual(IsEmri.objects.count(), 6)
+
+
+class SequenceServiceTest(TransactionTestCase):
+    """Blok halinde belge numarası ayırma"""
+
+    def setUp(self):
+        SequenceService.onbellegi_temizle()
+
+    def tearDown(self):
+        SequenceService.onbellegi_temizle()
+
+    def test_blok_bellekten_dagitilir(self):
+        DocumentSequence.objects.create(onek='TST', sablon='TST-{numara:04d}', blok_boyutu=10)
+        ilk = SequenceService.sonraki('TST')
+        with self.assertNumQueries(0):
+            sonrakiler = SequenceService.ayir('TST', 9)
+        self.assertEqual([ilk] + sonrakiler, [f'TST-{i:04d}' for i in range(1, 11)])
+
+        # Blok bitince yeni blok ayrılır
+        self.assertEqual(SequenceService.sonraki('TST'), 'TST-0011')
+        self.assertEqual(DocumentSequence.objects.get(onek='TST').son_deger, 20)
+
+    def test_bloktan_buyuk_istek(self):
+        DocumentSequence.objects.create(onek='TST', blok_boyutu=5)
+        numaralar = SequenceService.ayir('TST', 12)
+        self.assertEqual(len(set(numaralar)), 12)
+        self.assertNotIn(numaralar[-1], SequenceService.ayir('TST', 5))
+
+    def test_varsayilan_sablon_tarihli(self):
+        self.assertEqual(SequenceService.sonraki('SA'), f'SA-{date.today():%Y}-00001')
+
+    def test_blok_tek_sorguda_ayrilir(self):
+        DocumentSequence.objects.create(onek='TST', sablon='TST-{numara:04d}', blok_boyutu=10)
+        # Sayaç UPDATE ... RETURNING ile artırılıp okunur
+        with self.assertNumQueries(1):
+            blok = DocumentSequence.blok_ayir('TST')
+        self.assertEqual((blok.ilk, blok.son, blok.sablon), (1, 10, 'TST-{numara:04d}'))
+        self.assertEqual(DocumentSequence.blok_ayir('TST', 3)[:2], (11, 13))
+
+    def test_blok_ayirma_guncellenme_tarihini_yazar(self):
+        from django.db import connection
+        sayac = DocumentSequence.objects.create(onek='TST', blok_boyutu=10)
+        eski = timezone.now() - timedelta(days=1)
+        DocumentSequence.objects.filter(pk=sayac.pk).update(guncellenme_tarihi=eski)
+
+        once = timezone.now()
+        DocumentSequence.blok_ayir('TST')
+        sayac.refresh_from_db()
+        self.assertGreaterEqual(sayac.guncellenme_tarihi, once)
+
+        # RETURNING desteklemeyen veritabanlarındaki update() yolu da zaman damgasını yazar
+        DocumentSequence.objects.filter(pk=sayac.pk).update(guncellenme_tarihi=eski)
+        with mock.patch.object(connection.features, 'can_return_columns_from_insert', False):
+            self.assertEqual(DocumentSequence.blok_ayir('TST', 3)[:2], (11, 13))
+        sayac.refresh_from_db()
+        self.assertGreaterEqual(sayac.guncellenme_tarihi, once)
+
+    def test_admin_ekleme_formu_numara_harcamaz(self):
+        from django.contrib import admin
+        from django.contrib.auth.models import User
+        from django.test import RequestFactory
+        kullanici = User.objects.create_superuser('yonetici', 'y@example.com', 'x')
+        self.client.force_login(kullanici)
+        for _ in range(2):
+            self.assertEqual(self.client.get(reverse('admin:production_siparis_add')).status_code, 200)
+        self.assertFalse(DocumentSequence.objects.filter(onek='SIP', son_deger__gt=0).exists())
+
+        istek = RequestFactory().post('/')
+        istek.user = kullanici
+        siparis = Siparis(musteri=Musteri.objects.create(kod='MST001', ad='Test'), siparis_no='')
+        admin.site._registry[Siparis].save_model(istek, siparis, None, False)
+        self.assertEqual(siparis.siparis_no, f'SIP-{date.today():%Y}-00001')
+
+
+class IsAkisiTasarimKayitTest(TestCase):
+    """Görsel tasarımcı kaydı sadece farkları yazmalı"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.urun = Urun.objects.create(kod='URN001', ad='Trafo', kategori='bitmis_urun', birim='adet')
+        cls.istasyon = IsIstasyonu.objects.create(kod='IST01', ad='Montaj 1', tip='montaj')
+        cls.adim = StandardIsAdimi.objects.create(
+            kod='STD01', ad='Montaj', kategori='montaj', tahmini_sure_birim=30, gerekli_istasyon_tipi='montaj'
+        )
+
+    def setUp(self):
+        self.is_akisi = IsAkisi.objects.create(kod='AKS01', ad='Trafo Akışı', urun=self.urun)
+
+    def _adimlar(self, adet):
+        return [{'id': f'step-{i}', 'standard_id': self.adim.pk, 'name': f'Op {i}'} for i in range(adet)]
+
+    def _zincir(self, adim_idleri):
+        return [{'from': a, 'to': b} for a, b in zip(adim_idleri, adim_idleri[1:])]
+
+    def test_ilk_kayit_ve_degisiklik_yok(self):
+        adimlar = self._adimlar(60)
+        baglantilar = self._zincir([a['id'] for a in adimlar])
+        sonuc = IsAkisiService.tasarimi_kaydet(self.is_akisi, adimlar, baglantilar)
+        self.assertEqual(sonuc['olusturulan'], 60)
+        self.assertEqual(sonuc['eklenen_baglanti'], 59)
+
+        # İkinci kayıt: kimlikler op_id ile eşlenir, hiçbir yazma yapılmaz
+        for adim in adimlar:
+            adim['op_id'] = sonuc['operasyonlar'][adim['id']]
+        # savepoint + 4 okuma + release
+        with self.assertNumQueries(6):
+            sonuc = IsAkisiService.tasarimi_kaydet(self.is_akisi, adimlar, baglantilar)
+        self.assertEqual((sonuc['olusturulan'], sonuc['guncellenen'], sonuc['silinen']), (0, 0, 0))
+
+    def test_sira_degisimi_silme_ve_ekleme(self):
+        adimlar = self._adimlar(3)
+        sonuc = IsAkisiService.tasarimi_kaydet(self.is_akisi, adimlar, self._zincir(['step-0', 'step-1', 'step-2']))
+        for adim in adimlar:
+            adim['op_id'] = sonuc['operasyonlar'][adim['id']]
+
+        # Sırayı tersine çevir, ortadakini sil, yeni bir adım ekle
+        yeni = {'id': 'step-yeni', 'standard_id': self.adim.pk, 'name': 'Test'}
+        adimlar = [adimlar[2], adimlar[0], yeni]
+        sonuc = IsAkisiService.tasarimi_kaydet(
+            self.is_akisi, adimlar, self._zincir(['step-2', 'step-0', 'step-yeni'])
+        )
+        self.assertEqual((sonuc['olusturulan'], sonuc['silinen']), (1, 1))
+        sira = list(self.is_akisi.operasyonlar.order_by('sira_no').values_list('operasyon_adi', flat=True))
+        self.assertEqual(sira, ['Op 2', 'Op 0', 'Test'])
+        op0 = IsAkisiOperasyon.objects.get(operasyon_adi='Op 0')
+        self.assertEqual([o.operasyon_adi for o in op0.onceki_operasyonlar.all()], ['Op 2'])
+
+    def test_gonderilmeyen_sureler_korunur(self):
+        sonuc = IsAkisiService.tasarimi_kaydet(self.is_akisi, self._adimlar(1), [])
+        op = IsAkisiOperasyon.objects.get(pk=sonuc['operasyonlar']['step-0'])
+        self.assertEqual((op.standart_sure, op.hazirlik_suresi), (Decimal('30'), Decimal('0')))
+        IsAkisiOperasyon.objects.filter(pk=op.pk).update(standart_sure=90, hazirlik_suresi=15)
+
+        # Tasarımcı süre göndermez: elle girilmiş süreler standart adım varsayılanına dönmemeli
+        adim = {**self._adimlar(1)[0], 'op_id': op.pk, 'istasyon_id': None}
+        sonuc = IsAkisiService.tasarimi_kaydet(self.is_akisi, [adim], [])
+        self.assertEqual(sonuc['guncellenen'], 0)
+        op.refresh_from_db()
+        self.assertEqual((op.standart_sure, op.hazirlik_suresi, op.istasyon_id), (90, 15, self.istasyon.pk))
+
+        # Açıkça gönderilen 0 yazılır
+        sonuc = IsAkisiService.tasarimi_kaydet(self.is_akisi, [{**adim, 'hazirlik_suresi': 0}], [])
+        self.assertEqual(sonuc['guncellenen'], 1)
+        op.refresh_from_db()
+        self.assertEqual((op.standart_sure, op.hazirlik_suresi), (90, 0))
+
+    def test_is_emri_bagli_operasyon_silinemez(self):
+        sonuc = IsAkisiService.tasarimi_kaydet(self.is_akisi, self._adimlar(1), [])
+        musteri = Musteri.objects.create(kod='MST001', ad='Test')
+        IsEmri.objects.create(
+            siparis=Siparis.objects.create(musteri=musteri, siparis_no='SIP-001'),
+            urun=self.urun, is_akisi=self.is_akisi, operasyon_id=sonuc['operasyonlar']['step-0'],
+        )
+        with self.assertRaises(IsAkisiTasarimHatasi):
+            IsAkisiService.tasarimi_kaydet(self.is_akisi, [], [])
+        self.assertEqual(self.is_akisi.operasyonlar.count(), 1)
+
+    def test_dongu_reddedilir(self):
+        with self.assertRaises(IsAkisiTasarimHatasi):
+            IsAkisiService.tasarimi_kaydet(
+                self.is_akisi, self._adimlar(2),
+                [{'from': 'step-0', 'to': 'step-1'}, {'from': 'step-1', 'to': 'step-0'}]
+            )
+
+
+class IsAkisiSurumTest(TestCase):
+    """Yayınlanan rota sürümleri değişmez ve tek okumada yüklenir"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.urun = Urun.objects.create(kod='URN001', ad='Trafo', kategori='bitmis_urun', birim='adet')
+        istasyon = IsIstasyonu.objects.create(kod='IST01', ad='Sargı 1', tip='sargi')
+        cls.is_akisi = IsAkisi.objects.create(kod='AKS01', ad='Trafo Akışı', urun=cls.urun)
+        # Montaj sıra numarası olarak önce gelse de sargılardan sonra derlenmeli
+        cls.montaj = IsAkisiOperasyon.objects.create(
+            is_akisi=cls.is_akisi, istasyon=istasyon, operasyon_adi='Montaj', standart_sure=60, hazirlik_suresi=15
+        )
+        cls.ag = IsAkisiOperasyon.objects.create(is_akisi=cls.is_akisi, istasyon=istasyon, operasyon_adi='AG Sargı', standart_sure=30)
+        cls.yg = IsAkisiOperasyon.objects.create(is_akisi=cls.is_akisi, istasyon=istasyon, operasyon_adi='YG Sargı', standart_sure=40)
+        cls.montaj.onceki_operasyonlar.add(cls.ag, cls.yg)
+
+    def test_yayin_topolojik_ve_degismez(self):
+        surum = IsAkisiService.yayinla(self.is_akisi)
+        self.assertEqual((surum.yayin_no, surum.operasyon_sayisi), (1, 3))
+        self.assertEqual(IsAkisiService.yayinla(self.is_akisi).yayin_no, 2)
+
+        rota = DerlenmisRota(surum.icerik(), surum.pk, surum.yayin_no)
+        self.assertEqual(rota.op_idleri, [self.ag.pk, self.yg.pk, self.montaj.pk])
+        self.assertEqual(sorted(rota.oncekiler(2)), [0, 1])
+        # max(30, 40) * 2 + 60 * 2 + 15
+        self.assertEqual(rota.kritik_yol_suresi(2), 215)
+
+        surum.versiyon = '9.9'
+        with self.assertRaises(ValueError):
+            surum.save()
+
+    def test_son_surum_tek_sorguda_yuklenir(self):
+        IsAkisiService.yayinla(self.is_akisi)
+        son = IsAkisiService.yayinla(self.is_akisi)
+        # Yayın sonrası canlı değişiklik sürümü etkilemez
+        self.ag.delete()
+        with self.assertNumQueries(1):
+            rotalar = IsAkisiService.rotalari_yukle([self.is_akisi.pk])
+        self.assertEqual(rotalar[self.is_akisi.pk].surum_id, son.pk)
+        self.assertEqual(len(rotalar[self.is_akisi.pk]), 3)
+
+    def test_yayin_yoksa_canli_rota(self):
+        rota = IsAkisiService.rotalari_yukle([self.is_akisi.pk])[self.is_akisi.pk]
+        self.assertIsNone(rota.surum_id)
+        self.assertEqual(rota.op_idleri[-1], self.montaj.pk)
+
+    def test_is_emri_eskimis_surumde_canli_rotaya_doner(self):
+        IsAkisiService.yayinla(self.is_akisi)
+        self.yg.delete()
+        siparis = Siparis.objects.create(musteri=Musteri.objects.create(kod='MST001', ad='Test'), siparis_no='SIP-001')
+        SiparisKalem.objects.create(siparis=siparis, urun=self.urun, miktar=1, birim_fiyat=100)
+        sonuc = IsEmriService.is_emirleri_olustur([siparis])
+        self.assertEqual(sonuc['is_emri_sayisi'], 2)
+
+    def test_sure_tahmini_api(self):
+        IsAkisiService.yayinla(self.is_akisi)
+        response = self.client.get(f'/api/is-akislari/{self.is_akisi.pk}/sure_tahmini/?miktar=2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['kritik_yol_suresi'], 215)
+        self.assertEqual(response.json()['yayin_no'], 1)
+
+
+class KapasiteServiceTest(TestCase):
+    """İstasyon günlük yük tablosu iş emri değişiklikleriyle artımlı güncellenir"""
+
+    @classmethod
+    def setUpTestData(cls):
+        musteri, cls.urun, cls.sargi = temel_kayitlar(gunluk_calisma_saati=8)
+        cls.montaj = IsIstasyonu.objects.create(kod='IST02', ad='Montaj 1', tip='montaj', gunluk_calisma_saati=9)
+        cls.is_akisi, cls.operasyon = sargi_akisi(cls.urun, cls.sargi)
+        cls.siparis = Siparis.objects.create(musteri=musteri, siparis_no='SIP-001')
+        # 2030-01-07 Pazartesi
+        cls.pazartesi = date(2030, 1, 7)
+
+    def setUp(self):
+        # Test geri alımları save()/delete() çağırmadığı için takvim önbelleği elle temizlenir
+        TakvimService.onbellegi_temizle()
+
+    def _emir(self, **kwargs):
+        degerler = dict(
+            siparis=self.siparis, urun=self.urun, is_akisi=self.is_akisi, operasyon=self.operasyon,
+            planlanan_istasyon=self.sargi, planlanan_baslangic_tarihi=self.pazartesi, planlanan_sure=120,
+        )
+        degerler.update(kwargs)
+        return IsEmri.objects.create(**degerler)
+
+    def _yuk(self, istasyon, tarih):
+        satir = IstasyonGunlukYuk.objects.filter(istasyon=istasyon, tarih=tarih).first()
+        return (float(satir.planlanan_dakika), satir.is_emri_sayisi) if satir else (0.0, 0)
+
+    def test_planla_tasi_ve_kaldir(self):
+        emir = self._emir()
+        self._emir(planlanan_sure=60)
+        self.assertEqual(self._yuk(self.sargi, self.pazartesi), (180.0, 2))
+        self.assertEqual(
+            IstasyonGunlukYuk.objects.get(istasyon=self.sargi, tarih=self.pazartesi).kullanilabilir_dakika, 480
+        )
+
+        # Başka istasyon ve güne taşı (veritabanından okunan emir üzerinden)
+        emir = IsEmri.objects.get(pk=emir.pk)
+        emir.planlanan_istasyon = self.montaj
+        emir.planlanan_baslangic_tarihi = self.pazartesi + timedelta(days=1)
+        emir.save()
+        self.assertEqual(self._yuk(self.sargi, self.pazartesi), (60.0, 1))
+        self.assertEqual(self._yuk(self.montaj, self.pazartesi + timedelta(days=1)), (120.0, 1))
+
+        # Tamamlanan emir kapasite tüketmez
+        emir.durum = 'tamamlandi'
+        emir.save()
+        self.assertEqual(self._yuk(self.montaj, self.pazartesi + timedelta(days=1)), (0.0, 0))
+
+        IsEmri.objects.filter(durum='planlandi').get().delete()
+        self.assertEqual(self._yuk(self.sargi, self.pazartesi), (0.0, 0))
+
+    def test_yeniden_hesapla_artimli_ile_ayni(self):
+        for i in range(5):
+            self._emir(planlanan_baslangic_tarihi=self.pazartesi + timedelta(days=i % 2), planlanan_sure=30 + i)
+        artimli = sorted(IstasyonGunlukYuk.objects.values_list('istasyon_id', 'tarih', 'planlanan_dakika', 'is_emri_sayisi'))
+        KapasiteService.yeniden_hesapla()
+        yeniden = sorted(IstasyonGunlukYuk.objects.values_list('istasyon_id', 'tarih', 'planlanan_dakika', 'is_emri_sayisi'))
+        self.assertEqual(artimli, yeniden)
+
+    def test_cok_gunlu_emir_gunlere_dagitilir(self):
+        sali, carsamba = self.pazartesi + timedelta(days=1), self.pazartesi + timedelta(days=2)
+        emir = self._emir(planlanan_sure=600)
+        # Günde 480 dakika: 08:00'de başlayan 600 dakikalık iş ertesi güne 120 dakika taşar
+        self.assertEqual(self._yuk(self.sargi, self.pazartesi), (480.0, 1))
+        self.assertEqual(self._yuk(self.sargi, sali), (120.0, 1))
+
+        emir.planlanan_baslangic_saati = "12:00"
+        emir.save()
+        self.assertEqual(self._yuk(self.sargi, self.pazartesi), (240.0, 1))
+        self.assertEqual(self._yuk(self.sargi, sali), (360.0, 1))
+
+        # Salı tatil ilan edilince taşan kısım çarşambaya kayar
+        TatilGunu.objects.create(tarih=sali, ad='Tatil')
+        self.assertEqual(self._yuk(self.sargi, sali), (0.0, 0))
+        self.assertEqual(self._yuk(self.sargi, carsamba), (360.0, 1))
+
+        artimli = sorted(IstasyonGunlukYuk.objects.values_list('istasyon_id', 'tarih', 'planlanan_dakika', 'is_emri_sayisi'))
+        KapasiteService.yeniden_hesapla()
+        yeniden = sorted(IstasyonGunlukYuk.objects.values_list('istasyon_id', 'tarih', 'planlanan_dakika', 'is_emri_sayisi'))
+        self.assertEqual(artimli, yeniden)
+
+    def test_kademeli_ve_toplu_silme_yuku_duser(self):
+        self._emir(planlanan_sure=600)
+        self._emir(planlanan_istasyon=self.montaj)
+        IsEmri.objects.filter(planlanan_istasyon=self.montaj).delete()
+        self.assertEqual(self._yuk(self.montaj, self.pazartesi), (0.0, 0))
+        self.assertEqual(self._yuk(self.sargi, self.pazartesi), (480.0, 1))
+
+        # Sipariş silinince iş emirleri kademeli silinir
+        self.siparis.delete()
+        self.assertEqual(self._yuk(self.sargi, self.pazartesi), (0.0, 0))
+        self.assertEqual(self._yuk(self.sargi, self.pazartesi + timedelta(days=1)), (0.0, 0))
+
+    def test_doluluk_takvim_ve_tatil(self):
+        self._emir(planlanan_sure=480)
+        TatilGunu.objects.create(tarih=self.pazartesi + timedelta(days=1), ad='Arife', calisma_orani='0.5')
+        # Pazartesi-Pazar: 4 tam gün + 1 yarım gün = 4.5 * 480 dakika
+        doluluk = KapasiteService.doluluk([self.sargi.pk], self.pazartesi, self.pazartesi + timedelta(days=6))
+        self.assertEqual(doluluk[self.sargi.pk]['kullanilabilir_dakika'], 2160)
+        self.assertEqual(doluluk[self.sargi.pk]['doluluk_orani'], round(480 * 100 / 2160, 1))
+
+    def test_istasyon_yalnizca_takvim_alani_degisince_yuku_tazeler(self):
+        self._emir(planlanan_sure=600)
+        istasyon = IsIstasyonu.objects.get(pk=self.sargi.pk)
+        with mock.patch.object(KapasiteService, 'takvim_degisti', wraps=KapasiteService.takvim_degisti) as takvim_degisti:
+            istasyon.ad = 'Sargı 1A'
+            istasyon.save()
+            takvim_degisti.assert_not_called()
+
+            istasyon.gunluk_calisma_saati = 10
+            istasyon.save()
+            takvim_degisti.assert_called_once_with(istasyon_idleri=[self.sargi.pk], tarihler=[date.today()])
+        # Günde 600 dakika: iş tek güne sığar
+        self.assertEqual(self._yuk(self.sargi, self.pazartesi), (600.0, 1))
+        self.assertEqual(self._yuk(self.sargi, self.pazartesi + timedelta(days=1)), (0.0, 0))
+
+    def test_istasyon_yuk_api(self):
+        self._emir()
+        response = self.client.get(
+            f'/api/istasyon-yuk/?baslangic={self.pazartesi}&bitis={self.pazartesi + timedelta(days=4)}'
+            f'&istasyon={self.sargi.pk}'
+        )
+        self.assertEqual(response.status_code, 200)
+        veri = response.json()['data']
+        self.assertEqual(len(veri['gunler']), 1)
+        self.assertEqual(veri['gunler'][0]['planlanan_dakika'], 120.0)
+        self.assertEqual(veri['istasyonlar'][str(self.sargi.pk)]['kullanilabilir_dakika'], 2400)
+
+
+class TakvimServiceTest(TestCase):
+    """Vardiya, tatil ve istisnalardan çalışma dakikası hesapları"""
+
+    @classmethod
+    def setUpTestData(cls):
+        # 2030-01-04 Cuma, 2030-01-07 Pazartesi
+        cls.cuma = date(2030, 1, 4)
+        cls.pazartesi = date(2030, 1, 7)
+        cls.desen = VardiyaDeseni.objects.create(
+            kod='2V', ad='İki Vardiya',
+            vardiyalar={str(g): [['08:00', '12:00'], ['13:00', '17:00']] for g in range(5)},
+        )
+        cls.istasyon = IsIstasyonu.objects.create(kod='IST01', ad='Montaj 1', tip='montaj', vardiya_deseni=cls.desen)
+        cls.gece = IsIstasyonu.objects.create(
+            kod='IST02', ad='Fırın', tip='makine',
+            vardiya_deseni=VardiyaDeseni.objects.create(kod='GECE', ad='Gece', vardiyalar={'0': [['22:00', '06:00']]}),
+        )
+
+    def setUp(self):
+        TakvimService.onbellegi_temizle()
+
+    def test_dakika_ekle_hafta_sonu_ve_mola_atlanir(self):
+        baslangic = datetime.combine(self.cuma, datetime.min.time()).replace(hour=15)
+        # Cuma 15-17 (120 dk) + Pazartesi 08-12 (240 dk) + 13:30
+        bitis = TakvimService.dakika_ekle(self.istasyon.pk, baslangic, 390)
+        self.assertEqual(bitis, datetime(2030, 1, 7, 13, 30))
+        self.assertEqual(TakvimService.calisma_dakikasi(self.istasyon.pk, baslangic, bitis), 390)
+        # Vardiya sonuna denk gelen bitiş ertesi vardiyaya taşmaz
+        self.assertEqual(TakvimService.dakika_ekle(self.istasyon.pk, baslangic, 120), datetime(2030, 1, 4, 17, 0))
+
+    def test_tatil_istisna_ve_gece_vardiyasi(self):
+        TatilGunu.objects.create(tarih=self.pazartesi, ad='Arife', calisma_orani='0.5')
+        takvim = TakvimService.takvim(self.istasyon.pk, self.pazartesi)
+        self.assertEqual(takvim.gunluk_dakika(self.pazartesi), 240)
+
+        # İstasyon istisnası tatili ezer
+        TakvimIstisnasi.objects.create(istasyon=self.istasyon, tarih=self.pazartesi, vardiyalar=[['06:00', '18:00']])
+        self.assertEqual(TakvimService.takvim(self.istasyon.pk, self.pazartesi).gunluk_dakika(self.pazartesi), 720)
+        self.assertEqual(
+            TakvimService.sonraki_calisma_ani(self.istasyon.pk, datetime(2030, 1, 5, 10, 0)), datetime(2030, 1, 7, 6, 0)
+        )
+
+        # Gece vardiyası ertesi güne taşar; arifede vardiyanın ilk yarısı çalışılır
+        gece = TakvimService.takvim(self.gece.pk, self.pazartesi)
+        self.assertEqual(gece.gunluk_dakika(self.pazartesi + timedelta(days=7)), 120)
+        self.assertEqual(gece.gunluk_dakika(self.pazartesi + timedelta(days=8)), 360)
+        self.assertEqual(gece.gunluk_dakika(self.pazartesi + timedelta(days=1)), 120)
+
+    def test_resmi_tatiller_yuklenir(self):
+        eklenen, _ = TakvimService.resmi_tatilleri_yukle([2026])
+        self.assertEqual(eklenen, len(TakvimService.resmi_tatiller(2026)))
+        self.assertEqual(TatilGunu.objects.get(tarih=date(2026, 5, 26)).calisma_orani, Decimal('0.50'))
+        self.assertTrue(TatilGunu.objects.filter(tarih=date(2026, 3, 22), calisma_orani=0).exists())
+        # Tekrar yükleme yeni kayıt oluşturmaz
+        self.assertEqual(TakvimService.resmi_tatilleri_yukle([2026]), (0, 0))
+
+    def test_planlama_takvime_gore_yerlestirir(self):
+        musteri = Musteri.objects.create(kod='MST001', ad='Test')
+        urun = Urun.objects.create(kod='URN001', ad='Trafo', kategori='bitmis_urun', birim='adet')
+        is_akisi = IsAkisi.objects.create(kod='AKS01', ad='Akış', urun=urun)
+        operasyon = IsAkisiOperasyon.objects.create(
+            is_akisi=is_akisi, istasyon=self.istasyon, operasyon_adi='Montaj', standart_sure=60
+        )
+        emir = IsEmri.objects.create(
+            siparis=Siparis.objects.create(musteri=musteri, siparis_no='SIP-001'),
+            urun=urun, is_akisi=is_akisi, operasyon=operasyon, planlanan_sure=600,
+        )
+        # Cumartesiye bırakılan emir Pazartesi vardiya başına yerleşir
+        baslangic, bitis = emir.takvime_gore_zamanla(self.istasyon, date(2030, 1, 5))
+        self.assertEqual(baslangic, datetime(2030, 1, 7, 8, 0))
+        self.assertEqual(bitis, datetime(2030, 1, 8, 10, 0))
+
+
+class PlanlamaSimulasyonTest(TestCase):
+    """What-if simülasyonu planı bellekte yeniden çizelgeler, canlı veriye yazmaz"""
+
+    @classmethod
+    def setUpTestData(cls):
+        musteri, cls.urun, cls.sargi = temel_kayitlar(gunluk_calisma_saati=8)
+        cls.acil_urun = Urun.objects.create(kod='URN002', ad='Acil Trafo', kategori='bitmis_urun', birim='adet')
+        cls.is_akisi, cls.operasyon = sargi_akisi(cls.urun, cls.sargi)
+        acil_akis = IsAkisi.objects.create(kod='AKS02', ad='Acil Akış', urun=cls.acil_urun)
+        IsAkisiOperasyon.objects.create(
+            is_akisi=acil_akis, istasyon=cls.sargi, operasyon_adi='Sargı', standart_sure=30, hazirlik_suresi=0
+        )
+        siparis = Siparis.objects.create(musteri=musteri, siparis_no='SIP-001')
+        # 2030-01-07 Pazartesi; sargı istasyonu hafta içi 08:00-16:00 çalışır
+        cls.pazartesi = date(2030, 1, 7)
+        cls.simdi = datetime(2030, 1, 7, 8, 0)
+        kalem = SiparisKalem.objects.create(
+            siparis=siparis, urun=cls.urun, miktar=1, birim_fiyat=100, teslim_tarihi=cls.pazartesi
+        )
+        ortak = dict(
+            siparis=siparis, siparis_kalemi=kalem, urun=cls.urun, is_akisi=cls.is_akisi, operasyon=cls.operasyon,
+            planlanan_istasyon=cls.sargi, planlanan_baslangic_tarihi=cls.pazartesi, planlanan_sure=240,
+        )
+        cls.ilk = IsEmri.objects.create(emirNo='IE-0001', **ortak)
+        cls.ikinci = IsEmri.objects.create(emirNo='IE-0002', **ortak)
+        cls.ikinci.onceki_operasyonlar.add(cls.ilk)
+
+    def setUp(self):
+        TakvimService.onbellegi_temizle()
+
+    def _simule_et(self, *degisiklik_listeleri):
+        return PlanlamaService.simule_et(
+            [{'ad': f'S{i}', 'degisiklikler': d} for i, d in enumerate(degisiklik_listeleri)], simdi=self.simdi
+        )
+
+    def test_temel_cizelge_mevcut_plani_izler(self):
+        model = PlanlamaService.plani_yukle(self.simdi)
+        cizelge = cizelgele(model, [])
+        self.assertEqual(cizelge[self.ilk.id][1:3], (datetime(2030, 1, 7, 8), datetime(2030, 1, 7, 12)))
+        self.assertEqual(cizelge[self.ikinci.id][1:3], (datetime(2030, 1, 7, 12), datetime(2030, 1, 7, 16)))
+
+    def test_istasyon_bakimi_gecikme_ve_yuk_farki(self):
+        [sonuc] = self._simule_et([{
+            'tip': 'istasyon_bakim', 'istasyon': self.sargi.id,
+            'baslangic': '2030-01-07T08:00', 'bitis': '2030-01-07T12:00',
+        }])
+        self.assertEqual(sonuc['geciken_emir_sayisi'], 2)
+        self.assertEqual(sonuc['geciken_emirler'][0]['emir'], self.ikinci.id)
+        self.assertEqual(sonuc['geciken_emirler'][0]['yeni_bitis'], datetime(2030, 1, 8, 12))
+        [kalem] = sonuc['geciken_siparis_kalemleri']
+        self.assertTrue(kalem['yeni_teslim_asimi'])
+        self.assertEqual(
+            [(y['tarih'], y['fark_dakika']) for y in sonuc['istasyon_yuk_farki']],
+            [(self.pazartesi, -240.0), (self.pazartesi + timedelta(days=1), 240.0)]
+        )
+
+    def test_cok_gunluk_emir_yuk_farki_kapasite_tablosuyla_ayni(self):
+        def yukler():
+            return {
+                tarih: float(dakika) for tarih, dakika in
+                IstasyonGunlukYuk.objects.filter(istasyon=self.sargi).values_list('tarih', 'planlanan_dakika')
+            }
+
+        # İlk emir 720 dakikaya uzar: pazartesi 480, salı 240 dakika; ikinci emir salı 12:00'ye kayar
+        [sonuc] = self._simule_et([{'tip': 'sure_degistir', 'emir': self.ilk.id, 'sure': 720}])
+        simule = yukler()
+        for fark in sonuc['istasyon_yuk_farki']:
+            simule[fark['tarih']] = simule.get(fark['tarih'], 0) + fark['fark_dakika']
+
+        ilk = IsEmri.objects.get(pk=self.ilk.pk)
+        ilk.planlanan_sure = 720
+        ilk.save()
+        ikinci = IsEmri.objects.get(pk=self.ikinci.pk)
+        ikinci.planlanan_baslangic_tarihi = self.pazartesi + timedelta(days=1)
+        ikinci.planlanan_baslangic_saati = datetime(2030, 1, 8, 12).time()
+        ikinci.save()
+        self.assertEqual({t: d for t, d in simule.items() if d}, yukler())
+        self.assertEqual(yukler(), {self.pazartesi: 480.0, self.pazartesi + timedelta(days=1): 480.0})
+
+    def test_acil_siparis_one_yerlesir_ve_veritabani_degismez(self):
+        onceki = list(IsEmri.objects.order_by('id').values_list(
+            'id', 'planlanan_baslangic_tarihi', 'planlanan_baslangic_saati', 'planlanan_sure'
+        ))
+        [sonuc] = self._simule_et([{'tip': 'acil_siparis', 'urun': self.acil_urun.id, 'miktar': 2}])
+        self.assertEqual(sonuc['acil_siparis_bitisleri'][0]['bitis'], datetime(2030, 1, 7, 9))
+        # İkinci emir vardiya sonuna sığmaz, salı sabahına taşar
+        self.assertEqual(
+            {g['emir']: g['yeni_bitis'] for g in sonuc['geciken_emirler']},
+            {self.ilk.id: datetime(2030, 1, 7, 13), self.ikinci.id: datetime(2030, 1, 8, 9)}
+        )
+        self.assertEqual(IsEmri.objects.count(), 2)
+        self.assertEqual(onceki, list(IsEmri.objects.order_by('id').values_list(
+            'id', 'planlanan_baslangic_tarihi', 'planlanan_baslangic_saati', 'planlanan_sure'
+        )))
+
+    def test_coklu_senaryo_ve_gecersiz_degisiklik(self):
+        self.addCleanup(PlanlamaService.havuzu_kapat)
+        with override_settings(SIMULASYON_ISCI_SAYISI=2):
+            sonuclar = self._simule_et(
+                [{'tip': 'sure_degistir', 'emir': self.ilk.id, 'sure': 300}],
+                [{'tip': 'sure_degistir', 'emir': self.ilk.id, 'sure': 120}],
+            )
+            # Havuz istekler arasında korunur
+            self.assertIs(PlanlamaService.havuz(), PlanlamaService.havuz())
+        self.assertEqual([s['ad'] for s in sonuclar], ['S0', 'S1'])
+        self.assertNotEqual(sonuclar[0]['isci_pid'], os.getpid())
+        self.assertEqual(sonuclar[0]['geciken_emir_sayisi'], 2)
+        self.assertEqual(sonuclar[1]['one_cekilen_emir_sayisi'], 2)
+
+        yanit = self.client.post('/api/planlama/simulasyon/', {
+            'degisiklikler': [{'tip': 'istasyon_bakim', 'istasyon': self.sargi.id}]
+        }, content_type='application/json')
+        self.assertEqual(yanit.status_code, 400)
+
+
+class PlanlamaYayilimTest(TestCase):
+    """Gantt taşıması yalnızca etkilenen kuyruk ve ardıl zincirini kaydırır; toplu taşıma tek işlemde yazılır"""
+
+    @classmethod
+    def setUpTestData(cls):
+        musteri, urun, cls.sargi = temel_kayitlar(gunluk_calisma_saati=8)
+        cls.montaj = IsIstasyonu.objects.create(kod='IST02', ad='Montaj 1', tip='montaj', gunluk_calisma_saati=8)
+        is_akisi, operasyon = sargi_akisi(urun, cls.sargi)
+        siparis = Siparis.objects.create(musteri=musteri, siparis_no='SIP-001')
+        # 2030-01-07 Pazartesi; istasyonlar hafta içi 08:00-16:00
+        cls.pazartesi = date(2030, 1, 7)
+        ortak = dict(siparis=siparis, urun=urun, is_akisi=is_akisi, operasyon=operasyon)
+        cls.a = IsEmri.objects.create(emirNo='IE-A', planlanan_istasyon=cls.sargi, planlanan_baslangic_tarihi=cls.pazartesi,
+                                      planlanan_sure=240, **ortak)
+        cls.b = IsEmri.objects.create(emirNo='IE-B', planlanan_istasyon=cls.sargi, planlanan_baslangic_tarihi=cls.pazartesi,
+                                      planlanan_baslangic_saati='12:00', planlanan_sure=240, **ortak)
+        cls.c = IsEmri.objects.create(emirNo='IE-C', planlanan_istasyon=cls.montaj,
+                                      planlanan_baslangic_tarihi=cls.pazartesi + timedelta(days=1),
+                                      planlanan_sure=120, **ortak)
+        cls.d = IsEmri.objects.create(emirNo='IE-D', planlanan_istasyon=cls.montaj,
+                                      planlanan_baslangic_tarihi=cls.pazartesi + timedelta(days=2),
+                                      planlanan_sure=120, **ortak)
+        cls.c.onceki_operasyonlar.add(cls.a)
+
+    def setUp(self):
+        TakvimService.onbellegi_temizle()
+
+    def _baslangic(self, emir):
+        emir.refresh_from_db()
+        return datetime.combine(emir.planlanan_baslangic_tarihi, emir.planlanan_baslangic_saati)
+
+    def test_ardil_zinciri_kaydirilir(self):
+        degisenler = PlanlamaService.tasi_ve_yay(self.a, self.sargi, self.pazartesi + timedelta(days=1))
+        self.assertEqual([d['id'] for d in degisenler], [self.a.id, self.c.id])
+        self.assertEqual(self._baslangic(self.a), datetime(2030, 1, 8, 8))
+        self.assertEqual(self._baslangic(self.c), datetime(2030, 1, 8, 12))
+        self.assertEqual(self.c.planlanan_bitis_saati.hour, 14)
+        # Öne çekme yok, etkilenmeyen emirler yerinde
+        self.assertEqual(self._baslangic(self.b), datetime(2030, 1, 7, 12))
+        self.assertEqual(self._baslangic(self.d), datetime(2030, 1, 9, 8))
+
+    def test_tasinan_ve_kaydirilan_emirler_delta_sorgusunda_gorunur(self):
+        esik = timezone.now()
+        IsEmri.objects.update(guncellenme_tarihi=esik - timedelta(minutes=5))
+        PlanlamaService.tasi_ve_yay(self.a, self.sargi, self.pazartesi + timedelta(days=1))
+        yanit = self.client.get('/api/is-emirleri/', {'guncellenme_sonrasi': esik.isoformat(), 'ordering': 'emirNo'})
+        self.assertEqual([satir['emirNo'] for satir in yanit.json()['results']], ['IE-A', 'IE-C'])
+
+    def test_ardillar_seviye_basina_tek_sorguda_okunur(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        # C'nin üç ardılı salı sabahı montajda; A salıya taşınınca C ve üç ardılı sırayla kayar
+        ardillar = []
+        for i in range(3):
+            emir = IsEmri.objects.create(
+                emirNo=f'IE-E{i}', siparis=self.a.siparis, urun=self.a.urun, is_akisi=self.a.is_akisi,
+                operasyon=self.a.operasyon, planlanan_istasyon=self.montaj,
+                planlanan_baslangic_tarihi=self.pazartesi + timedelta(days=1), planlanan_sure=60,
+            )
+            emir.onceki_operasyonlar.add(self.c)
+            ardillar.append(emir.id)
+
+        tablo = IsEmri.onceki_operasyonlar.through._meta.db_table
+        with CaptureQueriesContext(connection) as sorgular:
+            degisenler = PlanlamaService.tasi_ve_yay(self.a, self.sargi, self.pazartesi + timedelta(days=1))
+        self.assertEqual([d['id'] for d in degisenler], [self.a.id, self.c.id, *ardillar])
+        ardil_sorgulari = [s for s in sorgular.captured_queries if tablo in s['sql'] and 'SELECT' in s['sql']]
+        # A, C ve üç ardıl için emir başına beş yerine seviye başına üç sorgu
+        self.assertEqual(len(ardil_sorgulari), 3)
+
+    def test_istasyon_kuyrugu_kaydirilir_ve_yuk_korunur(self):
+        self.b.refresh_from_db()
+        degisenler = PlanlamaService.tasi_ve_yay(self.b, self.sargi, self.pazartesi)
+        self.assertEqual([d['id'] for d in degisenler], [self.b.id, self.a.id])
+        self.assertEqual(self._baslangic(self.b), datetime(2030, 1, 7, 8))
+        self.assertEqual(self._baslangic(self.a), datetime(2030, 1, 7, 12))
+        # Ardıl C salı başlıyor, A pazartesi 16:00'da bittiği için kaydırılmaz
+        self.assertEqual(self._baslangic(self.c), datetime(2030, 1, 8, 8))
+        yuk = IstasyonGunlukYuk.objects.get(istasyon=self.sargi, tarih=self.pazartesi)
+        self.assertEqual((float(yuk.planlanan_dakika), yuk.is_emri_sayisi), (480.0, 2))
+
+    def test_admin_tasima_degisen_emirleri_dondurur(self):
+        from django.contrib.auth.models import User
+        self.client.force_login(User.objects.create_superuser('planlamaci', 'p@example.com', 'x'))
+        yanit = self.client.post('/admin/production/uretimplanlama/update-planning/', {
+            'order_id': self.a.id, 'station_id': self.sargi.id, 'date': '2030-01-08',
+        }, content_type='application/json').json()
+        self.assertTrue(yanit['success'])
+        self.assertEqual(
+            [(d['id'], d['tarih']) for d in yanit['degisen_emirler']],
+            [(self.a.id, '2030-01-08'), (self.c.id, '2030-01-08')]
+        )
+
+    def test_kapali_emir_tasinamaz(self):
+        IsEmri.objects.filter(pk=self.d.pk).update(durum='tamamlandi')
+        self.d.refresh_from_db()
+        with self.assertRaises(PlanlamaHatasi):
+            PlanlamaService.tasi_ve_yay(self.d, self.montaj, self.pazartesi)
+
+    def test_toplu_planla_ayni_gune_sirayla_dizer(self):
+        uygulandi, sonuclar = PlanlamaService.toplu_planla([
+            {'order_id': self.a.id, 'station_id': self.sargi.id, 'date': '2030-01-08'},
+            {'order_id': self.b.id, 'station_id': self.sargi.id, 'date': '2030-01-08'},
+            {'order_id': self.c.id, 'station_id': self.montaj.id, 'date': '2030-01-08'},
+        ])
+        self.assertTrue(uygulandi)
+        self.assertEqual(self._baslangic(self.a), datetime(2030, 1, 8, 8))
+        self.assertEqual(self._baslangic(self.b), datetime(2030, 1, 8, 12))
+        # C, öncülü A bitmeden başlıyor: yazılır ama uyarılır
+        self.assertIn('uyari', sonuclar[2])
+        self.assertNotIn('uyari', sonuclar[1])
+        yuk = IstasyonGunlukYuk.objects.get(istasyon=self.sargi, tarih=date(2030, 1, 8))
+        self.assertEqual((float(yuk.planlanan_dakika), yuk.is_emri_sayisi), (480.0, 2))
+
+    def test_toplu_planla_gecersiz_harekette_hicbirini_yazmaz(self):
+        uygulandi, sonuclar = PlanlamaService.toplu_planla([
+            {'order_id': self.a.id, 'station_id': self.sargi.id, 'date': '2030-01-08'},
+            {'order_id': self.a.id, 'station_id': self.montaj.id, 'date': '2030-01-09'},
+            {'order_id': self.b.id, 'station_id': None},
+        ])
+        self.assertFalse(uygulandi)
+        self.assertEqual([s['success'] for s in sonuclar], [True, False, True])
+        self.assertEqual(self._baslangic(self.a), datetime(2030, 1, 7, 8))
+        self.b.refresh_from_db()
+        self.assertEqual(self.b.planlanan_istasyon_id, self.sargi.id)
+
+    def test_toplu_planla_kuyrugu_kaydirir(self):
+        uygulandi, sonuclar = PlanlamaService.toplu_planla([
+            {'order_id': self.d.id, 'station_id': self.montaj.id, 'date': '2030-01-08'},
+        ])
+        self.assertTrue(uygulandi)
+        self.assertEqual(self._baslangic(self.d), datetime(2030, 1, 8, 8))
+        # Salı 08:00'de montajda bekleyen C, D bitene kadar ileri kayar
+        self.assertEqual(self._baslangic(self.c), datetime(2030, 1, 8, 10))
+        yuk = IstasyonGunlukYuk.objects.get(istasyon=self.montaj, tarih=date(2030, 1, 8))
+        self.assertEqual((float(yuk.planlanan_dakika), yuk.is_emri_sayisi), (240.0, 2))
+
+    def test_toplu_planla_takvim_disi_hata_olarak_doner(self):
+        kapali = IsIstasyonu.objects.create(kod='IST09', ad='Kapalı', tip='makine', gunluk_calisma_saati=0)
+        uygulandi, sonuclar = PlanlamaService.toplu_planla([
+            {'order_id': self.a.id, 'station_id': self.sargi.id, 'date': '2030-01-08'},
+            {'order_id': self.d.id, 'station_id': kapali.id, 'date': '2030-01-08'},
+        ])
+        self.assertFalse(uygulandi)
+        self.assertEqual([s['success'] for s in sonuclar], [True, False])
+        self.assertIn('error', sonuclar[1])
+        self.assertEqual(self._baslangic(self.a), datetime(2030, 1, 7, 8))
+
+    def test_admin_toplu_planlama(self):
+        from django.contrib.auth.models import User
+        self.client.force_login(User.objects.create_superuser('planlamaci', 'p@example.com', 'x'))
+        yanit = self.client.post('/admin/production/uretimplanlama/toplu-planlama/', {'moves': [
+            {'order_id': self.d.id, 'station_id': None},
+            {'order_id': self.c.id, 'station_id': self.montaj.id, 'date': '2030-01-09'},
+        ]}, content_type='application/json').json()
+        self.assertTrue(yanit['success'])
+        self.assertEqual([r['order_id'] for r in yanit['results']], [self.d.id, self.c.id])
+        self.d.refresh_from_db()
+        self.assertIsNone(self.d.planlanan_istasyon_id)
+        self.assertEqual(self._baslangic(self.c), datetime(2030, 1, 9, 8))
+
+    def test_toplu_planlama_ve_admin_islemleri_delta_sorgusunda_gorunur(self):
+        from django.contrib.auth.models import User
+        self.client.force_login(User.objects.create_superuser('planlamaci', 'p@example.com', 'x'))
+
+        def degisenler(esik):
+            yanit = self.client.get('/api/is-emirleri/', {'guncellenme_sonrasi': esik.isoformat(), 'ordering': 'emirNo'})
+            return [satir['emirNo'] for satir in yanit.json()['results']]
+
+        def esik_al():
+            esik = timezone.now()
+            IsEmri.objects.update(guncellenme_tarihi=esik - timedelta(minutes=5))
+            return esik
+
+        esik = esik_al()
+        uygulandi, _ = PlanlamaService.toplu_planla([
+            {'order_id': self.d.id, 'station_id': self.montaj.id, 'date': '2030-01-10'},
+        ])
+        self.assertTrue(uygulandi)
+        self.assertEqual(degisenler(esik), ['IE-D'])
+
+        for eylem, emir in (('reset_durum_malzeme_bekliyor', self.b), ('reset_planlanan_istasyon', self.c)):
+            esik = esik_al()
+            self.client.post('/admin/production/isemri/', {'action': eylem, '_selected_action': [emir.id]})
+            self.assertEqual(degisenler(esik), [emir.emirNo])
+
+
+@override_settings(PLANLAMA_AKIS_GECIKME=0, PLANLAMA_AKIS_YOKLAMA_ARALIGI=0)
+class DegisiklikAkisiTest(TestCase):
+    """İş emri plan değişiklikleri sıra numaralı akışa yazılır ve farklar olarak okunur"""
+
+    @classmethod
+    def setUpTestData(cls):
+        musteri, urun, cls.sargi = temel_kayitlar(gunluk_calisma_saati=8)
+        is_akisi, operasyon = sargi_akisi(urun, cls.sargi)
+        siparis = Siparis.objects.create(musteri=musteri, siparis_no='SIP-001')
+        cls.ortak = dict(siparis=siparis, urun=urun, is_akisi=is_akisi, operasyon=operasyon, planlanan_sure=60)
+
+    def setUp(self):
+        TakvimService.onbellegi_temizle()
+        DegisiklikAkisiService.onbellegi_temizle()
+
+    def test_yalnizca_plan_degisikligi_kaydedilir(self):
+        emir = IsEmri.objects.create(emirNo='IE-1', **self.ortak)
+        self.assertEqual(list(PlanlamaDegisiklik.objects.values_list('is_emri_id', 'islem')), [(emir.id, 'olustur')])
+
+        emir = IsEmri.objects.get(pk=emir.pk)
+        emir.uretilen_miktar = 1
+        emir.save()
+        emir.save(update_fields=['uretilen_miktar'])
+        self.assertEqual(PlanlamaDegisiklik.objects.count(), 1)
+
+        emir.planlanan_istasyon = self.sargi
+        emir.planlanan_baslangic_tarihi = date(2030, 1, 7)
+        emir.save()
+        emir_id = emir.id
+        emir.delete()
+        kayitlar = list(PlanlamaDegisiklik.objects.values_list('islem', 'veri'))
+        self.assertEqual([k[0] for k in kayitlar], ['olustur', 'guncelle', 'sil'])
+        self.assertEqual(kayitlar[1][1]['istasyon'], self.sargi.id)
+        self.assertEqual(kayitlar[1][1]['baslangic'], '2030-01-07T08:00')
+        self.assertEqual(PlanlamaDegisiklik.objects.last().is_emri_id, emir_id)
+
+    def test_kademeli_silme_akisa_yazilir(self):
+        emirler = [IsEmri.objects.create(emirNo=f'IE-{i}', **self.ortak) for i in range(2)]
+        self.ortak['siparis'].delete()
+        self.assertEqual(
+            sorted(PlanlamaDegisiklik.objects.filter(islem='sil').values_list('is_emri_id', flat=True)),
+            [e.id for e in emirler]
+        )
+
+    def test_farklar_emir_basina_son_hal(self):
+        birinci = IsEmri.objects.create(emirNo='IE-1', **self.ortak)
+        ikinci = IsEmri.objects.create(emirNo='IE-2', **self.ortak)
+        son = DegisiklikAkisiService.son_sira()
+
+        PlanlamaService.toplu_planla([
+            {'order_id': birinci.id, 'station_id': self.sargi.id, 'date': '2030-01-07'},
+            {'order_id': ikinci.id, 'station_id': self.sargi.id, 'date': '2030-01-07'},
+        ])
+        PlanlamaService.toplu_planla([{'order_id': birinci.id, 'station_id': self.sargi.id, 'date': '2030-01-08'}])
+
+        sonuc = DegisiklikAkisiService.degisiklikler(son)
+        self.assertEqual(sonuc['son'], DegisiklikAkisiService.son_sira())
+        self.assertEqual([(d['id'], d['baslangic']) for d in sonuc['degisiklikler']],
+                         [(ikinci.id, '2030-01-07T09:00'), (birinci.id, '2030-01-08T08:00')])
+        self.assertEqual(DegisiklikAkisiService.degisiklikler(sonuc['son'])['degisiklikler'], [])
+
+        # Temizlenmiş aralıktan isteyen istemci ekranı yenilemeli
+        PlanlamaDegisiklik.objects.filter(id__lte=son).delete()
+        self.assertTrue(DegisiklikAkisiService.degisiklikler(1)['yenile'])
+
+    def test_uzun_yoklama_ve_sse(self):
+        from asgiref.sync import async_to_sync
+        son = DegisiklikAkisiService.son_sira()
+        IsEmri.objects.create(emirNo='IE-1', **self.ortak)
+
+        yanit = self.client.get(f'/api/planlama/degisiklikler/?son={son}')
+        self.assertEqual([d['emirNo'] for d in yanit.json()['data']['degisiklikler']], ['IE-1'])
+
+        async def ilk_olaylar():
+            akis = DegisiklikAkisiService.olay_akisi(son)
+            olaylar = [await akis.__anext__(), await akis.__anext__()]
+            await akis.aclose()
+            return olaylar
+        retry, olay = async_to_sync(ilk_olaylar)()
+        self.assertTrue(retry.startswith('retry:'))
+        self.assertIn('event: plan', olay)
+        self.assertIn('"emirNo": "IE-1"', olay)
+
+
+class AsyncEndpointTest(TestCase):
+    """Harici kaynağa bağlı async uç noktalar ve async middleware zinciri"""
+
+    @classmethod
+    def setUpTestData(cls):
+        Musteri.objects.create(kod='MST001', ad='Senkron Müşteri', mikro_fly_kodu='120.01')
+        Musteri.objects.create(kod='MST002', ad='Yerel Müşteri')
+
+    def setUp(self):
+        cache.clear()
+
+    async def test_kur_servisi_yanit_vermezse_yedek_kurlar(self):
+        with mock.patch.object(CurrencyService, '_afetch_from_api', mock.AsyncMock(return_value=None)):
+            yanit = await self.async_client.get('/api/exchange-rates/?base=EUR')
+        veri = yanit.json()
+        self.assertEqual(yanit.status_code, 200)
+        self.assertEqual((veri['success'], veri['base'], veri['source']), (True, 'EUR', 'fallback'))
+        self.assertEqual(veri['rates']['EUR'], 1.0)
+
+    async def test_kur_servisi_sonucu_onbelleklenir(self):
+        kurlar = CurrencyService._parse_rates({'rates': {'TRY': 32.5, 'XXX': 1}}, 'USD')
+        sahte = mock.AsyncMock(return_value=kurlar)
+        with mock.patch.object(CurrencyService, '_afetch_from_api', sahte):
+            await self.async_client.get('/api/exchange-rates/')
+            yanit = await self.async_client.get('/api/exchange-rates/')
+        self.assertEqual(sahte.await_count, 1)
+        self.assertEqual(yanit.json()['rates'], {'TRY': 32.5, 'USD': 1.0})
+
+    async def test_mikro_fly_durum_senkron_yanitla_ayni(self):
+        async_yanit = await self.async_client.get('/api/mikro-fly/durum/')
+        senkron_yanit = await sync_to_async(self.client.get)('/api/musteriler/sync_status/')
+        self.assertEqual(async_yanit.json(), senkron_yanit.json())
+        self.assertFalse(async_yanit.json()['is_connected'])
+        self.assertEqual(async_yanit.json()['total_customers_synced'], 1)
+
+    @override_settings(MIKRO_FLY_DURUM_ZAMAN_ASIMI=0.05)
+    async def test_yavas_mikro_fly_zaman_asimina_duser(self):
+        def yavas_baglanti():
+            time.sleep(0.5)
+            return True, 99
+
+        with mock.patch.object(MikroFlyService, 'uzak_durum', yavas_baglanti):
+            baslangic = time.monotonic()
+            yanit = await self.async_client.get('/api/mikro-fly/durum/')
+        self.assertLess(time.monotonic() - baslangic, 0.4)
+        self.assertEqual((yanit.json()['is_connected'], yanit.json()['total_customers_in_mikro']), (False, 0))
+
+    @override_settings(QUERY_PROFILING_ENABLED=True, QUERY_PROFILING_SAMPLE_RATE=1.0)
+    async def test_sorgu_profili_async_zincirde_olculur(self):
+        query_profile_buffer.temizle()
+        await self.async_client.get('/api/mikro-fly/durum/')
+        kayitlar = query_profile_buffer.kayitlar()
+        self.assertEqual([k['endpoint'] for k in kayitlar], ['GET /api/mikro-fly/durum/'])
+        self.assertGreaterEqual(kayitlar[0]['sorgu_sayisi'], 2)
+
+    @override_settings(QUERY_PROFILING_ENABLED=True)
+    def test_sorgu_profili_varsayilan_oran_ve_surec(self):
+        from django.conf import settings
+        from django.contrib.auth.models import User
+        del settings.QUERY_PROFILING_SAMPLE_RATE  # ayar yoksa settings.py ile aynı varsayılan (0.1)
+        query_profile_buffer.temizle()
+        with mock.patch('backend.production.middleware.random.random', return_value=0.5):
+            self.client.get('/api/musteriler/')
+        self.assertEqual(query_profile_buffer.kayitlar(), [])
+
+        self.client.force_login(User.objects.create_superuser('yonetici', 'y@example.com', 'x'))
+        yanit = self.client.get('/api/sorgu-profili/').json()
+        self.assertEqual((yanit['ornekleme_orani'], yanit['surec']), (0.1, os.getpid()))
+
+
+class IstatistikServiceTest(TestCase):
+    """MRP özeti: tek sorguda sipariş sayıları, net malzeme eksikleri ve önbellek temizliği"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.musteri = Musteri.objects.create(kod='MST001', ad='Test Müşteri')
+        trafo = Urun.objects.create(kod='URN001', ad='Trafo', kategori='bitmis_urun', birim='adet')
+        sargi = Urun.objects.create(kod='ARA001', ad='Sargı', kategori='ara_urun', birim='adet', stok_miktari=1)
+        bakir = Urun.objects.create(kod='HAM001', ad='Bakır Tel', kategori='hammadde', birim='kg', stok_miktari=10)
+        sac = Urun.objects.create(kod='HAM002', ad='Çelik Sac', kategori='hammadde', birim='kg')
+        UrunRecete.objects.create(urun=trafo, malzeme=sargi, miktar=2)
+        UrunRecete.objects.create(urun=trafo, malzeme=sac, miktar=5)
+        UrunRecete.objects.create(urun=sargi, malzeme=bakir, miktar=10)
+
+        bugun = timezone.now().date()
+        for siparis_no, durum, miktar in [('SIP-1', 'beklemede', 3), ('SIP-2', 'tamamlandi', 1), ('SIP-3', 'iptal', 9)]:
+            siparis = Siparis.objects.create(
+                musteri=cls.musteri, siparis_no=siparis_no, durum=durum, tarih=bugun - timedelta(days=10)
+            )
+            SiparisKalem.objects.create(siparis=siparis, urun=trafo, miktar=miktar, birim_fiyat=100)
+
+        # Çelik sac için 8 kg sipariş verilmiş, 3 kg gelmiş: yolda 5 kg
+        tedarikci = Tedarikci.objects.create(ad='Tedarikçi', kod='TED01')
+        satinalma = SatinAlmaSiparisi.objects.create(
+            siparis_no='SA-1', tedarikci=tedarikci, teslim_tarihi=bugun, toplam_tutar=0
+        )
+        ihtiyac = MalzemeIhtiyac.objects.create(
+            malzeme_adi='Çelik Sac', miktar=8, birim='kg', islem_tipi='satin_al',
+            ilgili_siparisler=['SIP-1'], ilgili_urunler=['Trafo'],
+        )
+        kalem = SatinAlmaKalemi.objects.create(siparis=satinalma, malzeme_ihtiyaci=ihtiyac, miktar=8, birim_fiyat=1)
+        MalzemeGelis.objects.create(satinalma_siparisi=satinalma, satinalma_kalemi=kalem, gelen_miktar=3)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_siparis_sayilari_tek_sorgu(self):
+        with self.assertNumQueries(1):
+            sayilar = IstatistikService.siparis_sayilari()
+        self.assertEqual((sayilar['beklemede'], sayilar['tamamlandi'], sayilar['iptal']), (1, 1, 1))
+        self.assertEqual(sayilar['bu_ay_tamamlanan'], 1)
+        self.assertEqual(sayilar['ortalama_teslim_gun'], 10.0)
+
+    def test_kritik_malzemeler_netlenir(self):
+        # Trafo 3 → Sargı 6 - stok 1 = 5 → Bakır 50 - stok 10 = 40; Çelik Sac 15 - yolda 5 = 10
+        self.assertEqual(IstatistikService.kritik_malzemeler(), [
+            {'name': 'Bakır Tel', 'shortage': 40.0, 'unit': 'kg'},
+            {'name': 'Çelik Sac', 'shortage': 10.0, 'unit': 'kg'},
+        ])
+
+    def test_onbellek_durum_degisiminde_temizlenir(self):
+        yanit = self.client.get('/api/production/mrp-stats/')
+        self.assertEqual(yanit.json()['data']['plannedOrders'], 1)
+        with self.assertNumQueries(0):
+            IstatistikService.mrp_ozeti()
+
+        siparis = Siparis.objects.get(siparis_no='SIP-1')
+        with self.captureOnCommitCallbacks(execute=True) as geri_cagirmalar:
+            siparis.notlar = 'not'
+            siparis.save()
+        self.assertEqual(geri_cagirmalar, [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            siparis.durum = 'uretimde'
+            siparis.save()
+        ozet = IstatistikService.mrp_ozeti()
+        self.assertEqual((ozet['plannedOrders'], ozet['inProduction']), (0, 1))
+        self.assertEqual(ozet['criticalMaterials'], [])
+
+    def test_tamamlanma_tarihi_durum_gecisinde_yazilir(self):
+        siparis = Siparis.objects.get(siparis_no='SIP-1')
+        siparis.durum = 'tamamlandi'
+        siparis.save(update_fields=['durum'])
+        siparis.refresh_from_db()
+        tamamlanma = siparis.tamamlanma_tarihi
+        self.assertIsNotNone(tamamlanma)
+
+        # Sonraki düzenlemeler tamamlanma tarihini (ve teslim süresini) değiştirmez
+        siparis.notlar = 'fatura kesildi'
+        siparis.save()
+        siparis.refresh_from_db()
+        self.assertEqual(siparis.tamamlanma_tarihi, tamamlanma)
+
+        siparis.durum = 'uretimde'
+        siparis.save()
+        self.assertIsNone(siparis.tamamlanma_tarihi)
+
+
+class MetrikServiceTest(TestCase):
+    """Günlük KPI anlık görüntüsü ve trend okuması"""
+
+    @classmethod
+    def setUpTestData(cls):
+        musteri, urun, cls.sargi = temel_kayitlar(gunluk_calisma_saati=8)
+        is_akisi, operasyon = sargi_akisi(urun, cls.sargi)
+        bugun = timezone.localdate()
+        uretimde = Siparis.objects.create(musteri=musteri, siparis_no='SIP-1', durum='uretimde')
+        for siparis_no, teslim in [('SIP-2', bugun), ('SIP-3', bugun - timedelta(days=5))]:
+            siparis = Siparis.objects.create(musteri=musteri, siparis_no=siparis_no, durum='tamamlandi')
+            SiparisKalem.objects.create(siparis=siparis, urun=urun, miktar=1, birim_fiyat=1, teslim_tarihi=teslim)
+        # Pencereden önce tamamlanıp bugün düzenlenen sipariş oranı etkilemez
+        eski = Siparis.objects.create(musteri=musteri, siparis_no='SIP-4', durum='tamamlandi')
+        SiparisKalem.objects.create(siparis=eski, urun=urun, miktar=1, birim_fiyat=1, teslim_tarihi=bugun - timedelta(days=90))
+        Siparis.objects.filter(pk=eski.pk).update(tamamlanma_tarihi=timezone.now() - timedelta(days=60))
+        for emir_no, durum in [('IE-1', 'basladi'), ('IE-2', 'devam_ediyor'), ('IE-3', 'planlandi')]:
+            IsEmri.objects.create(
+                emirNo=emir_no, siparis=uretimde, urun=urun, is_akisi=is_akisi, operasyon=operasyon,
+                planlanan_sure=60, planlanan_istasyon=cls.sargi, durum=durum,
+            )
+
+        cls.tedarikci = Tedarikci.objects.create(ad='Tedarikçi', kod='TED01')
+        satinalma = SatinAlmaSiparisi.objects.create(
+            siparis_no='SA-1', tedarikci=cls.tedarikci, teslim_tarihi=bugun - timedelta(days=3), toplam_tutar=0
+        )
+        ihtiyac = MalzemeIhtiyac.objects.create(
+            malzeme_adi='Bakır Tel', miktar=8, birim='kg', islem_tipi='satin_al',
+            ilgili_siparisler=[], ilgili_urunler=[],
+        )
+        kalem = SatinAlmaKalemi.objects.create(siparis=satinalma, malzeme_ihtiyaci=ihtiyac, miktar=8, birim_fiyat=1)
+        for gelis_tarihi in (bugun - timedelta(days=4), bugun - timedelta(days=1)):
+            MalzemeGelis.objects.create(
+                satinalma_siparisi=satinalma, satinalma_kalemi=kalem, gelen_miktar=2, gelis_tarihi=gelis_tarihi
+            )
+
+    def test_ozet_al_metrikleri_yazar(self):
+        from django.core.management import call_command
+        call_command('metrik_ozet_al', stdout=StringIO())
+        call_command('metrik_ozet_al', stdout=StringIO())  # aynı gün tekrar: satırlar yenilenir
+
+        degerler = {
+            (m.metrik, m.anahtar): float(m.deger) for m in GunlukMetrik.objects.filter(tarih=timezone.localdate())
+        }
+        self.assertEqual(degerler[('siparis_durum', 'tamamlandi')], 3)
+        self.assertEqual(degerler[('siparis_durum', 'uretimde')], 1)
+        self.assertEqual(degerler[('istasyon_wip', str(self.sargi.id))], 2)
+        self.assertEqual(degerler[('zamaninda_teslim', '')], 50.0)
+        self.assertEqual(degerler[('tedarikci_zamaninda', str(self.tedarikci.id))], 50.0)
+
+        yanit = self.client.get('/api/dashboard/metrikler/')
+        wip = yanit.json()['data']['metrikler']['istasyon_wip']
+        self.assertEqual(wip, [{'anahtar': str(self.sargi.id), 'etiket': 'Sargı 1', 'deger': 2.0}])
+
+    def test_trend_tek_aralik_taramasi(self):
+        bugun = timezone.localdate()
+        GunlukMetrik.objects.bulk_create([
+            GunlukMetrik(tarih=bugun - timedelta(days=gun), metrik='siparis_durum', anahtar='uretimde', deger=gun)
+            for gun in range(40)
+        ])
+        with self.assertNumQueries(1):
+            seriler = MetrikService.trend('siparis_durum', bugun - timedelta(days=2), bugun)
+        self.assertEqual([d for _, d in seriler['uretimde']['degerler']], [2.0, 1.0, 0.0])
+
+        yanit = self.client.get('/api/dashboard/metrikler/trend/?metrik=siparis_durum&gun=7')
+        self.assertEqual(len(yanit.json()['data']['seriler']['uretimde']['degerler']), 7)
+        self.assertEqual(self.client.get('/api/dashboard/metrikler/trend/?metrik=yok').status_code, 400)
+
+
+class TedarikciPerformansTest(TestCase):
+    """Tedarikçi karnesi: pencere fonksiyonlarıyla aylık toplama, önbellek ve sıralama"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.a = Tedarikci.objects.create(ad='A Metal', kod='TED-A')
+        cls.b = Tedarikci.objects.create(ad='B Bobin', kod='TED-B')
+        ihtiyac = MalzemeIhtiyac.objects.create(
+            malzeme_adi='Bakır Tel', miktar=30, birim='kg', islem_tipi='satin_al',
+            ilgili_siparisler=[], ilgili_urunler=[],
+        )
+
+        def siparis(no, tedarikci, teslim, gelisler):
+            satinalma = SatinAlmaSiparisi.objects.create(
+                siparis_no=no, tedarikci=tedarikci, teslim_tarihi=teslim, toplam_tutar=0
+            )
+            kalem = SatinAlmaKalemi.objects.create(siparis=satinalma, malzeme_ihtiyaci=ihtiyac, miktar=10, birim_fiyat=1)
+            for gelis_tarihi, miktar in gelisler:
+                MalzemeGelis.objects.create(
+                    satinalma_siparisi=satinalma, satinalma_kalemi=kalem, gelen_miktar=miktar, gelis_tarihi=gelis_tarihi
+                )
+            return satinalma
+
+        # A: biri zamanında, biri 10 gün gecikmeli ve bir kez ertelenmiş; ikisi de tamamlandı
+        siparis('SA-1', cls.a, date(2025, 3, 10), [(date(2025, 3, 8), 10)])
+        gec = siparis('SA-2', cls.a, date(2025, 3, 20), [(date(2025, 3, 25), 5), (date(2025, 3, 30), 5)])
+        SatinAlmaTeslimGuncelleme.objects.create(
+            siparis=gec, eski_teslim_tarihi=date(2025, 3, 20), yeni_teslim_tarihi=date(2025, 3, 30)
+        )
+        # B: teslim tarihi geçmiş, 10'un 4'ü gelmiş açık sipariş
+        cls.acik = siparis('SA-3', cls.b, date(2025, 3, 15), [(date(2025, 3, 14), 4)])
+
+    def test_karne_olculeri(self):
+        siralama = TedarikciPerformansService.siralama(date(2025, 1, 1), date(2025, 6, 30))
+        a, b = siralama
+        self.assertEqual((a['sira'], a['ad'], b['sira'], b['ad']), (1, 'A Metal', 2, 'B Bobin'))
+        self.assertEqual(
+            (a['siparis_sayisi'], a['zamaninda_orani'], a['ortalama_kayma_gun'], a['revizyon_sayisi'], a['doluluk_orani']),
+            (2, 50.0, 5.0, 1, 100.0)
+        )
+        self.assertEqual((b['zamaninda_orani'], b['doluluk_orani']), (0.0, 40.0))
+        self.assertEqual(b['ortalama_kayma_gun'], (timezone.localdate() - date(2025, 3, 15)).days)
+
+        satir = TedarikciPerformans.objects.get(tedarikci=self.a)
+        self.assertEqual((satir.ay, satir.vadesi_gelen, satir.zamaninda, satir.acik_siparis), (date(2025, 3, 1), 2, 1, 0))
+
+    def test_onbellek_ve_gecersiz_kilma(self):
+        TedarikciPerformansService.siralama(date(2025, 1, 1), date(2025, 6, 30))
+        # Önbellek tamken: eksik kontrolü (2) + toplama sorgusu
+        with self.assertNumQueries(3):
+            TedarikciPerformansService.siralama(date(2025, 1, 1), date(2025, 6, 30))
+
+        kalem = self.acik.kalemler.get()
+        MalzemeGelis.objects.create(
+            satinalma_siparisi=self.acik, satinalma_kalemi=kalem, gelen_miktar=6, gelis_tarihi=date(2025, 3, 18)
+        )
+        self.assertFalse(TedarikciPerformans.objects.filter(tedarikci=self.b).exists())
+        b = TedarikciPerformansService.siralama(date(2025, 1, 1), date(2025, 6, 30))[1]
+        self.assertEqual((b['zamaninda_orani'], b['ortalama_kayma_gun'], b['doluluk_orani']), (0.0, 3.0, 100.0))
+
+        yanit = self.client.get('/api/tedarikci-performans/?baslangic=2025-01-01&bitis=2025-06-30&limit=1')
+        self.assertEqual([t['kod'] for t in yanit.json()['data']['tedarikciler']], ['TED-A'])
+
+    def test_siparis_kaydi_yalnizca_etkilenen_aylari_siler(self):
+        SatinAlmaSiparisi.objects.create(
+            siparis_no='SA-4', tedarikci=self.b, teslim_tarihi=date(2025, 6, 5), toplam_tutar=0
+        )
+        TedarikciPerformansService.siralama(date(2025, 1, 1), date(2025, 6, 30))
+        aylar = lambda: set(TedarikciPerformans.objects.filter(tedarikci=self.b).values_list('ay', flat=True))
+        self.assertEqual(aylar(), {date(2025, 3, 1), date(2025, 6, 1)})
+
+        acik = SatinAlmaSiparisi.objects.get(pk=self.acik.pk)
+        acik.toplam_tutar = 100
+        acik.save()
+        self.assertEqual(aylar(), {date(2025, 3, 1), date(2025, 6, 1)})
+
+        acik.teslim_tarihi = date(2025, 4, 15)
+        acik.save()
+        self.assertEqual(aylar(), {date(2025, 6, 1)})
+        self.assertTrue(TedarikciPerformans.objects.filter(tedarikci=self.a).exists())
+
+    def test_admin_karne_sayfasi(self):
+        from django.contrib.auth.models import User
+        self.client.force_login(User.objects.create_superuser('yonetici', 'y@example.com', 'x'))
+        yanit = self.client.get(
+            reverse('admin:malzeme_gelis_tedarikci_performans') + '?baslangic=2025-01-01&bitis=2025-06-30'
+        )
+        self.assertContains(yanit, 'A Metal')
+        self.assertContains(yanit, 'B Bobin')
+
+
+class TedarikSuresiTest(TestCase):
+    """Gelişlerden öğrenilen tedarik süreleri ve malzeme hazır tarihi tahmini"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tedarikci = Tedarikci.objects.create(ad='A Metal', kod='TED-A')
+        gecmis = MalzemeIhtiyac.objects.create(
+            malzeme_adi='Bakır Tel', miktar=40, birim='kg', islem_tipi='satin_al',
+            ilgili_siparisler=['SIP-ESKI'], ilgili_urunler=[],
+        )
+        # Sipariş→tam geliş: 10, 12, 20, 30 gün; son sipariş yarım kalmış (gözlem değil)
+        for no, sure in [('SA-1', 10), ('SA-2', 12), ('SA-3', 20), ('SA-4', 30), ('SA-5', 5)]:
+            satinalma = SatinAlmaSiparisi.objects.create(
+                siparis_no=no, tedarikci=cls.tedarikci, tarih=date(2025, 1, 1),
+                teslim_tarihi=date(2025, 1, 15), toplam_tutar=0,
+            )
+            kalem = SatinAlmaKalemi.objects.create(siparis=satinalma, malzeme_ihtiyaci=gecmis, miktar=10, birim_fiyat=1)
+            MalzemeGelis.objects.create(
+                satinalma_siparisi=satinalma, satinalma_kalemi=kalem, gelen_miktar=5 if no == 'SA-5' else 10,
+                gelis_tarihi=date(2025, 1, 1) + timedelta(days=sure),
+            )
+
+        musteri, urun, istasyon = temel_kayitlar('sargi')
+        is_akisi, cls.sargi = sargi_akisi(urun, istasyon, 'AG Sargı', 30)
+        cls.siparis = Siparis.objects.create(musteri=musteri, siparis_no='SIP-100')
+        cls.kalem = SiparisKalem.objects.create(
+            siparis=cls.siparis, urun=urun, miktar=1, birim_fiyat=100, teslim_tarihi='2030-01-01'
+        )
+        cls.ihtiyac = MalzemeIhtiyac.objects.create(
+            malzeme_adi='Bakır Tel', miktar=10, birim='kg', islem_tipi='satin_al',
+            ilgili_siparisler=['SIP-100'], ilgili_urunler=[],
+        )
+        cls.emir = IsEmri.objects.create(
+            emirNo='IE-0001', ana_emirNo='AIE-001', siparis=cls.siparis, siparis_kalemi=cls.kalem,
+            urun=urun, is_akisi=is_akisi, operasyon=cls.sargi,
+        )
+
+    def test_gelislerle_artimli_ogrenme(self):
+        satirlar = {
+            (s.tedarikci_id, s.malzeme_adi): (s.gozlem_sayisi, s.medyan_gun, s.p90_gun)
+            for s in TedarikSuresi.objects.all()
+        }
+        self.assertEqual(satirlar, {(self.tedarikci.id, 'Bakır Tel'): (4, 20, 30)})
+
+        # Yarım kalan kalem tamamlanınca yeni gözlem olarak eklenir
+        kalem = SatinAlmaKalemi.objects.get(siparis__siparis_no='SA-5')
+        MalzemeGelis.objects.create(
+            satinalma_siparisi=kalem.siparis, satinalma_kalemi=kalem, gelen_miktar=5, gelis_tarihi=date(2025, 1, 6)
+        )
+        satir = TedarikSuresi.objects.get(tedarikci=self.tedarikci, malzeme_adi='Bakır Tel')
+        self.assertEqual((satir.gozlem_sayisi, satir.medyan_gun, satir.p90_gun), (5, 12, 30))
+
+        from django.core.management import call_command
+        TedarikSuresi.objects.all().delete()
+        call_command('tedarik_sureleri_hesapla', stdout=StringIO())
+        self.assertEqual(TedarikSuresi.objects.get().gozlem_sayisi, 5)
+
+    def test_malzeme_ve_genel_tahmin_tedarikci_satirlarindan_birlesir(self):
+        # İkinci tedarikçinin Bakır Tel'i 5 günde, Çelik Sac'ı 40 günde gelir (birer gözlem)
+        ikinci = Tedarikci.objects.create(ad='B Bobin', kod='TED-B')
+        for malzeme_adi, sure in [('Bakır Tel', 5), ('Çelik Sac', 40)]:
+            ihtiyac = MalzemeIhtiyac.objects.create(
+                malzeme_adi=malzeme_adi, miktar=1, birim='kg', islem_tipi='satin_al',
+                ilgili_siparisler=['SIP-ESKI'], ilgili_urunler=[],
+            )
+            satinalma = SatinAlmaSiparisi.objects.create(
+                siparis_no=f'SB-{sure}', tedarikci=ikinci, tarih=date(2025, 2, 1),
+                teslim_tarihi=date(2025, 2, 15), toplam_tutar=0,
+            )
+            kalem = SatinAlmaKalemi.objects.create(siparis=satinalma, malzeme_ihtiyaci=ihtiyac, miktar=1, birim_fiyat=1)
+            MalzemeGelis.objects.create(
+                satinalma_siparisi=satinalma, satinalma_kalemi=kalem, gelen_miktar=1,
+                gelis_tarihi=date(2025, 2, 1) + timedelta(days=sure),
+            )
+
+        # Her geliş tahmine hemen yansır: p90 Bakır Tel (30*4 + 5) / 5 = 25, genel (120 + 5 + 40) / 6 = 27.5 → 28
+        with self.assertNumQueries(2):
+            sureler = TedarikSuresiService.tahmini_sureler(['Bakır Tel', 'Çelik Sac', 'Conta'])
+        self.assertEqual(sureler, {'Bakır Tel': 25, 'Çelik Sac': 28, 'Conta': 28})
+        # Tedarikçinin kendi satırı yeterli gözlemliyse o kullanılır
+        self.assertEqual(TedarikSuresiService.tahmini_sureler(['Bakır Tel'], tedarikci_id=self.tedarikci.id),
+                         {'Bakır Tel': 30})
+        # Medyan: (20*4 + 5 + 40) / 6 = 20.8 → 21
+        self.assertEqual(TedarikSuresiService.genel_sure('medyan_gun'), 21)
+        self.assertEqual(self.emir.hesapla_malzeme_hazir_tarihi(), timezone.now().date() + timedelta(days=25))
+
+    def test_ilgili_siparis_tam_eslesir(self):
+        bugun = timezone.now().date()
+        # 'SIP-10' metin olarak 'SIP-100' içinde geçer ama ilgili sipariş değildir
+        siparis = Siparis.objects.create(musteri=self.siparis.musteri, siparis_no='SIP-10', durum='malzeme_planlandi')
+        kalem = SiparisKalem.objects.create(siparis=siparis, urun=self.kalem.urun, miktar=1, birim_fiyat=1,
+                                            teslim_tarihi='2030-01-01')
+        emir = IsEmri.objects.create(emirNo='IE-0002', siparis=siparis, siparis_kalemi=kalem, urun=self.kalem.urun,
+                                     is_akisi=self.emir.is_akisi, operasyon=self.sargi)
+        # İhtiyacı bulunmayan, malzemesi planlanmış sipariş genel medyanı (20) bekler; SIP-100'ün Bakır Tel
+        # ihtiyacı yanlışlıkla eşleşseydi p90 (30) beklenirdi
+        self.assertEqual(emir.hesapla_malzeme_hazir_tarihi(), bugun + timedelta(days=20))
+
+        # Türkçe karakterli sipariş numarası da bulunur; stoktan kullanılan ihtiyaç bugün hazırdır
+
+        Siparis.objects.filter(pk=siparis.pk).update(siparis_no='SİP-ÇĞ1')
+        MalzemeIhtiyac.objects.create(
+            malzeme_adi='Cıvata', miktar=1, birim='adet', islem_tipi='stoktan_kullan',
+            ilgili_siparisler=['SİP-ÇĞ1'], ilgili_urunler=[],
+        )
+        emir = IsEmri.objects.select_related('siparis_kalemi__siparis', 'operasyon').get(pk=emir.pk)
+        self.assertEqual(emir.hesapla_malzeme_hazir_tarihi(), bugun)
+
+    def test_malzeme_hazir_tarihi_tahmini(self):
+        bugun = timezone.now().date()
+        # Satın alma siparişi verilmemiş ihtiyaç: öğrenilmiş p90
+        self.assertEqual(self.emir.hesapla_malzeme_hazir_tarihi(), bugun + timedelta(days=30))
+        with override_settings(TEDARIK_SURESI_TAHMIN_OLCUSU='medyan_gun'):
+            self.assertEqual(self.emir.hesapla_malzeme_hazir_tarihi(), bugun + timedelta(days=20))
+        # Yetersiz gözlemde genele, hiç veri yoksa varsayılana düşülür
+        with override_settings(TEDARIK_SURESI_MIN_GOZLEM=10, TEDARIK_SURESI_VARSAYILAN_GUN=9):
+            self.assertEqual(self.emir.hesapla_malzeme_hazir_tarihi(), bugun + timedelta(days=9))
+
+        # Sipariş kalemi olmayan sargı operasyonu genel süreyi bekler
+        emir = IsEmri(operasyon=self.sargi)
+        self.assertEqual(emir.hesapla_malzeme_hazir_tarihi(), bugun + timedelta(days=30))
+
+        # Açık satın alma siparişi verilince onun teslim tarihi geçerli olur
+        satinalma = SatinAlmaSiparisi.objects.create(
+            siparis_no='SA-YENI', tedarikci=self.tedarikci, teslim_tarihi=bugun + timedelta(days=5), toplam_tutar=0
+        )
+        SatinAlmaKalemi.objects.create(siparis=satinalma, malzeme_ihtiyaci=self.ihtiyac, miktar=10, birim_fiyat=1)
+        self.assertEqual(self.emir.hesapla_malzeme_hazir_tarihi(), bugun + timedelta(days=5))
+
+
+class OperasyonSinifiTest(TestCase):
+    """Operasyon/istasyon sınıfları: addan ilk atama, Gantt sırası ve sınıf politikaları"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.urun = Urun.objects.create(kod='URN001', ad='Trafo', kategori='bitmis_urun', birim='adet')
+        cls.istasyonlar = [
+            IsIstasyonu.objects.create(kod=kod, ad=ad, tip='makine')
+            for kod, ad in [('IST1', 'Test Odası'), ('IST2', 'YG SARGI 1'), ('IST3', 'Pres'), ('IST4', 'AG Sargı 2'),
+                            ('IST5', 'Montaj Hattı')]
+        ]
+        is_akisi = IsAkisi.objects.create(kod='AKS01', ad='Trafo Akışı', urun=cls.urun)
+        cls.montaj = IsAkisiOperasyon.objects.create(
+            is_akisi=is_akisi, istasyon=cls.istasyonlar[4], operasyon_adi='Nüve montajı', standart_sure=30
+        )
+
+    def setUp(self):
+        self.addCleanup(OperasyonPolitikaService.onbellegi_temizle)
+
+    def test_addan_siniflandirma(self):
+        self.assertEqual(
+            [istasyon.sinif for istasyon in self.istasyonlar],
+            [OperasyonSinifi.TEST, OperasyonSinifi.YG_SARGI, OperasyonSinifi.DIGER, OperasyonSinifi.AG_SARGI,
+             OperasyonSinifi.MONTAJ]
+        )
+        self.assertEqual((self.montaj.sinif, self.montaj.css_sinifi), (OperasyonSinifi.MONTAJ, 'montaj'))
+
+        # Elle seçilen sınıf addan tahminle ezilmez
+        self.montaj.sinif = OperasyonSinifi.DIGER
+        self.montaj.save()
+        self.montaj.refresh_from_db()
+        self.assertEqual(self.montaj.sinif, OperasyonSinifi.DIGER)
+
+    def test_tasarimci_siniflandirma(self):
+        is_akisi = IsAkisi.objects.create(kod='AKS02', ad='Sargı Akışı', urun=self.urun, versiyon='2.0')
+        adim = {'id': 'step-0', 'name': 'AG Sargı', 'istasyon_id': self.istasyonlar[3].pk}
+        sonuc = IsAkisiService.tasarimi_kaydet(is_akisi, [adim], [])
+        op = IsAkisiOperasyon.objects.get(pk=sonuc['operasyonlar']['step-0'])
+        self.assertEqual(op.sinif, OperasyonSinifi.AG_SARGI)
+
+        # Aynı adla kayıt elle seçilen sınıfı korur, yeniden adlandırma sınıfı yeniler
+        IsAkisiOperasyon.objects.filter(pk=op.pk).update(sinif=OperasyonSinifi.DIGER)
+        adim['op_id'] = op.pk
+        self.assertEqual(IsAkisiService.tasarimi_kaydet(is_akisi, [adim], [])['guncellenen'], 0)
+        IsAkisiService.tasarimi_kaydet(is_akisi, [{**adim, 'name': 'Kurutma'}], [])
+        op.refresh_from_db()
+        self.assertEqual(op.sinif, OperasyonSinifi.KURUTMA)
+
+    def test_gantt_istasyon_sirasi(self):
+        from django.contrib.auth.models import User
+        self.client.force_login(User.objects.create_superuser('yonetici', 'y@example.com', 'x'))
+        yanit = self.client.get('/admin/production/uretimplanlama/')
+        self.assertEqual(
+            [istasyon.ad for istasyon in yanit.context['istasyonlar']],
+            ['AG Sargı 2', 'YG SARGI 1', 'Montaj Hattı', 'Test Odası', 'Pres']
+        )
+
+    def test_sinif_politikasi(self):
+        bugun = timezone.now().date()
+        emir = IsEmri(operasyon=self.montaj)
+        # Varsayılan: montaj stoktan çalışır
+        self.assertEqual(emir.hesapla_malzeme_hazir_tarihi(), bugun)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            OperasyonSinifPolitikasi.objects.create(
+                sinif=OperasyonSinifi.MONTAJ, malzeme_kontrolu=True, kalemsiz_tedarik_bekle=True
+            )
+        with override_settings(TEDARIK_SURESI_VARSAYILAN_GUN=9):
+            self.assertEqual(emir.hesapla_malzeme_hazir_tarihi(), bugun + timedelta(days=9))
+
+
+class DisaAktarimTest(TestCase):
+    """Akış halinde CSV / XLSX dökümleri"""
+
+    @classmethod
+    def setUpTestData(cls):
+        musteri = Musteri.objects.create(kod='MST001', ad='Test & Müşteri')
+        urun = Urun.objects.create(kod='URN001', ad='Trafo <1000 kVA>', kategori='bitmis_urun', birim='adet')
+        istasyon = IsIstasyonu.objects.create(kod='IST01', ad='Sargı 1', tip='makine')
+        is_akisi = IsAkisi.objects.create(kod='AKS01', ad='Trafo Akışı', urun=urun)
+        operasyon = IsAkisiOperasyon.objects.create(
+            is_akisi=is_akisi, istasyon=istasyon, operasyon_adi='AG Sargı', standart_sure=30
+        )
+        siparis = Siparis.objects.create(musteri=musteri, siparis_no='SIP-001')
+        SiparisKalem.objects.create(siparis=siparis, urun=urun, miktar=3, birim_fiyat=100, teslim_tarihi='2030-01-15')
+        for i in range(5):
+            IsEmri.objects.create(
+                emirNo=f'IE-{i:04d}', ana_emirNo='AIE-001', siparis=siparis, urun=urun, is_akisi=is_akisi,
+                operasyon=operasyon, durum='tamamlandi' if i == 4 else 'planlandi',
+            )
+
+    def _icerik(self, yanit):
+        self.assertTrue(yanit.streaming)
+        return b''.join(yanit.streaming_content)
+
+    def test_csv(self):
+        with override_settings(DISA_AKTARIM_PARCA_BOYUTU=2):
+            yanit = self.client.get('/api/disa-aktar/is-emirleri/?bicim=csv&durum=planlandi')
+        satirlar = list(csv.reader(StringIO(self._icerik(yanit).decode('utf-8-sig')), delimiter=';'))
+        self.assertEqual(satirlar[0][:3], ['İş Emri No', 'Ana İş Emri No', 'Sipariş No'])
+        self.assertEqual([satir[0] for satir in satirlar[1:]], ['IE-0000', 'IE-0001', 'IE-0002', 'IE-0003'])
+        self.assertEqual(satirlar[1][8], 'Planlandı')
+        self.assertIn('attachment; filename="is-emirleri-', yanit['Content-Disposition'])
+
+    def test_csv_formul_enjeksiyonu_etkisizlestirilir(self):
+        from .disa_aktarim_service import DisaAktarimService
+        icerik = b''.join(DisaAktarimService.csv_akisi(
+            ['Not', 'Miktar'], [('=HYPERLINK("x")', Decimal('-5')), ('@SUM(A1)', 3), ('normal', 1)]
+        )).decode('utf-8-sig')
+        satirlar = list(csv.reader(StringIO(icerik), delimiter=';'))
+        self.assertEqual(satirlar[1:], [["'=HYPERLINK(\"x\")", '-5'], ["'@SUM(A1)", '3'], ['normal', '1']])
+
+    def test_xlsx(self):
+        import zipfile
+        from xml.etree import ElementTree
+
+        yanit = self.client.get('/api/disa-aktar/siparis-kalemleri/?bicim=xlsx')
+        arsiv = zipfile.ZipFile(BytesIO(self._icerik(yanit)))
+        self.assertIsNone(arsiv.testzip())
+        ns = {'x': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+        sayfa = ElementTree.fromstring(arsiv.read('xl/worksheets/sheet1.xml'))
+        satirlar = sayfa.findall('.//x:row', ns)
+        self.assertEqual(len(satirlar), 2)
+        hucreler = {c.get('r'): c for c in satirlar[1].findall('x:c', ns)}
+        self.assertEqual(hucreler['E2'].find('x:is/x:t', ns).text, 'Test & Müşteri')
+        self.assertEqual(hucreler['G2'].find('x:is/x:t', ns).text, 'Trafo <1000 kVA>')
+        self.assertEqual(hucreler['H2'].find('x:v', ns).text, '3')
+        # Tarih: Excel seri numarası + tarih stili
+        self.assertEqual(hucreler['M2'].find('x:v', ns).text, str((date(2030, 1, 15) - date(1899, 12, 30)).days))
+        self.assertEqual(hucreler['M2'].get('s'), '2')
+
+    def test_gecersiz_istek(self):
+        self.assertEqual(self.client.get('/api/disa-aktar/kullanicilar/').status_code, 400)
+        self.assertEqual(self.client.get('/api/disa-aktar/is-emirleri/?bicim=pdf').status_code, 400)
+
+
+class SatinAlmaPdfTest(TestCase):
+    """Sunucu tarafı satın alma siparişi PDF'i: toplu veri okuma, sayfalama, birleştirme ve zip"""
+
+    @classmethod
+    def setUpTestData(cls):
+        tedarikci = Tedarikci.objects.create(ad='Şahin Bakır (İzmir)', kod='TED-P', telefon='0232 000 00 00')
+        ihtiyac = MalzemeIhtiyac.objects.create(
+            malzeme_adi='Bakır Tel Ğ', miktar=30, birim='kg', islem_tipi='satin_al',
+            ilgili_siparisler=[], ilgili_urunler=[],
+        )
+        cls.siparisler = []
+        for i, kalem_sayisi in enumerate((1, 2, 60)):
+            satinalma = SatinAlmaSiparisi.objects.create(
+                siparis_no=f'SA-PDF-{i}', tedarikci=tedarikci, teslim_tarihi=date(2030, 1, 15), toplam_tutar=1234.5
+            )
+            for _ in range(kalem_sayisi):
+                SatinAlmaKalemi.objects.create(siparis=satinalma, malzeme_ihtiyaci=ihtiyac, miktar=10, birim_fiyat=12.5)
+            cls.siparisler.append(satinalma)
+
+    @staticmethod
+    def _sayfalar(pdf):
+        import re
+        import zlib
+        return [zlib.decompress(akis) for akis in re.findall(rb'stream\n(.*?)\nendstream', pdf, re.S)]
+
+    def test_tek_pdf_ve_sayfalama(self):
+        from .satinalma_pdf_service import SatinAlmaPdfService
+
+        idler = [s.pk for s in self.siparisler]
+        with override_settings(PDF_ISLEM_SAYISI=0):
+            # Sipariş sayısından bağımsız: siparişler + tüm kalemler
+            with self.assertNumQueries(2):
+                pdf, content_type, _ = SatinAlmaPdfService.olustur(idler)
+        self.assertEqual(content_type, 'application/pdf')
+        self.assertTrue(pdf.startswith(b'%PDF-1.4') and pdf.rstrip().endswith(b'%%EOF'))
+
+        sayfalar = self._sayfalar(pdf)
+        # 60 kalemli sipariş üç sayfaya taşar
+        self.assertEqual(len(sayfalar), 1 + 1 + 3)
+        self.assertIn(b'(SA-PDF-0)', sayfalar[0])
+        self.assertIn('(Bakır Tel Ğ)'.encode('cp1254'), sayfalar[0])
+        self.assertIn(b'(1.234,50 TL)', sayfalar[0])
+        self.assertIn(b'(1.481,40 TL)', sayfalar[0])
+        self.assertIn(b'(Sayfa 3 / 3)', sayfalar[-1])
+        self.assertIn(f'/Count {len(sayfalar)}'.encode(), pdf)
+
+    def test_zip_islem_havuzu_ile(self):
+        import zipfile
+        from .satinalma_pdf_service import SatinAlmaPdfService
+
+        self.addCleanup(SatinAlmaPdfService.havuzu_kapat)
+        with override_settings(PDF_ISLEM_SAYISI=2):
+            icerik, content_type, dosya_adi = SatinAlmaPdfService.olustur(
+                [s.pk for s in self.siparisler], bicim='zip'
+            )
+        self.assertEqual(content_type, 'application/zip')
+        arsiv = zipfile.ZipFile(BytesIO(icerik))
+        self.assertEqual(arsiv.namelist(), ['SA-PDF-0.pdf', 'SA-PDF-1.pdf', 'SA-PDF-2.pdf'])
+        self.assertEqual(len(self._sayfalar(arsiv.read('SA-PDF-2.pdf'))), 3)
+
+    def test_admin_pdf_ve_toplu_eylem(self):
+        from django.contrib.auth.models import User
+        self.client.force_login(User.objects.create_superuser('yonetici', 'y@example.com', 'x'))
+        with override_settings(PDF_ISLEM_SAYISI=0):
+            yanit = self.client.get(reverse('admin:production_satinalmasiparisi_pdf', args=[self.siparisler[1].pk]))
+            self.assertEqual(yanit['Content-Type'], 'application/pdf')
+            self.assertIn('SA-PDF-1.pdf', yanit['Content-Disposition'])
+
+            yanit = self.client.post(reverse('admin:production_satinalmasiparisi_changelist'), {
+                'action': 'pdf_indir', '_selected_action': [s.pk for s in self.siparisler[:2]],
+            })
+        self.assertEqual(yanit['Content-Type'], 'application/pdf')
+        self.assertEqual(len(self._sayfalar(yanit.content)), 2)
+
+
+class ParcaliYuklemeTest(TestCase):
+    """Parçalı, devam ettirilebilir yükleme ve içerik özetiyle tekilleştirme"""
+
+    ICERIK = b'irsaliye-pdf-icerigi-0123456789'  # 31 bayt: 10 + 10 + 10 + 1
+
+    @classmethod
+    def setUpTestData(cls):
+        musteri = Musteri.objects.create(kod='MST001', ad='Test Müşteri')
+        cls.siparis = Siparis.objects.create(musteri=musteri, siparis_no='SIP-001')
+
+    def setUp(self):
+        import shutil
+        import tempfile
+        medya = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, medya, ignore_errors=True)
+        ayarlar = override_settings(MEDIA_ROOT=medya, PARCALI_YUKLEME_PARCA_BOYUTU=10)
+        ayarlar.enable()
+        self.addCleanup(ayarlar.disable)
+        self.medya = medya
+
+    @staticmethod
+    def _ozet(veri):
+        import hashlib
+        return hashlib.sha256(veri).hexdigest()
+
+    def _baslat(self, hedef='siparis_dosyasi', **ek):
+        yanit = self.client.post('/api/yuklemeler/', {
+            'dosya_adi': '../irsaliye 1.pdf', 'toplam_boyut': len(self.ICERIK),
+            'hedef': hedef, 'hedef_id': self.siparis.pk, **ek,
+        }, content_type='application/json')
+        self.assertEqual(yanit.status_code, 201, yanit.content)
+        return yanit.json()['data']
+
+    def _parca(self, yukleme_id, no, veri=None, ozet=None):
+        veri = self.ICERIK[no * 10:(no + 1) * 10] if veri is None else veri
+        return self.client.put(
+            f'/api/yuklemeler/{yukleme_id}/parcalar/{no}/', veri, content_type='application/octet-stream',
+            headers={'X-Content-SHA256': ozet or self._ozet(veri)},
+        )
+
+    def _tamamla(self, yukleme_id):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(f'/api/yuklemeler/{yukleme_id}/tamamla/')
+
+    def test_devam_ettirme_ve_tamamlama(self):
+        import os
+        yukleme = self._baslat(sha256=self._ozet(self.ICERIK))
+        self.assertEqual((yukleme['parca_sayisi'], yukleme['parca_boyutu']), (4, 10))
+
+        # Sırasız parçalar; biri eksikken tamamlanamaz
+        for no in (3, 1, 2):
+            self.assertEqual(self._parca(yukleme['id'], no).status_code, 200)
+        durum = self.client.get(f"/api/yuklemeler/{yukleme['id']}/").json()['data']
+        self.assertEqual(durum['eksik_parcalar'], [0])
+        yanit = self._tamamla(yukleme['id'])
+        self.assertEqual(yanit.status_code, 400)
+        self.assertIn('Eksik', yanit.json()['error'])
+
+        # Bozuk özet, fazla veri ve geçersiz numara reddedilir, parça yazılmaz
+        self.assertEqual(self._parca(yukleme['id'], 0, ozet='0' * 64).status_code, 400)
+        self.assertEqual(self._parca(yukleme['id'], 0, veri=self.ICERIK[:11]).status_code, 400)
+        self.assertEqual(self._parca(yukleme['id'], 4, veri=b'x').status_code, 400)
+        self.assertFalse(YuklemeParcasi.objects.filter(yukleme_id=yukleme['id'], no=0).exists())
+
+        self.assertEqual(self._parca(yukleme['id'], 0).status_code, 200)
+
+        # Yeniden gönderilen parça doğrulanamazsa eskisi korunur, doğrulanırsa yerine geçer
+        eski = YuklemeParcasi.objects.get(yukleme_id=yukleme['id'], no=1)
+        self.assertEqual(self._parca(yukleme['id'], 1, veri=b'kisa').status_code, 400)
+        self.assertEqual(YuklemeParcasi.objects.get(pk=eski.pk).dosya.name, eski.dosya.name)
+        self.assertTrue(eski.dosya.storage.exists(eski.dosya.name))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self._parca(yukleme['id'], 1).status_code, 200)
+        yeni = YuklemeParcasi.objects.get(pk=eski.pk)
+        self.assertNotEqual(yeni.dosya.name, eski.dosya.name)
+        self.assertFalse(eski.dosya.storage.exists(eski.dosya.name))
+
+        yanit = self._tamamla(yukleme['id'])
+        self.assertEqual(yanit.status_code, 200, yanit.content)
+        sonuc = yanit.json()['data']
+        self.assertEqual((sonuc['sha256'], sonuc['boyut'], sonuc['tekrar']), (self._ozet(self.ICERIK), 31, False))
+
+        dosya = SiparisDosya.objects.get(pk=sonuc['kayit_id'])
+        self.assertEqual((dosya.siparis_id, os.path.basename(dosya.dosya.name)), (self.siparis.pk, 'irsaliye_1.pdf'))
+        with dosya.dosya.open('rb') as f:
+            self.assertEqual(f.read(), self.ICERIK)
+        # Parçalar silinir, yükleme tekrar tamamlanamaz
+        self.assertFalse(YuklemeParcasi.objects.exists())
+        self.assertFalse(os.listdir(os.path.join(self.medya, 'parcali_yuklemeler', yukleme['id'])))
+        self.assertEqual(self._tamamla(yukleme['id']).status_code, 400)
+
+    def test_tekillestirme(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        ilk = self._baslat()
+        for no in range(4):
+            self._parca(ilk['id'], no)
+        ilk_sonuc = self._tamamla(ilk['id']).json()['data']
+
+        ikinci = self._baslat(hedef='siparis_mektubu')
+        for no in range(4):
+            self._parca(ikinci['id'], no)
+        ikinci_sonuc = self._tamamla(ikinci['id']).json()['data']
+        self.assertTrue(ikinci_sonuc['tekrar'])
+        self.assertEqual(ikinci_sonuc['dosya'], ilk_sonuc['dosya'])
+
+        # Tek istekte yükleme de aynı içeriği kullanır
+        yanit = self.client.post(f'/api/siparisler/{self.siparis.pk}/dosya_ekle/', {
+            'dosya': SimpleUploadedFile('kopya.pdf', self.ICERIK), 'aciklama': 'kopya',
+        })
+        self.assertEqual(yanit.status_code, 201)
+
+        icerik = DosyaIcerigi.objects.get()
+        self.assertEqual(icerik.boyut, 31)
+        self.siparis.refresh_from_db()
+        self.assertEqual(self.siparis.siparis_mektubu.name, icerik.dosya.name)
+        self.assertEqual(
+            set(SiparisDosya.objects.values_list('dosya', flat=True)), {icerik.dosya.name}
+        )
+
+    def test_ozet_uyusmazligi_ve_temizlik(self):
+        yukleme = self._baslat(sha256=self._ozet(b'baska icerik'))
+        for no in range(4):
+            self._parca(yukleme['id'], no)
+        yanit = self._tamamla(yukleme['id'])
+        self.assertEqual(yanit.status_code, 400)
+        self.assertFalse(DosyaIcerigi.objects.exists())
+
+        self.assertEqual(self.client.post('/api/yuklemeler/', {
+            'dosya_adi': 'a.pdf', 'toplam_boyut': 5, 'hedef': 'kullanicilar', 'hedef_id': self.siparis.pk,
+        }, content_type='application/json').status_code, 400)
+
+        from .dosya_yukleme_service import DosyaYuklemeService
+        self.assertEqual(DosyaYuklemeService.eskileri_temizle(saat=1), 0)
+        ParcaliYukleme.objects.update(guncellenme_tarihi=timezone.now() - timedelta(hours=2))
+        self.assertEqual(DosyaYuklemeService.eskileri_temizle(saat=1), 1)
+        self.assertFalse(YuklemeParcasi.objects.exists())
+
+
+class BenchKomutlariTest(TestCase):
+    """generate_dataset sentetik verisi ve bench baseline karşılaştırması"""
+
+    def _uret(self, **secenekler):
+        from django.core.management import call_command
+        cikti = StringIO()
+        call_command('generate_dataset', stdout=cikti, **{'orders': 4, 'depth': 2, 'stations': 3, **secenekler})
+        return {
+            ad: int(adet) for ad, adet in
+            (satir.strip().split(': ') for satir in cikti.getvalue().splitlines() if ': ' in satir)
+        }
+
+    def test_generate_dataset_sayilar_ve_temizlik(self):
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+
+        gercek = Musteri.objects.create(kod='MST001', ad='Gerçek Müşteri')
+        sayilar = self._uret(seed=7)
+        self.assertEqual((sayilar['Siparis'], sayilar['IsIstasyonu']), (4, 3))
+        self.assertEqual(Siparis.objects.filter(siparis_no__startswith='GEN-').count(), 4)
+        self.assertEqual(IsIstasyonu.objects.filter(kod__startswith='GEN-').count(), 3)
+        self.assertEqual(sayilar['Musteri'], Musteri.objects.filter(kod__startswith='GEN-').count())
+        self.assertEqual(sayilar['SiparisKalem'], SiparisKalem.objects.count())
+        self.assertEqual(sayilar['IsEmri'], IsEmri.objects.count())
+        durumlar = list(Siparis.objects.order_by('siparis_no').values_list('siparis_no', 'durum'))
+
+        # Veri varken ikinci kez üretilmez; geçersiz sayılar reddedilir
+        with self.assertRaises(CommandError):
+            self._uret(seed=7)
+        with self.assertRaises(CommandError):
+            self._uret(orders=0)
+
+        call_command('generate_dataset', temizle=True, stdout=StringIO())
+        self.assertEqual(list(Musteri.objects.all()), [gercek])
+        for model in (Siparis, IsEmri, Urun, IsIstasyonu, IsAkisi, Tedarikci, SatinAlmaSiparisi, MalzemeIhtiyac):
+            self.assertFalse(model.objects.exists(), model.__name__)
+
+        # Aynı seed aynı veriyi üretir
+        self.assertEqual(self._uret(seed=7), sayilar)
+        self.assertEqual(list(Siparis.objects.order_by('siparis_no').values_list('siparis_no', 'durum')), durumlar)
+
+    def test_bench_baseline_gerilemede_hata_verir(self):
+        import json
+        import tempfile
+        from django.core.management.base import CommandError
+        from .management.commands.bench import Command
+
+        def rapor(orders=20, **olcum):
+            return {
+                'parametreler': {'orders': orders},
+                'sonuclar': {'siparis_viewset_list': {'sorgu_sayisi': 100, 'sure_ms': 50.0, 'tepe_bellek_kb': 400.0, **olcum}},
+            }
+
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as dosya:
+            json.dump(rapor(), dosya)
+        self.addCleanup(os.remove, dosya.name)
+        cikti = StringIO()
+        komut = Command(stdout=cikti)
+        komut.options = {
+            'baseline': dosya.name, 'query_tolerance': 0.10, 'time_tolerance': 1.00, 'memory_tolerance': 0.50,
+        }
+
+        # Tolerans içindeki artışlar ve baseline'da olmayan yeni ölçümler geçer
+        yeni = rapor(sorgu_sayisi=110, sure_ms=99.0, tepe_bellek_kb=600.0)
+        yeni['sonuclar']['yeni_olcum'] = {'sorgu_sayisi': 1000, 'sure_ms': 1.0, 'tepe_bellek_kb': 1.0}
+        komut._baseline_karsilastir(yeni)
+        self.assertIn('gerileme yok', cikti.getvalue())
+
+        with self.assertRaises(CommandError) as hata:
+            komut._baseline_karsilastir(rapor(sorgu_sayisi=111, sure_ms=101.0))
+        self.assertIn('siparis_viewset_list.sorgu_sayisi: 111 > 100', str(hata.exception))
+        self.assertIn('siparis_viewset_list.sure_ms', str(hata.exception))
+        self.assertNotIn('tepe_bellek_kb', str(hata.exception))
+
+        # Farklı parametrelerle alınmış baseline ile karşılaştırılmaz
+        with self.assertRaises(CommandError) as hata:
+            komut._baseline_karsilastir(rapor(orders=500))
+        self.assertIn('farklı parametrelerle', str(hata.exception))
+
+        # Baseline yoksa yalnızca uyarı verilir
+        komut.options['baseline'] = dosya.name + '.yok'
+        komut._baseline_karsilastir(rapor(sorgu_sayisi=1000))
+        self.assertIn('Baseline bulunamadı', cikti.getvalue())
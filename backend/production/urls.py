@@ -24,6 +24,23 @@ urlpatterns = [
     path('ulkeler/', views.ulke_listesi, name='ulke-listesi'),
     path('istasyon-listesi/', views.istasyon_listesi, name='istasyon-listesi'),
     path('exchange-rates/', views.exchange_rates, name='exchange-rates'),
+    path('mikro-fly/durum/', views.mikro_fly_durum, name='mikro-fly-durum'),
     path('convert-currency/', views.convert_currency, name='convert-currency'),
     path('currencies/', views.currency_list, name='currency-list'),
+    path('sorgu-profili/', views.sorgu_profili, name='sorgu-profili'),
+    path('istasyon-yuk/', views.istasyon_yuk, name='istasyon-yuk'),
+    path('planlama/simulasyon/', views.planlama_simulasyon, name='planlama-simulasyon'),
+    path('planlama/degisiklikler/', views.planlama_degisiklikleri, name='planlama-degisiklikleri'),
+    path('planlama/degisiklikler/akis/', views.planlama_akisi, name='planlama-akisi'),
+    path('production/station-stats/', views.production_station_stats, name='production-station-stats'),
+    path('production/mrp-stats/', views.production_mrp_stats, name='production-mrp-stats'),
+    path('dashboard/metrikler/', views.dashboard_metrikleri, name='dashboard-metrikleri'),
+    path('dashboard/metrikler/trend/', views.metrik_trendi, name='metrik-trendi'),
+    path('tedarikci-performans/', views.tedarikci_performans, name='tedarikci-performans'),
+    path('disa-aktar/<slug:kaynak>/', views.disa_aktar, name='disa-aktar'),
+    path('yuklemeler/', views.parcali_yukleme_baslat, name='parcali-yukleme-baslat'),
+    path('yuklemeler/<uuid:yukleme_id>/', views.parcali_yukleme_durumu, name='parcali-yukleme-durumu'),
+    path('yuklemeler/<uuid:yukleme_id>/parcalar/<int:no>/', views.parcali_yukleme_parcasi, name='parcali-yukleme-parcasi'),
+    path('yuklemeler/<uuid:yukleme_id>/tamamla/', views.parcali_yukleme_tamamla, name='parcali-yukleme-tamamla'),
+    path('stations-real-data/', views.stations_real_data, name='stations-real-data'),
 ]
\ No newline at end of file
@@ -1,25 +1,32 @@
 # backend/production/views.py
 
+import hashlib
+import json
+import os
 from django.db import models
+from django.db.models import Q
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_GET
 from rest_framework import viewsets, status,filters
-from rest_framework.decorators import action, api_view
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 import logging
-try:
-    import pyodbc
-    PYODBC_AVAILABLE = True
-except ImportError:
-    # pyodbc not available (production environment)
-    pyodbc = None
-    PYODBC_AVAILABLE = False
 from datetime import datetime
 from decimal import Decimal
+from io import BytesIO
 from django.conf import settings
 from .currency_service import CurrencyService
+from .mikro_fly_service import MikroFlyService, PYODBC_AVAILABLE, pyodbc
+from .middleware import VARSAYILAN_ORNEKLEME_ORANI, query_profile_buffer
+from .pagination import KeysetOptionalMixin, SecenekMixin
+from .filters import IsEmriFilter
 from .models import (
     Musteri, Urun, Siparis, SiparisKalem, SiparisDosya, ULKE_CHOICES,
     IsIstasyonu, StandardIsAdimi, IsAkisi, IsEmri, UrunRecete, IsAkisiOperasyon, BOMTemplate
@@ -34,7 +41,47 @@ from .serializers import (
 
 
 
-class MusteriViewSet(viewsets.ModelViewSet):
+class AraMixin:
+    """
+    `kod`/`ad` üzerinde önek araması yapan hafif typeahead endpoint'i.
+    En fazla ARAMA_MAX_LIMIT adet {id, kod, ad} döndürür, ETag ve Cache-Control ekler.
+    """
+
+    def ara_queryset(self):
+        return self.get_queryset()
+
+    @action(detail=False, methods=['get'])
+    def ara(self, request):
+        """Kod veya ada göre önek araması (typeahead)"""
+        q = request.query_params.get('q', '').strip()
+        max_limit = getattr(settings, 'ARAMA_MAX_LIMIT', 50)
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), max_limit)
+        except ValueError:
+            return Response({'error': 'limit sayı olmalı'}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.ara_queryset()
+        if q:
+            # Önek araması: PostgreSQL'de trigram, SQLite'ta NOCASE indeksi kullanır
+            queryset = queryset.filter(Q(kod__istartswith=q) | Q(ad__istartswith=q))
+        sonuclar = [
+            {'id': id_, 'kod': kod, 'ad': ad}
+            for id_, kod, ad in queryset.order_by('kod').values_list('id', 'kod', 'ad')[:limit]
+        ]
+
+        etag = '"%s"' % hashlib.md5(
+            json.dumps(sonuclar, ensure_ascii=False).encode('utf-8')
+        ).hexdigest()
+        if etag in request.headers.get('If-None-Match', ''):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(sonuclar)
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, max_age=getattr(settings, 'ARAMA_CACHE_MAX_AGE', 300))
+        return response
+
+
+class MusteriViewSet(KeysetOptionalMixin, SecenekMixin, AraMixin, viewsets.ModelViewSet):
     """
     Müşteri CRUD işlemleri için ViewSet
     """
@@ -45,6 +92,11 @@ class MusteriViewSet(viewsets.ModelViewSet):
     search_fields = ['ad', 'kod', 'email']
     ordering_fields = ['ad', 'kod', 'olusturulma_tarihi']
     ordering = ['ad']
+    keyset_ordering = 'kod'
+    secenek_alanlari = ('kod', 'ad')
+    
+    def ara_queryset(self):
+        return Musteri.objects.filter(aktif=True)
     
     @action(detail=False, methods=['get'])
     def aktif_musteriler(self, request):
@@ -70,28 +122,7 @@ class MusteriViewSet(viewsets.ModelViewSet):
     def sync_status(self, request):
         """Mikro Fly senkronizasyon durumunu getir"""
         try:
-            # Son senkronizasyon tarihi
-            last_sync_customer = Musteri.objects.filter(
-                mikro_fly_sync_tarihi__isnull=False
-            ).order_by('-mikro_fly_sync_tarihi').first()
-            
-            last_sync = last_sync_customer.mikro_fly_sync_tarihi if last_sync_customer else None
-            
-            # Mikro Fly bağlantısını test et
-            is_connected = self._test_mikro_fly_connection()
-            
-            # İstatistikler
-            total_synced = Musteri.objects.filter(mikro_fly_kodu__isnull=False).count()
-            total_mikro_customers = self._get_mikro_fly_customer_count() if is_connected else 0
-            
-            return Response({
-                'last_sync': last_sync.isoformat() if last_sync else None,
-                'is_connected': is_connected,
-                'mikro_fly_version': 'V17',
-                'total_customers_in_mikro': total_mikro_customers,
-                'total_customers_synced': total_synced
-            })
-            
+            return Response(MikroFlyService.durum())
         except Exception as e:
             logging.error(f"Sync status hatası: {str(e)}")
             return Response({
@@ -99,38 +130,6 @@ class MusteriViewSet(viewsets.ModelViewSet):
                 'message': f'Durum kontrolü hatası: {str(e)}'
             }, status=500)
     
-    def _test_mikro_fly_connection(self):
-        """Mikro Fly veritabanı bağlantısını test et"""
-        if not PYODBC_AVAILABLE:
-            logging.warning("pyodbc not available - skipping MikroFly connection test")
-            return False
-            
-        try:
-            conn_str = self._get_mikro_fly_connection_string()
-            with pyodbc.connect(conn_str, timeout=5) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT TOP 1 1 FROM CARI_HESAPLAR")
-                return True
-        except Exception as e:
-            logging.warning(f"Mikro Fly bağlantı testi başarısız: {str(e)}")
-            return False
-    
-    def _get_mikro_fly_customer_count(self):
-        """Mikro Fly'deki toplam müşteri sayısını getir"""
-        try:
-            conn_str = self._get_mikro_fly_connection_string()
-            with pyodbc.connect(conn_str) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT COUNT(*) 
-                    FROM CARI_HESAPLAR 
-                    WHERE cari_iptal = 0
-                """)
-                result = cursor.fetchone()
-                return result[0] if result else 0
-        except Exception:
-            return 0
-    
     def _sync_customers_from_mikro_fly(self):
         """Mikro Fly'den müşteri bilgilerini senkronize et"""
         try:
@@ -212,30 +211,9 @@ class MusteriViewSet(viewsets.ModelViewSet):
     
     def _get_mikro_fly_connection_string(self):
         """Mikro Fly veritabanı bağlantı string'ini oluştur"""
-        server = getattr(settings, 'MIKRO_FLY_SERVER', 'localhost')
-        database = getattr(settings, 'MIKRO_FLY_DATABASE', 'MikroFly_V17')
-        username = getattr(settings, 'MIKRO_FLY_USERNAME', 'sa')
-        password = getattr(settings, 'MIKRO_FLY_PASSWORD', '')
-        
-        # Domain kullanıcısı kontrolü - Windows Authentication kullan
-        if '\\' in username:
-            return f"""
-                DRIVER={{SQL Server}};
-                SERVER={server};
-                DATABASE={database};
-                Trusted_Connection=yes;
-            """
-        else:
-            return f"""
-                DRIVER={{SQL Server}};
-                SERVER={server};
-                DATABASE={database};
-                UID={username};
-                PWD={password};
-                Trusted_Connection=no;
-            """
+        return MikroFlyService.baglanti_dizesi()
 
-class UrunViewSet(viewsets.ModelViewSet):
+class UrunViewSet(KeysetOptionalMixin, SecenekMixin, AraMixin, viewsets.ModelViewSet):
     """
     Ürün CRUD işlemleri için ViewSet
     """
@@ -246,6 +224,15 @@ class UrunViewSet(viewsets.ModelViewSet):
     search_fields = ['ad', 'kod']
     ordering_fields = ['ad', 'kod', 'stok_miktari']
     ordering = ['ad']
+    keyset_ordering = 'kod'
+    secenek_alanlari = ('kod', 'ad')
+    
+    def ara_queryset(self):
+        queryset = Urun.objects.all()
+        kategori = self.request.query_params.get('kategori')
+        if kategori:
+            queryset = queryset.filter(kategori=kategori)
+        return queryset
     
     @action(detail=False, methods=['get'])
     def stok_kritik(self, request):
@@ -471,36 +458,17 @@ class UrunViewSet(viewsets.ModelViewSet):
     
     def _get_mikro_fly_connection_string(self):
         """Mikro Fly veritabanı bağlantı string'ini oluştur"""
-        server = getattr(settings, 'MIKRO_FLY_SERVER', 'localhost')
-        database = getattr(settings, 'MIKRO_FLY_DATABASE', 'MikroFly_V17')
-        username = getattr(settings, 'MIKRO_FLY_USERNAME', 'sa')
-        password = getattr(settings, 'MIKRO_FLY_PASSWORD', '')
-        
-        # Domain kullanıcısı kontrolü - Windows Authentication kullan
-        if '\\' in username:
-            return f"""
-                DRIVER={{SQL Server}};
-                SERVER={server};
-                DATABASE={database};
-                Trusted_Connection=yes;
-            """
-        else:
-            return f"""
-                DRIVER={{SQL Server}};
-                SERVER={server};
-                DATABASE={database};
-                UID={username};
-                PWD={password};
-                Trusted_Connection=no;
-            """
+        return MikroFlyService.baglanti_dizesi()
 
-class SiparisViewSet(viewsets.ModelViewSet):
+class SiparisViewSet(KeysetOptionalMixin, SecenekMixin, viewsets.ModelViewSet):
     queryset = Siparis.objects.all()
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     search_fields = ['siparis_no', 'musteri__ad']
     filterset_fields = ['durum', 'musteri', 'tarih']
     ordering_fields = ['tarih', 'teslim_tarihi', 'siparis_no']
     ordering = ['-tarih']
+    keyset_ordering = '-id'
+    secenek_alanlari = ('siparis_no',)
     
     
     def get_serializer_class(self):
@@ -510,7 +478,8 @@ class SiparisViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['post'], parser_classes=[MultiPartParser, FormParser])
     def dosya_ekle(self, request, pk=None):
-        """Siparişe dosya ekleme endpoint'i"""
+        """Siparişe dosya ekleme endpoint'i (büyük dosyalar için parçalı yükleme: yuklemeler/)"""
+        from .dosya_yukleme_service import DosyaYuklemeService
         siparis = self.get_object()
         dosya = request.FILES.get('dosya')
         aciklama = request.data.get('aciklama', '')
@@ -518,9 +487,11 @@ class SiparisViewSet(viewsets.ModelViewSet):
         if not dosya:
             return Response({'error': 'Dosya gerekli'}, status=status.HTTP_400_BAD_REQUEST)
         
+        # Aynı içerik daha önce yüklendiyse mevcut dosya kullanılır
+        icerik, _ = DosyaYuklemeService.icerik_kaydet(dosya)
         siparis_dosya = SiparisDosya.objects.create(
             siparis=siparis,
-            dosya=dosya,
+            dosya=icerik.dosya.name,
             aciklama=aciklama
         )
         
@@ -535,6 +506,17 @@ class SiparisViewSet(viewsets.ModelViewSet):
         serializer = SiparisKalemSerializer(kalemler, many=True)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['post'])
+    def is_emirleri_olustur(self, request):
+        """Verilen siparişler için iş emirlerini toplu oluştur"""
+        from .is_emri_service import IsEmriService
+        siparis_idleri = request.data.get('siparis_idleri') or []
+        if not isinstance(siparis_idleri, list) or not siparis_idleri:
+            return Response({'error': 'siparis_idleri listesi gerekli'}, status=status.HTTP_400_BAD_REQUEST)
+        olusturan = request.user if request.user.is_authenticated else None
+        sonuc = IsEmriService.is_emirleri_olustur(siparis_idleri, olusturan=olusturan)
+        return Response(sonuc, status=status.HTTP_201_CREATED)
+    
     @action(detail=False, methods=['get'])
     def bekleyen_siparisler(self, request):
         """Bekleyen siparişleri listele"""
@@ -542,11 +524,12 @@ class SiparisViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(siparisler, many=True)
         return Response(serializer.data)
 
-class SiparisKalemViewSet(viewsets.ModelViewSet):
-    queryset = SiparisKalem.objects.all()
+class SiparisKalemViewSet(KeysetOptionalMixin, viewsets.ModelViewSet):
+    queryset = SiparisKalem.objects.order_by('-id')
     serializer_class = SiparisKalemSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['siparis', 'urun']
+    keyset_ordering = '-id'
 
 @api_view(['GET'])
 def istasyon_listesi(request):
@@ -570,16 +553,17 @@ def ulke_listesi(request):
     return Response(ulkeler)
 
 # Kur API'leri
-@api_view(['GET'])
-def exchange_rates(request):
+@require_GET
+async def exchange_rates(request):
     """
-    Güncel döviz kurlarını döndür
+    Güncel döviz kurlarını döndür.
+    Harici kur servisi beklenirken worker bloklanmasın diye async (ASGI altında event loop'ta çalışır).
     """
     base_currency = request.GET.get('base', 'USD')
     
     try:
-        rates_data = CurrencyService.get_exchange_rates(base_currency)
-        return Response({
+        rates_data = await CurrencyService.aget_exchange_rates(base_currency)
+        return JsonResponse({
             'success': True,
             'base': rates_data.get('base'),
             'source': rates_data.get('source'),
@@ -587,11 +571,27 @@ def exchange_rates(request):
             'timestamp': rates_data.get('timestamp')
         })
     except Exception as e:
-        return Response({
+        return JsonResponse({
             'success': False,
             'error': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+
+@require_GET
+async def mikro_fly_durum(request):
+    """
+    Mikro Fly müşteri senkronizasyon durumu (musteriler/sync_status ile aynı yanıt).
+    ODBC bağlantısı thread havuzunda beklenir, MIKRO_FLY_DURUM_ZAMAN_ASIMI aşılırsa bağlı değil döner.
+    """
+    try:
+        return JsonResponse(await MikroFlyService.adurum())
+    except Exception as e:
+        logging.error(f"Sync status hatası: {str(e)}")
+        return JsonResponse({
+            'status': 'error',
+            'message': f'Durum kontrolü hatası: {str(e)}'
+        }, status=500)
+
 @api_view(['POST'])
 def convert_currency(request):
     """
@@ -642,7 +642,9 @@ def stations_real_data(request):
     """
     try:
         from .models import IsIstasyonu
+        from .kapasite_service import KapasiteService
         stations = IsIstasyonu.objects.all()
+        doluluk = KapasiteService.doluluk()
         
         station_data = []
         for station in stations:
@@ -654,7 +656,7 @@ def stations_real_data(request):
                 'durum': station.durum,
                 'tip_display': station.get_tip_display(),
                 'durum_display': station.get_durum_display(),
-                'utilization': 60 + (station.id * 7) % 35  # Station ID'ye göre sabit ama farklı değerler
+                'utilization': doluluk.get(station.id, {}).get('doluluk_orani', 0)
             })
             
         return Response({
@@ -727,52 +729,14 @@ def production_bom_stats(request):
 @api_view(['GET'])
 def production_mrp_stats(request):
     """
-    MRP (Material Requirements Planning) istatistiklerini döndür
+    MRP (Material Requirements Planning) istatistiklerini döndür.
+    Tek gruplanmış sorgu + net malzeme ihtiyacı; sonuç kısa süre önbelleklenir (IstatistikService).
     """
     try:
-        # Sipariş durumlarına göre istatistikler
-        siparisler = Siparis.objects.all()
-        
-        # Durum bazlı sayımlar
-        planned_orders = siparisler.filter(durum='beklemede').count()
-        waiting_materials = siparisler.filter(durum='malzeme_planlandi').count()
-        ready_orders = siparisler.filter(durum='is_emirleri_olusturuldu').count()
-        in_production = siparisler.filter(durum='uretimde').count()
-        completed = siparisler.filter(durum='tamamlandi').count()
-        
-        # Bu aylık tamamlanan siparişler
-        current_month = timezone.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        monthly_completed = siparisler.filter(
-            durum='tamamlandi',
-            guncellenme_tarihi__gte=current_month
-        ).count()
-        
-        # Gecikmiş siparişler (tahmini - gelecekte kalemlerden hesaplanacak)
-        delayed_orders = siparisler.filter(
-            durum__in=['uretimde', 'is_emirleri_olusturuldu'],
-            tarih__lt=timezone.now().date()
-        ).count()
-        
-        # Kritik malzemeler (örnek veri - gelecekte gerçek hesaplama yapılacak)
-        critical_materials = [
-            {'name': 'Çelik Sac', 'shortage': 500, 'unit': 'kg'},
-            {'name': 'Bakır Tel', 'shortage': 200, 'unit': 'metre'},
-            {'name': 'Transformer Oil', 'shortage': 150, 'unit': 'litre'}
-        ]
-        
+        from .istatistik_service import IstatistikService
         return Response({
             'success': True,
-            'data': {
-                'plannedOrders': planned_orders,
-                'waitingMaterials': waiting_materials,
-                'readyOrders': ready_orders,
-                'inProduction': in_production,
-                'completed': completed,
-                'monthlyCompleted': monthly_completed,
-                'delayedOrders': delayed_orders,
-                'avgDeliveryTime': 14.5,  # Gelecekte gerçek hesaplama
-                'criticalMaterials': critical_materials
-            }
+            'data': IstatistikService.mrp_ozeti()
         })
         
     except Exception as e:
@@ -816,13 +780,14 @@ def production_station_stats(request):
         total_stations = IsIstasyonu.objects.count()
         
         # Gerçek istasyon verilerini çek
-        stations = IsIstasyonu.objects.all()[:10]  # İlk 10 istasyon
+        from .kapasite_service import KapasiteService
+        stations = list(IsIstasyonu.objects.all()[:10])  # İlk 10 istasyon
+        doluluk = KapasiteService.doluluk([station.id for station in stations])
         capacity_data = []
         
         for station in stations:
-            # Gerçek istasyon bilgileriyle kapasite verisi oluştur
-            import random
-            utilization = random.randint(60, 95)
+            # Doluluk istasyon günlük yük tablosundan (önümüzdeki KAPASITE_DOLULUK_GUN_SAYISI gün)
+            utilization = doluluk.get(station.id, {}).get('doluluk_orani', 0)
             
             capacity_data.append({
                 'id': station.id,
@@ -863,6 +828,47 @@ def production_station_stats(request):
             'error': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['GET'])
+def istasyon_yuk(request):
+    """
+    İstasyon günlük kapasite/yük tablosu - planlama ve panolar için tek aralık sorgusu
+    ?baslangic=YYYY-MM-DD&bitis=YYYY-MM-DD&istasyon=1,2
+    """
+    from datetime import date
+    from .kapasite_service import KapasiteService
+    try:
+        varsayilan_baslangic, varsayilan_bitis = KapasiteService.varsayilan_aralik()
+        baslangic = request.query_params.get('baslangic')
+        bitis = request.query_params.get('bitis')
+        baslangic = date.fromisoformat(baslangic) if baslangic else varsayilan_baslangic
+        bitis = date.fromisoformat(bitis) if bitis else varsayilan_bitis
+        istasyon = request.query_params.get('istasyon')
+        istasyon_idleri = [int(i) for i in istasyon.split(',') if i] if istasyon else None
+    except ValueError:
+        return Response({'success': False, 'error': 'Geçersiz tarih veya istasyon parametresi'},
+                        status=status.HTTP_400_BAD_REQUEST)
+    if bitis < baslangic or (bitis - baslangic).days > 366:
+        return Response({'success': False, 'error': 'Tarih aralığı 0-366 gün olmalı'},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    yukler = KapasiteService.gunluk_yukler(baslangic, bitis, istasyon_idleri)
+    return Response({
+        'success': True,
+        'data': {
+            'baslangic': baslangic,
+            'bitis': bitis,
+            'istasyonlar': KapasiteService.doluluk(istasyon_idleri, baslangic, bitis),
+            'gunler': [{
+                'istasyon': satir.istasyon_id,
+                'tarih': satir.tarih,
+                'kullanilabilir_dakika': satir.kullanilabilir_dakika,
+                'planlanan_dakika': float(satir.planlanan_dakika),
+                'is_emri_sayisi': satir.is_emri_sayisi,
+                'doluluk_orani': satir.doluluk_orani,
+            } for satir in sorted(yukler.values(), key=lambda s: (s.istasyon_id, s.tarih))],
+        }
+    })
+
 @api_view(['GET'])
 def production_operations_stats(request):
     """
@@ -888,7 +894,7 @@ def production_operations_stats(request):
 
 # Production ViewSets
 
-class IsIstasyonuViewSet(viewsets.ModelViewSet):
+class IsIstasyonuViewSet(SecenekMixin, viewsets.ModelViewSet):
     """İş İstasyonu CRUD işlemleri"""
     queryset = IsIstasyonu.objects.all()
     serializer_class = IsIstasyonuSerializer
@@ -897,6 +903,7 @@ class IsIstasyonuViewSet(viewsets.ModelViewSet):
     search_fields = ['ad', 'kod', 'lokasyon']
     ordering_fields = ['ad', 'kod', 'gunluk_calisma_saati']
     ordering = ['ad']
+    secenek_alanlari = ('kod', 'ad')
     
     def destroy(self, request, *args, **kwargs):
         """İstasyon silme - İlişkili kayıtları kontrol et"""
@@ -939,16 +946,68 @@ class IsAkisiViewSet(viewsets.ModelViewSet):
     ordering_fields = ['ad', 'kod', 'olusturulma_tarihi']
     ordering = ['ad']
 
+    @action(detail=True, methods=['post'])
+    def yayinla(self, request, pk=None):
+        """İş akışının güncel halini değişmez rota sürümü olarak yayınla"""
+        from .is_akisi_service import IsAkisiService, IsAkisiTasarimHatasi
+        is_akisi = self.get_object()
+        try:
+            surum = IsAkisiService.yayinla(
+                is_akisi, yayinlayan=request.user if request.user.is_authenticated else None
+            )
+        except IsAkisiTasarimHatasi as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'id': surum.pk,
+            'yayin_no': surum.yayin_no,
+            'versiyon': surum.versiyon,
+            'operasyon_sayisi': surum.operasyon_sayisi,
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['get'])
+    def sure_tahmini(self, request, pk=None):
+        """Verilen miktar için rota üzerinden tahmini üretim süresi (dakika)"""
+        from .is_akisi_service import IsAkisiService
+        try:
+            miktar = float(request.query_params.get('miktar', 1))
+        except ValueError:
+            return Response({'error': 'miktar sayı olmalı'}, status=status.HTTP_400_BAD_REQUEST)
+        is_akisi = self.get_object()
+        rota = IsAkisiService.rotalari_yukle([is_akisi.pk]).get(is_akisi.pk)
+        if rota is None:
+            return Response({'error': 'İş akışında operasyon yok'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({
+            'is_akisi': rota.is_akisi_id,
+            'yayin_no': rota.yayin_no,
+            'miktar': miktar,
+            'operasyon_sayisi': len(rota),
+            'toplam_is_suresi': round(sum(rota.sure(i, miktar) for i in range(len(rota))), 2),
+            'kritik_yol_suresi': round(rota.kritik_yol_suresi(miktar), 2),
+        })
+
 
-class IsEmriViewSet(viewsets.ModelViewSet):
-    """İş Emri CRUD işlemleri"""
+class IsEmriViewSet(KeysetOptionalMixin, viewsets.ModelViewSet):
+    """İş Emri CRUD işlemleri - istasyon terminalleri sürekli sorguladığı için hafif tutulur"""
     queryset = IsEmri.objects.all()
     serializer_class = IsEmriSerializer
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ['durum', 'istasyon', 'siparis', 'urun']
-    search_fields = ['is_emri_no', 'siparis__siparis_no', 'urun__ad']
-    ordering_fields = ['is_emri_no', 'baslangic_tarihi', 'bitis_tarihi']
-    ordering = ['-baslangic_tarihi']
+    filterset_class = IsEmriFilter
+    search_fields = ['emirNo', 'ana_emirNo', 'siparis__siparis_no', 'urun__ad']
+    ordering_fields = ['emirNo', 'planlanan_baslangic_tarihi', 'planlanan_bitis_tarihi', 'oncelik', 'durum']
+    ordering = ['-id']
+    keyset_ordering = '-id'
+
+    def get_queryset(self):
+        queryset = IsEmri.objects.select_related(
+            'siparis__musteri', 'urun', 'planlanan_istasyon'
+        )
+        # Sparse fieldset istenmişse ve öncüller yoksa prefetch sorgusunu atla
+        alanlar = self.request.query_params.get('fields') if self.request else None
+        if not alanlar or 'onceki_operasyonlar' in alanlar.split(','):
+            queryset = queryset.prefetch_related(
+                models.Prefetch('onceki_operasyonlar', queryset=IsEmri.objects.only('id'))
+            )
+        return queryset
 
 
 class UrunReceteViewSet(viewsets.ModelViewSet):
@@ -1026,4 +1085,253 @@ class BOMTemplateViewSet(viewsets.ModelViewSet):
             raise
             
         logger.info("=== End Debug ===")
-        return instance
\ No newline at end of file
+        return instance
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdminUser])
+def sorgu_profili(request):
+    """
+    Profilleme tamponundaki en kötü endpointleri listeler, DELETE ile tamponu boşaltır.
+    Tampon süreç başınadır: yanıt yalnızca isteği karşılayan işçi sürecin (surec) örneklerini içerir.
+    """
+    if request.method == 'DELETE':
+        query_profile_buffer.temizle()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    siralama = request.query_params.get('siralama', 'toplam_db_ms')
+    izinli = ('toplam_db_ms', 'ort_db_ms', 'ort_sorgu', 'max_sorgu', 'ort_sure_ms', 'max_sure_ms', 'istek_sayisi')
+    if siralama not in izinli:
+        return Response({'error': f'Geçersiz sıralama. Seçenekler: {", ".join(izinli)}'}, status=400)
+    try:
+        limit = min(int(request.query_params.get('limit', 20)), 100)
+    except ValueError:
+        return Response({'error': 'limit sayı olmalı'}, status=400)
+
+    return Response({
+        'aktif': getattr(settings, 'QUERY_PROFILING_ENABLED', False),
+        'ornekleme_orani': getattr(settings, 'QUERY_PROFILING_SAMPLE_RATE', VARSAYILAN_ORNEKLEME_ORANI),
+        'surec': os.getpid(),
+        'kayit_sayisi': len(query_profile_buffer.kayitlar()),
+        'endpointler': query_profile_buffer.rapor(limit=limit, siralama=siralama),
+    })
+
+@api_view(['POST'])
+def planlama_simulasyon(request):
+    """
+    What-if planlama simülasyonu - canlı iş emirlerine yazmadan senaryoları yeniden çizelgeler
+    {"senaryolar": [{"ad": "...", "degisiklikler": [...]}]} veya tek senaryo için {"degisiklikler": [...]}
+    Değişiklik tipleri:
+      {"tip": "acil_siparis", "urun": 5, "miktar": 2, "teslim_tarihi": "YYYY-MM-DD"}
+      {"tip": "istasyon_bakim", "istasyon": 3, "baslangic": "YYYY-MM-DDTHH:MM", "bitis": "YYYY-MM-DDTHH:MM"}
+      {"tip": "emir_tasi", "emir": 12, "istasyon": 4, "tarih": "YYYY-MM-DD"}
+      {"tip": "sure_degistir", "emir": 12, "sure": 240}
+    """
+    from .planlama_service import PlanlamaService, SimulasyonHatasi
+    senaryolar = request.data.get('senaryolar')
+    if senaryolar is None:
+        senaryolar = [{'ad': request.data.get('ad'), 'degisiklikler': request.data.get('degisiklikler') or []}]
+    max_senaryo = getattr(settings, 'SIMULASYON_MAX_SENARYO', 8)
+    if not isinstance(senaryolar, list) or not 0 < len(senaryolar) <= max_senaryo:
+        return Response({'success': False, 'error': f'1-{max_senaryo} senaryo gönderilmeli'},
+                        status=status.HTTP_400_BAD_REQUEST)
+    try:
+        sonuclar = PlanlamaService.simule_et(senaryolar)
+    except SimulasyonHatasi as e:
+        return Response({'success': False, 'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'success': True, 'data': sonuclar})
+
+def _son_sira_parametresi(request):
+    """Last-Event-ID başlığı (EventSource yeniden bağlanması) ya da ?son=; yoksa None"""
+    deger = request.headers.get('Last-Event-ID') or request.GET.get('son')
+    if deger in (None, ''):
+        return None
+    son = int(deger)
+    if son < 0:
+        raise ValueError(deger)
+    return son
+
+@require_GET
+async def planlama_degisiklikleri(request):
+    """
+    Planlama değişiklik akışı - uzun yoklama (ASGI altında bekleme işçi thread'i tutmaz)
+    ?son=<sıra>&bekle=<saniye>: son sıradan sonraki değişiklikleri döndürür; yoksa en çok
+    `bekle` saniye (PLANLAMA_UZUN_YOKLAMA_SURESI ile sınırlı) yeni kayıt bekler.
+    """
+    from asgiref.sync import sync_to_async
+    from .degisiklik_akisi_service import DegisiklikAkisiService
+    try:
+        son = _son_sira_parametresi(request)
+        bekle = min(float(request.GET.get('bekle', 0)), getattr(settings, 'PLANLAMA_UZUN_YOKLAMA_SURESI', 25))
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Geçersiz son veya bekle parametresi'},
+                            status=status.HTTP_400_BAD_REQUEST)
+    if son is None:
+        son = await sync_to_async(DegisiklikAkisiService.son_sira)()
+        return JsonResponse({'success': True, 'data': {'son': son, 'degisiklikler': [],
+                                                       'yenile': False, 'devam': False}})
+    return JsonResponse({'success': True, 'data': await DegisiklikAkisiService.bekle(son, bekle)})
+
+async def planlama_akisi(request):
+    """
+    Planlama değişiklik akışı - server-sent events (ASGI altında çalıştırılmalı: uvicorn backend.asgi:application)
+    ?son=<sıra> ya da Last-Event-ID başlığından sonraki değişiklikleri 'plan' olayları olarak gönderir.
+    """
+    from asgiref.sync import sync_to_async
+    from django.http import HttpResponseBadRequest, StreamingHttpResponse
+    from .degisiklik_akisi_service import DegisiklikAkisiService
+    try:
+        son = _son_sira_parametresi(request)
+    except ValueError:
+        return HttpResponseBadRequest('Geçersiz son parametresi')
+    if son is None:
+        son = await sync_to_async(DegisiklikAkisiService.son_sira)()
+
+    yanit = StreamingHttpResponse(DegisiklikAkisiService.olay_akisi(son), content_type='text/event-stream')
+    yanit['Cache-Control'] = 'no-cache'
+    yanit['X-Accel-Buffering'] = 'no'  # nginx arabelleğe almasın
+    return yanit
+
+@api_view(['GET'])
+def dashboard_metrikleri(request):
+    """
+    Dashboard KPI'larının en son günlük anlık görüntüsü (metrik_ozet_al komutuyla hesaplanır)
+    """
+    from .metrik_service import MetrikService
+    yanit = Response({'success': True, 'data': MetrikService.son_durum()})
+    patch_cache_control(yanit, private=True, max_age=getattr(settings, 'METRIK_CACHE_MAX_AGE', 300))
+    return yanit
+
+@api_view(['GET'])
+def metrik_trendi(request):
+    """
+    Bir metriğin günlük trend serileri
+    ?metrik=<siparis_durum|istasyon_wip|zamaninda_teslim|tedarikci_zamaninda|malzeme_eksigi>
+    &gun=<son N gün, varsayılan 30> veya &baslangic=YYYY-MM-DD&bitis=YYYY-MM-DD, isteğe bağlı &anahtar=
+    """
+    from datetime import date, timedelta
+    from .metrik_service import MetrikService
+    from .models import GunlukMetrik
+    metrik = request.query_params.get('metrik')
+    if metrik not in dict(GunlukMetrik.METRIKLER):
+        return Response({'success': False, 'error': 'Geçersiz metrik'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        bitis = date.fromisoformat(request.query_params['bitis']) if 'bitis' in request.query_params else timezone.localdate()
+        if 'baslangic' in request.query_params:
+            baslangic = date.fromisoformat(request.query_params['baslangic'])
+        else:
+            baslangic = bitis - timedelta(days=int(request.query_params.get('gun', 30)) - 1)
+    except ValueError:
+        return Response({'success': False, 'error': 'Geçersiz tarih aralığı'}, status=status.HTTP_400_BAD_REQUEST)
+
+    seriler = MetrikService.trend(metrik, baslangic, bitis, request.query_params.get('anahtar'))
+    yanit = Response({'success': True, 'data': {
+        'metrik': metrik, 'baslangic': baslangic, 'bitis': bitis, 'seriler': seriler,
+    }})
+    patch_cache_control(yanit, private=True, max_age=getattr(settings, 'METRIK_CACHE_MAX_AGE', 300))
+    return yanit
+
+@api_view(['GET'])
+def tedarikci_performans(request):
+    """
+    Tedarikçi karnesi sıralaması
+    ?baslangic=YYYY-MM-DD&bitis=YYYY-MM-DD (varsayılan son 6 ay), isteğe bağlı &limit=
+    """
+    from datetime import date, timedelta
+    from .tedarikci_performans_service import TedarikciPerformansService
+    try:
+        bitis = date.fromisoformat(request.query_params['bitis']) if 'bitis' in request.query_params else timezone.localdate()
+        baslangic = (date.fromisoformat(request.query_params['baslangic']) if 'baslangic' in request.query_params
+                     else (bitis - timedelta(days=180)).replace(day=1))
+        limit = int(request.query_params['limit']) if 'limit' in request.query_params else None
+    except ValueError:
+        return Response({'success': False, 'error': 'Geçersiz tarih aralığı veya limit'},
+                        status=status.HTTP_400_BAD_REQUEST)
+    return Response({'success': True, 'data': {
+        'baslangic': baslangic, 'bitis': bitis,
+        'tedarikciler': TedarikciPerformansService.siralama(baslangic, bitis, limit),
+    }})
+
+@require_GET
+def disa_aktar(request, kaynak):
+    """
+    Tam döküm indirme: is-emirleri, malzeme-ihtiyaclari, siparis-kalemleri
+    ?bicim=csv|xlsx (varsayılan csv), isteğe bağlı &durum=. Yanıt akış halinde üretilir.
+    """
+    from django.http import StreamingHttpResponse
+    from .disa_aktarim_service import DisaAktarimService
+    bicim = request.GET.get('bicim', 'csv')
+    if kaynak not in DisaAktarimService.KAYNAKLAR or bicim not in DisaAktarimService.BICIMLER:
+        return JsonResponse({'success': False, 'error': 'Geçersiz kaynak veya biçim'}, status=400)
+
+    basliklar, satirlar = DisaAktarimService.satirlar(kaynak, request.GET.get('durum'))
+    if bicim == 'xlsx':
+        icerik = DisaAktarimService.xlsx_akisi(DisaAktarimService.kaynak(kaynak)['sayfa'], basliklar, satirlar)
+        tur = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    else:
+        icerik = DisaAktarimService.csv_akisi(basliklar, satirlar)
+        tur = 'text/csv; charset=utf-8'
+    yanit = StreamingHttpResponse(icerik, content_type=tur)
+    yanit['Content-Disposition'] = f'attachment; filename="{kaynak}-{timezone.localdate():%Y%m%d}.{bicim}"'
+    yanit['X-Accel-Buffering'] = 'no'
+    return yanit
+
+@api_view(['POST'])
+def parcali_yukleme_baslat(request):
+    """
+    Büyük dosya için parçalı yükleme başlatır.
+    {dosya_adi, toplam_boyut, hedef: siparis_dosyasi|siparis_mektubu|maliyet_hesabi|evrak_dosyasi,
+     hedef_id, sha256 (isteğe bağlı, tüm dosya), aciklama}
+    Yanıttaki parca_boyutu'na göre parçalar PUT yuklemeler/<id>/parcalar/<no>/ ile gönderilir.
+    """
+    from .dosya_yukleme_service import DosyaYuklemeHatasi, DosyaYuklemeService
+    try:
+        yukleme = DosyaYuklemeService.baslat(
+            dosya_adi=request.data.get('dosya_adi', ''),
+            toplam_boyut=int(request.data.get('toplam_boyut') or 0),
+            hedef=request.data.get('hedef', ''),
+            hedef_id=int(request.data.get('hedef_id') or 0),
+            sha256=request.data.get('sha256', ''),
+            aciklama=request.data.get('aciklama', ''),
+            olusturan=request.user if request.user.is_authenticated else None,
+        )
+    except (DosyaYuklemeHatasi, TypeError, ValueError) as e:
+        return Response({'success': False, 'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'success': True, 'data': DosyaYuklemeService.durum(yukleme)}, status=status.HTTP_201_CREATED)
+
+@api_view(['GET'])
+def parcali_yukleme_durumu(request, yukleme_id):
+    """Alınan ve eksik parçalar; kesilen yükleme eksik parçalardan devam ettirilir"""
+    from .dosya_yukleme_service import DosyaYuklemeService
+    from .models import ParcaliYukleme
+    yukleme = get_object_or_404(ParcaliYukleme, pk=yukleme_id)
+    return Response({'success': True, 'data': DosyaYuklemeService.durum(yukleme)})
+
+@api_view(['PUT'])
+def parcali_yukleme_parcasi(request, yukleme_id, no):
+    """
+    Tek parça; gövde ham bayt (application/octet-stream). İsteğe bağlı X-Content-SHA256
+    başlığıyla parça özeti doğrulanır. Gövde belleğe alınmadan depolamaya yazılır.
+    """
+    from .dosya_yukleme_service import DosyaYuklemeHatasi, DosyaYuklemeService
+    from .models import ParcaliYukleme
+    yukleme = get_object_or_404(ParcaliYukleme, pk=yukleme_id)
+    try:
+        parca = DosyaYuklemeService.parca_yaz(
+            yukleme, no, request.stream or BytesIO(), sha256=request.headers.get('X-Content-SHA256')
+        )
+    except DosyaYuklemeHatasi as e:
+        return Response({'success': False, 'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'success': True, 'data': {'no': parca.no, 'boyut': parca.boyut, 'sha256': parca.sha256}})
+
+@api_view(['POST'])
+def parcali_yukleme_tamamla(request, yukleme_id):
+    """Parçaları birleştirir, içerik özetine göre tekilleştirir ve dosyayı hedef kayda bağlar"""
+    from .dosya_yukleme_service import DosyaYuklemeHatasi, DosyaYuklemeService
+    from .models import ParcaliYukleme
+    yukleme = get_object_or_404(ParcaliYukleme, pk=yukleme_id)
+    try:
+        sonuc = DosyaYuklemeService.tamamla(yukleme)
+    except DosyaYuklemeHatasi as e:
+        return Response({'success': False, 'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'success': True, 'data': sonuc})
@@ -34,6 +34,12 @@ CORS_ALLOW_CREDENTIALS = True
 # Basic Auth (production ortamında aktif olacak)
 BASIC_AUTH_ENABLED = os.environ.get('BASIC_AUTH_ENABLED', 'False').lower() == 'true'
 
+# Sorgu profilleme (istek başına sorgu sayısı / DB süresi). Örnekler işçi süreç başına bellekte tutulur;
+# /api/sorgu-profili/ raporu yalnızca isteği karşılayan sürecin örneklerini gösterir.
+QUERY_PROFILING_ENABLED = os.environ.get('QUERY_PROFILING_ENABLED', 'False').lower() == 'true'
+QUERY_PROFILING_SAMPLE_RATE = float(os.environ.get('QUERY_PROFILING_SAMPLE_RATE', '0.1'))
+QUERY_PROFILING_BUFFER_SIZE = int(os.environ.get('QUERY_PROFILING_BUFFER_SIZE', '500'))
+
 # Application definition
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -54,6 +60,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'backend.production.middleware.BasicAuthMiddleware',
+    'backend.production.middleware.QueryProfilingMiddleware',  # QUERY_PROFILING_ENABLED ile açılır
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',  # Bu satır önemli!
     'corsheaders.middleware.CorsMiddleware',
@@ -93,6 +100,13 @@ DATABASES = {
     }
 }
 
+# Belge numarası sayaçları (production.sequence_service) ayrı bir bağlantıda ayrılır; böylece dış
+# transaction'lar sayaç satırını commit'e kadar kilitlemez. SQLite'ta tek yazıcı olduğundan ikinci
+# bağlantı dış transaction'ı bekler, bu yüzden yalnızca sunucu veritabanlarında tanımlanır.
+if DATABASES['default']['ENGINE'] != 'django.db.backends.sqlite3':
+    DATABASES['sekans'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+    DOCUMENT_SEQUENCE_DB = 'sekans'
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -148,6 +162,63 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 1000  # Müşteri dropdown'ı için artırıldı
 }
 
+# Keyset (cursor) sayfalama - büyük koleksiyonlar için (pagination.KeysetPagination)
+KEYSET_PAGE_SIZE = int(os.environ.get('KEYSET_PAGE_SIZE', '100'))
+KEYSET_MAX_PAGE_SIZE = 1000
+SECENEK_LIMIT = 5000  # /secenekler/ dropdown endpointlerinin üst sınırı
+ARAMA_MAX_LIMIT = 50  # /ara/ typeahead endpointlerinin döndürdüğü en fazla kayıt
+ARAMA_CACHE_MAX_AGE = 300  # saniye
+
+# İstasyon kapasite takvimi (production.kapasite_service)
+KAPASITE_CALISMA_GUNLERI = (0, 1, 2, 3, 4)  # Pazartesi-Cuma
+KAPASITE_DOLULUK_GUN_SAYISI = 7  # Panolardaki doluluk oranı bugünden itibaren kaç günü kapsar
+
+# Çalışma takvimi (production.takvim_service)
+# Vardiya deseni olmayan ekranlar için varsayılan: {"0": [["08:00", "17:00"]], ...}; None ise hafta içi 9 saat
+VARSAYILAN_VARDIYA_DESENI = None
+TAKVIM_UFUK_GUN = 400  # Takvimin bugünden itibaren önceden hesaplandığı gün sayısı
+TAKVIM_GECMIS_GUN = 60
+TAKVIM_ONBELLEK_SURESI = 300  # saniye; diğer süreçlerdeki takvim değişikliklerinin yansıma süresi
+
+# Planlama: artımlı yeniden planlama ve what-if simülasyonu (production.planlama_service)
+SIMULASYON_ISCI_SAYISI = 4  # Paralel senaryo süreç sayısı; 1 ise senaryolar sırayla çalışır
+SIMULASYON_MAX_SENARYO = 8
+PLANLAMA_YAYILIM_SINIRI = 500  # Gantt'ta tek taşımanın kaydırabileceği en fazla iş emri
+
+# Gantt canlı değişiklik akışı (production.degisiklik_akisi_service)
+PLANLAMA_AKIS_YOKLAMA_ARALIGI = 1.0  # saniye; SSE/uzun yoklama veritabanı kontrol aralığı
+PLANLAMA_AKIS_GECIKME = 1.0  # saniye; commit sırası farkı için yeni kayıtların bekletilme süresi
+PLANLAMA_AKIS_SURESI = 300  # saniye; SSE bağlantısı kapanır, tarayıcı Last-Event-ID ile yeniden bağlanır
+PLANLAMA_AKIS_LIMIT = 1000
+PLANLAMA_UZUN_YOKLAMA_SURESI = 25
+PLANLAMA_DEGISIKLIK_SAKLAMA_GUN = 7
+
+# Dashboard istatistikleri (production.istatistik_service)
+MRP_ISTATISTIK_ONBELLEK_SURESI = 60  # saniye; sipariş durumu değişince erken temizlenir
+MRP_KRITIK_MALZEME_LIMIT = 10
+METRIK_PERFORMANS_PENCERESI_GUN = 30  # Zamanında teslim oranlarının hesaplandığı geriye dönük pencere
+METRIK_MALZEME_LIMIT = 50  # Günlük anlık görüntüye yazılan en fazla malzeme eksiği
+METRIK_CACHE_MAX_AGE = 300
+
+# Tedarik süreleri (production.tedarik_suresi_service)
+TEDARIK_SURESI_GOZLEM_SAYISI = 100  # Dağılımın çıkarıldığı en yeni gözlem sayısı
+TEDARIK_SURESI_MIN_GOZLEM = 3  # Daha az gözlemli satırlar yerine bir üst (daha genel) satır kullanılır
+TEDARIK_SURESI_TAHMIN_OLCUSU = 'p90_gun'  # veya 'medyan_gun'
+TEDARIK_SURESI_VARSAYILAN_GUN = 14  # Hiç geliş geçmişi yokken
+
+# Dışa aktarım (production.disa_aktarim_service)
+DISA_AKTARIM_PARCA_BOYUTU = 2000  # Veritabanından tek seferde okunan satır sayısı
+DISA_AKTARIM_CSV_AYIRICI = ';'  # Türkçe Excel liste ayırıcısı
+
+# Satın alma PDF çıktısı (production.satinalma_pdf_service)
+SIRKET_ADI = 'ŞİRKET ADI'  # Sipariş belgesinin başlığı
+PDF_ISLEM_SAYISI = 2  # PDF çizen işçi süreç sayısı; 0: istek sürecinde çiz
+
+# Parçalı dosya yükleme (production.dosya_yukleme_service)
+PARCALI_YUKLEME_PARCA_BOYUTU = 5 * 1024 * 1024  # Parça boyutu (bayt); son parça daha küçük olabilir
+PARCALI_YUKLEME_MAX_BOYUT = 1024 * 1024 * 1024  # Tek dosya için üst sınır (bayt)
+PARCALI_YUKLEME_SURESI_SAAT = 48  # Bu süre ilerlemeyen yarım yüklemeler temizlenir
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
@@ -159,4 +230,5 @@ MIKRO_FLY_PASSWORD = os.getenv('MIKRO_FLY_PASSWORD', '')
 
 # Senkronizasyon ayarları
 MIKRO_FLY_SYNC_ENABLED = True
-MIKRO_FLY_SYNC_INTERVAL_MINUTES = 60  # Her saat başı senkronizasyon
\ No newline at end of file
+MIKRO_FLY_SYNC_INTERVAL_MINUTES = 60  # Her saat başı senkronizasyon
+MIKRO_FLY_DURUM_ZAMAN_ASIMI = 10  # saniye, async durum kontrolünde ODBC yanıtı için üst sınır
\ No newline at end of file
@@ -13,6 +13,8 @@ import {
 } from '@ant-design/icons';
 import { PieChart, Pie, Cell, ResponsiveContainer, BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip } from 'recharts';
 import styled from 'styled-components';
+import { useQuery } from '@tanstack/react-query';
+import { dashboardService } from '../../services/dashboardService';
 
 const { Title } = Typography;
 
@@ -42,18 +44,30 @@ const ActionCard = styled(Card)`
 `;
 
 const ProcurementDashboard: React.FC = () => {
+  const { data: metrikOzeti, isLoading } = useQuery({
+    queryKey: ['metric-snapshot'],
+    queryFn: () => dashboardService.getMetricSnapshot()
+  });
+
+  const tedarikciOranlari = metrikOzeti?.metrikler.tedarikci_zamaninda || [];
+  const malzemeEksikleri = metrikOzeti?.metrikler.malzeme_eksigi || [];
+  const ortalamaTeslimat = tedarikciOranlari.length
+    ? tedarikciOranlari.reduce((toplam, satir) => toplam + satir.deger, 0) / tedarikciOranlari.length
+    : 0;
+
   const procurementStats = [
     { title: 'Aktif Tedarikçiler', value: 28, prefix: <UserOutlined />, color: '#1890ff' },
     { title: 'Bekleyen Siparişler', value: 15, prefix: <ClockCircleOutlined />, color: '#fa8c16' },
     { title: 'Aylık Harcama', value: '₺1.8M', prefix: <DollarOutlined />, color: '#722ed1' },
-    { title: 'Teslimat Oranı', value: '92%', prefix: <TruckOutlined />, color: '#52c41a' },
+    { title: 'Teslimat Oranı', value: `${ortalamaTeslimat.toFixed(0)}%`, prefix: <TruckOutlined />, color: '#52c41a' },
   ];
 
+  // Tedarikçiler zamanında teslim oranına göre: A ≥ %90, B ≥ %70, C altı
   const supplierPerformance = [
-    { name: 'A Sınıfı', value: 65, color: '#52c41a' },
-    { name: 'B Sınıfı', value: 25, color: '#fa8c16' },
-    { name: 'C Sınıfı', value: 10, color: '#f5222d' },
-  ];
+    { name: 'A Sınıfı', value: tedarikciOranlari.filter(t => t.deger >= 90).length, color: '#52c41a' },
+    { name: 'B Sınıfı', value: tedarikciOranlari.filter(t => t.deger >= 70 && t.deger < 90).length, color: '#fa8c16' },
+    { name: 'C Sınıfı', value: tedarikciOranlari.filter(t => t.deger < 70).length, color: '#f5222d' },
+  ].filter(sinif => sinif.value > 0);
 
   const pendingOrders = [
     { 
@@ -164,7 +178,7 @@ const ProcurementDashboard: React.FC = () => {
       <Row gutter={[16, 16]}>
         {/* Tedarikçi Performansı */}
         <Col xs={24} lg={8}>
-          <Card title="Tedarikçi Performansı" size="small">
+          <Card title="Tedarikçi Performansı" size="small" loading={isLoading}>
             <ResponsiveContainer width="100%" height={250}>
               <PieChart>
                 <Pie
@@ -221,59 +235,56 @@ const ProcurementDashboard: React.FC = () => {
 
         {/* Kritik Stok Durumu */}
         <Col xs={24} lg={12}>
-          <Card title="Kritik Stok Uyarıları" size="small">
+          <Card title="Kritik Stok Uyarıları" size="small" loading={isLoading}>
             <List
               itemLayout="horizontal"
-              dataSource={[
-                { material: 'Bakır İletken', current: 50, minimum: 100, unit: 'kg' },
-                { material: 'Trafo Yağı', current: 25, minimum: 50, unit: 'L' },
-                { material: 'İzolasyon Bandı', current: 15, minimum: 30, unit: 'rulo' },
-              ]}
+              dataSource={malzemeEksikleri.slice(0, 5)}
               renderItem={item => (
                 <List.Item>
                   <List.Item.Meta
                     avatar={<WarningOutlined style={{ color: '#fa8c16', fontSize: '18px' }} />}
-                    title={item.material}
-                    description={`Mevcut: ${item.current} ${item.unit} / Min: ${item.minimum} ${item.unit}`}
-                  />
-                  <Progress 
-                    percent={Math.round((item.current / item.minimum) * 100)}
-                    size="small"
-                    strokeColor={item.current < item.minimum ? '#f5222d' : '#52c41a'}
+                    title={item.anahtar}
+                    description={`Eksik: ${item.deger} ${item.etiket}`}
                   />
                 </List.Item>
               )}
+              locale={{ emptyText: 'Eksik malzeme bulunmuyor' }}
             />
           </Card>
         </Col>
 
         {/* Bu Ayki Teslimatlar */}
         <Col xs={24} lg={12}>
-          <Card title="Bu Ay Teslim Edilen" size="small">
+          <Card title="Tedarikçi Zamanında Teslim" size="small" loading={isLoading}>
             <Row gutter={16}>
               <Col span={12}>
                 <Statistic 
-                  title="Zamanında" 
-                  value={23} 
-                  suffix="/ 25"
+                  title="Hedefte (≥ %90)" 
+                  value={tedarikciOranlari.filter(t => t.deger >= 90).length} 
+                  suffix={`/ ${tedarikciOranlari.length}`}
                   prefix={<CheckCircleOutlined style={{ color: '#52c41a' }} />}
                 />
               </Col>
               <Col span={12}>
                 <Statistic 
                   title="Gecikmeli" 
-                  value={2} 
-                  suffix="/ 25"
+                  value={tedarikciOranlari.filter(t => t.deger < 90).length} 
+                  suffix={`/ ${tedarikciOranlari.length}`}
                   prefix={<ClockCircleOutlined style={{ color: '#f5222d' }} />}
                 />
               </Col>
             </Row>
             <div style={{ marginTop: '16px' }}>
-              <Progress 
-                percent={92} 
-                strokeColor="#52c41a"
-                format={() => 'Teslimat Başarı Oranı: %92'}
-              />
+              {[...tedarikciOranlari].sort((a, b) => a.deger - b.deger).slice(0, 5).map(tedarikci => (
+                <div key={tedarikci.anahtar}>
+                  <div style={{ fontSize: '12px', color: '#666' }}>{tedarikci.etiket}</div>
+                  <Progress 
+                    percent={Math.round(tedarikci.deger)} 
+                    size="small"
+                    strokeColor={tedarikci.deger >= 90 ? '#52c41a' : tedarikci.deger >= 70 ? '#fa8c16' : '#f5222d'}
+                  />
+                </div>
+              ))}
             </div>
           </Card>
         </Col>
@@ -27,6 +27,7 @@ import styled from 'styled-components';
 import { useNavigate } from 'react-router-dom';
 import { useQuery } from '@tanstack/react-query';
 import { productionService } from '../../services/productionService';
+import { dashboardService } from '../../services/dashboardService';
 import dayjs from 'dayjs';
 
 const { Title } = Typography;
@@ -95,6 +96,11 @@ const ProductionDashboard: React.FC = () => {
     queryFn: () => productionService.getOperationsStats()
   });
 
+  const { data: teslimTrendi, isLoading: trendLoading } = useQuery({
+    queryKey: ['metric-trend', 'zamaninda_teslim', 90],
+    queryFn: () => dashboardService.getMetricTrend('zamaninda_teslim', 90)
+  });
+
   const isLoading = bomLoading || workflowLoading || stationLoading || mrpLoading || operationsLoading;
 
   // Helper function for number formatting
@@ -191,15 +197,11 @@ const ProductionDashboard: React.FC = () => {
   // Recent workflows
   const recentWorkflows = workflowData?.recentWorkflows || [];
 
-  // Production efficiency data
-  const efficiencyData = [
-    { month: 'Oca', verimlilik: 85, kapasite: 78 },
-    { month: 'Şub', verimlilik: 88, kapasite: 82 },
-    { month: 'Mar', verimlilik: 92, kapasite: 85 },
-    { month: 'Nis', verimlilik: 89, kapasite: 88 },
-    { month: 'May', verimlilik: 94, kapasite: 91 },
-    { month: 'Haz', verimlilik: 96, kapasite: 93 },
-  ];
+  // On-time delivery trend from the daily metric snapshots
+  const efficiencyData = (teslimTrendi?.seriler['']?.degerler || []).map(([tarih, deger]) => ({
+    tarih: dayjs(tarih).format('DD.MM'),
+    zamaninda: deger,
+  }));
 
   // Critical materials
   const criticalMaterials = mrpData?.criticalMaterials || [];
@@ -370,17 +372,16 @@ const ProductionDashboard: React.FC = () => {
           </Card>
         </Col>
 
-        {/* Production Efficiency Trend */}
+        {/* On-time Delivery Trend */}
         <Col xs={24} lg={12}>
-          <Card title="Son 6 Ay Üretim Verimliliği" size="small" loading={isLoading}>
+          <Card title="Son 90 Gün Zamanında Teslim Oranı" size="small" loading={trendLoading}>
             <ResponsiveContainer width="100%" height={300}>
               <LineChart data={efficiencyData}>
                 <CartesianGrid strokeDasharray="3 3" />
-                <XAxis dataKey="month" />
-                <YAxis />
-                <Tooltip formatter={(value, name) => [`%${value}`, name === 'verimlilik' ? 'Verimlilik' : 'Kapasite Kullanımı']} />
-                <Line type="monotone" dataKey="verimlilik" stroke="#52c41a" name="verimlilik" />
-                <Line type="monotone" dataKey="kapasite" stroke="#722ed1" name="kapasite" />
+                <XAxis dataKey="tarih" />
+                <YAxis domain={[0, 100]} />
+                <Tooltip formatter={(value) => [`%${value}`, 'Zamanında Teslim']} />
+                <Line type="monotone" dataKey="zamaninda" stroke="#52c41a" name="zamaninda" dot={false} />
               </LineChart>
             </ResponsiveContainer>
           </Card>
@@ -21,6 +21,7 @@ import styled from 'styled-components';
 import { useNavigate } from 'react-router-dom';
 import { useQuery } from '@tanstack/react-query';
 import { salesService } from '../../services/salesService';
+import { dashboardService } from '../../services/dashboardService';
 import dayjs from 'dayjs';
 import {
   ComposableMap,
@@ -86,21 +87,30 @@ const SalesDashboard: React.FC = () => {
     queryFn: () => salesService.getSalesStats()
   });
 
+  const { data: metrikOzeti } = useQuery({
+    queryKey: ['metric-snapshot'],
+    queryFn: () => dashboardService.getMetricSnapshot()
+  });
+
   const orders = ordersData?.results || [];
   const customers = customersData || [];
 
   // İptal edilmeyen siparişler
   const activeOrders = orders.filter(order => order.durum !== 'iptal');
 
-  // Sipariş durum istatistikleri (iptal edilmeyenler)
-  const orderStatusStats = {
-    beklemede: activeOrders.filter(o => o.durum === 'beklemede').length,
-    malzeme_planlandi: activeOrders.filter(o => o.durum === 'malzeme_planlandi').length,
-    is_emirleri_olusturuldu: activeOrders.filter(o => o.durum === 'is_emirleri_olusturuldu').length,
-    uretimde: activeOrders.filter(o => o.durum === 'uretimde').length,
-    tamamlandi: activeOrders.filter(o => o.durum === 'tamamlandi').length,
-    iptal: orders.filter(o => o.durum === 'iptal').length, // İptal sayısı için tüm siparişler
-  };
+  // Sipariş durum istatistikleri: günlük metrik anlık görüntüsü varsa tüm siparişler üzerinden,
+  // yoksa yüklenen ilk sayfadaki siparişlerden
+  const metrikDurumlari = metrikOzeti?.metrikler.siparis_durum;
+  const orderStatusStats: Record<string, number> = metrikDurumlari?.length
+    ? Object.fromEntries(metrikDurumlari.map(satir => [satir.anahtar, satir.deger]))
+    : {
+      beklemede: activeOrders.filter(o => o.durum === 'beklemede').length,
+      malzeme_planlandi: activeOrders.filter(o => o.durum === 'malzeme_planlandi').length,
+      is_emirleri_olusturuldu: activeOrders.filter(o => o.durum === 'is_emirleri_olusturuldu').length,
+      uretimde: activeOrders.filter(o => o.durum === 'uretimde').length,
+      tamamlandi: activeOrders.filter(o => o.durum === 'tamamlandi').length,
+      iptal: orders.filter(o => o.durum === 'iptal').length, // İptal sayısı için tüm siparişler
+    };
   
   // Yılbaşından bu yana veriler
   const yearStart = dayjs().startOf('year');
@@ -177,12 +187,12 @@ const SalesDashboard: React.FC = () => {
 
   // Sipariş durum dağılımı (Pie chart için)
   const statusDistribution = [
-    { name: 'Beklemede', value: orderStatusStats.beklemede, color: '#1890ff' },
-    { name: 'Malzeme Planlandı', value: orderStatusStats.malzeme_planlandi, color: '#fa8c16' },
-    { name: 'İş Emirleri Oluşturuldu', value: orderStatusStats.is_emirleri_olusturuldu, color: '#722ed1' },
-    { name: 'Üretimde', value: orderStatusStats.uretimde, color: '#52c41a' },
-    { name: 'Tamamlandı', value: orderStatusStats.tamamlandi, color: '#13c2c2' },
-    { name: 'İptal', value: orderStatusStats.iptal, color: '#ff4d4f' },
+    { name: 'Beklemede', value: orderStatusStats.beklemede || 0, color: '#1890ff' },
+    { name: 'Malzeme Planlandı', value: orderStatusStats.malzeme_planlandi || 0, color: '#fa8c16' },
+    { name: 'İş Emirleri Oluşturuldu', value: orderStatusStats.is_emirleri_olusturuldu || 0, color: '#722ed1' },
+    { name: 'Üretimde', value: orderStatusStats.uretimde || 0, color: '#52c41a' },
+    { name: 'Tamamlandı', value: orderStatusStats.tamamlandi || 0, color: '#13c2c2' },
+    { name: 'İptal', value: orderStatusStats.iptal || 0, color: '#ff4d4f' },
   ].filter(item => item.value > 0);
 
   // Aylık satış trendi (son 12 ay - iptal edilmeyenler)
@@ -1,5 +1,5 @@
 import api from './api';
-import { ApiResponse, Siparis, Musteri, Urun, DashboardStats } from '../types';
+import { ApiResponse, Siparis, Musteri, Urun, DashboardStats, MetrikOzeti, MetrikTrendi } from '../types';
 
 export const dashboardService = {
   // Get dashboard statistics
@@ -98,4 +98,28 @@ export const dashboardService = {
       throw error;
     }
   },
+
+  // Günlük KPI anlık görüntüsü (metrik_ozet_al ile önceden hesaplanır)
+  getMetricSnapshot: async (): Promise<MetrikOzeti> => {
+    try {
+      const response = await api.get('/dashboard/metrikler/');
+      return response.data.data;
+    } catch (error) {
+      console.error('Metric snapshot error:', error);
+      throw error;
+    }
+  },
+
+  // Bir metriğin son N günlük trend serileri
+  getMetricTrend: async (metrik: string, gun: number = 30, anahtar?: string): Promise<MetrikTrendi> => {
+    try {
+      const response = await api.get('/dashboard/metrikler/trend/', {
+        params: { metrik, gun, ...(anahtar !== undefined ? { anahtar } : {}) },
+      });
+      return response.data.data;
+    } catch (error) {
+      console.error('Metric trend error:', error);
+      throw error;
+    }
+  },
 };
\ No newline at end of file
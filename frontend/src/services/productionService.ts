@@ -191,29 +191,9 @@ export const productionService = {
   // Get MRP statistics
   getMRPStats: async () => {
     try {
-      // Get real orders data and calculate MRP statistics
-      const ordersResponse = await api.get('/siparisler/');
-      const orders = ordersResponse.data.results || ordersResponse.data;
-      
-      // Calculate MRP statistics from real orders
-      const orderStats = {
-        plannedOrders: orders.filter((o: any) => o.durum === 'beklemede').length, // "Beklemede" -> "Planlanan" olarak göster
-        waitingMaterials: orders.filter((o: any) => o.durum === 'malzeme_planlandi').length,
-        readyOrders: orders.filter((o: any) => o.durum === 'is_emirleri_olusturuldu').length,
-        inProduction: orders.filter((o: any) => o.durum === 'uretimde').length,
-        completed: orders.filter((o: any) => o.durum === 'tamamlandi').length,
-        monthlyCompleted: orders.filter((o: any) => 
-          o.durum === 'tamamlandi' && 
-          new Date(o.tarih).getMonth() === new Date().getMonth()
-        ).length,
-        delayedOrders: orders.filter((o: any) => 
-          o.durum !== 'tamamlandi' && new Date(o.tarih) < new Date()
-        ).length,
-        avgDeliveryTime: 14.5, // Calculate from real data later
-        criticalMaterials: [] // Remove mock data - no critical materials system implemented yet
-      };
-
-      return orderStats;
+      // Sipariş durum sayıları, kritik malzemeler ve ortalama teslim süresi backend'de hesaplanır
+      const response = await api.get('/production/mrp-stats/');
+      return response.data.data;
     } catch (error) {
       console.error('MRP stats error:', error);  
       throw error;
@@ -469,5 +449,13 @@ export const productionService = {
       console.error('Standard steps error:', error);
       throw error;
     }
+  },
+
+  // Full dump download URL (is-emirleri | malzeme-ihtiyaclari | siparis-kalemleri).
+  // The backend streams the file, so open it directly instead of buffering a blob through axios.
+  getExportUrl: (kaynak: string, bicim: 'csv' | 'xlsx' = 'xlsx', durum?: string) => {
+    const params = new URLSearchParams({ bicim });
+    if (durum) params.set('durum', durum);
+    return `${api.defaults.baseURL}disa-aktar/${kaynak}/?${params.toString()}`;
   }
 };
\ No newline at end of file
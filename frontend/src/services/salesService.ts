@@ -1,5 +1,5 @@
 import api from './api';
-import { ApiResponse, Siparis, Musteri, SiparisKalem, Urun, Ulke } from '../types';
+import { ApiResponse, AramaSonucu, Siparis, Musteri, SiparisKalem, Urun, Ulke } from '../types';
 
 export const salesService = {
   // Kur servisleri
@@ -183,6 +183,18 @@ export const salesService = {
     }
   },
 
+  // Müşteri typeahead (kod/ad önek araması)
+  searchCustomers: async (q: string, limit = 20): Promise<AramaSonucu[]> => {
+    try {
+      const queryParams = new URLSearchParams({ q, limit: limit.toString() });
+      const response = await api.get<AramaSonucu[]>(`/musteriler/ara/?${queryParams}`);
+      return response.data;
+    } catch (error) {
+      console.error('Search customers error:', error);
+      throw error;
+    }
+  },
+
   // Ürün servisleri
   getProducts: async (params?: {
     page?: number;
@@ -205,6 +217,19 @@ export const salesService = {
     }
   },
 
+  // Ürün typeahead (kod/ad önek araması)
+  searchProducts: async (q: string, params?: { limit?: number; kategori?: string }): Promise<AramaSonucu[]> => {
+    try {
+      const queryParams = new URLSearchParams({ q, limit: (params?.limit ?? 20).toString() });
+      if (params?.kategori) queryParams.append('kategori', params.kategori);
+      const response = await api.get<AramaSonucu[]>(`/urunler/ara/?${queryParams}`);
+      return response.data;
+    } catch (error) {
+      console.error('Search products error:', error);
+      throw error;
+    }
+  },
+
   getProductById: async (id: number): Promise<Urun> => {
     try {
       const response = await api.get<Urun>(`/urunler/${id}/`);
@@ -261,6 +286,44 @@ export const salesService = {
     }
   },
 
+  // Büyük dosyalar için parçalı yükleme; yuklemeId verilirse eksik parçalardan devam eder
+  uploadFileChunked: async (
+    hedef: 'siparis_dosyasi' | 'siparis_mektubu' | 'maliyet_hesabi' | 'evrak_dosyasi',
+    hedefId: number,
+    file: File,
+    options: { aciklama?: string; yuklemeId?: string; onProgress?: (oran: number) => void } = {}
+  ): Promise<any> => {
+    try {
+      const durum = options.yuklemeId
+        ? (await api.get(`/yuklemeler/${options.yuklemeId}/`)).data.data
+        : (await api.post('/yuklemeler/', {
+            dosya_adi: file.name,
+            toplam_boyut: file.size,
+            hedef,
+            hedef_id: hedefId,
+            aciklama: options.aciklama || '',
+          })).data.data;
+
+      const eksik: number[] = durum.eksik_parcalar;
+      for (const [i, no] of eksik.entries()) {
+        const parca = await file.slice(no * durum.parca_boyutu, (no + 1) * durum.parca_boyutu).arrayBuffer();
+        const ozet = Array.from(new Uint8Array(await crypto.subtle.digest('SHA-256', parca)))
+          .map(b => b.toString(16).padStart(2, '0'))
+          .join('');
+        await api.put(`/yuklemeler/${durum.id}/parcalar/${no}/`, parca, {
+          headers: { 'Content-Type': 'application/octet-stream', 'X-Content-SHA256': ozet },
+        });
+        options.onProgress?.((durum.parca_sayisi - eksik.length + i + 1) / durum.parca_sayisi);
+      }
+
+      const response = await api.post(`/yuklemeler/${durum.id}/tamamla/`);
+      return response.data;
+    } catch (error) {
+      console.error('Chunked upload error:', error);
+      throw error;
+    }
+  },
+
   // Mikro Fly V17 Entegrasyonu
   syncCustomersFromMikroFly: async (): Promise<{
     synchronized_count: number;
@@ -302,7 +365,7 @@ export const salesService = {
     total_customers_synced: number;
   }> => {
     try {
-      const response = await api.get('/musteriler/sync_status/');
+      const response = await api.get('/mikro-fly/durum/');
       return response.data;
     } catch (error) {
       console.error('Get sync status error:', error);
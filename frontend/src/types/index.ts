@@ -95,6 +95,13 @@ export interface ApiResponse<T> {
   results: T[];
 }
 
+// /ara/ typeahead endpointlerinin döndürdüğü hafif kayıt
+export interface AramaSonucu {
+  id: number;
+  kod: string;
+  ad: string;
+}
+
 export interface DashboardStats {
   aktif_siparisler: number;
   uretimde: number;
@@ -102,4 +109,23 @@ export interface DashboardStats {
   bekleyen: number;
   toplam_musteri: number;
   toplam_urun: number;
+}
+
+// /dashboard/metrikler/ günlük KPI anlık görüntüsü
+export interface MetrikSatiri {
+  anahtar: string;
+  etiket: string;
+  deger: number;
+}
+
+export interface MetrikOzeti {
+  tarih: string | null;
+  metrikler: Record<string, MetrikSatiri[]>;
+}
+
+export interface MetrikTrendi {
+  metrik: string;
+  baslangic: string;
+  bitis: string;
+  seriler: Record<string, { etiket: string; degerler: [string, number][] }>;
 }
\ No newline at end of file